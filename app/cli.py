@@ -0,0 +1,519 @@
+# ==========================================================
+# LÍNEA DE COMANDOS: PROCESAMIENTO POR LOTES SIN NAVEGADOR
+# ==========================================================
+"""Procesa lotes de archivos LAS con el mismo flujo que la app
+
+Uso (desde la raíz del repositorio):
+    python -m app.cli process data/*.las --jobs 16 --out results/ \\
+        --formats csv,xlsx,pdf,npz --config params.toml
+
+Cada pozo se procesa con process_well en un pool de procesos y sus
+entregables se escriben en --out a medida que termina. Al final se escriben
+los entregables consolidados y run_summary.json con los tiempos y errores de
+cada archivo. El código de salida es 1 si algún archivo falló.
+
+    python -m app.cli watch /datos/entrada --out results/ --jobs 4
+
+vigila una carpeta: procesa cada LAS nuevo o modificado (por huella del
+contenido) una vez que deja de cambiar, escribe sus entregables y lo
+registra en el catálogo de pozos. La cola se guarda en SQLite, de modo que
+un reinicio no vuelve a procesar lo ya hecho.
+
+    python -m app.cli serve --port 8765 --jobs 4
+
+expone el mismo flujo como API HTTP local (ver modules/http_api.py).
+
+Los archivos de --out-of-core-mb MB o más (o todos, con --out-of-core) se
+procesan por tramos sobre curvas mapeadas en disco (modules/out_of_core.py)
+sin cargar el pozo en memoria; de ellos solo se escriben los entregables
+csv y npz y no entran en los consolidados.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from .modules.jobs import ignore_interrupts
+from .modules.pipeline import process_well, fit_facies_model, default_pipeline_config, well_name_from_file
+from .modules.data_export import (
+    EXPORT_FINGERPRINT_COLUMNS, results_frame, export_npz_bytes, export_zone_stats_csv_bytes, export_field_matrix_npz
+)
+from .modules.export_cache import bytes_fingerprint, result_fingerprint
+from .modules.http_api import API_HOST, API_PORT, ProcessingApi
+from .modules.out_of_core import STORE_OUTPUT_FORMATS, process_las_out_of_core, supports_out_of_core, write_store_outputs
+from .modules.well_outputs import OUTPUT_FORMATS, well_output_bytes, well_stats, well_summary
+from .modules.watch_folder import (
+    WATCH_INTERVAL_SECONDS, WATCH_PATTERN, WATCH_SETTLE_SECONDS, IngestQueue, Debouncer, scan_directory
+)
+
+
+CLI_DEFAULT_FORMATS = ('csv', 'xlsx', 'pdf', 'npz')
+
+SUMMARY_FILE = 'run_summary.json'
+
+# Tamaño a partir del cual process usa el flujo por tramos (MB)
+OUT_OF_CORE_MIN_MB = 512
+
+# Cola persistente del subcomando watch (dentro de --out)
+WATCH_STATE_FILE = 'watch_state.sqlite'
+
+
+def load_config(path):
+    """Parámetros de process_well desde un TOML o JSON plano (claves sin distinguir mayúsculas)
+
+    Raises:
+        ValueError: Si hay claves que no son de default_pipeline_config
+    """
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            raw = json.load(f)
+    else:
+        import tomllib
+        with open(path, 'rb') as f:
+            raw = tomllib.load(f)
+    defaults = default_pipeline_config()
+    config = {str(key).upper(): value for key, value in raw.items()}
+    unknown = sorted(set(config) - set(defaults))
+    if unknown:
+        raise ValueError(f"Parámetros desconocidos en {path}: {', '.join(unknown)} "
+                         f"(válidos: {', '.join(defaults)})")
+    return config
+
+
+def unique_well_names(paths):
+    """Nombre de pozo por archivo; los repetidos llevan sufijo _2, _3, ..."""
+    names, seen = [], {}
+    for path in paths:
+        name = well_name_from_file(os.path.basename(path))
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name}_{seen[name]}")
+    return names
+
+
+def _write(out_dir, file_name, data):
+    path = os.path.join(out_dir, file_name)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def write_well_outputs(result, out_dir, formats, language, stats):
+    """Escribe los entregables de un pozo procesado; devuelve sus rutas"""
+    return [_write(out_dir, name, data)
+            for name, data in well_output_bytes(result, formats, language, stats).items()]
+
+
+def _well_record(path, result, process_seconds, export_seconds, outputs):
+    return {
+        'file': path,
+        'status': 'ok',
+        **well_summary(result),
+        'process_seconds': round(process_seconds, 4),
+        'export_seconds': round(export_seconds, 4),
+        'outputs': [os.path.basename(p) for p in outputs],
+    }
+
+
+def use_out_of_core(path, forced, min_mb):
+    """True si el archivo va al flujo por tramos: forzado o de min_mb MB o más, y con un LAS que se lee por bloques"""
+    if not forced and os.path.getsize(path) < min_mb * 1024 * 1024:
+        return False
+    try:
+        return supports_out_of_core(path)
+    except Exception:
+        # process_well informará del error de lectura
+        return False
+
+
+def process_file_out_of_core(path, well_name, config, facies_model, out_dir, formats):
+    """Procesa un archivo por tramos sobre un CurveStore temporal dentro de out_dir
+
+    Returns:
+        (registro del resumen, None): el pozo no entra en los consolidados
+    """
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix=f".{well_name}_store_", dir=out_dir) as directory:
+        result = process_las_out_of_core(path, directory, well_name, config, facies_model)
+        process_seconds = time.perf_counter() - start
+        outputs, skipped = write_store_outputs(result, out_dir, formats)
+    record = _well_record(path, result, process_seconds, time.perf_counter() - start - process_seconds, outputs)
+    record['out_of_core'] = True
+    record['skipped_formats'] = skipped
+    return record, None
+
+
+def process_file(path, well_name, config, facies_model, out_dir, formats, language, keep_well, out_of_core=False):
+    """Procesa un archivo y escribe sus entregables (se ejecuta en un proceso del pool)
+
+    Returns:
+        (registro del resumen, datos del pozo para los consolidados o None)
+    """
+    if out_of_core:
+        return process_file_out_of_core(path, well_name, config, facies_model, out_dir, formats)
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        raw_bytes = f.read()
+    result = process_well(raw_bytes, well_name, config, facies_model)
+    process_seconds = time.perf_counter() - start
+
+    stats = well_stats(result, language)
+    outputs = write_well_outputs(result, out_dir, formats, language, stats)
+    record = _well_record(path, result, process_seconds, time.perf_counter() - start - process_seconds, outputs)
+    well = None
+    if keep_well:
+        well = {
+            'df': result['well_df'],
+            'well_name': well_name,
+            'config': result['config'],
+            'stats': stats,
+            'curve_mapping': result['available_curves'],
+            'curve_stats': result['curve_stats'],
+            'pay_zones': result['pay_zones'],
+        }
+    return record, well
+
+
+def ingest_file(path, well_name, config, out_dir, formats, language, catalog_file):
+    """Procesa un archivo de la carpeta vigilada, escribe sus entregables y
+    lo registra en el catálogo (se ejecuta en un proceso del pool)
+
+    Returns:
+        Registro como el de process_file (incluye la huella del contenido procesado)
+    """
+    from .modules.well_catalog import WellCatalog, las_header
+
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        raw_bytes = f.read()
+    result = process_well(raw_bytes, well_name, config)
+    process_seconds = time.perf_counter() - start
+
+    df = result['df']
+    stats = well_stats(result, language)
+    outputs = write_well_outputs(result, out_dir, formats, language, stats)
+    fingerprint = result_fingerprint(df, EXPORT_FINGERPRINT_COLUMNS, result['file_fingerprint'], well_name,
+                                     sorted(result['available_curves'].items()))
+    WellCatalog(catalog_file).record_well(
+        result['well_df'], well_name, result['file_fingerprint'],
+        result_fingerprint=fingerprint,
+        file_name=os.path.basename(path),
+        header=las_header(result['source'].las),
+        curve_mapping=result['available_curves'],
+        config=result['config'],
+        stats=stats,
+        arrays_bytes=export_npz_bytes(df, well_name, result['config'])
+    )
+    return _well_record(path, result, process_seconds, time.perf_counter() - start - process_seconds, outputs)
+
+
+def write_consolidated(wells, out_dir, formats, language, config, tops=None):
+    """Entregables de todo el lote (en el orden de los archivos de entrada)
+
+    Returns:
+        Nombres de los archivos escritos
+    """
+    n = len(wells)
+    zone_stats = None
+    outputs = []
+    if tops is not None:
+        from .modules.formation_tops import zone_statistics
+        zone_stats = zone_statistics(wells, tops)
+        outputs.append(_write(out_dir, 'zone_statistics.csv', export_zone_stats_csv_bytes(zone_stats)))
+    if 'csv' in formats:
+        combined = pd.concat([results_frame(well['df']) for well in wells], keys=[well['well_name'] for well in wells])
+        outputs.append(_write(out_dir, f"Analisis_Consolidado_{n}_pozos.csv", combined.to_csv().encode('utf-8')))
+    if 'pdf' in formats:
+        from .modules.pdf_batch_export import create_pdf_batch_report
+        pdf_buffer = create_pdf_batch_report(wells, language=language, zone_stats=zone_stats)
+        outputs.append(_write(out_dir, f"Analisis_Consolidado_{n}_pozos.pdf", pdf_buffer.getvalue()))
+    if 'npz' in formats:
+        matrix = export_field_matrix_npz(wells, step=config.get('RESAMPLE_STEP'),
+                                         anchor=config.get('RESAMPLE_ANCHOR', 0.0))
+        outputs.append(_write(out_dir, f"Matriz_Campo_{n}_pozos.npz", matrix))
+    return [os.path.basename(p) for p in outputs]
+
+
+def _parse_formats(value):
+    formats = [f.strip().lower() for f in value.split(',') if f.strip()]
+    unknown = [f for f in formats if f not in OUTPUT_FORMATS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"formato desconocido: {', '.join(unknown)} (válidos: {', '.join(OUTPUT_FORMATS)})")
+    return tuple(dict.fromkeys(formats))
+
+
+def run_process(args):
+    """Subcomando process: devuelve el código de salida"""
+    started = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    config = load_config(args.config) if args.config else {}
+    tops = None
+    if args.tops:
+        from .modules.formation_tops import read_tops_csv
+        tops = read_tops_csv(args.tops)
+    os.makedirs(args.out, exist_ok=True)
+
+    paths = list(dict.fromkeys(args.files))
+    names = unique_well_names(paths)
+    consolidate = len(paths) > 0 and (tops is not None or any(f in args.formats for f in ('csv', 'pdf', 'npz')))
+
+    facies_model = None
+    facies_seconds = None
+    if args.facies:
+        facies_start = time.perf_counter()
+        # Los archivos se leen de disco en cada pasada del ajuste
+        facies_model = fit_facies_model(paths, args.facies)
+        facies_seconds = round(time.perf_counter() - facies_start, 4)
+
+    records = [None] * len(paths)
+    wells = [None] * len(paths)
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {}
+        for i, (path, name) in enumerate(zip(paths, names)):
+            out_of_core = use_out_of_core(path, args.out_of_core, args.out_of_core_mb)
+            future = pool.submit(process_file, path, name, config, facies_model, args.out,
+                                 args.formats, args.language, consolidate, out_of_core)
+            futures[future] = (i, time.perf_counter())
+        for done, future in enumerate(as_completed(futures), 1):
+            i, submitted = futures[future]
+            try:
+                records[i], wells[i] = future.result()
+            except Exception as e:
+                records[i] = {
+                    'file': paths[i],
+                    'well_name': names[i],
+                    'status': 'error',
+                    'error': f"{type(e).__name__}: {e}",
+                    'traceback': ''.join(traceback.format_exception(type(e), e, e.__traceback__)),
+                }
+            records[i]['seconds'] = round(time.perf_counter() - submitted, 4)
+            if not args.quiet:
+                print(f"[{done}/{len(paths)}] {names[i]} {records[i]['status']} "
+                      f"{records[i]['seconds']:.2f} s", file=sys.stderr)
+
+    ok_wells = [well for well in wells if well is not None]
+    consolidated, consolidated_error = [], None
+    if consolidate and ok_wells:
+        try:
+            consolidated = write_consolidated(ok_wells, args.out, args.formats, args.language, config, tops)
+        except Exception as e:
+            consolidated_error = f"{type(e).__name__}: {e}"
+
+    failed = sum(1 for record in records if record['status'] != 'ok')
+    summary = {
+        'started': started.isoformat(),
+        'finished': datetime.now(timezone.utc).isoformat(),
+        'seconds': round(time.perf_counter() - start, 4),
+        'jobs': args.jobs,
+        'formats': list(args.formats),
+        'language': args.language,
+        'config': config,
+        'facies_clusters': args.facies,
+        'facies_seconds': facies_seconds,
+        'files': len(paths),
+        'ok': len(paths) - failed,
+        'failed': failed,
+        'consolidated': consolidated,
+        'consolidated_error': consolidated_error,
+        'wells': records,
+    }
+    summary_path = args.summary or os.path.join(args.out, SUMMARY_FILE)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    if not args.quiet:
+        print(f"{summary['ok']}/{len(paths)} pozos en {summary['seconds']:.1f} s → {summary_path}", file=sys.stderr)
+    return 1 if failed or consolidated_error else 0
+
+
+def _log(message):
+    print(f"{datetime.now().strftime('%H:%M:%S')} {message}", file=sys.stderr, flush=True)
+
+
+def _finish_ingest(queue, future, path, submitted, quiet=False):
+    """Registra en la cola el resultado de un ingest_file terminado"""
+    seconds = round(time.perf_counter() - submitted, 4)
+    try:
+        record = future.result()
+    except Exception as e:
+        queue.fail(path, f"{type(e).__name__}: {e}", seconds)
+        if not quiet:
+            _log(f"error {os.path.basename(path)}: {type(e).__name__}: {e}")
+        return
+    queue.complete(path, record['file_fingerprint'], record['well_name'], seconds)
+    if not quiet:
+        _log(f"ok {record['well_name']} {seconds:.2f} s · net pay {record['net_pay_ft']:.1f} ft")
+
+
+def run_watch(args):
+    """Subcomando watch: vigila una carpeta hasta recibir SIGINT/SIGTERM (o, con --once,
+    hasta procesar lo que haya); devuelve el código de salida"""
+    from .modules.well_catalog import catalog_path
+
+    if not os.path.isdir(args.directory):
+        raise ValueError(f"No existe la carpeta {args.directory}")
+    config = load_config(args.config) if args.config else {}
+    os.makedirs(args.out, exist_ok=True)
+    queue = IngestQueue(args.state or os.path.join(args.out, WATCH_STATE_FILE))
+    catalog_file = args.catalog or catalog_path()
+    # Cambiar parámetros, formatos o idioma vuelve a procesar los archivos
+    settings_key = bytes_fingerprint(
+        json.dumps([config, list(args.formats), args.language], sort_keys=True, default=str).encode()
+    )
+    recovered = queue.recover()
+    if recovered and not args.quiet:
+        _log(f"{recovered} archivo(s) interrumpido(s) vuelven a la cola")
+
+    stop = []
+    previous_handlers = {sig: signal.signal(sig, lambda signum, frame: stop.append(signum))
+                         for sig in (signal.SIGINT, signal.SIGTERM)}
+    debouncer = Debouncer(args.settle)
+    in_flight = {}
+    try:
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=ignore_interrupts) as pool:
+            while not stop:
+                now = time.monotonic()
+                for path, signature in debouncer.update(scan_directory(args.directory, args.pattern, args.recursive), now):
+                    if queue.signature(path) == signature:
+                        continue
+                    try:
+                        with open(path, 'rb') as f:
+                            fingerprint = bytes_fingerprint(f.read())
+                    except FileNotFoundError:
+                        continue
+                    if queue.offer(path, signature, fingerprint, settings_key) and not args.quiet:
+                        _log(f"en cola {os.path.basename(path)}")
+
+                # Pool acotado: solo se reclaman tantos archivos como procesos
+                while len(in_flight) < args.jobs:
+                    item = queue.claim()
+                    if item is None:
+                        break
+                    path = item['path']
+                    well_name = well_name_from_file(os.path.basename(path))
+                    future = pool.submit(ingest_file, path, well_name, config, args.out,
+                                         args.formats, args.language, catalog_file)
+                    in_flight[future] = (path, time.perf_counter())
+
+                if args.once and not in_flight and not debouncer.unsettled(now) and not queue.counts()['pending']:
+                    break
+                if in_flight:
+                    done, _ = wait(in_flight, timeout=args.interval, return_when=FIRST_COMPLETED)
+                else:
+                    done = ()
+                    time.sleep(args.interval)
+                for future in done:
+                    _finish_ingest(queue, future, *in_flight.pop(future), quiet=args.quiet)
+
+            # Al detenerse se terminan los trabajos en curso; los pendientes siguen en la cola
+            for future, (path, submitted) in in_flight.items():
+                _finish_ingest(queue, future, path, submitted, quiet=args.quiet)
+    finally:
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+
+    counts = queue.counts()
+    if not args.quiet:
+        _log(f"procesados {counts['done']} · pendientes {counts['pending']} · con error {counts['error']}")
+    return 1 if counts['error'] else 0
+
+
+async def _serve_until_signal(api, host, port, ready):
+    server = asyncio.ensure_future(api.serve(host, port, ready=ready))
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, server.cancel)
+    try:
+        await server
+    except asyncio.CancelledError:
+        pass
+
+
+def run_serve(args):
+    """Subcomando serve: API HTTP local hasta recibir SIGINT/SIGTERM"""
+    api = ProcessingApi(max_workers=args.jobs)
+    ready = None if args.quiet else \
+        (lambda port: _log(f"API en http://{args.host}:{port} · {api.max_workers} procesos"))
+    asyncio.run(_serve_until_signal(api, args.host, args.port, ready))
+    if not args.quiet:
+        _log("API detenida")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m app.cli', description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    process = commands.add_parser('process', help='procesa archivos LAS y escribe sus entregables')
+    process.add_argument('files', nargs='+', help='archivos .las')
+    process.add_argument('--out', default='results', help='carpeta de salida (por defecto: results)')
+    process.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='procesos del pool (por defecto: núcleos)')
+    process.add_argument('--formats', type=_parse_formats, default=CLI_DEFAULT_FORMATS,
+                         help=f"formatos por pozo separados por comas ({', '.join(OUTPUT_FORMATS)}; "
+                              f"por defecto: {','.join(CLI_DEFAULT_FORMATS)})")
+    process.add_argument('--config', help='parámetros de process_well en TOML o JSON (claves de default_pipeline_config)')
+    process.add_argument('--language', default='es', choices=('es', 'en', 'fr'), help='idioma de los PDF')
+    process.add_argument('--facies', type=int, metavar='K', help='electrofacies con K clusters ajustadas sobre todo el lote')
+    process.add_argument('--tops', help='CSV de topes de formación para las estadísticas por zona')
+    process.add_argument('--out-of-core', action='store_true',
+                         help=f"procesa todos los archivos por tramos en disco (solo {','.join(STORE_OUTPUT_FORMATS)})")
+    process.add_argument('--out-of-core-mb', type=float, default=OUT_OF_CORE_MIN_MB, metavar='MB',
+                         help=f'tamaño a partir del cual un archivo se procesa por tramos (por defecto: {OUT_OF_CORE_MIN_MB})')
+    process.add_argument('--summary', help=f'ruta del resumen JSON (por defecto: OUT/{SUMMARY_FILE})')
+    process.add_argument('--quiet', action='store_true', help='sin progreso en stderr')
+
+    watch = commands.add_parser('watch', help='vigila una carpeta y procesa los LAS nuevos o modificados')
+    watch.add_argument('directory', help='carpeta vigilada')
+    watch.add_argument('--out', default='results', help='carpeta de salida (por defecto: results)')
+    watch.add_argument('--jobs', type=int, default=min(4, os.cpu_count() or 1),
+                       help='procesos del pool (por defecto: min(4, núcleos))')
+    watch.add_argument('--formats', type=_parse_formats, default=('csv', 'npz'),
+                       help=f"formatos por pozo separados por comas ({', '.join(OUTPUT_FORMATS)}; por defecto: csv,npz)")
+    watch.add_argument('--config', help='parámetros de process_well en TOML o JSON (claves de default_pipeline_config)')
+    watch.add_argument('--language', default='es', choices=('es', 'en', 'fr'), help='idioma de los PDF')
+    watch.add_argument('--pattern', default=WATCH_PATTERN, help=f'patrón de archivos (por defecto: {WATCH_PATTERN})')
+    watch.add_argument('--recursive', action='store_true', help='incluye subcarpetas')
+    watch.add_argument('--interval', type=float, default=WATCH_INTERVAL_SECONDS,
+                       help=f'segundos entre barridos (por defecto: {WATCH_INTERVAL_SECONDS:g})')
+    watch.add_argument('--settle', type=float, default=WATCH_SETTLE_SECONDS,
+                       help=f'segundos sin cambios antes de procesar un archivo (por defecto: {WATCH_SETTLE_SECONDS:g})')
+    watch.add_argument('--state', help=f'base SQLite de la cola (por defecto: OUT/{WATCH_STATE_FILE})')
+    watch.add_argument('--catalog', help='catálogo de pozos (por defecto: AIWELLLOG_CATALOG_PATH o ~/.aiwelllog)')
+    watch.add_argument('--once', action='store_true', help='procesa lo que haya en la carpeta y termina')
+    watch.add_argument('--quiet', action='store_true', help='sin registro en stderr')
+
+    serve = commands.add_parser('serve', help='API HTTP local para enviar LAS y descargar resultados')
+    serve.add_argument('--host', default=API_HOST, help=f'interfaz (por defecto: {API_HOST})')
+    serve.add_argument('--port', type=int, default=API_PORT, help=f'puerto (por defecto: {API_PORT}; 0 = libre)')
+    serve.add_argument('--jobs', type=int, default=min(4, os.cpu_count() or 1),
+                       help='procesos del pool (por defecto: min(4, núcleos))')
+    serve.add_argument('--quiet', action='store_true', help='sin registro en stderr')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error('--jobs debe ser al menos 1')
+    try:
+        if args.command == 'process':
+            return run_process(args)
+        if args.command == 'watch':
+            return run_watch(args)
+        if args.command == 'serve':
+            return run_serve(args)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,22 +4,38 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.colors import ListedColormap
-from matplotlib.ticker import MultipleLocator, AutoMinorLocator
-import lasio
-import io
+import functools
+import os
+import sqlite3
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
 from modules.petrofisica import (
-    PetroConfig, PetroPhysics, LithoClassifier, LITHO_COLORS,
-    smooth_curve, flag_bad_data, clean_depth_data, 
-    detect_dominant_matrix, get_valid_data_range
+    LITHO_COLORS, SMOOTHING_METHODS, SMOOTHED_CURVES, SW_MODELS, sw_model_column,
+    litho_counts, get_valid_data_range
 )
-from modules.pdf_export import create_pdf_report
-from modules.pdf_batch_export import create_pdf_batch_report
+from modules.pay_zones import sample_thickness
+from modules.uncertainty import UNCERTAIN_PARAMS, DISTRIBUTIONS, run_monte_carlo
+from modules.well_model import memory_report
+from modules.pipeline import process_well, fit_facies_model, config_key, well_name_from_file
+from modules.jobs import JobManager
+from modules.result_store import ResultStore
+from modules.log_qc import QC_SPIKE_THRESHOLD
+from modules.depth_matching import (
+    DEPTH_MATCH_MODES, DEPTH_MATCH_CURVES, DEPTH_MATCH_MAX_SHIFT_FT, DEPTH_MATCH_WINDOW_FT
+)
+from modules.well_catalog import WellCatalog, las_header
+from modules.export_cache import (
+    ExportCache, EXPORT_CACHE_MAX_BYTES, bytes_fingerprint, result_fingerprint, export_key
+)
+from modules.data_export import (
+    EXPORT_FINGERPRINT_COLUMNS, results_frame, export_csv_bytes, export_excel_bytes,
+    export_npz_bytes, export_parquet_bytes, export_las_bytes, export_field_matrix_npz,
+    export_pay_zones_csv_bytes, export_zone_stats_csv_bytes
+)
+from modules.formation_tops import read_tops_csv, match_tops, zone_statistics
+from modules.locales import translate
 
 
 LANG_OPTIONS = {
@@ -28,337 +44,10 @@ LANG_OPTIONS = {
     "Français": "fr",
 }
 
-UI_TEXTS = {
-    "es": {
-        "sidebar_title": "⚙️ Configuración",
-        "language_selector": "🌐 Idioma",
-        "adjustable_params": "### 📋 Parámetros Ajustables",
-        "adjustable_desc": """
-Ajusta los siguientes parámetros según tus necesidades de análisis:
-
-- **Cutoffs**: Umbrales mínimos y máximos para identificar zonas productivas
-- **Archie**: Parámetros de la ecuación de Archie para cálculo de saturación
-""",
-        "cutoffs_header": "Cutoffs para Net Pay",
-        "phi_min": "Porosidad mínima (%)",
-        "vsh_max": "VSH máximo (%)",
-        "sw_max": "Sw máximo (%)",
-        "archie_header": "Parámetros de Archie",
-        "param_a": "Parámetro A",
-        "param_m": "Parámetro M (cementación)",
-        "param_n": "Parámetro N (saturación)",
-        "rw_label": "Resistividad agua (Rw) [ohm-m]",
-        "las_explorer": "📊 Explorador de Datos del Archivo LAS",
-        "available_columns": "Columnas disponibles",
-        "select_columns": "Selecciona columnas para visualizar",
-        "first_samples": "Primeras 100 muestras",
-        "column_stats": "Estadísticas de Columnas",
-        "detailed_info": "Información Detallada",
-        "hero_badge": "Petrofísica Computacional",
-        "hero_title": "INTERPRETACIÓN AUTOMATIZADA<br/>DE REGISTROS DE POZOS",
-        "hero_subtitle": "Herramienta para el procesamiento preliminar automatizado de registros de pozos",
-        "feature_visualization": "Visualización",
-        "feature_visualization_desc": "Registro profesional de 8 tracks",
-        "feature_multiwell": "Multi-Pozo",
-        "feature_multiwell_desc": "Procesamiento simultáneo por lotes",
-        "feature_export": "Exportación",
-        "feature_export_desc": "Reportes en PDF, Excel y CSV",
-        "feature_analysis": "Análisis",
-        "feature_analysis_desc": "Litología, Net Pay y saturación",
-        "curve_aliases": "Alias de curvas",
-        "export_formats": "Formatos export",
-        "columns": "columnas",
-        "upload_label": "📤 Carga uno o más archivos LAS (.las)",
-        "files_ready": "archivo(s) listos para procesar",
-        "processing": "📖 Procesando",
-        "well_banner_samples": "muestras",
-        "well_banner_file": "Archivo",
-        "of": "de",
-        "depth_identification": "Identificación de Profundidad",
-        "depth_start_metric": "Profundidad Inicial (ft)",
-        "depth_end_metric": "Profundidad Final (ft)",
-        "depth_interval_metric": "Intervalo (ft)",
-        "curve_mapping": "Mapeo de Curvas Disponibles",
-        "mapped_curves": "✓ Curvas mapeadas",
-        "dominant_matrix_detection": "Detección de Matriz Dominante",
-        "dominant_matrix": "Matriz Dominante",
-        "density": "Densidad (g/cc)",
-        "petrophysical_calcs": "Cálculos Petrofísicos",
-        "vsh_precalc": "✓ VSH: valores pre-calculados",
-        "vsh_calc": "✓ VSH: calculado (Larionov)",
-        "vsh_no_gr": "⚠️ VSH: No se puede calcular sin GR",
-        "porosity_precalc": "✓ Porosidad: valores pre-calculados",
-        "porosity_calc": "✓ Porosidad: calculada para",
-        "samples": "muestras",
-        "porosity_no_rhob": "⚠️ Porosidad: No se puede calcular sin RHOB",
-        "sw_precalc": "✓ Saturación: valores pre-calculados",
-        "sw_calc": "✓ Saturación: calculada para",
-        "sw_no_rt": "⚠️ Saturación: No se puede calcular sin RT",
-        "net_pay": "✓ Net pay",
-        "stat_summary": "Resumen Estadístico",
-        "prop_header": "Propiedad",
-        "mean_header": "Promedio",
-        "min_header": "Mínimo",
-        "max_header": "Máximo",
-        "valid_header": "Válidos",
-        "effective_porosity": "Porosidad Efectiva",
-        "clay_volume": "Volumen de Arcilla",
-        "water_saturation": "Saturación de Agua",
-        "permeability": "Permeabilidad",
-        "lith_distribution": "Distribución Litológica",
-        "lithology": "Litología",
-        "samples_label": "Muestras",
-        "percentage": "Porcentaje (%)",
-        "lith_composition": "Composición Litológica",
-        "petro_log_8_tracks": "Registro Petrofísico — 8 Tracks",
-        "depth_ft": "Profundidad (ft)",
-        "resistivity": "RESISTIVIDAD\n(ohm·m)",
-        "lithology_type": "LITOLOGÍA\n(Tipo)",
-        "export_results": "Exportación de Resultados",
-        "download_csv": "📥 Descargar CSV",
-        "download_excel": "📊 Descargar Excel",
-        "download_pdf": "📄 Descargar PDF",
-        "process_completed": "✅ Procesamiento completado",
-        "process_error": "❌ Error procesando",
-        "consolidated_export": "Exportación Consolidada — Todos los Pozos",
-        "download_pdf_report_batch": "📄 Descargar Reporte PDF Consolidado",
-        "download_pdf_batch": "📥 Descargar PDF Consolidado",
-        "download_csv_batch_btn": "📊 Descargar CSV Consolidado",
-        "download_csv_batch": "📥 Descargar CSV Consolidado",
-        "wells_processed": "pozo(s) procesado(s) exitosamente",
-        "empty_title": "Carga archivos LAS para comenzar el análisis",
-        "empty_desc": "Arrastra o selecciona uno o más archivos .LAS para procesarlos automáticamente",
-        "cap_1": "Lectura automática de LAS",
-        "cap_2": "Mapeo flexible de curvas",
-        "cap_3": "Detección de matriz",
-        "cap_4": "Cálculos petrofísicos",
-        "cap_5": "Visualización 8 tracks",
-        "cap_6": "Procesamiento batch",
-        "cap_7": "Exportación PDF/Excel/CSV",
-        "cap_8": "Litología y Net Pay",
-    },
-    "en": {
-        "sidebar_title": "⚙️ Settings",
-        "language_selector": "🌐 Language",
-        "adjustable_params": "### 📋 Adjustable Parameters",
-        "adjustable_desc": """
-Adjust the following parameters according to your analysis needs:
-
-- **Cutoffs**: Minimum/maximum thresholds to identify productive zones
-- **Archie**: Archie equation parameters for saturation calculation
-""",
-        "cutoffs_header": "Net Pay Cutoffs",
-        "phi_min": "Minimum porosity (%)",
-        "vsh_max": "Maximum VSH (%)",
-        "sw_max": "Maximum Sw (%)",
-        "archie_header": "Archie Parameters",
-        "param_a": "A Parameter",
-        "param_m": "M Parameter (cementation)",
-        "param_n": "N Parameter (saturation)",
-        "rw_label": "Water resistivity (Rw) [ohm-m]",
-        "las_explorer": "📊 LAS File Data Explorer",
-        "available_columns": "Available columns",
-        "select_columns": "Select columns to display",
-        "first_samples": "First 100 samples",
-        "column_stats": "Column statistics",
-        "detailed_info": "Detailed information",
-        "hero_badge": "Computational Petrophysics",
-        "hero_title": "AUTOMATED WELL LOG<br/>INTERPRETATION",
-        "hero_subtitle": "Tool for automated preliminary well-log processing",
-        "feature_visualization": "Visualization",
-        "feature_visualization_desc": "Professional 8-track log",
-        "feature_multiwell": "Multi-Well",
-        "feature_multiwell_desc": "Simultaneous batch processing",
-        "feature_export": "Export",
-        "feature_export_desc": "Reports in PDF, Excel and CSV",
-        "feature_analysis": "Analysis",
-        "feature_analysis_desc": "Lithology, Net Pay and saturation",
-        "curve_aliases": "Curve aliases",
-        "export_formats": "Export formats",
-        "columns": "columns",
-        "upload_label": "📤 Upload one or more LAS files (.las)",
-        "files_ready": "file(s) ready to process",
-        "processing": "📖 Processing",
-        "well_banner_samples": "samples",
-        "well_banner_file": "File",
-        "of": "of",
-        "depth_identification": "Depth Identification",
-        "depth_start_metric": "Start Depth (ft)",
-        "depth_end_metric": "End Depth (ft)",
-        "depth_interval_metric": "Interval (ft)",
-        "curve_mapping": "Available Curve Mapping",
-        "mapped_curves": "✓ Mapped curves",
-        "dominant_matrix_detection": "Dominant Matrix Detection",
-        "dominant_matrix": "Dominant Matrix",
-        "density": "Density (g/cc)",
-        "petrophysical_calcs": "Petrophysical Calculations",
-        "vsh_precalc": "✓ VSH: pre-calculated values",
-        "vsh_calc": "✓ VSH: calculated (Larionov)",
-        "vsh_no_gr": "⚠️ VSH: cannot be calculated without GR",
-        "porosity_precalc": "✓ Porosity: pre-calculated values",
-        "porosity_calc": "✓ Porosity: calculated for",
-        "samples": "samples",
-        "porosity_no_rhob": "⚠️ Porosity: cannot be calculated without RHOB",
-        "sw_precalc": "✓ Saturation: pre-calculated values",
-        "sw_calc": "✓ Saturation: calculated for",
-        "sw_no_rt": "⚠️ Saturation: cannot be calculated without RT",
-        "net_pay": "✓ Net pay",
-        "stat_summary": "Statistical Summary",
-        "prop_header": "Property",
-        "mean_header": "Mean",
-        "min_header": "Minimum",
-        "max_header": "Maximum",
-        "valid_header": "Valid",
-        "effective_porosity": "Effective Porosity",
-        "clay_volume": "Clay Volume",
-        "water_saturation": "Water Saturation",
-        "permeability": "Permeability",
-        "lith_distribution": "Lithology Distribution",
-        "lithology": "Lithology",
-        "samples_label": "Samples",
-        "percentage": "Percentage (%)",
-        "lith_composition": "Lithological Composition",
-        "petro_log_8_tracks": "Petrophysical Log — 8 Tracks",
-        "depth_ft": "Depth (ft)",
-        "resistivity": "RESISTIVITY\n(ohm·m)",
-        "lithology_type": "LITHOLOGY\n(Type)",
-        "export_results": "Export Results",
-        "download_csv": "📥 Download CSV",
-        "download_excel": "📊 Download Excel",
-        "download_pdf": "📄 Download PDF",
-        "process_completed": "✅ Processing completed",
-        "process_error": "❌ Error processing",
-        "consolidated_export": "Consolidated Export — All Wells",
-        "download_pdf_report_batch": "📄 Download Consolidated PDF Report",
-        "download_pdf_batch": "📥 Download Consolidated PDF",
-        "download_csv_batch_btn": "📊 Download Consolidated CSV",
-        "download_csv_batch": "📥 Download Consolidated CSV",
-        "wells_processed": "well(s) processed successfully",
-        "empty_title": "Upload LAS files to start the analysis",
-        "empty_desc": "Drag or select one or more .LAS files to process automatically",
-        "cap_1": "Automatic LAS reading",
-        "cap_2": "Flexible curve mapping",
-        "cap_3": "Matrix detection",
-        "cap_4": "Petrophysical calculations",
-        "cap_5": "8-track visualization",
-        "cap_6": "Batch processing",
-        "cap_7": "PDF/Excel/CSV export",
-        "cap_8": "Lithology and Net Pay",
-    },
-    "fr": {
-        "sidebar_title": "⚙️ Configuration",
-        "language_selector": "🌐 Langue",
-        "adjustable_params": "### 📋 Paramètres ajustables",
-        "adjustable_desc": """
-Ajustez les paramètres suivants selon vos besoins d'analyse :
-
-- **Cutoffs**: Seuils minimum/maximum pour identifier les zones productives
-- **Archie**: Paramètres de l'équation d'Archie pour le calcul de saturation
-""",
-        "cutoffs_header": "Seuils Net Pay",
-        "phi_min": "Porosité minimale (%)",
-        "vsh_max": "VSH maximal (%)",
-        "sw_max": "Sw maximal (%)",
-        "archie_header": "Paramètres d'Archie",
-        "param_a": "Paramètre A",
-        "param_m": "Paramètre M (cimentation)",
-        "param_n": "Paramètre N (saturation)",
-        "rw_label": "Résistivité de l'eau (Rw) [ohm-m]",
-        "las_explorer": "📊 Explorateur de données LAS",
-        "available_columns": "Colonnes disponibles",
-        "select_columns": "Sélectionnez les colonnes à afficher",
-        "first_samples": "100 premiers échantillons",
-        "column_stats": "Statistiques des colonnes",
-        "detailed_info": "Informations détaillées",
-        "hero_badge": "Pétrophysique computationnelle",
-        "hero_title": "INTERPRÉTATION AUTOMATISÉE<br/>DES DIAGRAPHIES DE PUITS",
-        "hero_subtitle": "Outil de traitement préliminaire automatisé des diagraphies",
-        "feature_visualization": "Visualisation",
-        "feature_visualization_desc": "Diagraphie professionnelle à 8 pistes",
-        "feature_multiwell": "Multi-puits",
-        "feature_multiwell_desc": "Traitement par lots simultané",
-        "feature_export": "Exportation",
-        "feature_export_desc": "Rapports en PDF, Excel et CSV",
-        "feature_analysis": "Analyse",
-        "feature_analysis_desc": "Lithologie, Net Pay et saturation",
-        "curve_aliases": "Alias de courbes",
-        "export_formats": "Formats d'export",
-        "columns": "colonnes",
-        "upload_label": "📤 Importez un ou plusieurs fichiers LAS (.las)",
-        "files_ready": "fichier(s) prêt(s) à traiter",
-        "processing": "📖 Traitement",
-        "well_banner_samples": "échantillons",
-        "well_banner_file": "Fichier",
-        "of": "sur",
-        "depth_identification": "Identification de profondeur",
-        "depth_start_metric": "Profondeur initiale (ft)",
-        "depth_end_metric": "Profondeur finale (ft)",
-        "depth_interval_metric": "Intervalle (ft)",
-        "curve_mapping": "Cartographie des courbes disponibles",
-        "mapped_curves": "✓ Courbes cartographiées",
-        "dominant_matrix_detection": "Détection de la matrice dominante",
-        "dominant_matrix": "Matrice dominante",
-        "density": "Densité (g/cc)",
-        "petrophysical_calcs": "Calculs pétrophysiques",
-        "vsh_precalc": "✓ VSH : valeurs pré-calculées",
-        "vsh_calc": "✓ VSH : calculé (Larionov)",
-        "vsh_no_gr": "⚠️ VSH : impossible à calculer sans GR",
-        "porosity_precalc": "✓ Porosité : valeurs pré-calculées",
-        "porosity_calc": "✓ Porosité : calculée pour",
-        "samples": "échantillons",
-        "porosity_no_rhob": "⚠️ Porosité : impossible à calculer sans RHOB",
-        "sw_precalc": "✓ Saturation : valeurs pré-calculées",
-        "sw_calc": "✓ Saturation : calculée pour",
-        "sw_no_rt": "⚠️ Saturation : impossible à calculer sans RT",
-        "net_pay": "✓ Net pay",
-        "stat_summary": "Résumé statistique",
-        "prop_header": "Propriété",
-        "mean_header": "Moyenne",
-        "min_header": "Minimum",
-        "max_header": "Maximum",
-        "valid_header": "Valides",
-        "effective_porosity": "Porosité effective",
-        "clay_volume": "Volume d'argile",
-        "water_saturation": "Saturation en eau",
-        "permeability": "Perméabilité",
-        "lith_distribution": "Distribution lithologique",
-        "lithology": "Lithologie",
-        "samples_label": "Échantillons",
-        "percentage": "Pourcentage (%)",
-        "lith_composition": "Composition lithologique",
-        "petro_log_8_tracks": "Diagraphie pétrophysique — 8 pistes",
-        "depth_ft": "Profondeur (ft)",
-        "resistivity": "RÉSISTIVITÉ\n(ohm·m)",
-        "lithology_type": "LITHOLOGIE\n(Type)",
-        "export_results": "Exportation des résultats",
-        "download_csv": "📥 Télécharger CSV",
-        "download_excel": "📊 Télécharger Excel",
-        "download_pdf": "📄 Télécharger PDF",
-        "process_completed": "✅ Traitement terminé",
-        "process_error": "❌ Erreur lors du traitement",
-        "consolidated_export": "Exportation consolidée — Tous les puits",
-        "download_pdf_report_batch": "📄 Télécharger le rapport PDF consolidé",
-        "download_pdf_batch": "📥 Télécharger PDF consolidé",
-        "download_csv_batch_btn": "📊 Télécharger CSV consolidé",
-        "download_csv_batch": "📥 Télécharger CSV consolidé",
-        "wells_processed": "puits traité(s) avec succès",
-        "empty_title": "Importez des fichiers LAS pour démarrer l'analyse",
-        "empty_desc": "Faites glisser ou sélectionnez un ou plusieurs fichiers .LAS pour un traitement automatique",
-        "cap_1": "Lecture automatique des LAS",
-        "cap_2": "Cartographie flexible des courbes",
-        "cap_3": "Détection de matrice",
-        "cap_4": "Calculs pétrophysiques",
-        "cap_5": "Visualisation 8 pistes",
-        "cap_6": "Traitement batch",
-        "cap_7": "Export PDF/Excel/CSV",
-        "cap_8": "Lithologie et Net Pay",
-    }
-}
-
 
 def t(key):
-    lang = st.session_state.get("app_lang", "es")
-    return UI_TEXTS.get(lang, UI_TEXTS["es"]).get(key, UI_TEXTS["es"].get(key, key))
+    # Los textos de cada idioma (app/locales/*.json) se leen la primera vez que se usan
+    return translate(st.session_state.get("app_lang", "es"), key)
 
 # ==========================================================
 # CONFIGURACIÓN DE STREAMLIT
@@ -811,32 +500,150 @@ st.sidebar.subheader(t("cutoffs_header"))
 phi_cutoff = st.sidebar.slider(t("phi_min"), 0.1, 20.0, 6.0, step=0.1) / 100
 vsh_cutoff = st.sidebar.slider(t("vsh_max"), 10.0, 80.0, 50.0, step=5.0) / 100
 sw_cutoff = st.sidebar.slider(t("sw_max"), 30.0, 100.0, 70.0, step=5.0) / 100
+pay_min_thickness = st.sidebar.number_input(t("pay_min_thickness"), min_value=0.0, max_value=100.0, value=0.0, step=0.5)
+pay_merge_gap = st.sidebar.number_input(t("pay_merge_gap"), min_value=0.0, max_value=50.0, value=0.0, step=0.5)
+
+st.sidebar.subheader(t("tops_header"))
+tops_file = st.sidebar.file_uploader(t("tops_upload"), type=['csv', 'txt'], key="tops_file")
+tops_df = None
+if tops_file is not None:
+    try:
+        tops_df = read_tops_csv(tops_file)
+        st.sidebar.caption(t("tops_loaded").format(zones=len(tops_df), wells=tops_df['WELL'].str.upper().nunique()))
+    except ValueError as e:
+        st.sidebar.error(f"{t('tops_error')}: {e}")
 
 st.sidebar.subheader(t("archie_header"))
 config_a = st.sidebar.slider(t("param_a"), 0.5, 2.0, 1.0, step=0.05)
 config_m = st.sidebar.slider(t("param_m"), 1.8, 2.5, 2.0, step=0.05)
 config_n = st.sidebar.slider(t("param_n"), 1.8, 2.5, 2.0, step=0.05)
 config_rw = st.sidebar.slider(t("rw_label"), 0.01, 0.5, 0.05, step=0.01)
+config_rsh = st.sidebar.slider(t("rsh_label"), 0.5, 10.0, 2.0, step=0.1)
+config_sw_model = st.sidebar.selectbox(t("sw_model"), SW_MODELS, format_func=lambda m: t(f"sw_model_{m}"))
+
+st.sidebar.subheader(t("resample_header"))
+resample_enabled = st.sidebar.checkbox(t("resample_enable"), value=False)
+resample_step = st.sidebar.number_input(t("resample_step"), min_value=0.05, max_value=10.0, value=0.5, step=0.05,
+                                        disabled=not resample_enabled)
+resample_anchor = st.sidebar.number_input(t("resample_anchor"), value=0.0, step=0.5,
+                                          disabled=not resample_enabled)
+
+st.sidebar.subheader(t("depth_match_header"))
+depth_match_mode = st.sidebar.selectbox(t("depth_match_mode"), DEPTH_MATCH_MODES,
+                                        index=DEPTH_MATCH_MODES.index('bulk'),
+                                        format_func=lambda m: t(f"depth_match_{m}"))
+depth_match_reference = st.sidebar.selectbox(t("depth_match_reference"), ('GR',) + DEPTH_MATCH_CURVES,
+                                             disabled=depth_match_mode == 'off')
+depth_match_max_shift = st.sidebar.number_input(t("depth_match_max_shift"), min_value=0.5, max_value=50.0,
+                                                value=DEPTH_MATCH_MAX_SHIFT_FT, step=0.5,
+                                                disabled=depth_match_mode == 'off')
+depth_match_window = st.sidebar.number_input(t("depth_match_window"), min_value=20.0, max_value=2000.0,
+                                             value=DEPTH_MATCH_WINDOW_FT, step=10.0,
+                                             disabled=depth_match_mode != 'windowed')
+
+st.sidebar.subheader(t("qc_header"))
+qc_mask_enabled = st.sidebar.checkbox(t("qc_mask"), value=False)
+qc_spike_threshold = st.sidebar.slider(t("qc_spike_threshold"), 2.0, 10.0, QC_SPIKE_THRESHOLD, step=0.5)
 
-# Actualizar configuración global
-PetroConfig.A = config_a
-PetroConfig.M = config_m
-PetroConfig.N = config_n
-PetroConfig.RW = config_rw
-PetroConfig.PHI_CUTOFF = phi_cutoff
-PetroConfig.VSH_CUTOFF = vsh_cutoff
-PetroConfig.SW_CUTOFF = sw_cutoff
+st.sidebar.subheader(t("smoothing_header"))
+smoothing_method = st.sidebar.selectbox(t("smoothing_method"), SMOOTHING_METHODS,
+                                        format_func=lambda m: t(f"smoothing_{m}"))
+smoothing_windows = {
+    curve: st.sidebar.slider(t("smoothing_window").format(curve=curve), 1, 21, 5, step=2)
+    for curve in SMOOTHED_CURVES
+}
+
+st.sidebar.subheader(t("facies_header"))
+facies_enabled = st.sidebar.checkbox(t("facies_enable"), value=False)
+facies_clusters = st.sidebar.slider(t("facies_clusters"), 3, 12, 6, disabled=not facies_enabled)
+
+st.sidebar.subheader(t("mc_header"))
+mc_enabled = st.sidebar.checkbox(t("mc_enable"), value=False)
+mc_spec = {}
+if mc_enabled:
+    mc_realizations = st.sidebar.number_input(t("mc_realizations"), min_value=100, max_value=20000, value=1000, step=100)
+    mc_seed = st.sidebar.number_input(t("mc_seed"), min_value=0, value=42, step=1)
+    with st.sidebar.expander(t("mc_distributions")):
+        for param in UNCERTAIN_PARAMS:
+            dist_col, spread_col = st.columns([3, 2])
+            dist = dist_col.selectbox(param, DISTRIBUTIONS, index=DISTRIBUTIONS.index('triangular'),
+                                      format_func=lambda d: t(f"mc_dist_{d}"), key=f"mc_dist_{param}")
+            spread = spread_col.number_input(t("mc_spread"), min_value=0.0, max_value=50.0, value=10.0,
+                                             step=1.0, key=f"mc_spread_{param}")
+            mc_spec[param] = (dist, spread / 100)
 
 # ==========================================================
 # FUNCIONES DE APOYO
 # ==========================================================
 
-def display_las_viewer(df, file_index):
-    """Muestra un explorador de datos interactivo del archivo LAS"""
-    with st.expander(t("las_explorer"), expanded=False):
+# Filas por página del explorador LAS
+EXPLORER_PAGE_SIZES = (100, 500, 1000, 5000)
+
+# Intervalo de sondeo del progreso de los trabajos (s)
+JOB_POLL_SECONDS = 0.2
+
+
+@st.cache_resource
+def get_export_cache():
+    """Caché de exportaciones compartida por el proceso"""
+    max_mb = os.environ.get("AIWELLLOG_EXPORT_CACHE_MB")
+    max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else EXPORT_CACHE_MAX_BYTES
+    return ExportCache(max_bytes=max_bytes)
+
+
+def pdf_report_bytes(*args, **kwargs):
+    """Bytes de create_pdf_report; reportlab se importa con el primer PDF pedido"""
+    from modules.pdf_export import create_pdf_report
+    return create_pdf_report(*args, **kwargs).getvalue()
+
+
+@st.cache_resource
+def get_result_store():
+    """Resultados por pozo compartidos entre sesiones (presupuesto en AIWELLLOG_RESULT_CACHE_MB)"""
+    return ResultStore()
+
+
+@st.cache_resource
+def get_job_manager():
+    """Trabajos de procesamiento compartidos por el proceso (hilos en AIWELLLOG_JOB_WORKERS)"""
+    return JobManager(store=get_result_store())
+
+
+def wait_for_job(job, label):
+    """Espera un trabajo mostrando su progreso y devuelve su resultado
+
+    Si un widget dispara un rerun, Streamlit interrumpe esta espera pero no
+    el trabajo: el siguiente rerun se engancha a él por su clave.
+    """
+    if not job.done():
+        bar = st.progress(0, text=label)
+        while not job.done():
+            bar.progress(min(int(job.progress), 100), text=label)
+            time.sleep(JOB_POLL_SECONDS)
+        bar.empty()
+    return job.result()
+
+
+@st.cache_resource
+def get_well_catalog():
+    """Catálogo SQLite de pozos (ruta en AIWELLLOG_CATALOG_PATH)"""
+    return WellCatalog()
+
+
+def display_las_viewer(source, file_index):
+    """Muestra un explorador de datos interactivo del archivo LAS
+
+    No calcula nada mientras está cerrado. Las filas se leen por páginas
+    sobre los arreglos del archivo y las estadísticas de cada columna salen
+    de la caché del LasSource (se calculan una vez por pozo).
+    """
+    if not st.toggle(t("las_explorer"), value=False, key=f"explorer_open_{file_index}"):
+        return
+    
+    with st.container(border=True):
         st.subheader(t("available_columns"))
         
-        all_columns = df.columns.tolist()
+        all_columns = source.curve_names
         selected_columns = st.multiselect(
             t("select_columns"),
             all_columns,
@@ -845,30 +652,38 @@ def display_las_viewer(df, file_index):
         )
         
         if selected_columns:
-            # Tabla de datos
-            st.subheader(t("first_samples"))
-            st.dataframe(
-                df[selected_columns].head(100),
-                use_container_width=True,
-                height=400
-            )
-            
-            # Estadísticas
+            # Tabla de datos paginada
+            total_rows = source.n_rows
+            col1, col2 = st.columns(2)
+            page_size = col1.selectbox(t("explorer_page_size"), EXPLORER_PAGE_SIZES, key=f"explorer_page_size_{file_index}")
+            pages = max(-(-total_rows // page_size), 1)
+            page = col2.number_input(t("explorer_page").format(pages=pages), min_value=1, max_value=pages,
+                                     value=1, step=1, key=f"explorer_page_{file_index}")
+            offset = (int(page) - 1) * page_size
+            page_df = source.read_rows(selected_columns, offset, page_size)
+            
+            st.subheader(t("explorer_rows").format(start=offset + 1 if total_rows else 0,
+                                                   stop=offset + len(page_df), total=total_rows))
+            st.dataframe(page_df, use_container_width=True, height=400)
+            
+            # Estadísticas (caché por pozo, compartida por ambas tablas)
             st.subheader(t("column_stats"))
-            stats_display = df[selected_columns].describe().T
-            st.dataframe(stats_display, use_container_width=True)
+            column_stats = source.column_stats(selected_columns)
+            numeric_columns = [c for c in selected_columns if c in column_stats]
+            st.dataframe(column_stats.table(numeric_columns), use_container_width=True)
             
             # Info de columnas
             st.subheader(t("detailed_info"))
             col_info_list = []
             for col in selected_columns:
+                record = column_stats[col] if col in column_stats else None
                 col_info_list.append({
                     'Columna': col,
-                    'Tipo': str(df[col].dtype),
-                    'No-nulos': df[col].notna().sum(),
-                    'Nulos': df[col].isna().sum(),
-                    'Min': f"{df[col].min():.4f}" if pd.api.types.is_numeric_dtype(df[col]) else '-',
-                    'Max': f"{df[col].max():.4f}" if pd.api.types.is_numeric_dtype(df[col]) else '-',
+                    'Tipo': str(page_df[col].dtype),
+                    'No-nulos': record['count'] if record else '-',
+                    'Nulos': record['nulls'] if record else '-',
+                    'Min': f"{record['min']:.4f}" if record and record['min'] is not None else '-',
+                    'Max': f"{record['max']:.4f}" if record and record['max'] is not None else '-',
                 })
             
             col_info_df = pd.DataFrame(col_info_list)
@@ -894,7 +709,7 @@ st.markdown(f"""
             <span class="hero-stat-label">{t('curve_aliases')}</span>
         </div>
         <div class="hero-stat">
-            <span class="hero-stat-value">3</span>
+            <span class="hero-stat-value">6</span>
             <span class="hero-stat-label">{t('export_formats')}</span>
         </div>
     </div>
@@ -945,6 +760,12 @@ st.markdown("<div style='height: 0.2rem;'></div>", unsafe_allow_html=True)
 uploaded_files = st.file_uploader(t("upload_label"), type=['las'], accept_multiple_files=True, key='las_files', label_visibility="visible")
 
 if uploaded_files:
+    # matplotlib solo se importa cuando hay pozos que graficar
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
+    from matplotlib.colors import ListedColormap
+    from matplotlib.ticker import MultipleLocator, AutoMinorLocator
+
     total_files = len(uploaded_files)
     st.markdown(f"""
     <div style="display: flex; align-items: center; gap: 0.6rem; background: #f0f9ff; border: 1px solid #bae6fd; border-radius: 10px; padding: 0.6rem 1rem; margin-bottom: 0.5rem;">
@@ -953,59 +774,103 @@ if uploaded_files:
     </div>
     """, unsafe_allow_html=True)
     
+    # Parámetros del flujo; cada pozo se procesa como un trabajo en segundo plano
+    # identificado por el contenido del archivo y esta configuración
+    pipeline_config = {
+        'A': config_a,
+        'M': config_m,
+        'N': config_n,
+        'RW': config_rw,
+        'RSH': config_rsh,
+        'SW_MODEL': config_sw_model,
+        'PHI_CUTOFF': phi_cutoff,
+        'VSH_CUTOFF': vsh_cutoff,
+        'SW_CUTOFF': sw_cutoff,
+        'PAY_MIN_THICKNESS': pay_min_thickness,
+        'PAY_MERGE_GAP': pay_merge_gap,
+        'RESAMPLE_STEP': resample_step if resample_enabled else None,
+        'RESAMPLE_ANCHOR': resample_anchor,
+        'DEPTH_MATCH_MODE': depth_match_mode,
+        'DEPTH_MATCH_REFERENCE': depth_match_reference,
+        'DEPTH_MATCH_MAX_SHIFT': depth_match_max_shift,
+        'DEPTH_MATCH_WINDOW': depth_match_window,
+        'QC_MASK': qc_mask_enabled,
+        'QC_SPIKE_THRESHOLD': qc_spike_threshold,
+        'SMOOTHING_METHOD': smoothing_method,
+        'SMOOTHING_WINDOW': smoothing_windows,
+    }
+    job_manager = get_job_manager()
+    uploads = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+    
+    # Electrofacies: un modelo para todos los pozos cargados, ajustado por
+    # mini-lotes sobre las curvas de entrada (solo se decodifican esas curvas)
+    facies_model = None
+    facies_key = None
+    if facies_enabled:
+        facies_key = ('facies', tuple(bytes_fingerprint(raw) for _, raw in uploads), facies_clusters)
+        facies_job = job_manager.submit(facies_key, fit_facies_model, [raw for _, raw in uploads], facies_clusters)
+        try:
+            facies_model = wait_for_job(facies_job, t("facies_summary"))
+        except ValueError as e:
+            st.warning(f"{t('facies_error')}: {e}")
+            facies_key = None
+        if facies_model is not None:
+            st.markdown(f'<div class="section-header"><span class="section-number">★</span><span class="section-title">{t("facies_summary")}</span></div>', unsafe_allow_html=True)
+            st.dataframe(facies_model.summary(), use_container_width=True, hide_index=True)
+            st.caption(t("facies_caption").format(samples=facies_model.samples, wells=total_files,
+                                                  seconds=facies_job.seconds or 0.0, curves=", ".join(facies_model.curves)))
+    
+    # Todos los pozos se encolan a la vez; un rerun se engancha a los trabajos en curso
+    well_jobs = []
+    for file_name, raw in uploads:
+        well_name = well_name_from_file(file_name)
+        job_key = ('well', bytes_fingerprint(raw), well_name, config_key(pipeline_config), facies_key)
+        well_jobs.append(job_manager.submit(job_key, process_well, raw, well_name, pipeline_config, facies_model))
+    del uploads
+    
     # Almacenar datos de todos los pozos
     all_wells_data = []
-    for file_idx, uploaded_file in enumerate(uploaded_files, 1):
+    for file_idx, (uploaded_file, well_job) in enumerate(zip(uploaded_files, well_jobs), 1):
         st.markdown("---")
         
         try:
             # ======================================================
             # LECTURA Y LIMPIEZA DE DATOS
             # ======================================================
-            st.info(f"{t('processing')}: {uploaded_file.name} ({file_idx}/{total_files})...")
-            
-            # Guardar archivo temporal
-            temp_path = f'/tmp/temp_well_{file_idx}.las'
-            with open(temp_path, 'wb') as f:
-                f.write(uploaded_file.getbuffer())
-            
-            las = lasio.read(temp_path, ignore_header_errors=True)
-            df = las.df().reset_index()
-            
-            well_name = uploaded_file.name.replace('.las', '').upper()
+            processing_label = f"{t('processing')}: {uploaded_file.name} ({file_idx}/{total_files})..."
+            st.info(processing_label)
+            
+            # El resultado se comparte entre sesiones (solo lectura): no se modifica
+            result = wait_for_job(well_job, processing_label)
+            source = result['source']
+            df = result['df']
+            well_name = result['well_name']
+            file_fingerprint = result['file_fingerprint']
+            original_columns = result['original_columns']
+            available_curves = result['available_curves']
+            curve_stats = result['curve_stats']
+            config_dict = result['config']
             
             st.markdown(f"""
             <div class="well-banner">
                 <p class="well-banner-name">🛢️ {well_name}</p>
-                <p class="well-banner-meta">{len(df.columns)} {t('columns')} · {len(df)} {t('well_banner_samples')} · {t('well_banner_file')} {file_idx} {t('of')} {total_files}</p>
+                <p class="well-banner-meta">{original_columns} {t('columns')} · {result['samples_before_resample']} {t('well_banner_samples')} · {t('well_banner_file')} {file_idx} {t('of')} {total_files}</p>
             </div>
             """, unsafe_allow_html=True)
             
             # ======================================================
             # EXPLORADOR DE DATOS
             # ======================================================
-            display_las_viewer(df, file_idx)
+            display_las_viewer(source, file_idx)
             
             # ======================================================
             # PASO 1: IDENTIFICAR PROFUNDIDAD
             # ======================================================
             st.markdown(f'<div class="section-header"><span class="section-number">1</span><span class="section-title">{t("depth_identification")}</span></div>', unsafe_allow_html=True)
             
-            depth_aliases = ['DEPTH', 'DEPT', 'MD', 'MEASURED_DEPTH', 'TVD', 'TVDSS', 
-                            'TDEP', 'MD_FT', 'DEPTM', 'INDEX']
-            depth_col = None
-            
-            for alias in depth_aliases:
-                if alias in df.columns:
-                    depth_col = alias
-                    break
-            
-            if depth_col is None:
-                depth_col = df.columns[0]
-            
-            df.rename(columns={depth_col: 'DEPTH_FT'}, inplace=True)
-            df = clean_depth_data(df)
-            df['DEPTH'] = df['DEPTH_FT'] * 0.3048
+            if result['resampled']:
+                st.caption(t("resample_done").format(step=resample_step, before=result['samples_before_resample'],
+                                                     after=len(df)))
             
             depth_ft_min = df['DEPTH_FT'].min()
             depth_ft_max = df['DEPTH_FT'].max()
@@ -1023,190 +888,72 @@ if uploaded_files:
             # ======================================================
             st.markdown(f'<div class="section-header"><span class="section-number">2</span><span class="section-title">{t("curve_mapping")}</span></div>', unsafe_allow_html=True)
             
-            curve_aliases = {
-                'CALI': ['CALI', 'CAL', 'CAL1', 'CALIPER'],
-                'BS': ['BS', 'BIT_SIZE'],
-                'GR': ['GR', 'GAM', 'HGR', 'GAMMA'],
-                'SP': ['SP', 'SSP'],
-                'RT': ['RT', 'RTRUE', 'RESD', 'RDEP', 'ILD', 'LLD', 'RILD', 'RD', 'AT90', 'AIT90', 'AT60', 'AIT60', 'RLA4', 'HRLA4'],
-                'RM_RES': ['RESM', 'LLM', 'ILM', 'AT30', 'AIT30', 'AT20', 'AIT20', 'RLA3', 'HRLA3', 'RLA2', 'HRLA2'],
-                'RXOS': ['RXOS', 'RESS', 'LLS', 'SFL', 'MSFL', 'RXO', 'AT10', 'AIT10', 'RLA1', 'HRLA1'],
-                'RMC': ['RMC', 'RMCAKE', 'MUDCAKE'],
-                'RMUD': ['RMUD', 'MUD_RES'],
-                'RW': ['RW', 'RWA', 'WATER_RES'],
-                'RHOB': ['RHOB', 'DEN', 'DENS', 'RHOZ', 'DENSITY'],
-                'NPHI': ['NPHI', 'NPL', 'NPOS', 'NEUT'],
-                'PEF': ['PEF', 'PE', 'PHOTO'],
-                'DT': ['DT', 'AC', 'SONIC'],
-                'VSH': ['VSH', 'VCL', 'VSHALE'],
-                'SW': ['SW', 'SWE', 'SWAT'],
-                'PHIT': ['PHIT', 'PHI_T', 'PHIE', 'PHI'],
-            }
-            
-            available_curves = {}
-            for standard_name, aliases in curve_aliases.items():
-                for alias in aliases:
-                    if alias in df.columns:
-                        df[standard_name] = df[alias].copy()
-                        available_curves[standard_name] = alias
-                        break
-                if standard_name not in available_curves:
-                    df[standard_name] = np.nan
-            
             available_str = ", ".join([f"{k} ({v})" for k, v in available_curves.items()])
             st.write(f"{t('mapped_curves')}: {available_str}")
+            depth_report = result['depth_report']
+            if not depth_report.empty:
+                st.write(t("depth_match_report").format(reference=depth_match_reference))
+                st.dataframe(depth_report, hide_index=True, use_container_width=True)
+            
+            # Control de calidad de todas las curvas (banderas uint16 por muestra)
+            qc_summary = result['qc_summary']
+            if not qc_summary.empty:
+                st.write(t("qc_title"))
+                st.dataframe(qc_summary, hide_index=True, use_container_width=True)
+                if config_dict['QC_MASK']:
+                    st.caption(t("qc_masked").format(values=int(qc_summary['FLAGGED'].sum())))
+                if not result['qc_washout_checked']:
+                    st.caption(t("qc_no_washout"))
             
             # ======================================================
             # PASO 3: DETECCIÓN DE MATRIZ
             # ======================================================
             st.markdown(f'<div class="section-header"><span class="section-number">3</span><span class="section-title">{t("dominant_matrix_detection")}</span></div>', unsafe_allow_html=True)
             
-            dominant_matrix, dominant_rho = detect_dominant_matrix(df)
-            PetroConfig.DOMINANT_MATRIX = dominant_matrix
-            PetroConfig.DOMINANT_RHO = dominant_rho
-            
-            if dominant_matrix in PetroConfig.ARCHIE_PARAMS:
-                params = PetroConfig.ARCHIE_PARAMS[dominant_matrix]
-                PetroConfig.A = params['A']
-                PetroConfig.M = params['M']
-                PetroConfig.N = params['N']
-            
             col1, col2 = st.columns(2)
             with col1:
-                st.metric(t("dominant_matrix"), dominant_matrix)
+                st.metric(t("dominant_matrix"), config_dict['DOMINANT_MATRIX'])
             with col2:
-                st.metric(t("density"), f"{dominant_rho:.3f}")
+                st.metric(t("density"), f"{config_dict['DOMINANT_RHO']:.3f}")
             
             # ======================================================
             # PASO 4: CÁLCULOS PETROFÍSICOS
             # ======================================================
             st.markdown(f'<div class="section-header"><span class="section-number">4</span><span class="section-title">{t("petrophysical_calcs")}</span></div>', unsafe_allow_html=True)
             
-            progress = st.progress(0)
-            
-            # Suavizado
-            for col in ['GR', 'RHOB', 'NPHI']:
-                if col in df.columns and df[col].notna().sum() > 10:
-                    df[col] = smooth_curve(df[col], window=5)
-            
-            progress.progress(20)
-            
-            # VSH
-            if df['VSH'].notna().any():
+            if result['vsh_source'] == 'precalc':
                 st.write(t("vsh_precalc"))
-            elif df['GR'].notna().any():
-                gr_valid = df['GR'].dropna()
-                gr_min = gr_valid.quantile(0.02)
-                gr_max = gr_valid.quantile(0.98)
-                df['VSH'] = df['GR'].apply(
-                    lambda x: PetroPhysics.calc_vsh_larionov(x, gr_min, gr_max)
-                )
+            elif result['vsh_source'] == 'GR':
                 st.write(t("vsh_calc"))
             else:
-                df['VSH'] = np.nan
                 st.warning(t("vsh_no_gr"))
             
-            progress.progress(40)
-            
-            # Litología
-            litho_list = []
-            rho_matrix_list = []
-            
-            for idx, row in df.iterrows():
-                lith = LithoClassifier.classify_advanced(
-                    row['VSH'], 0, row['RHOB'], row['NPHI'], 
-                    row['PEF'], dominant_matrix
-                )
-                litho_list.append(lith)
-                
-                if 'DOLOMITA' in lith:
-                    rho_ma = 2.87
-                elif 'CALIZA' in lith or 'CARBONATO' in lith:
-                    rho_ma = 2.71
-                elif 'LUTITA' in lith:
-                    rho_ma = 2.70
-                else:
-                    rho_ma = dominant_rho
-                
-                rho_matrix_list.append(rho_ma)
-            
-            df['LITOLOGIA'] = litho_list
-            df['RHO_MATRIX'] = rho_matrix_list
-            
-            progress.progress(60)
-            
-            # Porosidad
-            df['PHI_T'] = np.nan
-            df['PHI_E'] = np.nan
+            if 'FACIES' in df.columns:
+                facies = df['FACIES'].to_numpy()
+                st.caption(t("facies_assigned").format(pct=100 * np.count_nonzero(facies >= 0) / max(len(facies), 1)))
             
             if df['PHIT'].notna().any():
-                df['PHI_T'] = df['PHIT'].copy()
                 st.write(t("porosity_precalc"))
             elif df['RHOB'].notna().any():
-                for idx, row in df.iterrows():
-                    if pd.notna(row['RHOB']):
-                        if pd.notna(row['NPHI']):
-                            phi_t = PetroPhysics.calc_porosity_neutron_density(
-                                row['NPHI'], row['RHOB'], row['RHO_MATRIX'], 
-                                PetroConfig.RHO_FLUID, row['VSH']
-                            )
-                        else:
-                            phi_t = PetroPhysics.calc_porosity_density(
-                                row['RHOB'], row['RHO_MATRIX'], 
-                                PetroConfig.RHO_FLUID, row['VSH']
-                            )
-                        df.loc[idx, 'PHI_T'] = phi_t
-                
                 st.write(f"{t('porosity_calc')} {df['PHI_T'].notna().sum()} {t('samples')}")
             else:
                 st.warning(t("porosity_no_rhob"))
             
-            # Porosidad efectiva
-            for idx, row in df.iterrows():
-                if pd.notna(row['PHI_T']) and pd.notna(row['VSH']):
-                    phi_e = PetroPhysics.calc_effective_porosity(row['PHI_T'], row['VSH'])
-                    df.loc[idx, 'PHI_E'] = phi_e
-            
-            progress.progress(80)
-            
-            # Saturación
-            df['SW'] = np.nan
-            if df['SW'].notna().any():
-                st.write(t("sw_precalc"))
-            elif df['RT'].notna().any():
-                for idx, row in df.iterrows():
-                    sw = PetroPhysics.calc_water_saturation(
-                        row['PHI_E'], row['RT'], 
-                        PetroConfig.A, PetroConfig.M, 
-                        PetroConfig.N, PetroConfig.RW
-                    )
-                    df.loc[idx, 'SW'] = sw
-                st.write(f"{t('sw_calc')} {df['SW'].notna().sum()} {t('samples')}")
+            if df['RT'].notna().any():
+                sw_model_label = t(f"sw_model_{config_dict['SW_MODEL']}")
+                st.write(f"{t('sw_calc')} {df['SW'].notna().sum()} {t('samples')} · {sw_model_label}")
             else:
                 st.warning(t("sw_no_rt"))
             
-            # Permeabilidad
-            df['PERM'] = np.nan
-            for idx, row in df.iterrows():
-                perm = PetroPhysics.calc_permeability_kozeny(row['PHI_E'], row['VSH'])
-                df.loc[idx, 'PERM'] = perm
-            
-            progress.progress(90)
-            
-            # Net Pay
-            phi_ok = df['PHI_E'].fillna(0) >= PetroConfig.PHI_CUTOFF
-            vsh_ok = df['VSH'].fillna(1) <= PetroConfig.VSH_CUTOFF
-            sw_ok = df['SW'].fillna(1) <= PetroConfig.SW_CUTOFF
-            
-            if not df['RT'].notna().any():
-                df['IS_PAY'] = phi_ok & vsh_ok
-            else:
-                df['IS_PAY'] = phi_ok & vsh_ok & sw_ok
-            
-            net_pay = df['IS_PAY'].sum()
-            
-            progress.progress(100)
-            st.write(f"{t('net_pay')}: {net_pay} {t('samples')} ({100*net_pay/len(df):.1f}%)")
+            # Zonas productivas contiguas y net pay por espesor
+            pay_zones = result['pay_zones']
+            pay_totals = result['pay_totals']
+            interval_ft = result['interval_ft']
+            st.write(f"{t('net_pay')}: " + t('net_pay_detail').format(
+                net_ft=pay_totals['net_ft'], net_m=pay_totals['net_m'], zones=pay_totals['zones'],
+                samples=int(pay_zones['SAMPLES'].sum()),
+                pct=100 * pay_totals['net_ft'] / interval_ft if interval_ft > 0 else 0.0
+            ))
             
             # ======================================================
             # RESUMEN ESTADÍSTICO
@@ -1219,24 +966,9 @@ if uploaded_files:
                                ('VSH', t('clay_volume')),
                                ('SW', t('water_saturation')),
                                ('PERM', t('permeability'))]:
-                if df[col].notna().any():
-                    valid_data = df[df[col] > 0][col] if col == 'PERM' else df[col]
-                    valid_data = valid_data[valid_data.notna()]
-                    
-                    if len(valid_data) > 0:
-                        stats_dict[label] = {
-                            'mean': valid_data.mean(),
-                            'min': valid_data.min(),
-                            'max': valid_data.max(),
-                            'valid': len(valid_data)
-                        }
-                    else:
-                        stats_dict[label] = {
-                            'mean': None,
-                            'min': None,
-                            'max': None,
-                            'valid': 0
-                        }
+                # PERM: solo valores > 0 (ver curve_stats.update)
+                if col in result['stats']:
+                    stats_dict[label] = result['stats'][col]
             
             # Mostrar tabla de estadísticas
             stats_df = pd.DataFrame({
@@ -1249,10 +981,78 @@ if uploaded_files:
             
             st.dataframe(stats_df, use_container_width=True, hide_index=True)
             
+            st.markdown(f"**{t('pay_zones_header')}**")
+            if pay_zones.empty:
+                st.info(t("no_pay_zones"))
+            else:
+                st.dataframe(pay_zones, use_container_width=True, hide_index=True)
+
+            # Cada modelo de saturación con los mismos cutoffs de porosidad y arcilla
+            if curve_stats.has_data('SW'):
+                st.markdown(f"**{t('sw_models_compare')}**")
+                thickness = sample_thickness(df['DEPTH_FT'].to_numpy(dtype=np.float64))
+                rock_pay = ((df['PHI_E'].fillna(0.0) >= config_dict['PHI_CUTOFF']) &
+                            (df['VSH'].fillna(1.0) <= config_dict['VSH_CUTOFF'])).to_numpy()
+                model_rows = []
+                for model in SW_MODELS:
+                    model_sw = df[sw_model_column(model)]
+                    model_pay = rock_pay & (model_sw.fillna(1.0) <= config_dict['SW_CUTOFF']).to_numpy()
+                    model_rows.append({
+                        t('sw_model_col'): t(f"sw_model_{model}") + (" ✓" if model == config_dict['SW_MODEL'] else ""),
+                        t('sw_mean_col'): model_sw.mean(),
+                        t('sw_net_pay_col'): thickness[model_pay].sum(),
+                    })
+                st.dataframe(pd.DataFrame(model_rows).style.format({t('sw_mean_col'): "{:.4f}", t('sw_net_pay_col'): "{:.1f}"}),
+                             use_container_width=True, hide_index=True)
+
+            # Incertidumbre: realizaciones del modelo de saturación elegido y cutoffs
+            # alrededor de los valores usados. El resultado se guarda por la clave del
+            # trabajo del pozo, la especificación, la semilla y el modelo, de modo que
+            # los reruns de la app no repiten el sorteo
+            if mc_enabled:
+                st.markdown(f"**{t('mc_summary')}**")
+                if all(dist == 'fixed' or spread <= 0 for dist, spread in mc_spec.values()):
+                    st.info(t("mc_no_spread"))
+                else:
+                    mc_base = {name: config_dict[name] for name in
+                               ('A', 'M', 'N', 'RW', 'PHI_CUTOFF', 'VSH_CUTOFF', 'SW_CUTOFF')}
+                    mc_zones = {'min_thickness': config_dict['PAY_MIN_THICKNESS'],
+                                'merge_gap': config_dict['PAY_MERGE_GAP']}
+                    mc_key = ('mc', well_job.key, tuple(sorted(mc_spec.items())), int(mc_realizations),
+                              int(mc_seed), config_dict['SW_MODEL'], config_dict['RSH'], tuple(mc_zones.values()))
+                    mc_job = job_manager.submit(mc_key, run_monte_carlo, df, mc_base, mc_spec,
+                                                int(mc_realizations), int(mc_seed),
+                                                sw_model=config_dict['SW_MODEL'], rsh=config_dict['RSH'], **mc_zones)
+                    mc = wait_for_job(mc_job, t('mc_summary'))
+                    mc_seconds = mc_job.seconds or 0.0
+                    
+                    summary_df = mc['summary'].copy()
+                    summary_df.insert(0, t('mc_base'), [mc['base'][name] for name in summary_df.index])
+                    st.dataframe(summary_df.rename_axis(t('mc_metric')).style.format("{:.3f}", na_rep="-"),
+                                 use_container_width=True)
+                    st.caption(t("mc_caption").format(n=int(mc_realizations), seconds=mc_seconds))
+                    
+                    tornado_df = mc['tornado'].iloc[::-1]
+                    if not tornado_df.empty:
+                        fig, ax = plt.subplots(figsize=(8, 0.45 * len(tornado_df) + 1.2), facecolor='white')
+                        base_value = mc['base_net_pay']
+                        ax.barh(tornado_df['PARAM'], tornado_df['METRIC_LOW'] - base_value, left=base_value,
+                                color='#1f77b4', label='P10')
+                        ax.barh(tornado_df['PARAM'], tornado_df['METRIC_HIGH'] - base_value, left=base_value,
+                                color='#ff7f0e', label='P90')
+                        ax.axvline(base_value, color='black', linewidth=1)
+                        ax.set_xlabel('Net pay (ft)')
+                        ax.set_title(t('mc_tornado'), fontweight='bold', fontsize=11)
+                        ax.legend(loc='lower right', fontsize=8)
+                        ax.grid(True, axis='x', alpha=0.3)
+                        plt.tight_layout()
+                        st.pyplot(fig, use_container_width=True)
+                        plt.close(fig)
+            
             # Distribución litológica - Mejorada
             if 'LITOLOGIA' in df.columns:
                 st.markdown(f'<div class="section-header"><span class="section-number">6</span><span class="section-title">{t("lith_distribution")}</span></div>', unsafe_allow_html=True)
-                lith_counts = df['LITOLOGIA'].value_counts()
+                lith_counts = litho_counts(df['LITOLOGIA'])
                 lith_pct = (lith_counts / len(df) * 100).round(1)
                 
                 lith_df = pd.DataFrame({
@@ -1289,7 +1089,7 @@ if uploaded_files:
             # ======================================================
             st.markdown(f'<div class="section-header"><span class="section-number">7</span><span class="section-title">{t("petro_log_8_tracks")}</span></div>', unsafe_allow_html=True)
             
-            depth_min_data, depth_max_data = get_valid_data_range(df)
+            depth_min_data, depth_max_data = get_valid_data_range(df, stats=curve_stats)
             depth_min = depth_min_data
             depth_max = depth_max_data
             
@@ -1435,9 +1235,9 @@ if uploaded_files:
             valid_phi = df['PHI_E'].notna()
             if valid_phi.any():
                 ax.plot(df.loc[valid_phi, 'PHI_E'], df.loc[valid_phi, 'DEPTH_FT'], 'c-', linewidth=1.5)
-                ax.axvline(PetroConfig.PHI_CUTOFF, color='r', linestyle='--', alpha=0.7, linewidth=1.5)
+                ax.axvline(config_dict['PHI_CUTOFF'], color='r', linestyle='--', alpha=0.7, linewidth=1.5)
                 ax.fill_betweenx(df.loc[valid_phi, 'DEPTH_FT'], 0, df.loc[valid_phi, 'PHI_E'],
-                               where=(df.loc[valid_phi, 'PHI_E'] >= PetroConfig.PHI_CUTOFF),
+                               where=(df.loc[valid_phi, 'PHI_E'] >= config_dict['PHI_CUTOFF']),
                                color='cyan', alpha=0.3)
                 ax.set_xlim(-0.02, 0.45)
             else:
@@ -1450,9 +1250,9 @@ if uploaded_files:
             valid_vsh = df['VSH'].notna()
             if valid_vsh.any():
                 ax.plot(df.loc[valid_vsh, 'VSH'], df.loc[valid_vsh, 'DEPTH_FT'], 'brown', linewidth=1.5)
-                ax.axvline(PetroConfig.VSH_CUTOFF, color='r', linestyle='--', alpha=0.7, linewidth=1.5)
+                ax.axvline(config_dict['VSH_CUTOFF'], color='r', linestyle='--', alpha=0.7, linewidth=1.5)
                 ax.fill_betweenx(df.loc[valid_vsh, 'DEPTH_FT'], 0, df.loc[valid_vsh, 'VSH'],
-                               where=(df.loc[valid_vsh, 'VSH'] <= PetroConfig.VSH_CUTOFF),
+                               where=(df.loc[valid_vsh, 'VSH'] <= config_dict['VSH_CUTOFF']),
                                color='tan', alpha=0.3)
                 ax.set_xlim(0, 1)
             else:
@@ -1473,12 +1273,11 @@ if uploaded_files:
             
             # Track 8: Litología
             ax = axes[7]
-            litho_unique = df['LITOLOGIA'].unique()
-            litho_mapping = {lith: i for i, lith in enumerate(litho_unique)}
-            lith_num = df['LITOLOGIA'].map(litho_mapping)
+            litho_unique = [str(lith) for lith in df['LITOLOGIA'].unique()]
+            lith_num = pd.Categorical(df['LITOLOGIA'], categories=litho_unique).codes
             colors_present = [LITHO_COLORS.get(lith, '#CCCCCC') for lith in litho_unique]
             cmap = ListedColormap(colors_present)
-            img = np.array(lith_num).reshape(-1, 1)
+            img = lith_num.reshape(-1, 1)
             ax.imshow(img, aspect='auto', cmap=cmap, origin='upper',
                      extent=[0, 1, depth_max, depth_min], interpolation='nearest')
             ax.set_xticks([])
@@ -1500,15 +1299,26 @@ if uploaded_files:
             # ======================================================
             st.markdown(f'<div class="section-header"><span class="section-number">8</span><span class="section-title">{t("export_results")}</span></div>', unsafe_allow_html=True)
             
+            
+            # Las exportaciones se reutilizan entre reruns mientras no cambien
+            # los resultados, la configuración ni el idioma
+            export_cache = get_export_cache()
+            app_lang = st.session_state.get("app_lang", "es")
+            fingerprint = result_fingerprint(
+                df, EXPORT_FINGERPRINT_COLUMNS,
+                file_fingerprint, well_name, sorted(available_curves.items())
+            )
+            
+            def cached_export(fmt, builder, config=None, language=None):
+                return export_cache.get_or_build(
+                    export_key(fingerprint, fmt, config, language), builder
+                )
+            
             col1, col2, col3 = st.columns(3)
             
             # CSV
             with col1:
-                csv_data = df[['DEPTH_FT', 'GR', 'RHOB', 'NPHI', 'RT', 
-                              'VSH', 'PHI_T', 'PHI_E', 'SW', 'PERM',
-                              'LITOLOGIA', 'RHO_MATRIX', 'IS_PAY']].copy()
-                csv_str = csv_data.to_csv(index=False)
-                csv_bytes = csv_str.encode('utf-8')
+                csv_bytes = cached_export('csv', lambda: export_csv_bytes(df))
                 st.download_button(
                     label=t("download_csv"),
                     data=csv_bytes,
@@ -1519,10 +1329,7 @@ if uploaded_files:
             
             # Excel
             with col2:
-                excel_buffer = io.BytesIO()
-                with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                    csv_data.to_excel(writer, sheet_name='Datos', index=False)
-                excel_bytes = excel_buffer.getvalue()
+                excel_bytes = cached_export('xlsx', lambda: export_excel_bytes(df))
                 st.download_button(
                     label=t("download_excel"),
                     data=excel_bytes,
@@ -1531,61 +1338,209 @@ if uploaded_files:
                     key=f"excel_{file_idx}"
                 )
             
-            # PDF
+            # PDF: se genera (e importa reportlab) al pulsar el botón; una vez en
+            # la caché de exportaciones se ofrece directamente la descarga
             with col3:
-                config_dict = {
-                    'DOMINANT_MATRIX': PetroConfig.DOMINANT_MATRIX,
-                    'DOMINANT_RHO': PetroConfig.DOMINANT_RHO,
-                    'A': PetroConfig.A,
-                    'M': PetroConfig.M,
-                    'N': PetroConfig.N,
-                    'RW': PetroConfig.RW,
-                    'PHI_CUTOFF': PetroConfig.PHI_CUTOFF,
-                    'VSH_CUTOFF': PetroConfig.VSH_CUTOFF,
-                    'SW_CUTOFF': PetroConfig.SW_CUTOFF,
-                }
-                
-                pdf_buffer = create_pdf_report(
-                    df,
-                    well_name,
-                    config_dict,
-                    stats_dict,
-                    available_curves,
-                    language=st.session_state.get("app_lang", "es")
+                pdf_key = export_key(fingerprint, 'pdf', config_dict, app_lang)
+                if pdf_key in export_cache or st.button(t("generate_pdf"), key=f"generate_pdf_{file_idx}"):
+                    pdf_bytes = export_cache.get_or_build(
+                        pdf_key,
+                        functools.partial(
+                            pdf_report_bytes,
+                            df,
+                            well_name,
+                            config_dict,
+                            stats_dict,
+                            available_curves,
+                            language=app_lang,
+                            curve_stats=curve_stats,
+                            pay_zones=pay_zones
+                        )
+                    )
+                    st.download_button(
+                        label=t("download_pdf"),
+                        data=pdf_bytes,
+                        file_name=f"{well_name}_analysis.pdf",
+                        mime="application/pdf",
+                        key=f"pdf_{file_idx}"
+                    )
+            
+            col1, col2, col3 = st.columns(3)
+            
+            # NPZ columnar
+            npz_bytes = cached_export('npz', lambda: export_npz_bytes(df, well_name, config_dict),
+                                      config=config_dict)
+            with col1:
+                st.download_button(
+                    label=t("download_npz"),
+                    data=npz_bytes,
+                    file_name=f"{well_name}_results.npz",
+                    mime="application/octet-stream",
+                    key=f"npz_{file_idx}"
                 )
-                pdf_bytes = pdf_buffer.getvalue()
+            
+            # Parquet: se genera al pulsar el botón; sin pyarrow solo se desactiva esta descarga
+            with col2:
+                parquet_key = export_key(fingerprint, 'parquet', config_dict)
+                if parquet_key in export_cache or st.button(t("generate_parquet"), key=f"generate_parquet_{file_idx}"):
+                    try:
+                        parquet_bytes = export_cache.get_or_build(
+                            parquet_key, lambda: export_parquet_bytes(df, well_name, config_dict)
+                        )
+                    except ImportError:
+                        st.warning(t("parquet_unavailable"))
+                    else:
+                        st.download_button(
+                            label=t("download_parquet"),
+                            data=parquet_bytes,
+                            file_name=f"{well_name}_results.parquet",
+                            mime="application/vnd.apache.parquet",
+                            key=f"parquet_{file_idx}"
+                        )
+            
+            # LAS 2.0 con curvas calculadas
+            with col3:
                 st.download_button(
-                    label=t("download_pdf"),
-                    data=pdf_bytes,
-                    file_name=f"{well_name}_analysis.pdf",
-                    mime="application/pdf",
-                    key=f"pdf_{file_idx}"
+                    label=t("download_las"),
+                    data=cached_export('las', lambda: export_las_bytes(source, df, well_name, config_dict),
+                                       config=config_dict),
+                    file_name=f"{well_name}_results.las",
+                    mime="text/plain",
+                    key=f"las_{file_idx}"
                 )
             
-            # Almacenar datos del pozo para exportación batch
+            # Zonas productivas
+            st.download_button(
+                label=t("download_pay_zones"),
+                data=cached_export('pay_zones', lambda: export_pay_zones_csv_bytes(pay_zones), config=config_dict),
+                file_name=f"{well_name}_pay_zones.csv",
+                mime="text/csv",
+                key=f"pay_zones_{file_idx}"
+            )
+            
+            # Almacenar datos del pozo para exportación batch (solo curvas usadas)
+            well_df = result['well_df']
+            mem = memory_report(well_df, original_columns, available_curves, result)
+            st.caption(
+                f"{t('memory_usage')}: {mem['bytes'] / 1e6:.2f} MB · "
+                f"{t('memory_legacy')}: {mem['legacy_bytes'] / 1e6:.2f} MB ({mem['ratio']:.1f}×) · "
+                f"{t('memory_retained')}: {mem['retained_bytes'] / 1e6:.2f} MB"
+            )
             all_wells_data.append({
-                'df': df,
+                'df': well_df,
                 'well_name': well_name,
                 'config': config_dict,
                 'stats': stats_dict,
-                'curve_mapping': available_curves
+                'curve_mapping': available_curves,
+                'curve_stats': curve_stats,
+                'pay_zones': pay_zones,
+                'cutoff_index': result['cutoff_index'],
+                'qc_summary': qc_summary
             })
             
-            st.success(t("process_completed"))
+            # Registrar en el catálogo local (no interrumpe el procesamiento si falla)
+            try:
+                get_well_catalog().record_well(
+                    well_df, well_name, file_fingerprint,
+                    result_fingerprint=fingerprint,
+                    file_name=uploaded_file.name,
+                    header=las_header(source.las),
+                    curve_mapping=available_curves,
+                    config=config_dict,
+                    stats=stats_dict,
+                    arrays_bytes=npz_bytes
+                )
+                st.caption(t("catalog_saved"))
+            except (sqlite3.Error, OSError) as e:
+                st.warning(f"{t('catalog_error')}: {e}")
             
-            # Limpiar archivo temporal
-            import os
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            st.success(t("process_completed"))
         
         except Exception as e:
             st.error(f"{t('process_error')} {uploaded_file.name}: {str(e)}")
-            # Limpiar archivo temporal en caso de error
-            import os
-            temp_path = f'/tmp/temp_well_{file_idx}.las'
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
     
+    # ======================================================
+    # SENSIBILIDAD A CUTOFFS (ÍNDICES ACUMULADOS POR POZO)
+    # ======================================================
+    if all_wells_data:
+        st.markdown("---")
+        st.markdown(f'<div class="section-header"><span class="section-number">★</span><span class="section-title">{t("cutoff_sensitivity")}</span></div>', unsafe_allow_html=True)
+
+        # Cada curva fija dos cutoffs en el valor actual y recorre el tercero
+        sweeps = {
+            'PHI_E ≥': (np.round(np.arange(0, 201) * 0.001, 3), lambda x: (x, vsh_cutoff, sw_cutoff), phi_cutoff),
+            'VSH ≤': (np.round(np.arange(2, 17) * 0.05, 2), lambda x: (phi_cutoff, x, sw_cutoff), vsh_cutoff),
+            'SW ≤': (np.round(np.arange(6, 21) * 0.05, 2), lambda x: (phi_cutoff, vsh_cutoff, x), sw_cutoff),
+        }
+        grid_phi, grid_sw = np.meshgrid(np.round(np.arange(0, 41) * 0.005, 3), np.round(np.arange(6, 21) * 0.05, 2))
+
+        query_start = time.perf_counter()
+        curves = {label: [well['cutoff_index'].net_pay(*cutoffs(x)) for well in all_wells_data]
+                  for label, (x, cutoffs, _) in sweeps.items()}
+        field_grid = sum(well['cutoff_index'].net_pay(grid_phi, vsh_cutoff, grid_sw) for well in all_wells_data)
+        current = pd.DataFrame({
+            t('well_label'): [well['well_name'] for well in all_wells_data],
+            'NET PAY (FT)': [well['cutoff_index'].net_pay(phi_cutoff, vsh_cutoff, sw_cutoff) for well in all_wells_data],
+            'HCPV (FT)': [well['cutoff_index'].hcpv(phi_cutoff, vsh_cutoff, sw_cutoff) for well in all_wells_data],
+        })
+        query_ms = (time.perf_counter() - query_start) * 1000
+
+        fig, axes = plt.subplots(1, 3, figsize=(15, 4), facecolor='white', sharey=True)
+        for ax, (label, (x, _, value)) in zip(axes, sweeps.items()):
+            for well, net in zip(all_wells_data, curves[label]):
+                ax.plot(x, net, linewidth=1, alpha=0.7, label=well['well_name'])
+            ax.plot(x, np.sum(curves[label], axis=0), color='black', linewidth=2, label=t('cutoff_field_total'))
+            ax.axvline(value, color='r', linestyle='--', linewidth=1.2, label=t('cutoff_current'))
+            ax.set_xlabel(label, fontweight='bold')
+            ax.grid(True, alpha=0.3)
+        axes[0].set_ylabel('Net pay (ft)', fontweight='bold')
+        axes[-1].legend(loc='best', fontsize=7)
+        plt.tight_layout()
+        st.pyplot(fig, use_container_width=True)
+        plt.close(fig)
+
+        col1, col2 = st.columns([1, 1.5])
+        with col1:
+            st.dataframe(current.style.format({'NET PAY (FT)': "{:.1f}", 'HCPV (FT)': "{:.2f}"}, na_rep="-"),
+                         use_container_width=True, hide_index=True)
+        with col2:
+            fig, ax = plt.subplots(figsize=(7, 4), facecolor='white')
+            mesh = ax.pcolormesh(grid_phi, grid_sw, field_grid, cmap='viridis', shading='nearest')
+            ax.plot(phi_cutoff, sw_cutoff, marker='x', color='red', markersize=10, markeredgewidth=2)
+            fig.colorbar(mesh, ax=ax, label='Net pay (ft)')
+            ax.set_xlabel('PHI_E ≥', fontweight='bold')
+            ax.set_ylabel('SW ≤', fontweight='bold')
+            ax.set_title(t('cutoff_heatmap'), fontweight='bold', fontsize=10)
+            plt.tight_layout()
+            st.pyplot(fig, use_container_width=True)
+            plt.close(fig)
+        st.caption(t("cutoff_sensitivity_caption").format(wells=len(all_wells_data), ms=query_ms))
+
+    # ======================================================
+    # ESTADÍSTICAS POR ZONA DE FORMACIÓN (TOPES)
+    # ======================================================
+    zone_stats = None
+    if all_wells_data and tops_df is not None:
+        st.markdown("---")
+        st.markdown(f'<div class="section-header"><span class="section-number">★</span><span class="section-title">{t("zone_stats_header")}</span></div>', unsafe_allow_html=True)
+
+        matched = match_tops(all_wells_data, tops_df)
+        unmatched = [well['well_name'] for well in all_wells_data if well['well_name'] not in matched]
+        if unmatched:
+            st.info(t("zone_stats_unmatched").format(wells=", ".join(unmatched)))
+        if matched:
+            zone_stats = zone_statistics(all_wells_data, tops_df)
+            st.dataframe(zone_stats, use_container_width=True, hide_index=True)
+            st.download_button(
+                label=t("download_zone_stats"),
+                data=export_zone_stats_csv_bytes(zone_stats),
+                file_name=f"Estadisticas_Zonas_{len(matched)}_pozos.csv",
+                mime="text/csv",
+                key="download_zone_stats"
+            )
+        else:
+            st.warning(t("zone_stats_empty"))
+
     # ======================================================
     # DESCARGAS POR LOTE (BATCH)
     # ======================================================
@@ -1593,14 +1548,16 @@ if uploaded_files:
         st.markdown("---")
         st.markdown(f'<div class="section-header"><span class="section-number">★</span><span class="section-title">{t("consolidated_export")}</span></div>', unsafe_allow_html=True)
         
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         
         # PDF consolidado
         with col1:
             if st.button(t("download_pdf_report_batch"), key="btn_pdf_batch"):
+                from modules.pdf_batch_export import create_pdf_batch_report
                 pdf_buffer = create_pdf_batch_report(
                     all_wells_data,
-                    language=st.session_state.get("app_lang", "es")
+                    language=st.session_state.get("app_lang", "es"),
+                    zone_stats=zone_stats
                 )
                 st.download_button(
                     label=t("download_pdf_batch"),
@@ -1615,9 +1572,7 @@ if uploaded_files:
             if st.button(t("download_csv_batch_btn"), key="btn_csv_batch"):
                 # Concatenar todos los DataFrames
                 combined_df = pd.concat([
-                    well['df'][['DEPTH_FT', 'GR', 'RHOB', 'NPHI', 'RT', 
-                               'VSH', 'PHI_T', 'PHI_E', 'SW', 'PERM',
-                               'LITOLOGIA', 'RHO_MATRIX', 'IS_PAY']].copy()
+                    results_frame(well['df'])
                     for well in all_wells_data
                 ], keys=[well['well_name'] for well in all_wells_data])
                 
@@ -1631,7 +1586,48 @@ if uploaded_files:
                     key="download_csv_batch"
                 )
         
+        # ZIP con los entregables de cada pozo
+        with col3:
+            include_png = st.checkbox(t("include_png"), value=False, key="zip_include_png")
+            if st.button(t("download_zip_btn"), key="btn_zip_batch"):
+                from modules.batch_bundle import build_wells_zip
+                # download_button no acepta SpooledTemporaryFile: se entregan los bytes
+                with build_wells_zip(
+                    all_wells_data,
+                    language=st.session_state.get("app_lang", "es"),
+                    include_png=include_png,
+                    zone_stats=zone_stats
+                ) as zip_file:
+                    zip_bytes = zip_file.read()
+                st.download_button(
+                    label=t("download_zip"),
+                    data=zip_bytes,
+                    file_name=f"Entregables_{len(all_wells_data)}_pozos.zip",
+                    mime="application/zip",
+                    key="download_zip_batch"
+                )
+        
+        # Matriz pozos × profundidad sobre una malla común
+        if st.button(t("download_field_matrix_btn"), key="btn_field_matrix"):
+            matrix_bytes = export_field_matrix_npz(
+                all_wells_data,
+                step=resample_step if resample_enabled else None,
+                anchor=resample_anchor
+            )
+            st.download_button(
+                label=t("download_field_matrix"),
+                data=matrix_bytes,
+                file_name=f"Matriz_Campo_{len(all_wells_data)}_pozos.npz",
+                mime="application/octet-stream",
+                key="download_field_matrix"
+            )
+        
         st.success(f"✅ {len(all_wells_data)} {t('wells_processed')}")
+        store_stats = get_result_store().stats()
+        st.caption(t("result_store_caption").format(
+            entries=store_stats['entries'], used=store_stats['bytes'] / 2**20, budget=store_stats['max_bytes'] / 2**20,
+            hits=store_stats['hits'], misses=store_stats['misses'], evictions=store_stats['evictions']
+        ))
 
 else:
     st.markdown(f"""
@@ -0,0 +1,123 @@
+# ==========================================================
+# MÓDULO: PAQUETE ZIP CON LOS ENTREGABLES DE TODOS LOS POZOS
+# ==========================================================
+import os
+import tempfile
+import traceback
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .data_export import export_csv_bytes, export_excel_bytes, export_pay_zones_csv_bytes, export_zone_stats_csv_bytes
+from .pay_zones import well_pay_zones
+from .petrofisica import LITHO_COLORS
+
+
+# El ZIP se mantiene en memoria hasta este tamaño; por encima pasa a disco
+SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+# PDF, PNG y XLSX ya vienen comprimidos: se guardan sin recomprimir
+_STORED_EXTENSIONS = ('.pdf', '.png', '.xlsx')
+
+
+def _write_artifact(well_dir, file_name, data):
+    path = os.path.join(well_dir, file_name)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def _build_well_artifacts(well, folder, workdir, language, include_png):
+    """Genera los entregables de un pozo como archivos temporales
+
+    Returns:
+        Lista de (nombre dentro del ZIP, ruta temporal)
+    """
+    from .pdf_export import create_pdf_report, generate_8track_figure
+
+    well_name = well['well_name']
+    df = well['df']
+    well_dir = tempfile.mkdtemp(dir=workdir)
+    artifacts = []
+
+    artifacts.append((f"{folder}/{well_name}_results.csv",
+                      _write_artifact(well_dir, 'results.csv', export_csv_bytes(df))))
+    artifacts.append((f"{folder}/{well_name}_results.xlsx",
+                      _write_artifact(well_dir, 'results.xlsx', export_excel_bytes(df))))
+
+    pay_zones = well_pay_zones(well) if 'IS_PAY' in df.columns else None
+    if pay_zones is not None:
+        artifacts.append((f"{folder}/{well_name}_pay_zones.csv",
+                          _write_artifact(well_dir, 'pay_zones.csv', export_pay_zones_csv_bytes(pay_zones))))
+
+    pdf_buffer = create_pdf_report(
+        df, well_name, well['config'], well['stats'],
+        well.get('curve_mapping'), language=language, curve_stats=well.get('curve_stats'),
+        pay_zones=pay_zones
+    )
+    artifacts.append((f"{folder}/{well_name}_analysis.pdf",
+                      _write_artifact(well_dir, 'analysis.pdf', pdf_buffer.getvalue())))
+
+    if include_png:
+        png_buffer = generate_8track_figure(df, LITHO_COLORS, language=language,
+                                            curve_stats=well.get('curve_stats'))
+        if png_buffer is not None:
+            artifacts.append((f"{folder}/{well_name}_log.png",
+                              _write_artifact(well_dir, 'log.png', png_buffer.getvalue())))
+
+    return artifacts
+
+
+def build_wells_zip(wells_data, language='es', include_png=False, max_workers=None, zone_stats=None):
+    """Construye un ZIP con CSV, Excel, PDF (y PNG opcional) de cada pozo
+
+    Los entregables de cada pozo se generan en paralelo en un pool de hilos y se
+    agregan al ZIP a medida que terminan. Cada archivo pasa por disco temporal y
+    el ZIP se mantiene en un SpooledTemporaryFile, de modo que los lotes grandes
+    no quedan completos en RAM.
+
+    Args:
+        wells_data: Lista de diccionarios de pozos (ver create_pdf_batch_report)
+        include_png: Incluir el registro de 8 tracks como PNG
+        max_workers: Hilos de trabajo (por defecto, uno por CPU)
+        zone_stats: Estadísticas por zona de formación (zone_statistics); se
+            agregan como zone_statistics.csv en la raíz del ZIP
+
+    Returns:
+        Archivo temporal (binario) posicionado al inicio con el ZIP
+    """
+    if max_workers is None:
+        max_workers = min(len(wells_data), os.cpu_count() or 1) or 1
+
+    archive = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    errors = []
+
+    with tempfile.TemporaryDirectory(prefix='aiwelllog_zip_') as workdir, \
+            zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_DEFLATED) as zf, \
+            ThreadPoolExecutor(max_workers=max_workers) as pool:
+
+        futures = {}
+        for idx, well in enumerate(wells_data, 1):
+            # Prefijo numérico: evita colisiones entre pozos con el mismo nombre
+            folder = f"{idx:03d}_{well['well_name']}"
+            future = pool.submit(_build_well_artifacts, well, folder, workdir, language, include_png)
+            futures[future] = well['well_name']
+
+        for future in as_completed(futures):
+            try:
+                artifacts = future.result()
+            except Exception as e:
+                errors.append(f"{futures[future]}: {e}\n{traceback.format_exc()}")
+                continue
+            for arcname, path in artifacts:
+                compress_type = zipfile.ZIP_STORED if path.endswith(_STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+                zf.write(path, arcname, compress_type=compress_type)
+                os.remove(path)
+
+        if zone_stats is not None and len(zone_stats):
+            zf.writestr('zone_statistics.csv', export_zone_stats_csv_bytes(zone_stats))
+
+        if errors:
+            zf.writestr('ERRORES.txt', "\n\n".join(errors))
+
+    archive.seek(0)
+    return archive
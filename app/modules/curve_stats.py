@@ -0,0 +1,316 @@
+# ==========================================================
+# MÓDULO: ESTADÍSTICAS DE CURVAS POR POZO
+# ==========================================================
+import numpy as np
+import pandas as pd
+
+
+# Cuantiles que se calculan siempre (P2/P98 para VSH, cuartiles y mediana)
+STAT_QUANTILES = (0.02, 0.25, 0.5, 0.75, 0.98)
+
+# Filas por tramo al recorrer curvas mapeadas en memoria (update_chunks)
+STATS_CHUNK_ROWS = 262144
+
+# Clases del histograma que acota cada valor de orden en las pasadas por tramos
+_SELECT_BINS = 4096
+
+
+def _empty_record(count, nulls):
+    return {'count': count, 'nulls': nulls,
+            'mean': None, 'std': None, 'min': None, 'max': None,
+            'top': None, 'base': None, 'quantiles': {}}
+
+
+def _curve_record(values, depth, quantiles, positive=False):
+    """Estadísticas de una curva a partir de una sola extracción de muestras válidas"""
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    mask = ~missing
+    if positive:
+        mask &= values > 0
+    valid = values[mask]
+    count = len(valid)
+    record = _empty_record(count, int(np.count_nonzero(missing)))
+    if count == 0:
+        return record
+
+    # Un solo particionado para mínimo, máximo y todos los cuantiles
+    levels = np.quantile(valid, (0.0,) + tuple(quantiles) + (1.0,))
+    record.update(
+        mean=float(valid.mean()),
+        std=float(valid.std(ddof=1)) if count > 1 else None,
+        min=float(levels[0]),
+        max=float(levels[-1]),
+        quantiles={q: float(v) for q, v in zip(quantiles, levels[1:-1])},
+    )
+    if depth is not None:
+        idx = np.flatnonzero(mask)
+        record.update(top=float(depth[idx[0]]), base=float(depth[idx[-1]]))
+    return record
+
+
+def row_slices(length, chunk_rows):
+    """slices consecutivos de chunk_rows filas que cubren [0, length)"""
+    for start in range(0, length, chunk_rows):
+        yield slice(start, min(start + chunk_rows, length))
+
+
+def _quantile_positions(count, quantiles):
+    """(rango anterior, rango siguiente, peso) de cada cuantil, como el método 'linear' de np.quantile"""
+    levels = np.asarray(quantiles, dtype=np.float64)
+    virtual = (count - 1) * levels
+    positions = []
+    for index in virtual:
+        if index >= count - 1:
+            positions.append((count - 1, count - 1, 0.0))
+        elif index < 0:
+            positions.append((0, 0, 0.0))
+        else:
+            previous = np.floor(index)
+            positions.append((int(previous), int(previous) + 1, index - previous))
+    return positions
+
+
+def _lerp(a, b, t):
+    """Interpolación entre dos valores de orden con la misma fórmula que np.quantile"""
+    diff = b - a
+    return b - diff * (1 - t) if t >= 0.5 else a + diff * t
+
+
+def _order_statistics(valid_chunks, ranks, lo, hi, max_rows):
+    """Valores de orden ranks (0 = mínimo) de las muestras que entrega valid_chunks()
+
+    Cada pasada reparte las muestras del intervalo [lo, hi] de cada rango en
+    _SELECT_BINS clases y se queda con la clase que lo contiene (sus valores
+    mínimo y máximo son el nuevo intervalo). Cuando el intervalo tiene
+    max_rows muestras o menos, se reúnen y se ordenan. Los rangos con el mismo
+    intervalo comparten histograma.
+
+    Returns:
+        {rango: valor}
+    """
+    pending = {rank: (lo, hi, rank, None) for rank in set(ranks)}
+    found = {}
+    while pending:
+        groups = {}
+        for rank, (lo, hi, k, count) in list(pending.items()):
+            if lo == hi:
+                found[rank] = lo
+                del pending[rank]
+            elif (lo, hi) not in groups:
+                groups[lo, hi] = [] if count is not None and count <= max_rows else (
+                    np.linspace(lo, hi, _SELECT_BINS + 1), np.zeros(_SELECT_BINS, dtype=np.int64),
+                    np.full(_SELECT_BINS, np.inf), np.full(_SELECT_BINS, -np.inf))
+        if not groups:
+            break
+        for values in valid_chunks():
+            for (lo, hi), state in groups.items():
+                inside = values[(values >= lo) & (values <= hi)]
+                if isinstance(state, list):
+                    state.append(inside)
+                    continue
+                edges, counts, bin_min, bin_max = state
+                inside.sort()
+                bounds = np.concatenate(([0], np.searchsorted(inside, edges[1:-1]), [len(inside)]))
+                sizes = np.diff(bounds)
+                used = sizes > 0
+                counts += sizes
+                bin_min[used] = np.minimum(bin_min[used], inside[bounds[:-1][used]])
+                bin_max[used] = np.maximum(bin_max[used], inside[bounds[1:][used] - 1])
+
+        for rank, (lo, hi, k, _) in list(pending.items()):
+            state = groups[lo, hi]
+            if isinstance(state, list):
+                found[rank] = float(np.partition(np.concatenate(state), k)[k])
+                del pending[rank]
+                continue
+            _, counts, bin_min, bin_max = state
+            cumulative = np.cumsum(counts)
+            b = int(np.searchsorted(cumulative, k, side='right'))
+            below = int(cumulative[b - 1]) if b else 0
+            pending[rank] = (float(bin_min[b]), float(bin_max[b]), k - below, int(counts[b]))
+    return found
+
+
+def chunked_median(parts, max_rows=STATS_CHUNK_ROWS):
+    """Mediana (como np.median) de las muestras que entrega parts() sin reunirlas
+
+    Args:
+        parts: Función que devuelve un iterable de arreglos float64 sin NaN;
+            se llama una vez por pasada
+
+    Returns:
+        Mediana, o None si no hay muestras
+    """
+    count, vmin, vmax = 0, np.inf, -np.inf
+    for values in parts():
+        if len(values):
+            count += len(values)
+            vmin, vmax = min(vmin, values.min()), max(vmax, values.max())
+    if count == 0:
+        return None
+    middle = [(count - 1) // 2, count // 2]
+    order = _order_statistics(parts, middle, float(vmin), float(vmax), max_rows)
+    return float(np.mean([order[rank] for rank in middle]))
+
+
+def _chunked_record(values, depth, quantiles, positive=False, chunk_rows=STATS_CHUNK_ROWS):
+    """_curve_record recorriendo la curva por tramos
+
+    Conteos, extremos, tope, base y cuantiles son idénticos a los de
+    _curve_record; media y desviación se combinan por tramos (Chan et al.) y
+    pueden diferir en el último decimal.
+    """
+    def valid_parts():
+        for sl in row_slices(len(values), chunk_rows):
+            part = np.asarray(values[sl], dtype=np.float64)
+            mask = ~np.isnan(part)
+            if positive:
+                mask &= part > 0
+            yield sl, part, mask
+
+    count, nulls, mean, m2 = 0, 0, 0.0, 0.0
+    vmin, vmax, first, last = np.inf, -np.inf, None, None
+    for sl, part, mask in valid_parts():
+        nulls += int(np.isnan(part).sum())
+        valid = part[mask]
+        if not len(valid):
+            continue
+        idx = np.flatnonzero(mask)
+        first = sl.start + int(idx[0]) if first is None else first
+        last = sl.start + int(idx[-1])
+        n = len(valid)
+        chunk_mean = valid.mean()
+        delta = chunk_mean - mean
+        total = count + n
+        mean += delta * n / total
+        m2 += ((valid - chunk_mean) ** 2).sum() + delta ** 2 * count * n / total
+        count = total
+        vmin, vmax = min(vmin, valid.min()), max(vmax, valid.max())
+
+    record = _empty_record(count, nulls)
+    if count == 0:
+        return record
+
+    positions = _quantile_positions(count, quantiles)
+    ranks = {rank for previous, following, _ in positions for rank in (previous, following)}
+    order = _order_statistics(lambda: (part[mask] for _, part, mask in valid_parts()),
+                              ranks, float(vmin), float(vmax), chunk_rows)
+    record.update(
+        mean=float(mean),
+        std=float(np.sqrt(m2 / (count - 1))) if count > 1 else None,
+        min=float(vmin),
+        max=float(vmax),
+        quantiles={q: float(_lerp(order[previous], order[following], weight))
+                   for q, (previous, following, weight) in zip(quantiles, positions)},
+    )
+    if depth is not None:
+        record.update(top=float(depth[first]), base=float(depth[last]))
+    return record
+
+
+class CurveStats:
+    """Estadísticas por curva de un pozo, calculadas una vez y compartidas
+
+    Cada curva se recorre una sola vez: número de muestras válidas, media,
+    desviación, mínimo, máximo, los cuantiles de STAT_QUANTILES y la primera
+    y última profundidad con dato. Las curvas ausentes o vacías tienen count 0.
+    """
+
+    def __init__(self, df=None, columns=None, depth_col='DEPTH_FT', quantiles=STAT_QUANTILES):
+        self.depth_col = depth_col
+        self.quantiles = tuple(quantiles)
+        self._records = {}
+        if df is not None:
+            self.update(df, columns)
+
+    def update(self, df, columns=None, positive=()):
+        """(Re)calcula las curvas indicadas (por defecto todas las numéricas)
+
+        Args:
+            df: DataFrame del pozo
+            columns: Curvas a calcular
+            positive: Curvas en las que solo cuentan los valores > 0 (p. ej. PERM)
+        """
+        if columns is None:
+            columns = [c for c in df.columns
+                       if c != self.depth_col and pd.api.types.is_numeric_dtype(df[c])
+                       and not pd.api.types.is_bool_dtype(df[c])]
+        depth = df[self.depth_col].to_numpy() if self.depth_col in df.columns else None
+        for col in columns:
+            if col in df.columns:
+                self._records[col] = _curve_record(df[col].to_numpy(), depth, self.quantiles, col in positive)
+            else:
+                self._records[col] = _curve_record(np.empty(0), None, self.quantiles)
+        return self
+
+    def update_chunks(self, columns, depth=None, positive=(), chunk_rows=STATS_CHUNK_ROWS):
+        """Como update, sobre arreglos 1-D (p. ej. curvas mapeadas en memoria) recorridos por tramos
+
+        La memoria de trabajo es la de un tramo; los cuantiles son los mismos
+        que calcularía update con la curva completa en memoria.
+
+        Args:
+            columns: dict {curva: arreglo}; las curvas con None se registran vacías
+            depth: Profundidad de las muestras (tope y base de cada curva)
+            positive: Curvas en las que solo cuentan los valores > 0
+        """
+        for col, values in columns.items():
+            if values is None:
+                self._records[col] = _curve_record(np.empty(0), None, self.quantiles)
+            else:
+                self._records[col] = _chunked_record(values, depth, self.quantiles, col in positive, chunk_rows)
+        return self
+
+    def __contains__(self, name):
+        return name in self._records
+
+    def __getitem__(self, name):
+        return self._records[name]
+
+    @property
+    def columns(self):
+        return list(self._records)
+
+    def count(self, name):
+        """Muestras válidas (0 si la curva no existe)"""
+        record = self._records.get(name)
+        return record['count'] if record else 0
+
+    def has_data(self, name):
+        return self.count(name) > 0
+
+    def quantile(self, name, q):
+        """Cuantil precalculado (q debe estar en STAT_QUANTILES)"""
+        return self._records[name]['quantiles'][q]
+
+    def median(self, name):
+        return self.quantile(name, 0.5)
+
+    def valid_range(self, names):
+        """(primera, última) profundidad con dato en alguna de las curvas; None si no hay"""
+        records = [self._records[n] for n in names if self.count(n) > 0 and self._records[n]['top'] is not None]
+        if not records:
+            return None
+        return min(r['top'] for r in records), max(r['base'] for r in records)
+
+    def summary(self, name):
+        """Diccionario {mean, min, max, valid} del resumen estadístico"""
+        record = self._records.get(name)
+        if not record:
+            return {'mean': None, 'min': None, 'max': None, 'valid': 0}
+        return {'mean': record['mean'], 'min': record['min'], 'max': record['max'], 'valid': record['count']}
+
+    def table(self, names=None):
+        """Tabla en el formato de DataFrame.describe().T"""
+        names = self.columns if names is None else names
+        rows = {}
+        for name in names:
+            record = self._records[name]
+            row = {'count': float(record['count']), 'mean': record['mean'], 'std': record['std'],
+                   'min': record['min']}
+            for q in self.quantiles:
+                row[f"{q * 100:g}%"] = record['quantiles'].get(q)
+            row['max'] = record['max']
+            rows[name] = row
+        return pd.DataFrame.from_dict(rows, orient='index', dtype=np.float64)
@@ -0,0 +1,99 @@
+# ==========================================================
+# MÓDULO: ÍNDICE ACUMULADO PARA SENSIBILIDAD A CUTOFFS
+# ==========================================================
+import numpy as np
+
+from .pay_zones import sample_thickness
+
+
+# Bordes de los cutoffs (alineados con los pasos de los sliders de la barra lateral)
+PHI_EDGES = np.round(np.arange(0, 501) * 0.001, 6)
+VSH_EDGES = np.round(np.arange(0, 21) * 0.05, 6)
+SW_EDGES = np.round(np.arange(0, 21) * 0.05, 6)
+
+
+def _snap(edges, values):
+    """Índice del borde más cercano a cada cutoff (fuera de rango: el extremo)"""
+    values = np.asarray(values, dtype=np.float64)
+    idx = np.clip(np.searchsorted(edges, values), 1, len(edges) - 1)
+    nearer_left = (values - edges[idx - 1]) <= (edges[idx] - values)
+    return np.where(nearer_left, idx - 1, idx)
+
+
+class CutoffIndex:
+    """Histograma acumulado 3-D (PHI_E, VSH, SW) ponderado por espesor
+
+    Se construye una vez por pozo con una sola pasada (np.bincount). Net pay
+    y HCPV para cualquier terna de cutoffs (PHI_E >= phi, VSH <= vsh,
+    SW <= sw, con las mismas reglas de NaN que petro_stages) se leen en O(1)
+    como una celda del cubo acumulado. Los cutoffs se ajustan al borde más
+    cercano de PHI_EDGES / VSH_EDGES / SW_EDGES, así que coinciden
+    exactamente con el flujo en los valores de los sliders.
+
+    El índice cuenta el pay por muestra: no aplica el filtro de zonas
+    (PAY_MIN_THICKNESS, PAY_MERGE_GAP), que depende de la posición de las
+    muestras y no cabe en un histograma. Equivale al net pay de
+    extract_pay_zones sin espesor mínimo ni unión de zonas.
+    """
+
+    def __init__(self, df, phi_edges=PHI_EDGES, vsh_edges=VSH_EDGES, sw_edges=SW_EDGES):
+        self.phi_edges = np.asarray(phi_edges, dtype=np.float64)
+        self.vsh_edges = np.asarray(vsh_edges, dtype=np.float64)
+        self.sw_edges = np.asarray(sw_edges, dtype=np.float64)
+
+        phi = np.nan_to_num(df['PHI_E'].to_numpy(dtype=np.float64), nan=0.0)
+        vsh = np.nan_to_num(df['VSH'].to_numpy(dtype=np.float64), nan=1.0)
+        sw_raw = df['SW'].to_numpy(dtype=np.float64) if 'SW' in df.columns else np.full(len(df), np.nan)
+        # Sin RT la saturación no interviene en el pay (petro_stages)
+        self.has_sw = bool(np.any(~np.isnan(sw_raw)))
+        sw = np.nan_to_num(sw_raw, nan=1.0) if self.has_sw else np.zeros(len(df))
+        thickness = sample_thickness(df['DEPTH_FT'].to_numpy(dtype=np.float64))
+        self.total_thickness = float(thickness.sum())
+
+        # Posición de cada muestra respecto a los bordes:
+        # phi >= edges[k]  <=>  p > k ;  vsh <= edges[k]  <=>  v <= k
+        p = np.searchsorted(self.phi_edges, phi, side='right')
+        v = np.searchsorted(self.vsh_edges, vsh, side='left')
+        s = np.searchsorted(self.sw_edges, sw, side='left')
+        shape = (len(self.phi_edges) + 1, len(self.vsh_edges) + 1, len(self.sw_edges) + 1)
+        flat = np.ravel_multi_index((p, v, s), shape)
+
+        size = int(np.prod(shape))
+        weights = {'NET_PAY_FT': thickness}
+        if self.has_sw:
+            weights['HCPV_FT'] = thickness * phi * (1 - sw)
+        self._cubes = {}
+        for name, w in weights.items():
+            cube = np.bincount(flat, weights=w, minlength=size).reshape(shape)
+            # phi: acumulado desde arriba (>=); vsh y sw: desde abajo (<=)
+            cube = np.flip(np.cumsum(np.flip(cube, axis=0), axis=0), axis=0)
+            np.cumsum(cube, axis=1, out=cube)
+            np.cumsum(cube, axis=2, out=cube)
+            self._cubes[name] = cube
+
+    @property
+    def nbytes(self):
+        return sum(cube.nbytes for cube in self._cubes.values())
+
+    def query(self, phi_cutoff, vsh_cutoff, sw_cutoff, metric='NET_PAY_FT'):
+        """Métrica para una o varias ternas de cutoffs (admite arreglos con broadcasting)
+
+        Returns:
+            float o ndarray; NaN si la métrica no existe (HCPV sin SW)
+        """
+        if metric not in self._cubes:
+            shape = np.broadcast(np.asarray(phi_cutoff), np.asarray(vsh_cutoff), np.asarray(sw_cutoff)).shape
+            return np.full(shape, np.nan) if shape else np.nan
+        p = _snap(self.phi_edges, phi_cutoff) + 1
+        v = _snap(self.vsh_edges, vsh_cutoff)
+        s = _snap(self.sw_edges, sw_cutoff) if self.has_sw else len(self.sw_edges)
+        result = self._cubes[metric][p, v, s]
+        return float(result) if np.ndim(result) == 0 else result
+
+    def net_pay(self, phi_cutoff, vsh_cutoff, sw_cutoff):
+        """Net pay (ft) para los cutoffs dados"""
+        return self.query(phi_cutoff, vsh_cutoff, sw_cutoff, 'NET_PAY_FT')
+
+    def hcpv(self, phi_cutoff, vsh_cutoff, sw_cutoff):
+        """HCPV por unidad de área, Σ φ·(1 − Sw)·h en pay (ft)"""
+        return self.query(phi_cutoff, vsh_cutoff, sw_cutoff, 'HCPV_FT')
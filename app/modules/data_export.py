@@ -0,0 +1,265 @@
+# ==========================================================
+# MÓDULO: EXPORTACIÓN DE DATOS (CSV, EXCEL, NPZ, PARQUET, LAS)
+# ==========================================================
+import io
+import copy
+import json
+import numpy as np
+import pandas as pd
+
+from .petrofisica import LITHO_CLASSES, SW_MODEL_COLUMNS
+
+
+# Columnas de la tabla de resultados (CSV/Excel)
+EXPORT_COLUMNS = ['DEPTH_FT', 'GR', 'RHOB', 'NPHI', 'RT',
+                  'VSH', 'PHI_T', 'PHI_E', 'SW', *SW_MODEL_COLUMNS, 'PERM',
+                  'LITOLOGIA', 'FACIES', 'RHO_MATRIX', 'IS_PAY', 'QC_FLAGS']
+
+# Columnas que determinan el contenido de las exportaciones por pozo (result_fingerprint)
+EXPORT_FINGERPRINT_COLUMNS = [
+    'DEPTH_FT', 'GR', 'RHOB', 'NPHI', 'RT', 'RM_RES', 'RXOS',
+    'VSH', 'PHI_T', 'PHI_E', 'SW', *SW_MODEL_COLUMNS, 'PERM', 'LITOLOGIA', 'FACIES', 'RHO_MATRIX', 'IS_PAY', 'QC_FLAGS'
+]
+
+# Curvas calculadas que se anexan al LAS de salida: (mnemónico, unidad, descripción)
+COMPUTED_CURVES = {
+    'VSH': ('VSH', 'V/V', 'Volumen de arcilla'),
+    'PHI_T': ('PHIT', 'V/V', 'Porosidad total'),
+    'PHI_E': ('PHIE', 'V/V', 'Porosidad efectiva'),
+    'SW': ('SW', 'V/V', 'Saturación de agua'),
+    'SW_ARCHIE': ('SWAR', 'V/V', 'Saturación de agua (Archie)'),
+    'SW_SIMANDOUX': ('SWSI', 'V/V', 'Saturación de agua (Simandoux)'),
+    'SW_MOD_SIMANDOUX': ('SWMS', 'V/V', 'Saturación de agua (Simandoux modificado)'),
+    'SW_INDONESIA': ('SWIN', 'V/V', 'Saturación de agua (Indonesia)'),
+    'PERM': ('PERM', 'MD', 'Permeabilidad (Kozeny)'),
+    'LITOLOGIA': ('LITO', '', 'Código litológico'),
+    'FACIES': ('EFAC', '', 'Electrofacies k-means (-1 = sin asignar)'),
+    'RHO_MATRIX': ('RHOMA', 'G/C3', 'Densidad de matriz'),
+    'IS_PAY': ('PAY', '', 'Indicador net pay (1 = pay)'),
+    'QC_FLAGS': ('QCFL', '', 'Banderas de control de calidad (bits)'),
+}
+
+NPZ_FORMAT_VERSION = 1
+
+
+def results_frame(df):
+    """Tabla de resultados con las columnas estándar de exportación"""
+    return df[[c for c in EXPORT_COLUMNS if c in df.columns]].copy()
+
+
+def litho_codes(series):
+    """Convierte la columna LITOLOGIA a códigos int8 (-1 = sin clasificar)"""
+    return pd.Categorical(series, categories=LITHO_CLASSES).codes.astype(np.int8)
+
+
+def export_csv_bytes(df):
+    """Tabla de resultados en CSV (UTF-8)"""
+    return results_frame(df).to_csv(index=False).encode('utf-8')
+
+
+def write_results_csv(file, frames):
+    """Escribe la tabla de resultados bloque a bloque (mismo contenido que export_csv_bytes)
+
+    Args:
+        file: Archivo de texto abierto con newline=''
+        frames: Iterable de DataFrames consecutivos del pozo (al menos uno)
+    """
+    for i, frame in enumerate(frames):
+        results_frame(frame).to_csv(file, index=False, header=i == 0)
+
+
+def export_pay_zones_csv_bytes(zones):
+    """Tabla de zonas productivas (extract_pay_zones) en CSV (UTF-8)"""
+    return zones.to_csv(index=False).encode('utf-8')
+
+
+def export_zone_stats_csv_bytes(zone_stats):
+    """Estadísticas por zona de formación (zone_statistics) en CSV (UTF-8)"""
+    return zone_stats.to_csv(index=False).encode('utf-8')
+
+
+def export_excel_bytes(df):
+    """Tabla de resultados en Excel (hoja 'Datos')"""
+    excel_buffer = io.BytesIO()
+    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+        results_frame(df).to_excel(writer, sheet_name='Datos', index=False)
+    return excel_buffer.getvalue()
+
+
+def export_npz_bytes(df, well_name, config=None, compressed=True):
+    """Exporta los resultados a un archivo NumPy .npz columnar
+
+    Cada curva se guarda como un arreglo tipado (sin parseo de texto al leer).
+    LITOLOGIA se guarda como códigos int8 más la tabla LITOLOGIA_CLASSES.
+    Con compressed=False los miembros se guardan sin comprimir y pueden leerse
+    directamente desde el ZIP sin descompresión.
+    """
+    arrays = {}
+    for col in EXPORT_COLUMNS:
+        if col not in df.columns:
+            continue
+        if col == 'LITOLOGIA':
+            arrays[col] = litho_codes(df[col])
+        elif col == 'IS_PAY':
+            arrays[col] = df[col].to_numpy(dtype=bool)
+        else:
+            arrays[col] = df[col].to_numpy()
+
+    buffer = io.BytesIO()
+    write_npz_results(buffer, arrays, well_name, config, compressed)
+    return buffer.getvalue()
+
+
+def write_npz_results(file, arrays, well_name, config=None, compressed=True):
+    """Escribe el .npz de resultados a partir de las columnas ya tipadas
+
+    Args:
+        file: Ruta o archivo binario
+        arrays: dict {columna de EXPORT_COLUMNS: arreglo} (LITOLOGIA como
+            códigos int8); admite arreglos mapeados en memoria
+    """
+    members = {col: arrays[col] for col in EXPORT_COLUMNS if col in arrays}
+    members['LITOLOGIA_CLASSES'] = np.array(LITHO_CLASSES)
+    members['__meta__'] = np.array(json.dumps({
+        'format_version': NPZ_FORMAT_VERSION,
+        'well_name': well_name,
+        'config': config or {},
+    }, default=float))
+    if compressed:
+        np.savez_compressed(file, **members)
+    else:
+        np.savez(file, **members)
+
+
+def load_npz_results(file_ref):
+    """Lee un .npz generado por export_npz_bytes
+
+    Returns:
+        (DataFrame con los resultados, diccionario de metadatos)
+    """
+    with np.load(file_ref, allow_pickle=False) as data:
+        meta = json.loads(str(data['__meta__'])) if '__meta__' in data.files else {}
+        classes = list(data['LITOLOGIA_CLASSES']) if 'LITOLOGIA_CLASSES' in data.files else list(LITHO_CLASSES)
+        columns = {}
+        for col in EXPORT_COLUMNS:
+            if col not in data.files:
+                continue
+            if col == 'LITOLOGIA':
+                columns[col] = pd.Categorical.from_codes(data[col], categories=classes)
+            else:
+                columns[col] = data[col]
+    return pd.DataFrame(columns), meta
+
+
+def export_field_matrix_npz(wells_data, step=None, anchor=0.0):
+    """Exporta los resultados de varios pozos como matrices pozos × profundidad
+
+    Todos los pozos se remuestrean a una malla común (paso por defecto: el más
+    fino de los pozos). El NPZ contiene DEPTH_FT, WELLS, COVERAGE y una matriz
+    por columna de resultados.
+    """
+    from .resampling import stack_wells
+
+    columns = [c for c in EXPORT_COLUMNS if c != 'DEPTH_FT']
+    grid, matrices = stack_wells([well['df'] for well in wells_data], columns,
+                                 step=step, anchor=anchor)
+    arrays = {
+        'DEPTH_FT': grid.depths,
+        'WELLS': np.array([well['well_name'] for well in wells_data]),
+        **matrices,
+        'LITOLOGIA_CLASSES': np.array(LITHO_CLASSES),
+        '__meta__': np.array(json.dumps({
+            'format_version': NPZ_FORMAT_VERSION,
+            'grid': {'start': grid.start, 'step': grid.step, 'size': grid.size},
+        })),
+    }
+
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def export_parquet_bytes(df, well_name, config=None):
+    """Exporta los resultados a Parquet (pyarrow, compresión zstd)
+
+    LITOLOGIA se escribe como columna diccionario. El archivo puede abrirse con
+    pyarrow.parquet.read_table(ruta, memory_map=True) sin copiar los buffers.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    frame = results_frame(df)
+    if 'LITOLOGIA' in frame.columns:
+        frame['LITOLOGIA'] = pd.Categorical(frame['LITOLOGIA'], categories=LITHO_CLASSES)
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'aiwelllog'] = json.dumps({
+        'well_name': well_name,
+        'config': config or {},
+    }, default=float).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression='zstd')
+    return buffer.getvalue()
+
+
+def export_las_bytes(source, df, well_name, config=None):
+    """Escribe un LAS 2.0 con los encabezados originales más las curvas calculadas
+
+    Args:
+        source: LasSource del archivo original (encabezados y curvas crudas)
+        df: DataFrame procesado (DEPTH_FT limpio y ordenado)
+        well_name: Nombre del pozo
+        config: Diccionario con configuración petrofísica
+    """
+    import lasio
+
+    las = source.las
+    out = lasio.LASFile()
+    out.version = copy.deepcopy(las.version)
+    out.well = copy.deepcopy(las.well)
+    out.params = copy.deepcopy(las.params)
+
+    depth = df['DEPTH_FT'].to_numpy()
+    index_curve = las.curves[0]
+    out.append_curve(index_curve.mnemonic, depth, unit=index_curve.unit, descr=index_curve.descr)
+
+    # Curvas originales alineadas con la profundidad limpia (sin suavizado)
+    raw = source.read_all().set_index(index_curve.mnemonic)
+    raw = raw[~raw.index.duplicated(keep='first')].reindex(depth)
+    original_mnemonics = set()
+    for curve in las.curves[1:]:
+        if curve.mnemonic in raw.columns:
+            out.append_curve(curve.mnemonic, raw[curve.mnemonic].to_numpy(),
+                             unit=curve.unit, descr=curve.descr)
+            original_mnemonics.add(curve.mnemonic)
+
+    # Curvas calculadas (sufijo _AI si el mnemónico ya existe en el archivo)
+    for col, (mnemonic, unit, descr) in COMPUTED_CURVES.items():
+        if col not in df.columns:
+            continue
+        if mnemonic in original_mnemonics:
+            mnemonic = f"{mnemonic}_AI"
+        if col == 'LITOLOGIA':
+            data = litho_codes(df[col]).astype(float)
+            data[data < 0] = np.nan
+        else:
+            data = df[col].to_numpy(dtype=float)
+        out.append_curve(mnemonic, data, unit=unit, descr=descr)
+
+    # Tabla de códigos litológicos y parámetros de cálculo en ~Other
+    other_lines = [las.other.strip()] if las.other and las.other.strip() else []
+    other_lines.append(f"AI_WELL_LOG - {well_name}")
+    other_lines.append("LITO: " + ", ".join(f"{i}={lith}" for i, lith in enumerate(LITHO_CLASSES)))
+    if config:
+        other_lines.append("PARAMS: " + ", ".join(
+            f"{k}={v:.4g}" if isinstance(v, (int, float)) else f"{k}={v}"
+            for k, v in config.items()
+        ))
+    out.other = "\n".join(other_lines)
+
+    buffer = io.StringIO()
+    out.write(buffer, version=2.0, wrap=False)
+    return buffer.getvalue().encode('utf-8')
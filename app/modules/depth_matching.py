@@ -0,0 +1,401 @@
+# ==========================================================
+# MÓDULO: AJUSTE DE PROFUNDIDAD ENTRE CURVAS (CORRELACIÓN FFT)
+# ==========================================================
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .curve_stats import STATS_CHUNK_ROWS, chunked_median, row_slices
+from .resampling import DepthGrid, median_step, interpolate_at
+
+
+DEPTH_MATCH_MODES = ('off', 'bulk', 'windowed')
+
+# Curva de referencia y curvas que se ajustan a ella
+DEPTH_MATCH_REFERENCE = 'GR'
+DEPTH_MATCH_CURVES = ('RHOB', 'NPHI', 'RT', 'PEF')
+DEPTH_MATCH_LOG_CURVES = ('RT',)
+
+DEPTH_MATCH_MAX_SHIFT_FT = 10.0
+DEPTH_MATCH_WINDOW_FT = 200.0
+# Correlación mínima (en valor absoluto) para aceptar un desplazamiento
+DEPTH_MATCH_MIN_CORR = 0.3
+
+DEPTH_MATCH_COLUMNS = ['CURVE', 'APPLIED', 'BULK_SHIFT_FT', 'BULK_CORR', 'WINDOWS', 'WINDOWS_USED',
+                       'MIN_SHIFT_FT', 'MAX_SHIFT_FT']
+
+
+def _detrend(values, log, trend_samples):
+    """Curva sin tendencia (NaN → 0) y su máscara de datos
+
+    La tendencia (media móvil) se resta para que la correlación responda a
+    los contactos entre capas y no a la compactación. Cada muestra solo
+    depende de las trend_samples // 2 vecinas a cada lado.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if log:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.where(values > 0, np.log10(values), np.nan)
+    mask = ~np.isnan(values)
+    filled = np.where(mask, values, 0.0)
+    if trend_samples > 1:
+        # Convolución completa recortada al centro: igual a mode='same' y
+        # válida también con menos muestras que la ventana
+        kernel = np.ones(trend_samples)
+        center = slice(trend_samples // 2, trend_samples // 2 + len(values))
+        counts = np.convolve(mask.astype(np.float64), kernel)[center]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            trend = np.convolve(filled, kernel)[center] / counts
+        filled = np.where(mask, filled - trend, 0.0)
+    return filled, mask
+
+
+def _prepare(values, log, trend_samples):
+    """Curva sin tendencia y estandarizada (NaN → 0) y su máscara de datos"""
+    filled, mask = _detrend(values, log, trend_samples)
+    if mask.sum() > 1:
+        std = filled[mask].std()
+        if std > 0:
+            filled = np.where(mask, (filled - filled[mask].mean()) / std, 0.0)
+    return filled, mask.astype(np.float64)
+
+
+def _xcorr_sums(ref, ref_mask, cur, cur_mask, max_lag):
+    """Sumas de la correlación para desfases -max_lag..max_lag (última dimensión)
+
+    num[k] = Σ ref[i]·cur[i + k], overlap[k] = Σ m_ref[i]·m_cur[i + k] y las
+    energías Σ ref[i]²·m_cur[i + k] y Σ m_ref[i]·cur[i + k]². Las cuatro
+    correlaciones cruzadas salen de un solo lote de FFT. Son sumas sobre i,
+    así que se pueden acumular por tramos de ref.
+
+    Returns:
+        Arreglo (4, ..., 2·max_lag + 1): num, overlap, energía de ref y de cur
+    """
+    n = ref.shape[-1]
+    nfft = 1 << int(np.ceil(np.log2(n + max_lag + 1)))
+    spectra = np.fft.rfft(np.stack([ref, ref_mask, ref**2, cur, cur_mask, cur**2]), nfft, axis=-1)
+    ref_s, ref_m, ref_e, cur_s, cur_m, cur_e = spectra
+    products = np.stack([np.conj(ref_s) * cur_s, np.conj(ref_m) * cur_m,
+                         np.conj(ref_e) * cur_m, np.conj(ref_m) * cur_e])
+    raw = np.fft.irfft(products, nfft, axis=-1)
+    # Desfases negativos al final del arreglo circular
+    lags = np.arange(-max_lag, max_lag + 1) % nfft
+    return raw[..., lags]
+
+
+def _xcorr_normalize(sums):
+    """corr[k] = num / √(energía ref · energía cur), restringida a las muestras con dato en ambas curvas
+
+    Returns:
+        (corr, muestras solapadas)
+    """
+    num, overlap, ref_energy, cur_energy = sums
+    overlap = np.rint(overlap)
+    energy = np.maximum(ref_energy, 0) * np.maximum(cur_energy, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = np.where((overlap > 0) & (energy > 0), num / np.sqrt(energy), 0.0)
+    return corr, overlap
+
+
+def _xcorr(ref, ref_mask, cur, cur_mask, max_lag):
+    """Correlación normalizada para desfases -max_lag..max_lag (última dimensión)
+
+    Returns:
+        (corr, muestras solapadas), ambos con forma (..., 2·max_lag + 1)
+    """
+    return _xcorr_normalize(_xcorr_sums(ref, ref_mask, cur, cur_mask, max_lag))
+
+
+def _peak(corr, overlap, min_overlap):
+    """Desfase (submuestra, interpolación parabólica) y correlación del máximo de |corr|
+
+    corr y overlap son (filas × desfases); devuelve un valor por fila.
+    """
+    strength = np.where(overlap >= min_overlap, np.abs(corr), -np.inf)
+    rows = np.arange(len(corr))
+    best = np.argmax(strength, axis=1)
+    size = corr.shape[1]
+    peak = strength[rows, best]
+    prev = strength[rows, np.maximum(best - 1, 0)]
+    nxt = strength[rows, np.minimum(best + 1, size - 1)]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        denom = prev - 2 * peak + nxt
+        inner = (best > 0) & (best < size - 1) & np.isfinite(denom) & (denom < 0)
+        offset = np.where(inner, 0.5 * (prev - nxt) / denom, 0.0)
+    valid = np.isfinite(peak)
+    lag = best - (size - 1) // 2 + offset
+    return np.where(valid, lag, np.nan), np.where(valid, corr[rows, best], np.nan)
+
+
+_EMPTY_ESTIMATE = {'bulk': np.nan, 'bulk_corr': np.nan, 'centers': np.zeros(0), 'shifts': np.zeros(0),
+                   'corr': np.zeros(0)}
+
+
+def estimate_shift(depth, reference, curve, log=False, max_shift=DEPTH_MATCH_MAX_SHIFT_FT,
+                   window=DEPTH_MATCH_WINDOW_FT):
+    """Desplazamiento global y por ventanas de curve respecto a reference
+
+    Si el muestreo no es regular, las curvas se llevan a una malla uniforme
+    con el paso mediano solo para estimar. Un desplazamiento s positivo
+    significa que la curva está registrada s pies más profunda: el valor
+    correcto en d es curve(d + s).
+
+    Returns:
+        dict con 'bulk' (ft), 'bulk_corr', 'centers' (profundidades de las
+        ventanas), 'shifts' (ft) y 'corr' por ventana
+    """
+    depth = np.asarray(depth, dtype=np.float64)
+    step = median_step(depth)
+    empty = dict(_EMPTY_ESTIMATE)
+    if step <= 0 or len(depth) < 4:
+        return empty
+    if np.allclose(np.diff(depth), step, rtol=1e-3, atol=1e-6):
+        grid_depth = depth
+    else:
+        grid_depth = DepthGrid.covering(depth[0], depth[-1], step, depth[0]).depths
+        reference = interpolate_at(depth, reference, grid_depth)
+        curve = interpolate_at(depth, curve, grid_depth)
+
+    max_lag = max(int(round(max_shift / step)), 1)
+    trend = 8 * max_lag + 1
+    ref, ref_mask = _prepare(reference, False, trend)
+    cur, cur_mask = _prepare(curve, log, trend)
+    if ref_mask.sum() < 2 * max_lag or cur_mask.sum() < 2 * max_lag:
+        return empty
+
+    corr, overlap = _xcorr(ref, ref_mask, cur, cur_mask, max_lag)
+    bulk_lag, bulk_corr = _peak(corr[None], overlap[None], 0.25 * min(ref_mask.sum(), cur_mask.sum()))
+    result = dict(empty, bulk=float(bulk_lag[0]) * step, bulk_corr=float(bulk_corr[0]))
+
+    # Ventanas con 50 % de solape, todas en el mismo lote de FFT
+    size = int(round(window / step))
+    if size >= 4 * max_lag and size < len(grid_depth):
+        hop = size // 2
+        frames = [sliding_window_view(a, size)[::hop] for a in (ref, ref_mask, cur, cur_mask)]
+        w_corr, w_overlap = _xcorr(*frames, max_lag)
+        w_lag, w_value = _peak(w_corr, w_overlap, 3 * size // 4)
+        starts = np.arange(len(w_lag)) * hop
+        result.update(centers=grid_depth[starts + size // 2], shifts=w_lag * step, corr=w_value)
+    return result
+
+
+class _ChunkedGrid:
+    """Malla uniforme de estimación sobre una profundidad recorrida por tramos
+
+    Si el muestreo es regular la malla son las propias muestras; si no, las
+    curvas se interpolan en los nodos de la malla con el paso mediano (como
+    en estimate_shift), leyendo solo las muestras que los rodean.
+    """
+
+    def __init__(self, depth, step, regular):
+        self.depth = depth
+        self.regular = regular
+        self.grid = None if regular else DepthGrid.covering(depth[0], depth[-1], step, depth[0])
+        self.size = len(depth) if regular else self.grid.size
+
+    def depth_at(self, idx):
+        if self.regular:
+            return np.asarray(self.depth[idx], dtype=np.float64)
+        return self.grid.start + self.grid.step * np.asarray(idx)
+
+    def values(self, curve, start, stop):
+        """Curva en los nodos [start, stop) de la malla (float64)"""
+        if self.regular or stop <= start:
+            return np.asarray(curve[start:stop], dtype=np.float64)
+        targets = self.depth_at(np.arange(start, stop))
+        lo = max(int(np.searchsorted(self.depth, targets[0])) - 1, 0)
+        hi = min(int(np.searchsorted(self.depth, targets[-1])) + 1, len(self.depth))
+        return interpolate_at(self.depth[lo:hi], curve[lo:hi], targets)
+
+    def detrended(self, curve, log, trend, start, stop):
+        """_detrend de la curva en los nodos [start, stop), idéntico al de la curva completa"""
+        half = trend // 2
+        lo, hi = max(start - half, 0), min(stop + half, self.size)
+        filled, mask = _detrend(self.values(curve, lo, hi), log, trend)
+        return filled[start - lo:stop - lo], mask[start - lo:stop - lo]
+
+
+def _regular_step(depth, step, chunk_rows):
+    """np.allclose(np.diff(depth), step, rtol=1e-3, atol=1e-6) por tramos"""
+    for sl in row_slices(len(depth) - 1, chunk_rows):
+        diffs = np.diff(np.asarray(depth[sl.start:sl.stop + 1], dtype=np.float64))
+        if not np.allclose(diffs, step, rtol=1e-3, atol=1e-6):
+            return False
+    return True
+
+
+def estimate_shift_chunked(depth, reference, curve, log=False, max_shift=DEPTH_MATCH_MAX_SHIFT_FT,
+                           window=DEPTH_MATCH_WINDOW_FT, chunk_rows=STATS_CHUNK_ROWS):
+    """estimate_shift sobre arreglos recorridos por tramos (p. ej. curvas mapeadas en memoria)
+
+    La tendencia se resta con un halo de su semiventana, la media y la
+    desviación de la estandarización se combinan por tramos y las sumas de
+    la correlación global se acumulan tramo a tramo con max_lag muestras de
+    la curva a cada lado. Las ventanas se correlacionan por grupos. La
+    memoria es la de un tramo; el resultado coincide con el de estimate_shift
+    salvo por el redondeo de las sumas.
+    """
+    n = len(depth)
+    empty = dict(_EMPTY_ESTIMATE)
+    if n < 4:
+        return empty
+
+    def positive_steps():
+        for sl in row_slices(n - 1, chunk_rows):
+            diffs = np.diff(np.asarray(depth[sl.start:sl.stop + 1], dtype=np.float64))
+            yield diffs[diffs > 0]
+
+    step = chunked_median(positive_steps, chunk_rows) or 0.0
+    if step <= 0:
+        return empty
+    grid = _ChunkedGrid(depth, step, _regular_step(depth, step, chunk_rows))
+    size_total = grid.size
+
+    max_lag = max(int(round(max_shift / step)), 1)
+    trend = 8 * max_lag + 1
+    curves = ((reference, False), (curve, log))
+
+    # Pasada 1: muestras, media y desviación de cada curva sin tendencia (Chan et al.)
+    moments = []
+    for values, is_log in curves:
+        count, mean, m2 = 0, 0.0, 0.0
+        for sl in row_slices(size_total, chunk_rows):
+            filled, mask = grid.detrended(values, is_log, trend, sl.start, sl.stop)
+            valid = filled[mask]
+            if not len(valid):
+                continue
+            part_mean = valid.mean()
+            delta = part_mean - mean
+            total = count + len(valid)
+            mean += delta * len(valid) / total
+            m2 += ((valid - part_mean) ** 2).sum() + delta ** 2 * count * len(valid) / total
+            count = total
+        std = np.sqrt(m2 / count) if count else 0.0
+        moments.append((count, mean, std))
+    if moments[0][0] < 2 * max_lag or moments[1][0] < 2 * max_lag:
+        return empty
+
+    def standardized(start, stop):
+        out = []
+        for (values, is_log), (count, mean, std) in zip(curves, moments):
+            filled, mask = grid.detrended(values, is_log, trend, start, stop)
+            if count > 1 and std > 0:
+                filled = np.where(mask, (filled - mean) / std, 0.0)
+            out += [filled, mask.astype(np.float64)]
+        return out
+
+    # Pasada 2: sumas de la correlación global, tramo a tramo de la referencia
+    sums = 0.0
+    for sl in row_slices(size_total, chunk_rows):
+        lo, hi = max(sl.start - max_lag, 0), min(sl.stop + max_lag, size_total)
+        ref, ref_mask, cur, cur_mask = standardized(lo, hi)
+        outside = np.r_[0:sl.start - lo, sl.stop - lo:hi - lo]
+        ref[outside] = 0.0
+        ref_mask[outside] = 0.0
+        sums = sums + _xcorr_sums(ref, ref_mask, cur, cur_mask, max_lag)
+    corr, overlap = _xcorr_normalize(sums)
+    min_overlap = 0.25 * min(moments[0][0], moments[1][0])
+    bulk_lag, bulk_corr = _peak(corr[None], overlap[None], min_overlap)
+    result = dict(empty, bulk=float(bulk_lag[0]) * step, bulk_corr=float(bulk_corr[0]))
+
+    # Ventanas con 50 % de solape, por grupos de ventanas consecutivas
+    size = int(round(window / step))
+    if size >= 4 * max_lag and size < size_total:
+        hop = size // 2
+        n_windows = (size_total - size) // hop + 1
+        group = max(chunk_rows // hop, 1)
+        lags, values = [], []
+        for first in range(0, n_windows, group):
+            last = min(first + group, n_windows)
+            rows = standardized(first * hop, (last - 1) * hop + size)
+            frames = [sliding_window_view(a, size)[::hop] for a in rows]
+            w_corr, w_overlap = _xcorr(*frames, max_lag)
+            w_lag, w_value = _peak(w_corr, w_overlap, 3 * size // 4)
+            lags.append(w_lag)
+            values.append(w_value)
+        starts = np.arange(n_windows) * hop
+        result.update(centers=grid.depth_at(starts + size // 2), shifts=np.concatenate(lags) * step,
+                      corr=np.concatenate(values))
+    return result
+
+
+def shift_plan(name, est, mode, min_corr=DEPTH_MATCH_MIN_CORR):
+    """Fila del informe (DEPTH_MATCH_COLUMNS) y desplazamiento a aplicar de una estimación
+
+    En modo 'windowed' se usan las ventanas con |correlación| >= min_corr
+    (si ninguna es fiable, el global); el global solo si su correlación
+    alcanza min_corr.
+
+    Returns:
+        (fila, plan): plan es (centros, desplazamientos) por ventanas, un
+        desplazamiento global en ft o None si no se aplica ninguno
+    """
+    used = np.abs(est['corr']) >= min_corr
+    row = {
+        'CURVE': name,
+        'APPLIED': 'none',
+        'BULK_SHIFT_FT': est['bulk'],
+        'BULK_CORR': est['bulk_corr'],
+        'WINDOWS': len(est['corr']),
+        'WINDOWS_USED': int(used.sum()),
+        'MIN_SHIFT_FT': np.nan,
+        'MAX_SHIFT_FT': np.nan,
+    }
+    if mode == 'windowed' and used.any():
+        row['APPLIED'] = 'windowed'
+        return row, (est['centers'][used], est['shifts'][used])
+    if np.isfinite(est['bulk']) and abs(est['bulk_corr']) >= min_corr:
+        row['APPLIED'] = 'bulk'
+        return row, est['bulk']
+    return row, None
+
+
+def shift_profile(plan, depth):
+    """Desplazamiento (ft) en cada profundidad según el plan de shift_plan
+
+    Los desplazamientos por ventana se interpolan linealmente entre centros.
+    """
+    if isinstance(plan, tuple):
+        return np.interp(depth, *plan)
+    return np.full(len(depth), plan)
+
+
+def depth_match(df, reference=DEPTH_MATCH_REFERENCE, curves=DEPTH_MATCH_CURVES, mode='bulk',
+                max_shift=DEPTH_MATCH_MAX_SHIFT_FT, window=DEPTH_MATCH_WINDOW_FT,
+                min_corr=DEPTH_MATCH_MIN_CORR, depth_col='DEPTH_FT'):
+    """Ajusta en profundidad las curvas a la curva de referencia
+
+    En modo 'bulk' se aplica el desplazamiento global; en 'windowed', el de
+    cada ventana con |correlación| >= min_corr, interpolado linealmente entre
+    centros de ventana (si ninguna ventana es fiable se usa el global). Los
+    desplazamientos con correlación insuficiente no se aplican.
+
+    Returns:
+        (DataFrame con las curvas ajustadas, informe DEPTH_MATCH_COLUMNS)
+    """
+    rows = []
+    if mode == 'off' or reference not in df.columns or df[reference].notna().sum() < 4:
+        return df, pd.DataFrame(rows, columns=DEPTH_MATCH_COLUMNS)
+    if mode not in DEPTH_MATCH_MODES:
+        raise ValueError(f"Modo de ajuste de profundidad desconocido: {mode}")
+
+    depth = df[depth_col].to_numpy(dtype=np.float64)
+    ref_values = df[reference].to_numpy(dtype=np.float64)
+    shifted = {}
+    for name in curves:
+        if name == reference or name not in df.columns or df[name].notna().sum() < 4:
+            continue
+        values = df[name].to_numpy(dtype=np.float64)
+        est = estimate_shift(depth, ref_values, values, name in DEPTH_MATCH_LOG_CURVES, max_shift, window)
+        row, plan = shift_plan(name, est, mode, min_corr)
+        rows.append(row)
+        if plan is None:
+            continue
+        profile = shift_profile(plan, depth)
+        row['MIN_SHIFT_FT'], row['MAX_SHIFT_FT'] = float(profile.min()), float(profile.max())
+        if np.any(profile != 0):
+            shifted[name] = interpolate_at(depth, values, depth + profile).astype(df[name].dtype, copy=False)
+
+    if shifted:
+        df = df.assign(**shifted)
+    return df, pd.DataFrame(rows, columns=DEPTH_MATCH_COLUMNS)
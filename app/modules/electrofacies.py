@@ -0,0 +1,242 @@
+# ==========================================================
+# MÓDULO: ELECTROFACIES (K-MEANS POR MINI-LOTES EN NUMPY)
+# ==========================================================
+import numpy as np
+import pandas as pd
+
+from .petrofisica import LITHO_CLASSES, classify_lithology_array, vsh_larionov_array
+
+
+# Curvas de entrada; RT se usa en escala logarítmica
+FACIES_CURVES = ('GR', 'RHOB', 'NPHI', 'PEF', 'RT')
+FACIES_LOG_CURVES = ('RT',)
+
+# Fracción mínima de muestras con dato para que una curva entre en el modelo
+FACIES_MIN_COVERAGE = 0.5
+
+FACIES_BATCH_SIZE = 8192
+# Muestra aleatoria que se conserva para la inicialización k-means++ y los límites de GR
+FACIES_RESERVOIR_SIZE = 100_000
+
+
+def facies_features(df, curves=FACIES_CURVES):
+    """Matriz (muestras × curvas) en unidades físicas; log10 en FACIES_LOG_CURVES
+
+    Las curvas ausentes quedan en NaN, igual que los valores no positivos de
+    las curvas logarítmicas.
+    """
+    columns = []
+    for curve in curves:
+        values = df[curve].to_numpy(dtype=np.float64) if curve in df.columns else np.full(len(df), np.nan)
+        if curve in FACIES_LOG_CURVES:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values = np.where(values > 0, np.log10(values), np.nan)
+        columns.append(values)
+    return np.column_stack(columns) if columns else np.empty((len(df), 0))
+
+
+def _batches(features, batch_size):
+    for start in range(0, len(features), batch_size):
+        yield features[start:start + batch_size]
+
+
+def _sq_distances(x, centers):
+    """Distancias cuadráticas (sin el término |x|², constante por fila)"""
+    return (centers**2).sum(axis=1) - 2 * x @ centers.T
+
+
+class MiniBatchKMeans:
+    """K-means por mini-lotes (Sculley, 2010)
+
+    Cada centro es la media acumulada de todas las muestras que se le
+    asignaron: con v muestras previas y m nuevas, c ← (v·c + Σx) / (v + m).
+    """
+
+    def __init__(self, n_clusters, seed=None):
+        self.n_clusters = n_clusters
+        self.rng = np.random.default_rng(seed)
+        self.centers = None
+        self.counts = np.zeros(n_clusters)
+
+    def init_centers(self, x):
+        """Inicialización k-means++ sobre una muestra"""
+        if len(x) < self.n_clusters:
+            raise ValueError(f"Se necesitan al menos {self.n_clusters} muestras completas para el agrupamiento")
+        centers = [x[self.rng.integers(len(x))]]
+        closest = ((x - centers[0])**2).sum(axis=1)
+        for _ in range(1, self.n_clusters):
+            total = closest.sum()
+            idx = self.rng.choice(len(x), p=closest / total) if total > 0 else self.rng.integers(len(x))
+            centers.append(x[idx])
+            np.minimum(closest, ((x - x[idx])**2).sum(axis=1), out=closest)
+        self.centers = np.array(centers)
+        return self
+
+    def predict(self, x):
+        return np.argmin(_sq_distances(x, self.centers), axis=1) if len(x) else np.zeros(0, dtype=np.intp)
+
+    def partial_fit(self, x):
+        """Actualiza los centros con un mini-lote"""
+        labels = self.predict(x)
+        batch_counts = np.bincount(labels, minlength=self.n_clusters)
+        sums = np.column_stack([np.bincount(labels, weights=x[:, j], minlength=self.n_clusters)
+                                for j in range(x.shape[1])])
+        updated = batch_counts > 0
+        total = self.counts[updated] + batch_counts[updated]
+        self.centers[updated] = (self.centers[updated] * self.counts[updated, None] + sums[updated]) / total[:, None]
+        self.counts[updated] = total
+        return self
+
+
+class _Reservoir:
+    """Muestra aleatoria uniforme de tamaño acotado sobre un flujo de filas"""
+
+    def __init__(self, size, rng):
+        self.size = size
+        self.rng = rng
+        self.keys = np.empty(0)
+        self.rows = None
+
+    def add(self, rows):
+        keys = np.concatenate((self.keys, self.rng.random(len(rows))))
+        rows = rows if self.rows is None else np.concatenate((self.rows, rows))
+        if len(keys) > self.size:
+            keep = np.argpartition(keys, self.size)[:self.size]
+            keys, rows = keys[keep], rows[keep]
+        self.keys, self.rows = keys, rows
+
+
+class ElectrofaciesModel:
+    """Electrofacies ajustadas sobre uno o varios pozos
+
+    El ajuste recorre los pozos por mini-lotes (memoria acotada por el
+    tamaño de lote y la muestra de inicialización):
+        1. medias y desviaciones de cada curva y muestra aleatoria de filas;
+        2. k-means++ sobre la muestra estandarizada;
+        3. epochs pasadas de k-means por mini-lotes.
+    Cada cluster se asigna a una clase de LITHO_CLASSES aplicando las reglas
+    de classify_lithology_array a su centroide (VSH por Larionov con el
+    P2/P98 de GR de la muestra).
+    """
+
+    def __init__(self, n_clusters=6, epochs=2, batch_size=FACIES_BATCH_SIZE,
+                 reservoir_size=FACIES_RESERVOIR_SIZE, seed=None):
+        self.n_clusters = n_clusters
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.reservoir_size = reservoir_size
+        self.seed = seed
+        self.curves = None
+        self.mean = None
+        self.std = None
+        self.kmeans = None
+        self.cluster_codes = None
+        self.samples = 0
+
+    def _standardized(self, features):
+        """Filas completas estandarizadas (y máscara de filas usadas)"""
+        x = features[:, self._used]
+        complete = ~np.isnan(x).any(axis=1)
+        return (x[complete] - self.mean) / self.std, complete
+
+    @property
+    def fit_passes(self):
+        """Recorridos de fit sobre los pozos: estadísticas, muestra y epochs"""
+        return 2 + self.epochs
+
+    def fit(self, wells, dominant_matrix='ARENISCA'):
+        """Ajusta el modelo
+
+        Args:
+            wells: Iterable reiterable de DataFrames de pozo (curvas estándar);
+                se recorre fit_passes veces: estadísticas, muestra y epochs
+        """
+        rng = np.random.default_rng(self.seed)
+        n_all = len(FACIES_CURVES)
+        valid, sums, sq_sums = np.zeros(n_all), np.zeros(n_all), np.zeros(n_all)
+        total = 0
+        for df in wells:
+            features = facies_features(df)
+            ok = ~np.isnan(features)
+            filled = np.where(ok, features, 0.0)
+            valid += ok.sum(axis=0)
+            sums += filled.sum(axis=0)
+            sq_sums += (filled**2).sum(axis=0)
+            total += len(features)
+
+        coverage = valid / max(total, 1)
+        self._used = (coverage >= FACIES_MIN_COVERAGE) & (valid > 1)
+        if not self._used.any():
+            raise ValueError("Ninguna curva de electrofacies tiene datos suficientes")
+        self.curves = [c for c, used in zip(FACIES_CURVES, self._used) if used]
+        n = valid[self._used]
+        self.mean = sums[self._used] / n
+        self.std = np.sqrt(np.maximum(sq_sums[self._used] / n - self.mean**2, 0) * n / (n - 1))
+        self.std[self.std == 0] = 1.0
+
+        # Muestra acotada de filas completas (para k-means++ y límites de GR)
+        reservoir = _Reservoir(self.reservoir_size, rng)
+        for df in wells:
+            x, _ = self._standardized(facies_features(df))
+            reservoir.add(x)
+        if reservoir.rows is None:
+            raise ValueError("No hay muestras completas para el agrupamiento")
+
+        self.kmeans = MiniBatchKMeans(self.n_clusters, seed=self.seed).init_centers(reservoir.rows)
+        self.samples = 0
+        for _ in range(self.epochs):
+            for df in wells:
+                x, _ = self._standardized(facies_features(df))
+                x = x[rng.permutation(len(x))]
+                for batch in _batches(x, self.batch_size):
+                    self.kmeans.partial_fit(batch)
+                self.samples += len(x)
+        self.samples //= max(self.epochs, 1)
+
+        self.cluster_codes = self._map_clusters(reservoir.rows, dominant_matrix)
+        return self
+
+    def centroids(self):
+        """Centroides en unidades físicas (DataFrame clusters × curvas)"""
+        physical = self.kmeans.centers * self.std + self.mean
+        table = pd.DataFrame(physical, columns=self.curves)
+        for curve in FACIES_LOG_CURVES:
+            if curve in table.columns:
+                table[curve] = 10**table[curve]
+        return table
+
+    def _map_clusters(self, sample, dominant_matrix):
+        """Clase litológica de cada cluster a partir de su centroide"""
+        centroids = self.centroids()
+        get = lambda c: centroids[c].to_numpy() if c in centroids.columns else np.full(self.n_clusters, np.nan)
+        if 'GR' in centroids.columns:
+            gr = sample[:, self.curves.index('GR')] * self.std[self.curves.index('GR')] + self.mean[self.curves.index('GR')]
+            gr_min, gr_max = np.quantile(gr, (0.02, 0.98))
+            vsh = vsh_larionov_array(get('GR'), gr_min, gr_max) if gr_max > gr_min else np.full(self.n_clusters, np.nan)
+        else:
+            vsh = np.full(self.n_clusters, np.nan)
+        return classify_lithology_array(vsh, get('RHOB'), get('PEF'), dominant_matrix)
+
+    def predict(self, df):
+        """Cluster de cada muestra (int8; -1 si falta alguna curva del modelo)"""
+        x, complete = self._standardized(facies_features(df))
+        labels = np.full(len(df), -1, dtype=np.int8)
+        if len(x):
+            assigned = np.empty(len(x), dtype=np.int8)
+            for start in range(0, len(x), self.batch_size * 8):
+                chunk = x[start:start + self.batch_size * 8]
+                assigned[start:start + len(chunk)] = self.kmeans.predict(chunk)
+            labels[complete] = assigned
+        return labels
+
+    def litho_codes(self, facies):
+        """Códigos de LITHO_CLASSES de cada muestra (-1 sin cluster)"""
+        return np.where(facies >= 0, self.cluster_codes[np.maximum(facies, 0)], -1).astype(np.int8)
+
+    def summary(self):
+        """Centroides, clase asignada y muestras de ajuste por cluster"""
+        table = self.centroids()
+        table.insert(0, 'FACIES', np.arange(self.n_clusters))
+        table['LITOLOGIA'] = [LITHO_CLASSES[code] for code in self.cluster_codes]
+        table['SAMPLES'] = (self.kmeans.counts / max(self.epochs, 1)).round().astype(np.int64)
+        return table
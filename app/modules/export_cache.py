@@ -0,0 +1,137 @@
+# ==========================================================
+# MÓDULO: CACHÉ DE EXPORTACIONES (LRU POR BYTES)
+# ==========================================================
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+
+# Límite por defecto del total de bytes cacheados por proceso
+EXPORT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def bytes_fingerprint(data):
+    """Huella (blake2b, 128 bits) de un bloque de bytes"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_fingerprint(path, block_size=1 << 20):
+    """bytes_fingerprint del contenido de un archivo en disco, leído por bloques"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def result_fingerprint(df, columns, *extra):
+    """Huella barata de los arreglos de resultados de un pozo
+
+    Se calcula sobre los bytes crudos de cada columna numérica (sin serializar),
+    de modo que cuesta una fracción de generar cualquiera de las exportaciones.
+
+    Args:
+        df: DataFrame procesado
+        columns: Columnas que determinan el contenido de las exportaciones
+        extra: Valores adicionales que identifican el origen (p. ej. huella del archivo)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(len(df)).encode())
+    for col in columns:
+        if col not in df.columns:
+            continue
+        h.update(col.encode())
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.cat.codes.to_numpy()
+            h.update(repr(list(series.cat.categories)).encode())
+        elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy()
+        else:
+            values = pd.util.hash_pandas_object(series, index=False).to_numpy()
+        h.update(str(values.dtype).encode())
+        h.update(np.ascontiguousarray(values).data)
+    for item in extra:
+        h.update(repr(item).encode())
+    return h.hexdigest()
+
+
+def export_key(fingerprint, fmt, config=None, language=None):
+    """Clave de caché: huella + formato (+ configuración e idioma si aplican)"""
+    config_key = tuple(sorted(config.items())) if config else None
+    return (fingerprint, fmt, config_key, language)
+
+
+class ExportCache:
+    """Caché LRU de bytes exportados, acotada por el total de bytes
+
+    Es segura entre hilos: una misma instancia se comparte entre sesiones.
+    El tamaño de cada entrada lo da _size (len para bytes).
+    """
+
+    def __init__(self, max_bytes=EXPORT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _size(self, data):
+        return len(data)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, data):
+        """Guarda una entrada; False si no cabe en max_bytes (no se guarda)"""
+        size = self._size(data)
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (data, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+        return True
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Entradas, bytes ocupados y límite, aciertos, fallos y expulsiones"""
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.total_bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def get_or_build(self, key, builder):
+        """Devuelve los bytes cacheados o los genera con builder() y los guarda"""
+        data = self.get(key)
+        if data is None:
+            data = builder()
+            self.put(key, data)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
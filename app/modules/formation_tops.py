@@ -0,0 +1,191 @@
+# ==========================================================
+# MÓDULO: TOPES DE FORMACIÓN Y ESTADÍSTICAS POR ZONA
+# ==========================================================
+import numpy as np
+import pandas as pd
+
+from .pay_zones import sample_edges, sample_thickness
+
+
+# Nombres aceptados para cada columna del CSV de topes
+TOPS_ALIASES = {
+    'WELL': ['WELL', 'POZO', 'PUITS', 'WELL_NAME', 'UWI'],
+    'ZONE': ['ZONE', 'ZONA', 'FORMATION', 'FORMACION', 'FORMACIÓN', 'TOP_NAME', 'SURFACE'],
+    'TOP_FT': ['TOP_FT', 'TOP', 'TOPE', 'TOIT', 'DEPTH', 'MD', 'PROF'],
+}
+
+# Curvas que se resumen en cada zona
+ZONE_CURVES = ('GR', 'RHOB', 'NPHI', 'RT', 'VSH', 'PHI_E', 'SW', 'PERM')
+
+# Percentiles de cada curva (P10 = percentil 10 de las muestras)
+ZONE_QUANTILES = (0.1, 0.5, 0.9)
+
+ZONE_STATS_COLUMNS = ['WELL', 'ZONE', 'TOP_FT', 'BASE_FT', 'SAMPLES', 'GROSS_FT', 'NET_FT', 'NTG', 'HCPV_FT',
+                      *[f'{curve}_{stat}' for curve in ZONE_CURVES
+                        for stat in ('MEAN', *[f'P{q * 100:g}' for q in ZONE_QUANTILES])]]
+
+
+def _well_key(name):
+    return str(name).strip().upper()
+
+
+def read_tops_csv(source):
+    """Lee un CSV de topes (pozo, zona, profundidad del tope en ft)
+
+    El separador se detecta automáticamente y las columnas se reconocen por
+    TOPS_ALIASES sin distinguir mayúsculas.
+
+    Returns:
+        DataFrame WELL, ZONE, TOP_FT ordenado por pozo (sin distinguir
+        mayúsculas) y profundidad
+    """
+    raw = pd.read_csv(source, sep=None, engine='python')
+    upper = {str(c).strip().upper(): c for c in raw.columns}
+    columns = {}
+    for name, aliases in TOPS_ALIASES.items():
+        match = next((upper[a] for a in aliases if a in upper), None)
+        if match is None:
+            raise ValueError(f"Falta la columna {name} en el archivo de topes (alias: {', '.join(aliases)})")
+        columns[name] = match
+
+    tops = pd.DataFrame({
+        'WELL': raw[columns['WELL']].astype(str).str.strip(),
+        'ZONE': raw[columns['ZONE']].astype(str).str.strip(),
+        'TOP_FT': pd.to_numeric(raw[columns['TOP_FT']], errors='coerce'),
+    }).dropna(subset=['TOP_FT'])
+    order = np.lexsort((tops['TOP_FT'].to_numpy(), tops['WELL'].map(_well_key).to_numpy()))
+    return tops.iloc[order].reset_index(drop=True)
+
+
+def match_tops(wells, tops):
+    """Topes de cada pozo cargado (por nombre, sin distinguir mayúsculas)
+
+    Returns:
+        dict {well_name: DataFrame de topes}; los pozos sin topes no aparecen
+    """
+    groups = {key: group.sort_values('TOP_FT', kind='stable')
+              for key, group in tops.groupby(tops['WELL'].map(_well_key), sort=False)}
+    return {well['well_name']: groups[_well_key(well['well_name'])]
+            for well in wells if _well_key(well['well_name']) in groups}
+
+
+def assign_zones(depth, top_depths):
+    """Índice de zona de cada muestra (-1 por encima del primer tope)"""
+    return np.searchsorted(np.asarray(top_depths, dtype=np.float64), depth, side='right') - 1
+
+
+def _grouped_sums(values, starts, present, n_groups):
+    """Sumas por grupo con np.add.reduceat (grupos sin muestras = 0)"""
+    out = np.zeros((n_groups,) + values.shape[1:])
+    if len(starts):
+        out[present] = np.add.reduceat(values, starts, axis=0)
+    return out
+
+
+def _grouped_quantiles(values, groups, n_groups, quantiles):
+    """Cuantiles por grupo en una sola ordenación (interpolación lineal, como np.quantile)"""
+    valid = ~np.isnan(values)
+    v, g = values[valid], groups[valid]
+    order = np.lexsort((v, g))
+    v = v[order]
+    counts = np.bincount(g, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    out = np.full((len(quantiles), n_groups), np.nan)
+    has = counts > 0
+    if not has.any():
+        return out
+    for i, q in enumerate(quantiles):
+        pos = q * (counts[has] - 1)
+        lo = np.floor(pos).astype(np.intp)
+        hi = np.minimum(lo + 1, counts[has] - 1)
+        frac = pos - lo
+        base = starts[has]
+        out[i, has] = v[base + lo] * (1 - frac) + v[base + hi] * frac
+    return out
+
+
+def zone_statistics(wells, tops, curves=ZONE_CURVES, quantiles=ZONE_QUANTILES):
+    """Estadísticas por zona de todos los pozos en una sola pasada
+
+    Cada zona va de su tope al siguiente del mismo pozo (la última, hasta la
+    base de los datos). Las muestras se asignan con searchsorted; las de
+    todos los pozos se concatenan con un identificador de grupo global y las
+    sumas se reducen con np.add.reduceat sobre los grupos ordenados.
+
+    Args:
+        wells: Lista de pozos (dicts con 'df' y 'well_name')
+        tops: DataFrame de read_tops_csv
+
+    Returns:
+        DataFrame ZONE_STATS_COLUMNS: espesor bruto y neto (ft) ponderado por
+        muestra, NTG, HCPV (Σ φ·(1 − Sw)·h en pay; NaN sin SW) y media y
+        percentiles de cada curva. Los pozos sin topes no aparecen.
+    """
+    tops_by_well = match_tops(wells, tops)
+    rows, parts = [], []
+    offset = 0
+    for well in wells:
+        well_tops = tops_by_well.get(well['well_name'])
+        if well_tops is None:
+            continue
+        df = well['df']
+        depth = df['DEPTH_FT'].to_numpy(dtype=np.float64)
+        top_depths = well_tops['TOP_FT'].to_numpy(dtype=np.float64)
+        data_base = sample_edges(depth)[-1] if len(depth) else np.nan
+        bases = np.append(top_depths[1:], max(data_base, top_depths[-1]))
+        rows.append(pd.DataFrame({'WELL': well['well_name'], 'ZONE': well_tops['ZONE'].to_numpy(),
+                                  'TOP_FT': top_depths, 'BASE_FT': bases}))
+
+        zone = assign_zones(depth, top_depths)
+        inside = zone >= 0
+        thickness = sample_thickness(depth)[inside]
+        values = np.column_stack([
+            df[c].to_numpy(dtype=np.float64)[inside] if c in df.columns else np.full(inside.sum(), np.nan)
+            for c in curves
+        ]) if curves else np.empty((inside.sum(), 0))
+        pay = df['IS_PAY'].to_numpy(dtype=bool)[inside] if 'IS_PAY' in df.columns else np.zeros(inside.sum(), bool)
+        if 'SW' in df.columns and df['SW'].notna().any():
+            phi = np.nan_to_num(df['PHI_E'].to_numpy(dtype=np.float64)[inside], nan=0.0)
+            sw = np.nan_to_num(df['SW'].to_numpy(dtype=np.float64)[inside], nan=1.0)
+            hcpv = np.where(pay, thickness * phi * (1 - sw), 0.0)
+        else:
+            hcpv = np.full(len(thickness), np.nan)
+        parts.append((zone[inside] + offset, thickness, pay, hcpv, values))
+        offset += len(top_depths)
+
+    if not rows:
+        return pd.DataFrame(columns=ZONE_STATS_COLUMNS)
+
+    groups = np.concatenate([p[0] for p in parts])
+    order = np.argsort(groups, kind='stable')
+    groups = groups[order]
+    thickness = np.concatenate([p[1] for p in parts])[order]
+    pay = np.concatenate([p[2] for p in parts])[order]
+    hcpv = np.concatenate([p[3] for p in parts])[order]
+    values = np.concatenate([p[4] for p in parts])[order]
+
+    present, starts = np.unique(groups, return_index=True)
+    valid = ~np.isnan(values)
+    sums = _grouped_sums(
+        np.column_stack([np.ones(len(groups)), thickness, np.where(pay, thickness, 0.0), hcpv,
+                         valid, np.where(valid, values, 0.0)]),
+        starts, present, offset
+    )
+    n_curves = values.shape[1]
+    samples, gross, net, hcpv_sum = sums[:, 0], sums[:, 1], sums[:, 2], sums[:, 3]
+    counts, totals = sums[:, 4:4 + n_curves], sums[:, 4 + n_curves:]
+
+    result = pd.concat(rows, ignore_index=True)
+    result['SAMPLES'] = samples.astype(np.int64)
+    result['GROSS_FT'] = gross
+    result['NET_FT'] = net
+    result['NTG'] = np.divide(net, gross, out=np.zeros_like(net), where=gross > 0)
+    result['HCPV_FT'] = hcpv_sum
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, totals / counts, np.nan)
+    for i, curve in enumerate(curves):
+        result[f'{curve}_MEAN'] = means[:, i]
+        levels = _grouped_quantiles(values[:, i], groups, offset, quantiles)
+        for q, level in zip(quantiles, levels):
+            result[f'{curve}_P{q * 100:g}'] = level
+    return result
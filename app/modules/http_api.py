@@ -0,0 +1,326 @@
+# ==========================================================
+# MÓDULO: API HTTP LOCAL DE PROCESAMIENTO (ASYNCIO + POOL DE PROCESOS)
+# ==========================================================
+"""Servicio HTTP/1.1 mínimo sobre asyncio (solo biblioteca estándar)
+
+    POST /jobs?well=W1&language=en&PHI_CUTOFF=0.08   cuerpo: archivo LAS
+    GET  /jobs                                       trabajos registrados
+    GET  /jobs/<id>                                  estado y resumen
+    GET  /jobs/<id>/<formato>                        csv, npz, pdf, xlsx, parquet o las
+    GET  /health
+
+El procesamiento corre en un ProcessPoolExecutor, de modo que el bucle de
+eventos sigue atendiendo peticiones mientras se calculan los pozos. Cada
+respuesta lleva su duración en la cabecera X-Request-Time-Ms (y en
+request_ms en las respuestas JSON).
+"""
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+from .jobs import default_workers, ignore_interrupts
+from .pipeline import process_well, default_pipeline_config
+from .well_outputs import OUTPUT_FORMATS, OUTPUT_MIME_TYPES, output_name, well_output_bytes, well_summary
+
+
+API_HOST = '127.0.0.1'
+API_PORT = 8765
+
+# Tamaño máximo del cuerpo de un POST (archivo LAS)
+API_MAX_BODY_BYTES = 512 * 1024 * 1024
+
+# Trabajos terminados que se conservan (con sus entregables); los más antiguos se descartan
+API_JOB_HISTORY = 64
+
+# Entregables que se generan junto con el procesamiento; el resto, al pedirlos
+API_EAGER_FORMATS = ('csv', 'npz')
+
+API_LANGUAGES = ('es', 'en', 'fr')
+
+
+class HttpError(Exception):
+    """Error con código de estado HTTP (se responde como JSON {'error': ...})"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def run_api_job(raw_bytes, well_name, config, formats, language):
+    """Procesa un LAS y genera sus entregables (se ejecuta en un proceso del pool)
+
+    Returns:
+        (resumen, {formato: bytes}, segundos de process_well)
+    """
+    start = time.perf_counter()
+    result = process_well(raw_bytes, well_name, config)
+    seconds = time.perf_counter() - start
+    files = well_output_bytes(result, formats, language)
+    return well_summary(result), {fmt: files[output_name(well_name, fmt)] for fmt in formats}, seconds
+
+
+def _parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def parse_job_params(query):
+    """(well, language, config) desde los parámetros de la URL
+
+    Las claves de default_pipeline_config (sin distinguir mayúsculas) forman
+    la configuración; los valores se interpretan como JSON si es posible
+    (0.08, true, null) y si no como texto.
+    """
+    defaults = default_pipeline_config()
+    well, language, config = None, 'es', {}
+    for key, value in parse_qsl(query, keep_blank_values=True):
+        if key == 'well':
+            well = value.strip().upper() or None
+        elif key == 'language':
+            if value not in API_LANGUAGES:
+                raise HttpError(400, f"Idioma no soportado: {value}")
+            language = value
+        elif key.upper() in defaults:
+            config[key.upper()] = _parse_value(value)
+        else:
+            raise HttpError(400, f"Parámetro desconocido: {key}")
+    return well, language, config
+
+
+class ApiJob:
+    """Un pozo enviado a la API: estado, tiempos, resumen y entregables"""
+
+    def __init__(self, raw_bytes, well_name, config, language):
+        self.id = uuid.uuid4().hex
+        self.raw_bytes = raw_bytes
+        self.well_name = well_name
+        self.config = config
+        self.language = language
+        self.status = 'queued'
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.process_seconds = None
+        self.summary = None
+        self.error = None
+        self.outputs = {}
+        self._building = {}
+
+    def start(self):
+        self.status = 'running'
+        self.started = time.time()
+
+    def to_dict(self):
+        queue_end = self.started if self.started is not None else time.time()
+        return {
+            'id': self.id,
+            'well_name': self.well_name,
+            'status': self.status,
+            'language': self.language,
+            'config': self.config,
+            'submitted': datetime.fromtimestamp(self.submitted, timezone.utc).isoformat(),
+            'queue_seconds': round(queue_end - self.submitted, 4),
+            'run_seconds': round(self.finished - self.started, 4) if self.finished and self.started else None,
+            'process_seconds': round(self.process_seconds, 4) if self.process_seconds is not None else None,
+            'summary': self.summary,
+            'error': self.error,
+            'ready': sorted(self.outputs),
+            'results': {fmt: f"/jobs/{self.id}/{fmt}" for fmt in OUTPUT_FORMATS} if self.status == 'done' else {},
+        }
+
+
+class ProcessingApi:
+    """Registro de trabajos y manejador HTTP
+
+    Como mucho max_workers pozos se procesan a la vez (semáforo sobre el
+    pool); los demás esperan en estado 'queued'. Los formatos fuera de
+    API_EAGER_FORMATS se generan la primera vez que se piden, volviendo a
+    procesar el LAS conservado en el trabajo (process_well cuesta una
+    fracción del PDF), y quedan guardados para las siguientes peticiones.
+    """
+
+    def __init__(self, max_workers=None, history=API_JOB_HISTORY, max_body_bytes=API_MAX_BODY_BYTES):
+        self.max_workers = max_workers or default_workers()
+        self.pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=ignore_interrupts)
+        self.history = history
+        self.max_body_bytes = max_body_bytes
+        self.jobs = OrderedDict()
+        self._slots = None
+        self._tasks = set()
+
+    # ------------------------------------------------------
+    # Trabajos
+    # ------------------------------------------------------
+    async def _run_in_pool(self, job, formats, on_start=None):
+        # El semáforo se crea dentro del bucle de eventos que lo usa
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        async with self._slots:
+            if on_start is not None:
+                on_start()
+            return await asyncio.get_running_loop().run_in_executor(
+                self.pool, run_api_job, job.raw_bytes, job.well_name, job.config, formats, job.language
+            )
+
+    async def _process(self, job):
+        try:
+            summary, outputs, seconds = await self._run_in_pool(job, API_EAGER_FORMATS, on_start=job.start)
+            job.summary, job.process_seconds = summary, seconds
+            job.outputs.update(outputs)
+            job.status = 'done'
+        except Exception as e:
+            job.status = 'error'
+            job.error = f"{type(e).__name__}: {e}"
+            job.raw_bytes = None
+        finally:
+            job.finished = time.time()
+            self._prune()
+
+    def submit(self, raw_bytes, well_name, config, language):
+        job = ApiJob(raw_bytes, well_name, config, language)
+        self.jobs[job.id] = job
+        task = asyncio.get_running_loop().create_task(self._process(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in ('done', 'error')]
+        for job_id in finished[:max(len(finished) - self.history, 0)]:
+            del self.jobs[job_id]
+
+    async def _build(self, job, fmt):
+        _, outputs, _ = await self._run_in_pool(job, (fmt,))
+        job.outputs.update(outputs)
+
+    async def output(self, job, fmt):
+        """Bytes de un entregable; se genera (una sola vez) si aún no existe"""
+        if fmt in job.outputs:
+            return job.outputs[fmt]
+        if job.status != 'done':
+            raise HttpError(409, f"El trabajo está en estado '{job.status}'")
+        building = job._building.get(fmt)
+        if building is None:
+            # Las peticiones simultáneas del mismo formato esperan a la misma generación
+            building = job._building[fmt] = asyncio.ensure_future(self._build(job, fmt))
+            building.add_done_callback(lambda _: job._building.pop(fmt, None))
+        await asyncio.shield(building)
+        return job.outputs[fmt]
+
+    # ------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------
+    async def _route(self, method, path, query, body):
+        parts = [p for p in path.split('/') if p]
+        if parts == ['health']:
+            if method != 'GET':
+                raise HttpError(405, 'Método no permitido')
+            return 200, {'status': 'ok', 'workers': self.max_workers, 'jobs': len(self.jobs),
+                         'running': sum(1 for job in self.jobs.values() if job.status == 'running'),
+                         'queued': sum(1 for job in self.jobs.values() if job.status == 'queued')}
+        if parts == ['jobs']:
+            if method == 'GET':
+                return 200, {'jobs': [job.to_dict() for job in self.jobs.values()]}
+            if method == 'POST':
+                if not body:
+                    raise HttpError(400, 'El cuerpo debe contener el archivo LAS')
+                well, language, config = parse_job_params(query)
+                job = self.submit(body, well or 'WELL', config, language)
+                return 202, {**job.to_dict(), 'status_url': f"/jobs/{job.id}"}
+            raise HttpError(405, 'Método no permitido')
+        if len(parts) in (2, 3) and parts[0] == 'jobs':
+            if method != 'GET':
+                raise HttpError(405, 'Método no permitido')
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise HttpError(404, f"No existe el trabajo {parts[1]}")
+            if len(parts) == 2:
+                return 200, job.to_dict()
+            fmt = parts[2]
+            if fmt not in OUTPUT_FORMATS:
+                raise HttpError(404, f"Formato desconocido: {fmt} (válidos: {', '.join(OUTPUT_FORMATS)})")
+            return 200, (await self.output(job, fmt), OUTPUT_MIME_TYPES[fmt], output_name(job.well_name, fmt))
+        raise HttpError(404, f"Ruta desconocida: {path}")
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        method, target, _ = request_line.decode('latin-1').split(' ', 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        body = b''
+        if method == 'POST':
+            if 'content-length' not in headers:
+                raise HttpError(411, 'Falta Content-Length')
+            length = int(headers['content-length'])
+            if length > self.max_body_bytes:
+                raise HttpError(413, f"El archivo supera {self.max_body_bytes} bytes")
+            body = await reader.readexactly(length)
+        return method.upper(), target, body
+
+    async def handle(self, reader, writer):
+        """Atiende una petición por conexión (Connection: close)"""
+        start = time.perf_counter()
+        try:
+            try:
+                request = await self._read_request(reader)
+                if request is None:
+                    return
+                method, target, body = request
+                url = urlsplit(target)
+                status, payload = await self._route(method, url.path, url.query, body)
+            except HttpError as e:
+                status, payload = e.status, {'error': str(e)}
+            except (ValueError, asyncio.IncompleteReadError) as e:
+                status, payload = 400, {'error': f"Petición inválida: {e}"}
+            except Exception as e:
+                status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+
+            elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+            headers = {'X-Request-Time-Ms': f"{elapsed_ms}", 'Connection': 'close'}
+            if isinstance(payload, dict):
+                data = json.dumps({**payload, 'request_ms': elapsed_ms}, ensure_ascii=False, default=str).encode('utf-8')
+                headers['Content-Type'] = 'application/json; charset=utf-8'
+            else:
+                data, mime, file_name = payload
+                headers['Content-Type'] = mime
+                headers['Content-Disposition'] = f'attachment; filename="{file_name}"'
+            headers['Content-Length'] = str(len(data))
+            head = f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n" + \
+                ''.join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+            writer.write(head.encode('latin-1') + data)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=API_HOST, port=API_PORT, ready=None):
+        """Atiende peticiones hasta que se cancele la tarea
+
+        Args:
+            ready: Función opcional ready(puerto) llamada al empezar a escuchar
+                (port=0 elige un puerto libre)
+        """
+        server = await asyncio.start_server(self.handle, host, port, limit=2 ** 20)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(wait=False, cancel_futures=True)
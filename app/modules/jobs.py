@@ -0,0 +1,147 @@
+# ==========================================================
+# MÓDULO: TRABAJOS EN SEGUNDO PLANO (POOL DE HILOS + REGISTRO)
+# ==========================================================
+import os
+import signal
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+# Trabajos terminados que se conservan en el registro (los más antiguos se descartan)
+JOB_HISTORY = 32
+
+
+def default_workers():
+    """Hilos del pool: AIWELLLOG_JOB_WORKERS o min(4, núcleos)"""
+    value = os.environ.get("AIWELLLOG_JOB_WORKERS")
+    return max(int(value), 1) if value else min(4, os.cpu_count() or 1)
+
+
+def ignore_interrupts():
+    """Inicializador de pools de procesos: Ctrl+C llega solo al proceso principal,
+    que decide cómo terminar los trabajos en curso"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class Job:
+    """Un trabajo del registro: futuro, progreso (0-100) y tiempos"""
+
+    def __init__(self, key):
+        self.key = key
+        self.future = None
+        self.progress = 0.0
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        # El resultado quedó en el store (False si no cabía en él)
+        self.stored = False
+
+    @classmethod
+    def completed(cls, key, value):
+        """Trabajo ya resuelto con un resultado almacenado"""
+        job = cls(key)
+        job.future = Future()
+        job.future.set_result(value)
+        job.progress = 100.0
+        job.started = job.finished = job.submitted
+        job.stored = True
+        return job
+
+    def report(self, pct):
+        self.progress = float(pct)
+
+    def done(self):
+        return self.future.done()
+
+    def failed(self):
+        return self.future.done() and not self.future.cancelled() and self.future.exception() is not None
+
+    def result(self, timeout=None):
+        """Resultado del trabajo (relanza la excepción si falló)"""
+        return self.future.result(timeout)
+
+    @property
+    def seconds(self):
+        """Duración de la ejecución (None si no ha terminado)"""
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+class JobManager:
+    """Registro de trabajos por clave sobre un pool de hilos
+
+    submit() con una clave ya registrada devuelve el trabajo existente (en
+    curso o terminado), de modo que un rerun de la app se engancha al
+    trabajo en vuelo en lugar de reiniciarlo. Los trabajos fallidos se
+    vuelven a lanzar. Es seguro entre hilos y sesiones.
+
+    Con un store (ResultStore), los resultados se guardan en él al terminar
+    y se sirven desde él; el registro solo conserva los trabajos en curso,
+    los fallidos y los que no cabían en el store, de modo que la memoria de
+    los resultados la acotan el store y history.
+    """
+
+    def __init__(self, max_workers=None, history=JOB_HISTORY, store=None):
+        self.max_workers = max_workers or default_workers()
+        self.history = history
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="aiwelllog-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _run(self, job, fn, args, kwargs):
+        job.started = time.time()
+        try:
+            result = fn(*args, progress=job.report, **kwargs)
+            if self.store is not None:
+                result = self.store.freeze(result)
+                job.stored = self.store.put(job.key, result)
+            return result
+        finally:
+            job.finished = time.time()
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Trabajo con esa clave; si no existe (o falló) se lanza fn(*args, progress=..., **kwargs)"""
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(key)
+            if job is not None and not job.failed():
+                self._jobs.move_to_end(key)
+                return job
+            if self.store is not None:
+                stored = self.store.get(key)
+                if stored is not None:
+                    return Job.completed(key, stored)
+            job = Job(key)
+            job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+            self._jobs[key] = job
+            return job
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def _prune(self):
+        finished = [key for key, job in self._jobs.items() if job.done()]
+        if self.store is not None:
+            # Los resultados guardados se sirven desde el store; los que no
+            # cabían en él siguen en el registro (acotado por history)
+            for key in [key for key in finished if self._jobs[key].stored]:
+                del self._jobs[key]
+            finished = [key for key in finished if key in self._jobs]
+        for key in finished[:max(len(finished) - self.history, 0)]:
+            del self._jobs[key]
+
+    def stats(self):
+        """Trabajos registrados, en curso y en cola"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        running = sum(1 for job in jobs if job.started is not None and not job.done())
+        pending = sum(1 for job in jobs if job.started is None)
+        return {'jobs': len(jobs), 'running': running, 'pending': pending, 'workers': self.max_workers}
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,248 @@
+# ==========================================================
+# MÓDULO: LECTURA DE LAS CON PROYECCIÓN DE COLUMNAS
+# ==========================================================
+import io
+import re
+import numpy as np
+import pandas as pd
+
+from .petrofisica import DEPTH_ALIASES, CURVE_ALIASES
+from .curve_stats import CurveStats
+
+
+_ASCII_SECTION = re.compile(rb'(?im)^[ \t]*~A[^\r\n]*\r?\n')
+
+
+def _decode(raw_bytes):
+    """Texto del LAS; se pasa a lasio siempre en StringIO, porque una cadena
+    que no parece LAS la interpreta como ruta de archivo"""
+    try:
+        return raw_bytes.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw_bytes.decode('latin-1')
+
+
+def supports_projection(las):
+    """True si la sección ~A puede leerse por columnas (WRAP NO, LAS 2.0, espacios)"""
+    version = las.version
+    wrap = str(version['WRAP'].value).strip().upper() if 'WRAP' in version else 'NO'
+    vers = str(version['VERS'].value).strip() if 'VERS' in version else '2.0'
+    dlm = str(version['DLM'].value).strip().upper() if 'DLM' in version else 'SPACE'
+    return wrap == 'NO' and not vers.startswith('3') and dlm in ('SPACE', '') and len(las.curves) > 0
+
+
+def null_value(las):
+    """Valor NULL declarado en ~W (None si no hay)"""
+    if 'NULL' not in las.well:
+        return None
+    try:
+        return float(las.well['NULL'].value)
+    except (TypeError, ValueError):
+        return None
+
+
+def pipeline_columns(curve_names, depth_aliases=DEPTH_ALIASES, curve_aliases=CURVE_ALIASES):
+    """Columnas que usa el flujo: índice, profundidad y el primer alias de cada curva estándar"""
+    available = set(curve_names)
+    needed = {curve_names[0]}
+    for alias in depth_aliases:
+        if alias in available:
+            needed.add(alias)
+            break
+    for aliases in curve_aliases.values():
+        for alias in aliases:
+            if alias in available:
+                needed.add(alias)
+                break
+    return [n for n in curve_names if n in needed]
+
+
+class LasSource:
+    """Archivo LAS con lectura de columnas bajo demanda
+
+    Los encabezados (~V, ~W, ~C, ~P, ~O) se leen con lasio sin decodificar los
+    datos. Las columnas de ~A se decodifican solo cuando se piden y quedan en
+    caché. Los archivos que no admiten proyección (WRAP YES, LAS 3.0 o sin
+    sección ~A reconocible) se leen completos con lasio.
+
+    Las estadísticas de cada columna (column_stats) se calculan una vez y
+    quedan en caché con el archivo.
+    """
+
+    def __init__(self, raw_bytes):
+        import lasio
+
+        self._raw = bytes(raw_bytes)
+        self._columns = {}
+        self._full_df = None
+        self.projected = False
+
+        match = _ASCII_SECTION.search(self._raw)
+        if match is not None:
+            header_text = _decode(self._raw[:match.start()])
+            self.las = lasio.read(io.StringIO(header_text), ignore_data=True, ignore_header_errors=True)
+            self._data_offset = match.end()
+            self.projected = supports_projection(self.las)
+
+        if not self.projected:
+            self._load_full()
+
+        self.curve_names = [curve.mnemonic for curve in self.las.curves]
+        self.null_value = null_value(self.las)
+        self.stats = CurveStats(depth_col=self.curve_names[0] if self.curve_names else None)
+
+    def _load_full(self):
+        import lasio
+
+        self.las = lasio.read(io.StringIO(_decode(self._raw)), ignore_header_errors=True)
+        self._full_df = self.las.df().reset_index()
+        self.projected = False
+
+    def read_columns(self, names):
+        """Devuelve un DataFrame con las columnas pedidas (en el orden del archivo)"""
+        wanted = set(names)
+        names = [n for n in self.curve_names if n in wanted]
+        if self._full_df is None:
+            self._decode_pending(names)
+        if self._full_df is not None:
+            return self._full_df[names].copy()
+        return pd.DataFrame({n: self._columns[n] for n in names})
+
+    def _decode_pending(self, names):
+        pending = [n for n in names if n not in self._columns]
+        if not pending:
+            return
+        positions = [self.curve_names.index(n) for n in pending]
+        buffer = io.BytesIO(self._raw)
+        buffer.seek(self._data_offset)
+        try:
+            data = pd.read_csv(
+                buffer, sep=r'\s+', header=None, usecols=positions,
+                dtype=np.float64, engine='c', encoding='latin-1', comment='#'
+            )
+        except (ValueError, pd.errors.ParserError):
+            # Filas irregulares o valores no numéricos: lectura completa con lasio
+            self._load_full()
+            return
+        for name, position in zip(pending, positions):
+            values = data[position].to_numpy(copy=True)
+            if self.null_value is not None:
+                values[values == self.null_value] = np.nan
+            self._columns[name] = values
+
+    def read_rows(self, names, offset=0, limit=100):
+        """Filas [offset, offset + limit) de las columnas pedidas, sin copiar las columnas completas"""
+        wanted = set(names)
+        names = [n for n in self.curve_names if n in wanted]
+        if self._full_df is None:
+            self._decode_pending(names)
+        if self._full_df is not None:
+            return self._full_df[names].iloc[offset:offset + limit].copy()
+        page = pd.DataFrame({n: self._columns[n][offset:offset + limit] for n in names})
+        page.index += offset
+        return page
+
+    @property
+    def n_rows(self):
+        """Número de muestras del archivo (decodifica la primera columna si hace falta)"""
+        if not self.curve_names:
+            return 0
+        if self._full_df is None:
+            self._decode_pending(self.curve_names[:1])
+        if self._full_df is not None:
+            return len(self._full_df)
+        return len(self._columns[self.curve_names[0]])
+
+    def column_stats(self, names):
+        """CurveStats del archivo con las columnas numéricas pedidas ya calculadas
+
+        Solo se decodifican y recorren las columnas que aún no están en caché.
+        """
+        pending = [n for n in names if n in self.curve_names and n not in self.stats]
+        if pending:
+            df = self.read_columns(pending + [self.curve_names[0]])
+            numeric = [n for n in pending if pd.api.types.is_numeric_dtype(df[n])]
+            self.stats.update(df, numeric)
+        return self.stats
+
+    @property
+    def nbytes(self):
+        """Bytes del archivo crudo más las columnas ya decodificadas"""
+        size = len(self._raw) + sum(values.nbytes for values in self._columns.values())
+        if self._full_df is not None:
+            size += int(self._full_df.memory_usage(index=True).sum())
+        return size
+
+    def read_all(self):
+        """DataFrame con todas las curvas del archivo"""
+        return self.read_columns(self.curve_names)
+
+    def pipeline_columns(self, depth_aliases=DEPTH_ALIASES, curve_aliases=CURVE_ALIASES):
+        """Columnas que usa el flujo: índice, profundidad y el primer alias de cada curva estándar"""
+        return pipeline_columns(self.curve_names, depth_aliases, curve_aliases)
+
+
+def read_las_projected(raw_bytes, depth_aliases=DEPTH_ALIASES, curve_aliases=CURVE_ALIASES):
+    """Lee un LAS decodificando solo las columnas que usa el flujo petrofísico
+
+    Returns:
+        (LasSource para cargar columnas adicionales bajo demanda, DataFrame proyectado)
+    """
+    source = LasSource(raw_bytes)
+    df = source.read_columns(source.pipeline_columns(depth_aliases, curve_aliases))
+    return source, df
+
+
+def read_las_header(path):
+    """Lee solo los encabezados de un LAS en disco, sin cargar la sección ~A
+
+    Returns:
+        (LASFile sin datos, posición en bytes del inicio de los datos)
+    """
+    import lasio
+
+    header = []
+    offset = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            offset += len(line)
+            if _ASCII_SECTION.match(line):
+                las = lasio.read(io.StringIO(_decode(b''.join(header))), ignore_data=True, ignore_header_errors=True)
+                return las, offset
+            header.append(line)
+    raise ValueError(f"{path}: no se encontró la sección ~A")
+
+
+def iter_las_chunks(path, names=None, chunk_rows=262144):
+    """Recorre la sección ~A de un LAS en disco por bloques de filas
+
+    Solo se decodifican las columnas pedidas; la memoria usada es la de un bloque.
+
+    Yields:
+        DataFrame (float64, NULL como NaN) con las columnas pedidas
+    """
+    las, offset = read_las_header(path)
+    if not supports_projection(las):
+        raise ValueError(f"{path}: formato no admite lectura por bloques (WRAP, LAS 3.0 o delimitador)")
+
+    curve_names = [curve.mnemonic for curve in las.curves]
+    if names is not None:
+        wanted = set(names)
+        names = [n for n in curve_names if n in wanted]
+    else:
+        names = curve_names
+    positions = [curve_names.index(n) for n in names]
+    null = null_value(las)
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        reader = pd.read_csv(
+            f, sep=r'\s+', header=None, usecols=positions, dtype=np.float64,
+            engine='c', encoding='latin-1', comment='#', chunksize=chunk_rows
+        )
+        for chunk in reader:
+            chunk = chunk[positions]
+            chunk.columns = names
+            if null is not None:
+                chunk = chunk.mask(chunk == null)
+            yield chunk
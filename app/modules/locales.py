@@ -0,0 +1,32 @@
+# ==========================================================
+# MÓDULO: TEXTOS DE LA INTERFAZ (UN JSON POR IDIOMA, CARGA PEREZOSA)
+# ==========================================================
+import json
+import os
+from functools import lru_cache
+from types import MappingProxyType
+
+
+# app/locales/<idioma>.json
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'locales')
+
+# Idioma de respaldo para las claves que faltan en otro idioma
+DEFAULT_LANGUAGE = 'es'
+
+
+@lru_cache(maxsize=None)
+def load_texts(language):
+    """Textos de un idioma, leídos del disco la primera vez que se piden (vacío si no existe)"""
+    path = os.path.join(LOCALES_DIR, f'{language}.json')
+    if not os.path.exists(path):
+        return MappingProxyType({})
+    with open(path, encoding='utf-8') as f:
+        return MappingProxyType(json.load(f))
+
+
+def translate(language, key):
+    """Texto de key en el idioma; si falta, el de DEFAULT_LANGUAGE o la propia clave"""
+    texts = load_texts(language)
+    if key in texts:
+        return texts[key]
+    return load_texts(DEFAULT_LANGUAGE).get(key, key)
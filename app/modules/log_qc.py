@@ -0,0 +1,248 @@
+# ==========================================================
+# MÓDULO: CONTROL DE CALIDAD DE REGISTROS (BANDERAS POR BITS)
+# ==========================================================
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .petrofisica import QC_RANGES
+from .curve_stats import row_slices
+
+
+# Bits de cada verificación (bits 0-3 de QC_FLAGS)
+QC_CHECKS = {'RANGE': 1, 'SPIKE': 2, 'STUCK': 4, 'WASHOUT': 8}
+
+# Curvas evaluadas; la curva i marca el bit 4 + i de QC_FLAGS
+QC_CURVES = ('GR', 'RHOB', 'NPHI', 'RT', 'PEF', 'DT', 'CALI')
+QC_CURVE_BITS = {curve: 1 << (4 + i) for i, curve in enumerate(QC_CURVES)}
+
+# Curvas que se evalúan en escala logarítmica (picos y valores repetidos)
+QC_LOG_CURVES = ('RT',)
+
+# Picos: |x − mediana| > QC_SPIKE_THRESHOLD · 1.4826 · MAD en una ventana móvil
+QC_SPIKE_WINDOW = 11
+QC_SPIKE_THRESHOLD = 5.0
+# Escala mínima del pico como fracción del rango válido (evita MAD = 0 en tramos planos)
+QC_SPIKE_FLOOR = 0.01
+
+# Muestras consecutivas idénticas a partir de las cuales la curva se considera trabada
+QC_STUCK_SAMPLES = 15
+
+# Derrumbe: CALI − BS por encima de este valor (pulgadas) afecta a las curvas de patín
+QC_WASHOUT_IN = 2.0
+QC_WASHOUT_CURVES = ('RHOB', 'NPHI', 'PEF')
+
+# Filas por bloque en la mediana móvil (acota la memoria de las ventanas)
+QC_CHUNK_ROWS = 32768
+
+QC_SUMMARY_COLUMNS = ['CURVE', 'SAMPLES', *QC_CHECKS, 'FLAGGED', 'FLAGGED_PCT']
+
+
+def _qc_matrix(df, curves):
+    """Matriz (muestras × curvas) float64; log10 en QC_LOG_CURVES y rangos en la misma escala"""
+    n = len(df)
+    x = np.full((n, len(curves)), np.nan)
+    lo = np.array([QC_RANGES[c][0] for c in curves], dtype=np.float64)
+    hi = np.array([QC_RANGES[c][1] for c in curves], dtype=np.float64)
+    for j, curve in enumerate(curves):
+        if curve in df.columns:
+            x[:, j] = df[curve].to_numpy(dtype=np.float64)
+    log = np.array([c in QC_LOG_CURVES for c in curves], dtype=bool)
+    return x, lo, hi, log
+
+
+def out_of_range(x, lo, hi):
+    """Regla RANGE: muestras fuera de [lo, hi] (los NaN no se marcan)"""
+    with np.errstate(invalid='ignore'):
+        return (x < lo) | (x > hi)
+
+
+def _rolling_median_mad(x, window, chunk_rows=QC_CHUNK_ROWS):
+    """Mediana y MAD móviles por columna con ventanas por strides
+
+    Los bordes se completan por reflexión. Las ventanas con algún NaN dan
+    NaN. La MAD se calcula reutilizando el arreglo ya particionado.
+    """
+    n = len(x)
+    half = window // 2
+    med = np.full(x.shape, np.nan)
+    mad = np.full(x.shape, np.nan)
+    if n <= half:
+        return med, mad
+    padded = np.pad(x, ((half, half), (0, 0)), mode='reflect')
+    views = sliding_window_view(padded, window, axis=0)
+    nan_count = np.concatenate((np.zeros((1, x.shape[1])), np.cumsum(np.isnan(padded), axis=0)))
+    has_nan = (nan_count[window:] - nan_count[:-window]) > 0
+    for start in range(0, n, chunk_rows):
+        stop = min(start + chunk_rows, n)
+        part = np.partition(views[start:stop], half, axis=-1)
+        center = part[..., half].copy()
+        np.abs(part - center[..., None], out=part)
+        med[start:stop] = center
+        mad[start:stop] = np.partition(part, half, axis=-1)[..., half]
+    med[has_nan] = np.nan
+    mad[has_nan] = np.nan
+    return med, mad
+
+
+def _stuck_runs(x, min_samples):
+    """Muestras en tramos de al menos min_samples valores idénticos consecutivos (por columna)"""
+    n, k = x.shape
+    if n == 0:
+        return np.zeros(x.shape, dtype=bool)
+    change = np.ones((k, n), dtype=bool)
+    change[:, 1:] = x.T[:, 1:] != x.T[:, :-1]
+    run_id = np.cumsum(change.ravel()) - 1
+    lengths = np.bincount(run_id)
+    return (lengths[run_id].reshape(k, n) >= min_samples).T & ~np.isnan(x)
+
+
+class LogQC:
+    """Banderas de control de calidad de un pozo
+
+    flags es una matriz (muestras × curvas) uint8 con los bits de QC_CHECKS
+    de cada curva; sample_flags() la resume en un uint16 por muestra.
+    """
+
+    def __init__(self, curves, flags, valid, washout_checked):
+        self.curves = list(curves)
+        self.flags = flags
+        self.valid = valid
+        self.washout_checked = washout_checked
+
+    def sample_flags(self):
+        """QC_FLAGS por muestra: bits de verificación (0-3) y de curva (4+)"""
+        out = np.bitwise_or.reduce(self.flags, axis=1).astype(np.uint16) if self.curves else \
+            np.zeros(len(self.flags), dtype=np.uint16)
+        for j, curve in enumerate(self.curves):
+            out[self.flags[:, j] != 0] |= QC_CURVE_BITS[curve]
+        return out
+
+    def bad(self, curve, checks=tuple(QC_CHECKS)):
+        """Máscara de muestras de la curva con alguna de las verificaciones indicadas"""
+        bits = sum(QC_CHECKS[c] for c in checks)
+        return (self.flags[:, self.curves.index(curve)] & bits) != 0
+
+    def summary(self):
+        """Muestras con dato y marcadas por verificación de cada curva"""
+        rows = []
+        for j, curve in enumerate(self.curves):
+            column = self.flags[:, j]
+            samples = int(self.valid[:, j].sum())
+            flagged = int((column != 0).sum())
+            rows.append({
+                'CURVE': curve,
+                'SAMPLES': samples,
+                **{check: int(((column & bit) != 0).sum()) for check, bit in QC_CHECKS.items()},
+                'FLAGGED': flagged,
+                'FLAGGED_PCT': 100.0 * flagged / samples if samples else 0.0,
+            })
+        return pd.DataFrame(rows, columns=QC_SUMMARY_COLUMNS)
+
+
+def evaluate_qc(df, curves=QC_CURVES, spike_window=QC_SPIKE_WINDOW, spike_threshold=QC_SPIKE_THRESHOLD,
+                stuck_samples=QC_STUCK_SAMPLES, washout_in=QC_WASHOUT_IN):
+    """Evalúa todas las curvas a la vez (matriz muestras × curvas)
+
+    - RANGE: fuera de QC_RANGES (out_of_range; los límites son válidos);
+    - SPIKE: desviación respecto a la mediana móvil mayor que
+      spike_threshold MAD escaladas (con un mínimo de QC_SPIKE_FLOOR del rango);
+    - STUCK: tramos de stuck_samples o más valores idénticos;
+    - WASHOUT: CALI − BS > washout_in en QC_WASHOUT_CURVES (solo si hay CALI y BS).
+
+    Las curvas ausentes o sin datos no se evalúan.
+
+    Returns:
+        LogQC
+    """
+    curves = [c for c in curves if c in df.columns and df[c].notna().any()]
+    washout_checked = all(c in df.columns and df[c].notna().any() for c in ('CALI', 'BS'))
+    return _evaluate(df, curves, washout_checked, spike_window, spike_threshold, stuck_samples, washout_in)
+
+
+def _evaluate(df, curves, washout_checked, spike_window, spike_threshold, stuck_samples, washout_in):
+    """Banderas de las curvas indicadas (las decisiones de pozo completo se pasan ya tomadas)"""
+    x, lo, hi, log = _qc_matrix(df, curves)
+    valid = ~np.isnan(x)
+    flags = np.zeros(x.shape, dtype=np.uint8)
+
+    flags[out_of_range(x, lo, hi)] |= QC_CHECKS['RANGE']
+
+    # Picos y valores repetidos en escala logarítmica para las curvas de resistividad
+    if log.any():
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x[:, log] = np.where(x[:, log] > 0, np.log10(x[:, log]), np.nan)
+            lo[log], hi[log] = np.log10(lo[log]), np.log10(hi[log])
+
+    if spike_window > 1 and len(x) > spike_window:
+        med, mad = _rolling_median_mad(x, spike_window | 1)
+        scale = np.maximum(1.4826 * mad, QC_SPIKE_FLOOR * (hi - lo))
+        with np.errstate(invalid='ignore'):
+            flags[np.abs(x - med) > spike_threshold * scale] |= QC_CHECKS['SPIKE']
+
+    flags[_stuck_runs(x, stuck_samples)] |= QC_CHECKS['STUCK']
+
+    if washout_checked:
+        with np.errstate(invalid='ignore'):
+            washout = (df['CALI'].to_numpy(dtype=np.float64) - df['BS'].to_numpy(dtype=np.float64)) > washout_in
+        for j, curve in enumerate(curves):
+            if curve in QC_WASHOUT_CURVES:
+                flags[washout & valid[:, j], j] |= QC_CHECKS['WASHOUT']
+
+    return LogQC(curves, flags, valid, washout_checked)
+
+
+def iter_qc_chunks(columns, length, spike_window=QC_SPIKE_WINDOW, spike_threshold=QC_SPIKE_THRESHOLD,
+                   stuck_samples=QC_STUCK_SAMPLES, washout_in=QC_WASHOUT_IN, chunk_rows=QC_CHUNK_ROWS):
+    """evaluate_qc por tramos de filas sobre arreglos 1-D (p. ej. curvas mapeadas en memoria)
+
+    Cada tramo se evalúa con un halo de max(semiventana de picos,
+    stuck_samples - 1) filas a cada lado, así que sus banderas son idénticas
+    a las de evaluar el pozo completo.
+
+    Args:
+        columns: dict {curva: arreglo} con las curvas de QC_CURVES, CALI y BS disponibles
+        length: Muestras del pozo
+
+    Yields:
+        (slice del tramo, LogQC del tramo)
+    """
+    def has_data(name):
+        values = columns.get(name)
+        return values is not None and any(np.any(~np.isnan(values[sl])) for sl in row_slices(length, chunk_rows))
+
+    curves = [c for c in QC_CURVES if has_data(c)]
+    washout_checked = has_data('CALI') and has_data('BS')
+    names = [c for c in columns if c in curves or (washout_checked and c in ('CALI', 'BS'))]
+    halo = max((spike_window | 1) // 2, stuck_samples - 1)
+    for sl in row_slices(length, chunk_rows):
+        lo, hi = max(sl.start - halo, 0), min(sl.stop + halo, length)
+        frame = pd.DataFrame({name: np.asarray(columns[name][lo:hi]) for name in names})
+        qc = _evaluate(frame, curves, washout_checked, spike_window, spike_threshold, stuck_samples, washout_in)
+        core = slice(sl.start - lo, sl.stop - lo)
+        yield sl, LogQC(curves, qc.flags[core], qc.valid[core], washout_checked)
+
+
+def merge_qc_summaries(summaries):
+    """Suma los resúmenes (LogQC.summary) de varios tramos del mismo pozo"""
+    summaries = [s for s in summaries if len(s)]
+    if not summaries:
+        return pd.DataFrame(columns=QC_SUMMARY_COLUMNS)
+    counts = ['SAMPLES', *QC_CHECKS, 'FLAGGED']
+    total = pd.concat(summaries).groupby('CURVE', sort=False)[counts].sum().reset_index()
+    samples = total['SAMPLES'].to_numpy(dtype=np.float64)
+    total['FLAGGED_PCT'] = np.divide(100.0 * total['FLAGGED'].to_numpy(dtype=np.float64), samples,
+                                     out=np.zeros(len(total)), where=samples > 0)
+    return total[QC_SUMMARY_COLUMNS]
+
+
+def mask_flagged(df, qc, checks=tuple(QC_CHECKS)):
+    """Pone en NaN las muestras marcadas de cada curva evaluada (sin modificar df)"""
+    masked = {}
+    for curve in qc.curves:
+        bad = qc.bad(curve, checks)
+        if bad.any():
+            values = df[curve].to_numpy(copy=True)
+            values[bad] = np.nan
+            masked[curve] = values
+    return df.assign(**masked) if masked else df
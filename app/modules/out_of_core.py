@@ -0,0 +1,587 @@
+# ==========================================================
+# MÓDULO: PROCESAMIENTO FUERA DE MEMORIA (MEMMAP POR TRAMOS)
+# ==========================================================
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from .petrofisica import DEPTH_ALIASES, CURVE_ALIASES, SMOOTHED_CURVES, SW_MODEL_COLUMNS, smooth_array
+from .curve_stats import CurveStats, row_slices
+from .depth_matching import (
+    DEPTH_MATCH_COLUMNS, DEPTH_MATCH_CURVES, DEPTH_MATCH_LOG_CURVES, DEPTH_MATCH_MIN_CORR, DEPTH_MATCH_MODES,
+    estimate_shift_chunked, shift_plan, shift_profile
+)
+from .log_qc import QC_CURVE_BITS, QC_CURVES, iter_qc_chunks, merge_qc_summaries
+from .pay_zones import (
+    ZONE_AVERAGE_CURVES, extract_pay_zones_chunked, pay_in_zones, pay_summary, sample_edges_at, zone_rows
+)
+from .pipeline import (
+    STATS_CURVES, SUMMARY_CURVES, default_pipeline_config, matrix_parameters, stage_parameters, compute_stages,
+    effective_config, vsh_source, well_name_from_file
+)
+from .resampling import DepthGrid, interpolate_at
+from .data_export import EXPORT_COLUMNS, export_pay_zones_csv_bytes, write_npz_results, write_results_csv
+from .export_cache import file_fingerprint
+from .well_model import CURVE_DTYPE, STAGE_INPUT_CURVES, litho_from_codes
+from .las_ingest import read_las_header, iter_las_chunks, pipeline_columns, supports_projection
+
+
+# Filas por tramo (acota la memoria de trabajo de cada etapa)
+OUT_OF_CORE_CHUNK_ROWS = 262144
+
+# Suavizado por defecto (mismos valores que la app)
+SMOOTH_METHOD = 'median'
+SMOOTH_WINDOW = 5
+SMOOTH_MIN_VALID = 10
+
+# Tipo de almacenamiento de cada resultado
+RESULT_DTYPES = {
+    'VSH': CURVE_DTYPE, 'PHI_T': CURVE_DTYPE, 'PHI_E': CURVE_DTYPE, 'SW': CURVE_DTYPE,
+    **{column: CURVE_DTYPE for column in SW_MODEL_COLUMNS},
+    'PERM': CURVE_DTYPE, 'RHO_MATRIX': CURVE_DTYPE, 'LITOLOGIA': np.int8, 'IS_PAY': np.bool_,
+}
+
+# Entregables que se escriben directamente desde el store (el resto necesita el pozo en memoria)
+STORE_OUTPUT_FORMATS = ('csv', 'npz')
+
+
+class CurveStore:
+    """Curvas de un pozo en archivos .npy mapeados en memoria (uno por curva)
+
+    DEPTH_FT se guarda en float64 y el resto de curvas en CURVE_DTYPE. Los
+    metadatos del pozo (longitud, mapeo de curvas, encabezado) van en meta.json.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, name):
+        return os.path.join(self.directory, f'{name}.npy')
+
+    def __contains__(self, name):
+        return os.path.exists(self.path(name))
+
+    def names(self):
+        return sorted(f[:-4] for f in os.listdir(self.directory)
+                      if f.endswith('.npy') and not f.startswith('_'))
+
+    def create(self, name, length, dtype=CURVE_DTYPE):
+        """Crea una curva vacía mapeada en escritura"""
+        return np.lib.format.open_memmap(self.path(name), mode='w+', dtype=dtype, shape=(length,))
+
+    def open(self, name, mode='r'):
+        return np.load(self.path(name), mmap_mode=mode)
+
+    def remove(self, name):
+        if name in self:
+            os.remove(self.path(name))
+
+    def replace(self, name, temporary):
+        """Sustituye la curva name por la curva temporary (renombrando el archivo)"""
+        os.replace(self.path(temporary), self.path(name))
+
+    @property
+    def meta(self):
+        meta_path = os.path.join(self.directory, 'meta.json')
+        if not os.path.exists(meta_path):
+            return {}
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def update_meta(self, **values):
+        meta = self.meta
+        meta.update(values)
+        with open(os.path.join(self.directory, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, default=float, indent=1)
+
+    @property
+    def length(self):
+        return int(self.meta.get('length', 0))
+
+    def read(self, names, rows=slice(None)):
+        """Tramo de curvas como DataFrame (LITOLOGIA como categórica)"""
+        columns = {}
+        for name in names:
+            if name not in self:
+                continue
+            values = np.array(self.open(name)[rows])
+            columns[name] = litho_from_codes(values) if name == 'LITOLOGIA' else values
+        return pd.DataFrame(columns)
+
+
+def supports_out_of_core(path):
+    """True si el LAS puede leerse por bloques (ni WRAP, ni LAS 3.0, ni delimitador)"""
+    las, _ = read_las_header(path)
+    return supports_projection(las)
+
+
+# ----------------------------------------------------------
+# Ingesta
+# ----------------------------------------------------------
+def _depth_selection(depth, chunk_rows):
+    """Orden de las muestras tras limpiar la profundidad (reglas de clean_depth_data)
+
+    Si la profundidad es no decreciente, la selección se calcula por tramos y
+    conserva el orden del archivo. En otro caso se ordena la profundidad
+    completa (único paso que necesita un arreglo del largo del pozo).
+    """
+    monotonic = True
+    last = -np.inf
+    for sl in row_slices(len(depth), chunk_rows):
+        d = depth[sl]
+        d = d[~np.isnan(d)]
+        if len(d) and (d[0] < last or np.any(np.diff(d) < 0)):
+            monotonic = False
+            break
+        if len(d):
+            last = d[-1]
+
+    if not monotonic:
+        valid = np.flatnonzero(~np.isnan(depth))
+        order = valid[np.argsort(depth[valid], kind='stable')]
+        ordered = depth[order]
+        keep = np.ones(len(order), dtype=bool)
+        keep[1:] = ordered[1:] != ordered[:-1]
+        return order[keep]
+
+    pieces = []
+    previous = np.nan
+    for sl in row_slices(len(depth), chunk_rows):
+        d = depth[sl]
+        keep = ~np.isnan(d)
+        shifted = np.concatenate(([previous], d[:-1]))
+        # Duplicados consecutivos (ignorando NaN intermedios)
+        prev_valid = pd.Series(shifted).ffill().to_numpy()
+        keep &= d != prev_valid
+        pieces.append(np.flatnonzero(keep) + sl.start)
+        valid = d[~np.isnan(d)]
+        if len(valid):
+            previous = valid[-1]
+    return np.concatenate(pieces) if pieces else np.empty(0, dtype=np.int64)
+
+
+def ingest_las(path, store, depth_aliases=DEPTH_ALIASES, curve_aliases=CURVE_ALIASES,
+               chunk_rows=OUT_OF_CORE_CHUNK_ROWS, dtype=CURVE_DTYPE):
+    """Vuelca un LAS en disco a un CurveStore leyendo la sección ~A por tramos
+
+    Solo se decodifican la profundidad y el primer alias de cada curva estándar;
+    las estándar ausentes se crean vacías (NaN). La profundidad se limpia con las reglas de clean_depth_data (nulos,
+    duplicados y orden).
+
+    Args:
+        dtype: Tipo de las curvas (float64 si luego se remuestrean, como en process_well)
+
+    Returns:
+        dict {nombre estándar: columna original}
+    """
+    las, _ = read_las_header(path)
+    curve_names = [curve.mnemonic for curve in las.curves]
+    columns = pipeline_columns(curve_names, depth_aliases, curve_aliases)
+    depth_col = next((a for a in depth_aliases if a in columns), curve_names[0])
+
+    available_curves = {}
+    for standard_name, aliases in curve_aliases.items():
+        alias = next((a for a in aliases if a in columns), None)
+        if alias is not None:
+            available_curves[standard_name] = alias
+
+    # Paso 1: columnas crudas a archivos binarios temporales
+    raw_names = ['DEPTH_FT'] + list(available_curves)
+    raw_source = [depth_col] + list(available_curves.values())
+    raw_dtypes = [np.float64] + [dtype] * len(available_curves)
+    raw_paths = [os.path.join(store.directory, f'_raw_{name}.bin') for name in raw_names]
+    handles = [open(p, 'wb') for p in raw_paths]
+    length = 0
+    try:
+        for chunk in iter_las_chunks(path, set(raw_source), chunk_rows):
+            for handle, source, dtype in zip(handles, raw_source, raw_dtypes):
+                chunk[source].to_numpy(dtype=dtype).tofile(handle)
+            length += len(chunk)
+    finally:
+        for handle in handles:
+            handle.close()
+
+    # Paso 2: limpieza de profundidad y copia a .npy en el orden final
+    try:
+        raw = {name: np.memmap(p, dtype=dtype, mode='r', shape=(length,))
+               for name, p, dtype in zip(raw_names, raw_paths, raw_dtypes)} if length else {}
+        order = _depth_selection(raw['DEPTH_FT'], chunk_rows) if length else np.empty(0, dtype=np.int64)
+        for name, dtype in zip(raw_names, raw_dtypes):
+            out = store.create(name, len(order), dtype)
+            for sl in row_slices(len(order), chunk_rows):
+                out[sl] = raw[name][order[sl]]
+            out.flush()
+            del out
+        raw.clear()
+    finally:
+        for p in raw_paths:
+            if os.path.exists(p):
+                os.remove(p)
+
+    # Curvas estándar ausentes, vacías (como map_standard_curves)
+    for name in curve_aliases:
+        if name not in available_curves:
+            out = store.create(name, len(order), dtype)
+            for sl in row_slices(len(order), chunk_rows):
+                out[sl] = np.nan
+            out.flush()
+            del out
+
+    header = {item.mnemonic: str(item.value).strip() for item in las.well}
+    store.update_meta(length=int(len(order)), source=os.path.abspath(path), original_columns=len(curve_names),
+                      curve_mapping=available_curves, header=header)
+    return available_curves
+
+
+def _bracket_rows(depth, targets):
+    """Filas de depth que rodean a todas las profundidades objetivo (para interpolate_at)"""
+    lo = max(int(np.searchsorted(depth, targets.min())) - 1, 0)
+    hi = min(int(np.searchsorted(depth, targets.max())) + 1, len(depth))
+    return slice(lo, hi)
+
+
+def resample_store(store, step, anchor=0.0, chunk_rows=OUT_OF_CORE_CHUNK_ROWS):
+    """resample_well sobre un CurveStore: todas las curvas a la malla de paso step, por tramos de la malla
+
+    Las curvas se interpolan en float64 y se guardan en CURVE_DTYPE.
+
+    Returns:
+        True si se remuestreó (hace falta step y al menos dos muestras)
+    """
+    depth = store.open('DEPTH_FT')
+    if not step or len(depth) < 2:
+        return False
+    grid = DepthGrid.covering(depth[0], depth[-1], step, anchor)
+    names = [name for name in store.names() if name != 'DEPTH_FT']
+    sources = {name: store.open(name) for name in names}
+    outputs = {name: store.create(f'_resampled_{name}', grid.size) for name in names}
+    new_depth = store.create('_resampled_DEPTH_FT', grid.size, np.float64)
+    for sl in row_slices(grid.size, chunk_rows):
+        targets = grid.start + grid.step * np.arange(sl.start, sl.stop)
+        rows = _bracket_rows(depth, targets)
+        local_depth = np.asarray(depth[rows], dtype=np.float64)
+        new_depth[sl] = targets
+        for name in names:
+            outputs[name][sl] = interpolate_at(local_depth, sources[name][rows], targets)
+    for out in (new_depth, *outputs.values()):
+        out.flush()
+    del depth, sources, outputs, new_depth
+    for name in ['DEPTH_FT', *names]:
+        store.replace(name, f'_resampled_{name}')
+    store.update_meta(length=grid.size)
+    return True
+
+
+
+# ----------------------------------------------------------
+# Etapas por tramos
+# ----------------------------------------------------------
+def smooth_store_curves(store, names=SMOOTHED_CURVES, method=SMOOTH_METHOD, window=SMOOTH_WINDOW,
+                        chunk_rows=OUT_OF_CORE_CHUNK_ROWS):
+    """smooth_curves aplicado por tramos de filas con halo
+
+    El filtro de cada muestra solo depende de las window // 2 muestras vecinas
+    de su mismo tramo sin NaN, así que cada bloque se filtra con window // 2
+    filas originales a cada lado y el resultado es idéntico al de filtrar la
+    curva completa. Las curvas se filtran juntas en cada bloque.
+
+    Returns:
+        Lista de curvas suavizadas
+    """
+    windows = {}
+    for name in names:
+        w = window.get(name, 1) if isinstance(window, dict) else window
+        windows[name] = w + 1 if w > 1 and w % 2 == 0 else w
+    curves = {}
+    for name in names:
+        if name not in store or windows[name] <= 1:
+            continue
+        curve = store.open(name, mode='r+')
+        n_valid = sum(int(np.count_nonzero(~np.isnan(curve[sl]))) for sl in row_slices(len(curve), chunk_rows))
+        if n_valid > SMOOTH_MIN_VALID:
+            curves[name] = curve
+    if not curves:
+        return []
+
+    names = list(curves)
+    window_list = [windows[name] for name in names]
+    halo = max(window_list) // 2
+    length = store.length
+    # Últimas filas originales del bloque anterior (ya sobrescrito en disco)
+    carry = np.empty((0, len(names)))
+    for sl in row_slices(length, chunk_rows):
+        size = sl.stop - sl.start
+        ahead = np.column_stack([np.asarray(curves[n][sl.start:min(sl.stop + halo, length)], dtype=np.float64)
+                                 for n in names])
+        smoothed = smooth_array(np.vstack([carry, ahead]), window_list, method)
+        core = smoothed[len(carry):len(carry) + size]
+        for i, name in enumerate(names):
+            curves[name][sl] = core[:, i]
+        carry = ahead[max(size - halo, 0):size]
+
+    for curve in curves.values():
+        curve.flush()
+    return names
+
+
+def _valid_count(store, name, chunk_rows):
+    if name not in store:
+        return 0
+    curve = store.open(name)
+    return sum(int(np.count_nonzero(~np.isnan(curve[sl]))) for sl in row_slices(len(curve), chunk_rows))
+
+
+def depth_match_store(store, reference, curves, mode='bulk', max_shift=None, window=None,
+                      min_corr=DEPTH_MATCH_MIN_CORR, chunk_rows=OUT_OF_CORE_CHUNK_ROWS):
+    """depth_match sobre un CurveStore (estimate_shift_chunked)
+
+    Cada curva desplazada se escribe en un archivo temporal que sustituye al
+    original al terminar, porque la interpolación lee muestras vecinas.
+
+    Returns:
+        Informe DEPTH_MATCH_COLUMNS
+    """
+    rows = []
+    if mode == 'off' or _valid_count(store, reference, chunk_rows) < 4:
+        return pd.DataFrame(rows, columns=DEPTH_MATCH_COLUMNS)
+    if mode not in DEPTH_MATCH_MODES:
+        raise ValueError(f"Modo de ajuste de profundidad desconocido: {mode}")
+
+    depth = store.open('DEPTH_FT')
+    ref_values = store.open(reference)
+    for name in curves:
+        if name == reference or _valid_count(store, name, chunk_rows) < 4:
+            continue
+        values = store.open(name)
+        est = estimate_shift_chunked(depth, ref_values, values, name in DEPTH_MATCH_LOG_CURVES,
+                                     max_shift, window, chunk_rows)
+        row, plan = shift_plan(name, est, mode, min_corr)
+        rows.append(row)
+        if plan is None:
+            continue
+        low, high = np.inf, -np.inf
+        for sl in row_slices(len(depth), chunk_rows):
+            profile = shift_profile(plan, depth[sl])
+            low, high = min(low, profile.min()), max(high, profile.max())
+        row['MIN_SHIFT_FT'], row['MAX_SHIFT_FT'] = float(low), float(high)
+        if low == 0 and high == 0:
+            continue
+        out = store.create(f'_shifted_{name}', len(depth), values.dtype)
+        for sl in row_slices(len(depth), chunk_rows):
+            targets = np.asarray(depth[sl], dtype=np.float64)
+            targets = targets + shift_profile(plan, targets)
+            rows_in = _bracket_rows(depth, targets)
+            out[sl] = interpolate_at(depth[rows_in], values[rows_in], targets)
+        out.flush()
+        del out, values
+        store.replace(name, f'_shifted_{name}')
+    return pd.DataFrame(rows, columns=DEPTH_MATCH_COLUMNS)
+
+
+def qc_store(store, spike_threshold, mask=False, chunk_rows=OUT_OF_CORE_CHUNK_ROWS):
+    """evaluate_qc por tramos: escribe QC_FLAGS y, con mask, pone en NaN las muestras marcadas
+
+    El enmascarado es una segunda pasada sobre QC_FLAGS (los tramos se
+    evalúan con un halo de muestras aún sin enmascarar).
+
+    Returns:
+        (resumen QC_SUMMARY_COLUMNS, washout_checked)
+    """
+    length = store.length
+    columns = {name: store.open(name) for name in (*QC_CURVES, 'CALI', 'BS') if name in store}
+    flags = store.create('QC_FLAGS', length, np.uint16)
+    summaries, curves, washout_checked = [], [], False
+    for sl, qc in iter_qc_chunks(columns, length, spike_threshold=spike_threshold, chunk_rows=chunk_rows):
+        flags[sl] = qc.sample_flags()
+        summaries.append(qc.summary())
+        curves, washout_checked = qc.curves, qc.washout_checked
+    flags.flush()
+
+    if mask:
+        for curve in curves:
+            values = store.open(curve, mode='r+')
+            for sl in row_slices(length, chunk_rows):
+                bad = (flags[sl] & QC_CURVE_BITS[curve]) != 0
+                if bad.any():
+                    part = np.array(values[sl])
+                    part[bad] = np.nan
+                    values[sl] = part
+            values.flush()
+    return merge_qc_summaries(summaries), washout_checked
+
+
+def stage_store(store, params, facies_model=None, chunk_rows=OUT_OF_CORE_CHUNK_ROWS):
+    """compute_stages tramo a tramo; los resultados se escriben en curvas del mismo store"""
+    length = store.length
+    names = list(STAGE_INPUT_CURVES)
+    dtypes = dict(RESULT_DTYPES)
+    if facies_model is not None:
+        from .electrofacies import FACIES_CURVES
+        names += [c for c in FACIES_CURVES if c not in names]
+        dtypes['FACIES'] = np.int8
+    outputs = {name: store.open(name, mode='r+') if name in STAGE_INPUT_CURVES and name in store
+               else store.create(name, length, dtype) for name, dtype in dtypes.items()}
+    for sl in row_slices(length, chunk_rows):
+        stages = compute_stages(store.read(names, sl), params, facies_model)
+        for name, values in stages.items():
+            outputs[name][sl] = values
+    for values in outputs.values():
+        values.flush()
+
+
+def process_store(store, config=None, facies_model=None, chunk_rows=OUT_OF_CORE_CHUNK_ROWS, progress=None):
+    """Flujo de process_well sobre un CurveStore, tramo a tramo
+
+    Mismas etapas y en el mismo orden: remuestreo → ajuste de profundidad →
+    QC → estadísticas → matriz → suavizado → etapas petrofísicas (con
+    electrofacies) → zonas productivas. Las decisiones de pozo completo
+    (matriz, límites de GR, curvas disponibles) salen de CurveStats
+    calculadas por tramos y de las mismas funciones que usa process_well.
+    La memoria de trabajo es la de un tramo más las zonas productivas.
+
+    Args:
+        store: CurveStore con DEPTH_FT y curvas estándar (ingest_las)
+        config: dict de default_pipeline_config (las claves ausentes toman su valor por defecto)
+        facies_model: ElectrofaciesModel ajustado o None
+        chunk_rows: Filas por tramo
+
+    Returns:
+        dict con las claves de process_well salvo las que necesitan el pozo
+        en memoria (df, well_df, source, cutoff_index)
+    """
+    config = {**default_pipeline_config(), **(config or {})}
+    progress = progress or (lambda pct: None)
+
+    samples_before = store.length
+    resampled = resample_store(store, config['RESAMPLE_STEP'], config['RESAMPLE_ANCHOR'], chunk_rows)
+    depth_report = depth_match_store(
+        store, config['DEPTH_MATCH_REFERENCE'], ('GR',) + DEPTH_MATCH_CURVES, config['DEPTH_MATCH_MODE'],
+        config['DEPTH_MATCH_MAX_SHIFT'], config['DEPTH_MATCH_WINDOW'], chunk_rows=chunk_rows
+    )
+    progress(25)
+
+    qc_summary, washout_checked = qc_store(store, config['QC_SPIKE_THRESHOLD'], config['QC_MASK'], chunk_rows)
+    progress(40)
+
+    length = store.length
+    depth = store.open('DEPTH_FT')
+    curve_stats = CurveStats().update_chunks(
+        {c: store.open(c) if c in store else None for c in STATS_CURVES}, depth, chunk_rows=chunk_rows
+    )
+    matrix = matrix_parameters(curve_stats, config)
+
+    smoothed = smooth_store_curves(store, SMOOTHED_CURVES, config['SMOOTHING_METHOD'], config['SMOOTHING_WINDOW'],
+                                   chunk_rows)
+    curve_stats.update_chunks({c: store.open(c) for c in smoothed}, depth, chunk_rows=chunk_rows)
+    progress(55)
+
+    params = stage_parameters(curve_stats, matrix, config)
+    stage_store(store, params, facies_model, chunk_rows)
+    progress(75)
+
+    curve_stats.update_chunks({c: store.open(c) for c in SUMMARY_CURVES}, depth, positive=('PERM',),
+                              chunk_rows=chunk_rows)
+    pay_zones = extract_pay_zones_chunked(
+        depth, store.open('IS_PAY'), {c: store.open(c) for c in ZONE_AVERAGE_CURVES},
+        config['PAY_MIN_THICKNESS'], config['PAY_MERGE_GAP'], chunk_rows
+    )
+    # IS_PAY filtrado por zonas, como en process_well
+    starts, stops = zone_rows(depth, pay_zones)
+    pay = store.open('IS_PAY', mode='r+')
+    for sl in row_slices(length, chunk_rows):
+        pay[sl] = pay_in_zones(pay[sl], starts, stops, sl.start)
+    pay.flush()
+    edges = sample_edges_at(depth, [0, length]) if length else np.zeros(0)
+    progress(90)
+
+    effective = effective_config(params, config)
+    store.update_meta(config=effective)
+    return {
+        'store': store,
+        'samples_before_resample': samples_before,
+        'resampled': resampled,
+        'samples': length,
+        'depth_report': depth_report,
+        'qc_summary': qc_summary,
+        'qc_washout_checked': washout_checked,
+        'curve_stats': curve_stats,
+        'vsh_source': vsh_source(params),
+        'config': effective,
+        'stats': {col: curve_stats.summary(col) for col in SUMMARY_CURVES
+                  if curve_stats[col]['nulls'] < length},
+        'pay_zones': pay_zones,
+        'pay_totals': pay_summary(pay_zones),
+        'interval_ft': float(edges[-1] - edges[0]) if len(edges) else 0.0,
+    }
+
+
+def process_las_out_of_core(path, directory, well_name=None, config=None, facies_model=None,
+                            chunk_rows=OUT_OF_CORE_CHUNK_ROWS, progress=None):
+    """Ingesta y procesamiento completo de un LAS en disco sin cargarlo en memoria
+
+    Returns:
+        dict como el de process_store más well_name, file_fingerprint,
+        original_columns, available_curves y seconds
+    """
+    start = time.perf_counter()
+    progress = progress or (lambda pct: None)
+    store = CurveStore(directory)
+    resample = bool((config or {}).get('RESAMPLE_STEP'))
+    available_curves = ingest_las(path, store, chunk_rows=chunk_rows, dtype=np.float64 if resample else CURVE_DTYPE)
+    progress(10)
+    result = {
+        'well_name': well_name or well_name_from_file(os.path.basename(path)),
+        'file_fingerprint': file_fingerprint(path),
+        'original_columns': store.meta['original_columns'],
+        'available_curves': available_curves,
+        **process_store(store, config, facies_model, chunk_rows, progress),
+    }
+    result['seconds'] = time.perf_counter() - start
+    progress(100)
+    return result
+
+
+# ----------------------------------------------------------
+# Entregables
+# ----------------------------------------------------------
+def write_store_csv(store, path, chunk_rows=OUT_OF_CORE_CHUNK_ROWS):
+    """CSV de resultados (export_csv_bytes) escrito por tramos"""
+    names = [c for c in EXPORT_COLUMNS if c in store]
+    slices = list(row_slices(store.length, chunk_rows)) or [slice(0, 0)]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        write_results_csv(f, (store.read(names, sl) for sl in slices))
+    return path
+
+
+def write_store_npz(store, path, well_name, config=None):
+    """NPZ de resultados (export_npz_bytes) con los arreglos mapeados del store"""
+    write_npz_results(path, {c: store.open(c) for c in EXPORT_COLUMNS if c in store}, well_name, config)
+    return path
+
+
+def write_store_outputs(result, out_dir, formats, chunk_rows=OUT_OF_CORE_CHUNK_ROWS):
+    """Entregables de un resultado de process_las_out_of_core (solo STORE_OUTPUT_FORMATS)
+
+    Returns:
+        (rutas escritas, formatos omitidos)
+    """
+    from .well_outputs import output_name
+
+    store, well_name = result['store'], result['well_name']
+    paths, skipped = [], []
+    for fmt in formats:
+        path = os.path.join(out_dir, output_name(well_name, fmt))
+        if fmt == 'csv':
+            paths.append(write_store_csv(store, path, chunk_rows))
+            zones_path = os.path.join(out_dir, f"{well_name}_pay_zones.csv")
+            with open(zones_path, 'wb') as f:
+                f.write(export_pay_zones_csv_bytes(result['pay_zones']))
+            paths.append(zones_path)
+        elif fmt == 'npz':
+            paths.append(write_store_npz(store, path, well_name, result['config']))
+        else:
+            skipped.append(fmt)
+    return paths, skipped
@@ -0,0 +1,324 @@
+# ==========================================================
+# MÓDULO: ZONAS PRODUCTIVAS (NET PAY POR INTERVALOS)
+# ==========================================================
+import numpy as np
+import pandas as pd
+
+from .curve_stats import STATS_CHUNK_ROWS, row_slices
+
+
+FT_TO_M = 0.3048
+
+# Curvas que se promedian en cada zona (ponderadas por espesor)
+ZONE_AVERAGE_CURVES = ('PHI_E', 'VSH', 'SW', 'PERM')
+
+ZONE_COLUMNS = ['ZONE', 'TOP_FT', 'BASE_FT', 'GROSS_FT', 'NET_FT', 'GROSS_M', 'NET_M', 'NTG', 'SAMPLES',
+                *ZONE_AVERAGE_CURVES]
+
+
+def sample_edges(depth):
+    """Límites de la celda de cada muestra (puntos medios entre vecinas)
+
+    Las muestras extremas usan el paso adyacente. Devuelve len(depth) + 1 valores.
+    """
+    depth = np.asarray(depth, dtype=np.float64)
+    if len(depth) < 2:
+        return np.repeat(depth[:1], len(depth) + 1)
+    edges = np.empty(len(depth) + 1)
+    edges[1:-1] = (depth[1:] + depth[:-1]) / 2
+    edges[0] = depth[0] - (depth[1] - depth[0]) / 2
+    edges[-1] = depth[-1] + (depth[-1] - depth[-2]) / 2
+    return edges
+
+
+def sample_thickness(depth):
+    """Espesor que representa cada muestra
+
+    Con muestreo regular es el paso; con muestreo irregular cada muestra
+    aporta la mitad de la distancia a cada vecina.
+    """
+    return np.diff(sample_edges(depth))
+
+
+def sample_edges_at(depth, idx):
+    """Valores de sample_edges(depth) en los índices idx, leyendo solo las muestras vecinas
+
+    depth puede ser un arreglo mapeado en memoria; el resultado es idéntico al
+    de indexar sample_edges(depth) completo.
+    """
+    idx = np.asarray(idx, dtype=np.intp)
+    n = len(depth)
+    if n < 2:
+        return np.repeat(np.asarray(depth[:1], dtype=np.float64), len(idx))
+    inner = np.clip(idx, 1, n - 1)
+    below = np.asarray(depth[inner - 1], dtype=np.float64)
+    above = np.asarray(depth[inner], dtype=np.float64)
+    edges = (above + below) / 2
+    first, last = np.asarray(depth[[0, 1]], dtype=np.float64), np.asarray(depth[[n - 2, n - 1]], dtype=np.float64)
+    edges[idx == 0] = first[0] - (first[1] - first[0]) / 2
+    edges[idx == n] = last[1] + (last[1] - last[0]) / 2
+    return edges
+
+
+def _run_bounds(mask):
+    """Índices de inicio y fin (exclusivo) de cada racha de True"""
+    padded = np.concatenate(([0], mask.astype(np.int8), [0]))
+    changes = np.diff(padded)
+    return np.flatnonzero(changes == 1), np.flatnonzero(changes == -1)
+
+
+def _segment_sums(values, starts, stops):
+    """Suma de values[start:stop] de cada segmento (np.add.reduceat)"""
+    if len(starts) == 0:
+        return np.zeros(0)
+    # Índices intercalados inicio/fin; el 0 final permite stop == len(values)
+    padded = np.append(values, 0.0)
+    bounds = np.empty(2 * len(starts), dtype=np.intp)
+    bounds[0::2] = starts
+    bounds[1::2] = stops
+    return np.add.reduceat(padded, bounds)[0::2]
+
+
+def _zone_bounds(starts, stops, edges_at, min_thickness, merge_gap, breaks=None):
+    """Une las rachas separadas por hasta merge_gap pies y descarta las de espesor bruto menor que min_thickness
+
+    breaks (opcional) marca entre qué rachas consecutivas no se une nunca.
+
+    Returns:
+        (inicios, fines, topes, bases, espesor bruto) de las zonas que quedan
+    """
+    if len(starts) and merge_gap > 0:
+        gaps = edges_at(starts[1:]) - edges_at(stops[:-1])
+        split = gaps > merge_gap if breaks is None else (gaps > merge_gap) | breaks
+        new_zone = np.concatenate(([True], split))
+        last = np.concatenate((np.flatnonzero(new_zone)[1:] - 1, [len(starts) - 1]))
+        starts, stops = starts[new_zone], stops[last]
+
+    tops, bases = edges_at(starts), edges_at(stops)
+    gross = bases - tops
+    keep = gross >= min_thickness
+    return starts[keep], stops[keep], tops[keep], bases[keep], gross[keep]
+
+
+def _zones_frame(tops, bases, gross, net, samples, averages):
+    zones = {
+        'ZONE': np.arange(1, len(tops) + 1),
+        'TOP_FT': tops,
+        'BASE_FT': bases,
+        'GROSS_FT': gross,
+        'NET_FT': net,
+        'GROSS_M': gross * FT_TO_M,
+        'NET_M': net * FT_TO_M,
+        'NTG': np.divide(net, gross, out=np.zeros_like(net), where=gross > 0),
+        'SAMPLES': samples.astype(np.int64),
+        **averages,
+    }
+    return pd.DataFrame(zones, columns=ZONE_COLUMNS)
+
+
+def _weighted_average(weighted, total):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total > 0, weighted / total, np.nan)
+
+
+def extract_pay_zones(df, min_thickness=0.0, merge_gap=0.0, flag_col='IS_PAY', depth_col='DEPTH_FT'):
+    """Zonas productivas contiguas a partir de la bandera de pay
+
+    Las rachas de muestras pay se detectan por diferencias de la bandera; las
+    zonas separadas por un hueco no productivo de hasta merge_gap pies se
+    unen y luego se descartan las de espesor bruto menor que min_thickness.
+    Los límites de zona son los puntos medios entre muestras.
+
+    Args:
+        df: DataFrame ordenado por profundidad con flag_col
+        min_thickness: Espesor bruto mínimo de una zona (ft)
+        merge_gap: Hueco máximo entre zonas que se unen (ft)
+
+    Returns:
+        DataFrame con una fila por zona (ZONE_COLUMNS): tope, base, espesor
+        bruto y neto en ft y m, relación neto/bruto, muestras pay y promedios
+        de PHI_E, VSH, SW y PERM ponderados por espesor sobre las muestras pay.
+    """
+    if flag_col not in df.columns or len(df) == 0:
+        return pd.DataFrame(columns=ZONE_COLUMNS)
+
+    pay = df[flag_col].to_numpy(dtype=bool)
+    depth = df[depth_col].to_numpy(dtype=np.float64)
+    edges = sample_edges(depth)
+    thickness = np.diff(edges)
+
+    starts, stops = _run_bounds(pay)
+    starts, stops, tops, bases, gross = _zone_bounds(starts, stops, edges.__getitem__, min_thickness, merge_gap)
+
+    pay_thickness = np.where(pay, thickness, 0.0)
+    net = _segment_sums(pay_thickness, starts, stops)
+    averages = {}
+    for col in ZONE_AVERAGE_CURVES:
+        if col not in df.columns:
+            averages[col] = np.full(len(starts), np.nan)
+            continue
+        values = df[col].to_numpy(dtype=np.float64)
+        weights = np.where(np.isnan(values), 0.0, pay_thickness)
+        total = _segment_sums(weights, starts, stops)
+        weighted = _segment_sums(np.where(weights > 0, values, 0.0) * weights, starts, stops)
+        averages[col] = _weighted_average(weighted, total)
+
+    return _zones_frame(tops, bases, gross, net, _segment_sums(pay.astype(np.float64), starts, stops), averages)
+
+
+def extract_pay_zones_chunked(depth, pay, curves, min_thickness=0.0, merge_gap=0.0, chunk_rows=STATS_CHUNK_ROWS):
+    """extract_pay_zones sobre arreglos recorridos por tramos (p. ej. curvas mapeadas en memoria)
+
+    Las rachas se siguen de un tramo al siguiente; la memoria es la de un
+    tramo más las zonas. Límites y muestras son idénticos a los de
+    extract_pay_zones; las sumas de las zonas que cruzan tramos pueden diferir
+    en el último decimal.
+
+    Args:
+        depth: Profundidad (ft) ordenada
+        pay: Bandera de pay (bool)
+        curves: dict {curva de ZONE_AVERAGE_CURVES: arreglo}
+    """
+    n = len(depth)
+    if n == 0:
+        return pd.DataFrame(columns=ZONE_COLUMNS)
+
+    run_starts, run_stops = [], []
+    previous = False
+    for sl in row_slices(n, chunk_rows):
+        flags = np.asarray(pay[sl], dtype=bool)
+        changes = np.diff(np.concatenate(([previous], flags)).astype(np.int8))
+        run_starts.append(np.flatnonzero(changes == 1) + sl.start)
+        run_stops.append(np.flatnonzero(changes == -1) + sl.start)
+        previous = bool(flags[-1])
+    if previous:
+        run_stops.append(np.array([n]))
+    starts = np.concatenate(run_starts).astype(np.intp)
+    stops = np.concatenate(run_stops).astype(np.intp)
+    edges_at = lambda idx: sample_edges_at(depth, idx)
+    starts, stops, tops, bases, gross = _zone_bounds(starts, stops, edges_at, min_thickness, merge_gap)
+
+    names = [col for col in ZONE_AVERAGE_CURVES if col in curves]
+    net, samples = np.zeros(len(starts)), np.zeros(len(starts))
+    totals = {col: np.zeros(len(starts)) for col in names}
+    weighted = {col: np.zeros(len(starts)) for col in names}
+    for sl in row_slices(n, chunk_rows):
+        # Zonas que se solapan con el tramo, recortadas a él
+        first, last = np.searchsorted(stops, sl.start, side='right'), np.searchsorted(starts, sl.stop, side='left')
+        if first >= last:
+            continue
+        local_starts = np.maximum(starts[first:last], sl.start) - sl.start
+        local_stops = np.minimum(stops[first:last], sl.stop) - sl.start
+        flags = np.asarray(pay[sl], dtype=bool)
+        pay_thickness = np.where(flags, np.diff(edges_at(np.arange(sl.start, sl.stop + 1))), 0.0)
+        net[first:last] += _segment_sums(pay_thickness, local_starts, local_stops)
+        samples[first:last] += _segment_sums(flags.astype(np.float64), local_starts, local_stops)
+        for col in names:
+            values = np.asarray(curves[col][sl], dtype=np.float64)
+            weights = np.where(np.isnan(values), 0.0, pay_thickness)
+            totals[col][first:last] += _segment_sums(weights, local_starts, local_stops)
+            weighted[col][first:last] += _segment_sums(np.where(weights > 0, values, 0.0) * weights,
+                                                       local_starts, local_stops)
+
+    averages = {col: _weighted_average(weighted[col], totals[col]) if col in names else np.full(len(starts), np.nan)
+                for col in ZONE_AVERAGE_CURVES}
+    return _zones_frame(tops, bases, gross, net, samples, averages)
+
+
+def zone_rows(depth, zones):
+    """Filas [inicio, fin) de cada zona: muestras cuya profundidad cae entre TOP_FT y BASE_FT
+
+    depth puede ser un arreglo mapeado en memoria (solo se hacen búsquedas binarias).
+    """
+    if len(zones) == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    return (np.searchsorted(depth, zones['TOP_FT'].to_numpy(dtype=np.float64)),
+            np.searchsorted(depth, zones['BASE_FT'].to_numpy(dtype=np.float64)))
+
+
+def pay_in_zones(pay, starts, stops, offset=0):
+    """Bandera de pay restringida a las filas de las zonas (zone_rows)
+
+    Args:
+        pay: Bandera de pay de un bloque de muestras
+        offset: Fila del pozo en la que empieza el bloque (para recorrer por tramos)
+    """
+    pay = np.asarray(pay, dtype=bool)
+    n = len(pay)
+    cover = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(cover, np.clip(np.asarray(starts) - offset, 0, n), 1)
+    np.add.at(cover, np.clip(np.asarray(stops) - offset, 0, n), -1)
+    return pay & (np.cumsum(cover[:-1]) > 0)
+
+
+def zone_filtered_pay(pay, edges, min_thickness=0.0, merge_gap=0.0):
+    """Pay de las muestras que quedan en zonas con las reglas de extract_pay_zones
+
+    Admite una matriz (realizaciones × muestras): cada fila se filtra por
+    separado en una sola pasada sobre la matriz aplanada, con una columna
+    sin pay al final de cada fila para que las rachas no crucen de fila.
+
+    Args:
+        pay: Bandera de pay (muestras,) o (filas, muestras)
+        edges: sample_edges de la profundidad (muestras + 1)
+    """
+    pay = np.asarray(pay, dtype=bool)
+    if min_thickness <= 0 and merge_gap <= 0:
+        return pay
+    rows = np.atleast_2d(pay)
+    k, n = rows.shape
+    width = n + 1
+    flat = np.zeros((k, width), dtype=bool)
+    flat[:, :n] = rows
+    flat = flat.ravel()
+    starts, stops = _run_bounds(flat)
+    breaks = starts[1:] // width != stops[:-1] // width
+    starts, stops, *_ = _zone_bounds(starts, stops, lambda idx: edges[idx % width], min_thickness, merge_gap, breaks)
+    kept = pay_in_zones(flat, starts, stops).reshape(k, width)[:, :n]
+    return kept if pay.ndim > 1 else kept[0]
+
+
+def zone_pay_mask(df, zones, flag_col='IS_PAY', depth_col='DEPTH_FT'):
+    """IS_PAY de las muestras que pertenecen a alguna zona de extract_pay_zones
+
+    Quita el pay de las rachas descartadas por espesor mínimo, de modo que
+    las curvas, las exportaciones y los promedios coinciden con las zonas.
+    """
+    if flag_col not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    starts, stops = zone_rows(df[depth_col].to_numpy(dtype=np.float64), zones)
+    return pay_in_zones(df[flag_col].to_numpy(dtype=bool), starts, stops)
+
+
+def pay_summary(zones):
+    """Totales del pozo a partir de las zonas (espesores en ft y m)"""
+    net = float(zones['NET_FT'].sum()) if len(zones) else 0.0
+    gross = float(zones['GROSS_FT'].sum()) if len(zones) else 0.0
+    return {
+        'zones': int(len(zones)),
+        'net_ft': net,
+        'net_m': net * FT_TO_M,
+        'gross_ft': gross,
+        'gross_m': gross * FT_TO_M,
+        'thickest_ft': float(zones['GROSS_FT'].max()) if len(zones) else 0.0,
+    }
+
+
+def well_pay_zones(well):
+    """Zonas de un pozo de la lista de exportación batch
+
+    Usa well['pay_zones'] si existe; si no, las calcula con PAY_MIN_THICKNESS
+    y PAY_MERGE_GAP de well['config'].
+    """
+    if well.get('pay_zones') is not None:
+        return well['pay_zones']
+    config = well.get('config') or {}
+    return extract_pay_zones(well['df'], config.get('PAY_MIN_THICKNESS', 0.0), config.get('PAY_MERGE_GAP', 0.0))
+
+
+def net_pay_thickness(df):
+    """Espesor neto total (ft) de las muestras con IS_PAY"""
+    if 'IS_PAY' not in df.columns or len(df) < 2:
+        return 0.0
+    thickness = sample_thickness(df['DEPTH_FT'].to_numpy(dtype=np.float64))
+    return float(thickness[df['IS_PAY'].to_numpy(dtype=bool)].sum())
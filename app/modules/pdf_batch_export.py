@@ -9,22 +9,27 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from datetime import datetime
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.colors import ListedColormap
 import matplotlib.patches as mpatches
 import numpy as np
 
+from .pay_zones import well_pay_zones, pay_summary, sample_edges
 
-def create_pdf_batch_report(wells_data, language='es'):
+
+def create_pdf_batch_report(wells_data, language='es', zone_stats=None):
     """Crea un reporte PDF consolidado con reportes completos de múltiples pozos
     
     Args:
         wells_data: Lista de diccionarios con datos de cada pozo
                    [{'df': df, 'well_name': str, 'config': dict, 'stats': dict, 'curve_mapping': dict}, ...]
+                   ('curve_stats': CurveStats opcional, evita recalcular el rango de datos;
+                    'pay_zones': zonas de extract_pay_zones, se calculan si faltan)
+        zone_stats: Estadísticas por zona de formación (zone_statistics), opcional
     """
     
-    from .pdf_export import generate_8track_figure, _pdf_t
-    from .petrofisica import LITHO_COLORS
+    from .pdf_export import generate_8track_figure, pay_section_elements, _pay_table_style, _pdf_t
+    from .petrofisica import LITHO_COLORS, litho_counts
     t = lambda key: _pdf_t(language, key)
     
     buffer = io.BytesIO()
@@ -97,6 +102,7 @@ def create_pdf_batch_report(wells_data, language='es'):
         {'es': 'PROF. FIN. (FT)', 'en': 'END DEPTH (FT)', 'fr': 'PROF. FIN (FT)'}.get(language, 'PROF. FIN. (FT)'),
         t('samples'),
         {'es': 'MATRIZ', 'en': 'MATRIX', 'fr': 'MATRICE'}.get(language, 'MATRIZ'),
+        'NET PAY (FT)',
         'NET PAY (%)'
     ]]
     
@@ -108,10 +114,11 @@ def create_pdf_batch_report(wells_data, language='es'):
         samples = len(df)
         matrix = config.get('DOMINANT_MATRIX', t('na'))
         
-        if 'IS_PAY' in df.columns:
-            net_pay_pct = 100 * df['IS_PAY'].sum() / len(df)
-        else:
-            net_pay_pct = 0
+        # Net pay por espesor (no por número de muestras)
+        net_pay_ft = pay_summary(well_pay_zones(well))['net_ft'] if 'IS_PAY' in df.columns else 0.0
+        edges = sample_edges(df['DEPTH_FT'].to_numpy())
+        interval = edges[-1] - edges[0] if len(edges) else 0.0
+        net_pay_pct = 100 * net_pay_ft / interval if interval > 0 else 0
         
         summary_data.append([
             well['well_name'][:20],
@@ -119,10 +126,11 @@ def create_pdf_batch_report(wells_data, language='es'):
             f"{depth_fin:.1f}",
             f"{samples}",
             matrix,
+            f"{net_pay_ft:.1f}",
             f"{net_pay_pct:.1f}%"
         ])
     
-    summary_table = Table(summary_data, colWidths=[1.4*inch, 1.6*inch, 1.6*inch, 1.2*inch, 1.2*inch, 1.2*inch])
+    summary_table = Table(summary_data, colWidths=[1.4*inch, 1.6*inch, 1.6*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch])
     summary_table.setStyle(TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
@@ -137,6 +145,25 @@ def create_pdf_batch_report(wells_data, language='es'):
     ]))
     
     elements.append(summary_table)
+    
+    # Resumen por zona de formación (topes)
+    if zone_stats is not None and len(zone_stats):
+        elements.append(Spacer(1, 0.3*inch))
+        elements.append(Paragraph(t('zone_summary'), heading_style))
+        elements.append(Spacer(1, 0.1*inch))
+        fmt = lambda v, spec: format(v, spec) if v == v else '-'
+        zone_data = [[t('well').upper(), t('zone'), t('top'), t('base'), t('gross'), t('net'), 'NTG',
+                      'HCPV (FT)', 'PHI_E P50', 'VSH P50', 'SW P50']]
+        for row in zone_stats.itertuples(index=False):
+            zone_data.append([
+                str(row.WELL)[:20], str(row.ZONE)[:20], f"{row.TOP_FT:.1f}", f"{row.BASE_FT:.1f}",
+                f"{row.GROSS_FT:.1f}", f"{row.NET_FT:.1f}", f"{row.NTG:.2f}", fmt(row.HCPV_FT, '.2f'),
+                fmt(row.PHI_E_P50, '.4f'), fmt(row.VSH_P50, '.4f'), fmt(row.SW_P50, '.4f'),
+            ])
+        zone_table = Table(zone_data, colWidths=[1.3*inch, 1.3*inch] + [0.8*inch] * 9, repeatRows=1)
+        zone_table.setStyle(_pay_table_style(8))
+        elements.append(zone_table)
+    
     elements.append(PageBreak())
     
     # REPORTES INDIVIDUALES DE CADA POZO
@@ -249,7 +276,8 @@ def create_pdf_batch_report(wells_data, language='es'):
         elements.append(Spacer(1, 0.1*inch))
         
         try:
-            track_buffer = generate_8track_figure(df, LITHO_COLORS, language=language)
+            track_buffer = generate_8track_figure(df, LITHO_COLORS, language=language,
+                                                  curve_stats=well_data.get('curve_stats'))
             if track_buffer:
                 track_img = Image(track_buffer, width=7.5*inch, height=3.2*inch)
                 elements.append(track_img)
@@ -262,7 +290,7 @@ def create_pdf_batch_report(wells_data, language='es'):
             elements.append(Paragraph(t('section_7'), heading_style))
             elements.append(Spacer(1, 0.1*inch))
             
-            lith_counts = df['LITOLOGIA'].value_counts()
+            lith_counts = litho_counts(df['LITOLOGIA'])
             lith_data = [[t('lithology'), t('samples'), t('percentage')]]
             
             for lith, count in lith_counts.items():
@@ -292,7 +320,7 @@ def create_pdf_batch_report(wells_data, language='es'):
             
             # Gráfico pie + barras para litología
             try:
-                fig = plt.figure(figsize=(12, 5), facecolor='white')
+                fig = Figure(figsize=(12, 5), facecolor='white')
                 
                 litho_colors_custom = {
                     'ARENISCA': '#FFE17F',
@@ -308,7 +336,7 @@ def create_pdf_batch_report(wells_data, language='es'):
                 colors_plot = [litho_colors_custom.get(lith, '#CCCCCC') for lith in lith_unique]
                 
                 # Pie chart
-                ax1 = plt.subplot(1, 2, 1)
+                ax1 = fig.add_subplot(1, 2, 1)
                 wedges, texts, autotexts = ax1.pie(lith_counts.values, 
                                                    colors=colors_plot,
                                                    autopct='%1.0f%%',
@@ -326,7 +354,7 @@ def create_pdf_batch_report(wells_data, language='es'):
                           fontsize=9, frameon=True, fancybox=True)
                 
                 # Bar chart
-                ax2 = plt.subplot(1, 2, 2)
+                ax2 = fig.add_subplot(1, 2, 2)
                 lith_sorted = lith_counts.sort_values(ascending=True)
                 colors_sorted = [colors_plot[lith_unique.index(lith)] for lith in lith_sorted.index]
                 
@@ -346,12 +374,11 @@ def create_pdf_batch_report(wells_data, language='es'):
                     ax2.text(val + max(lith_sorted.values)*0.01, i, f'{int(val)}', 
                             va='center', fontsize=9, fontweight='bold')
                 
-                plt.tight_layout()
+                fig.tight_layout()
                 
                 img_buffer = io.BytesIO()
-                plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight', facecolor='white')
+                fig.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight', facecolor='white')
                 img_buffer.seek(0)
-                plt.close()
                 
                 litho_img = Image(img_buffer, width=6.5*inch, height=2.5*inch)
                 elements.append(litho_img)
@@ -362,45 +389,8 @@ def create_pdf_batch_report(wells_data, language='es'):
         
         # ===== SECCIÓN 6: ZONAS PRODUCTIVAS (NET PAY) =====
         if 'IS_PAY' in df.columns:
-            elements.append(Paragraph(t('section_8'), heading_style))
+            elements.extend(pay_section_elements(df, well_pay_zones(well_data), t, heading_style))
             elements.append(Spacer(1, 0.1*inch))
-            
-            net_pay = df['IS_PAY'].sum()
-            pct_pay = 100 * net_pay / len(df)
-            
-            pay_data = [
-                [t('metric'), t('value')],
-                [t('net_pay_samples'), str(int(net_pay))],
-                [t('interval_pct'), f"{pct_pay:.1f}%"],
-            ]
-            
-            if net_pay > 0:
-                pay_mask = df['IS_PAY']
-                if df.loc[pay_mask, 'PHI_E'].notna().any():
-                    pay_data.append([t('avg_phi_pay'), 
-                                   f"{df.loc[pay_mask, 'PHI_E'].mean():.4f}"])
-                if df.loc[pay_mask, 'VSH'].notna().any():
-                    pay_data.append([t('avg_vsh_pay'), 
-                                   f"{df.loc[pay_mask, 'VSH'].mean():.4f}"])
-                if df.loc[pay_mask, 'SW'].notna().any():
-                    pay_data.append([t('avg_sw_pay'), 
-                                   f"{df.loc[pay_mask, 'SW'].mean():.4f}"])
-            
-            pay_table = Table(pay_data, colWidths=[3*inch, 2*inch])
-            pay_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-            ]))
-            
-            elements.append(pay_table)
         
         # Salto de página entre pozos (excepto el último)
         if well_idx < len(wells_data) - 1:
@@ -9,13 +9,18 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from datetime import datetime
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.colors import ListedColormap
 import matplotlib.patches as mpatches
 from matplotlib.ticker import MultipleLocator, AutoMinorLocator
 import numpy as np
+import pandas as pd
 from PIL import Image as PILImage
 
+from .petrofisica import litho_counts, KEY_CURVES
+from .curve_stats import CurveStats
+from .pay_zones import extract_pay_zones, pay_summary, sample_edges, zone_pay_mask
+
 
 PDF_TEXTS = {
     'es': {
@@ -69,6 +74,16 @@ PDF_TEXTS = {
         'avg_phi_pay': 'Porosidad promedio en pay',
         'avg_vsh_pay': 'VSH promedio en pay',
         'avg_sw_pay': 'Sw promedio en pay',
+        'net_pay_thickness': 'Net Pay (espesor)',
+        'pay_zones_count': 'Zonas productivas',
+        'pay_zones': 'Zonas productivas',
+        'zone': 'ZONA',
+        'top': 'TOPE (FT)',
+        'base': 'BASE (FT)',
+        'gross': 'BRUTO (FT)',
+        'net': 'NETO (FT)',
+        'more_zones': '... y {n} zonas más',
+        'zone_summary': 'RESUMEN POR ZONA DE FORMACIÓN',
         'generated': 'Reporte generado',
         'na': 'N/A',
     },
@@ -123,6 +138,16 @@ PDF_TEXTS = {
         'avg_phi_pay': 'Average porosity in pay',
         'avg_vsh_pay': 'Average VSH in pay',
         'avg_sw_pay': 'Average Sw in pay',
+        'net_pay_thickness': 'Net Pay (thickness)',
+        'pay_zones_count': 'Pay zones',
+        'pay_zones': 'Pay zones',
+        'zone': 'ZONE',
+        'top': 'TOP (FT)',
+        'base': 'BASE (FT)',
+        'gross': 'GROSS (FT)',
+        'net': 'NET (FT)',
+        'more_zones': '... and {n} more zones',
+        'zone_summary': 'SUMMARY BY FORMATION ZONE',
         'generated': 'Report generated',
         'na': 'N/A',
     },
@@ -177,6 +202,16 @@ PDF_TEXTS = {
         'avg_phi_pay': 'Porosité moyenne en pay',
         'avg_vsh_pay': 'VSH moyenne en pay',
         'avg_sw_pay': 'Sw moyenne en pay',
+        'net_pay_thickness': 'Net Pay (épaisseur)',
+        'pay_zones_count': 'Zones productives',
+        'pay_zones': 'Zones productives',
+        'zone': 'ZONE',
+        'top': 'TOIT (FT)',
+        'base': 'BASE (FT)',
+        'gross': 'BRUT (FT)',
+        'net': 'NET (FT)',
+        'more_zones': '... et {n} zones de plus',
+        'zone_summary': 'RÉSUMÉ PAR ZONE DE FORMATION',
         'generated': 'Rapport généré',
         'na': 'N/D',
     }
@@ -187,26 +222,110 @@ def _pdf_t(language, key):
     return PDF_TEXTS.get(language, PDF_TEXTS['es']).get(key, PDF_TEXTS['es'].get(key, key))
 
 
-def generate_8track_figure(df, LITHO_COLORS, language='es'):
+# Máximo de zonas listadas en el PDF
+PDF_MAX_ZONES = 30
+
+
+def _pay_table_style(header_size):
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), header_size),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTSIZE', (0, 1), (-1, -1), header_size - 1),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+    ])
+
+
+def pay_section_elements(df, zones, t, heading_style):
+    """Sección de net pay (resumen por espesor y tabla de zonas) para los PDF
+
+    Args:
+        df: DataFrame del pozo con IS_PAY
+        zones: DataFrame de extract_pay_zones (los promedios usan solo el pay de las zonas)
+        t: Función de traducción del PDF
+        heading_style: Estilo del título de sección
+    """
+    elements = [Paragraph(t('section_8'), heading_style), Spacer(1, 0.1*inch)]
+    
+    summary = pay_summary(zones)
+    net_samples = int(zones['SAMPLES'].sum()) if len(zones) else 0
+    edges = sample_edges(df['DEPTH_FT'].to_numpy())
+    interval = edges[-1] - edges[0] if len(edges) else 0.0
+    pct_pay = 100 * summary['net_ft'] / interval if interval > 0 else 0.0
+    
+    pay_data = [
+        [t('metric'), t('value')],
+        [t('net_pay_thickness'), f"{summary['net_ft']:.1f} ft ({summary['net_m']:.1f} m)"],
+        [t('pay_zones_count'), str(summary['zones'])],
+        [t('net_pay_samples'), str(net_samples)],
+        [t('interval_pct'), f"{pct_pay:.1f}%"],
+    ]
+    
+    if net_samples > 0:
+        pay_mask = zone_pay_mask(df, zones)
+        if df.loc[pay_mask, 'PHI_E'].notna().any():
+            pay_data.append([t('avg_phi_pay'), 
+                           f"{df.loc[pay_mask, 'PHI_E'].mean():.4f}"])
+        if df.loc[pay_mask, 'VSH'].notna().any():
+            pay_data.append([t('avg_vsh_pay'), 
+                           f"{df.loc[pay_mask, 'VSH'].mean():.4f}"])
+        if df.loc[pay_mask, 'SW'].notna().any():
+            pay_data.append([t('avg_sw_pay'), 
+                           f"{df.loc[pay_mask, 'SW'].mean():.4f}"])
+    
+    pay_table = Table(pay_data, colWidths=[3*inch, 2*inch])
+    pay_table.setStyle(_pay_table_style(10))
+    elements.append(pay_table)
+    
+    if len(zones):
+        elements.append(Spacer(1, 0.15*inch))
+        elements.append(Paragraph(t('pay_zones'), heading_style))
+        fmt = lambda v, spec: t('na') if pd.isna(v) else format(v, spec)
+        zone_data = [[t('zone'), t('top'), t('base'), t('gross'), t('net'), 'NTG', 'PHI_E', 'VSH', 'SW', 'PERM']]
+        for row in zones.head(PDF_MAX_ZONES).itertuples(index=False):
+            zone_data.append([
+                str(row.ZONE), f"{row.TOP_FT:.1f}", f"{row.BASE_FT:.1f}", f"{row.GROSS_FT:.1f}",
+                f"{row.NET_FT:.1f}", f"{row.NTG:.2f}", fmt(row.PHI_E, '.4f'), fmt(row.VSH, '.4f'),
+                fmt(row.SW, '.4f'), fmt(row.PERM, '.2f'),
+            ])
+        zone_table = Table(zone_data, colWidths=[0.6*inch] + [0.9*inch] * 9, repeatRows=1)
+        zone_table.setStyle(_pay_table_style(8))
+        elements.append(zone_table)
+        if len(zones) > PDF_MAX_ZONES:
+            elements.append(Paragraph(f"<i>{t('more_zones').format(n=len(zones) - PDF_MAX_ZONES)}</i>",
+                                      ParagraphStyle('more_zones', fontSize=8, textColor=colors.grey)))
+    
+    return elements
+
+
+
+def generate_8track_figure(df, LITHO_COLORS, language='es', curve_stats=None):
     """Genera figura de 8 tracks para el PDF
     
     Args:
         df: DataFrame con datos petrofísicos
         LITHO_COLORS: Diccionario con colores para litologías
+        curve_stats: CurveStats del pozo (opcional; evita recorrer las curvas otra vez)
     
     Returns:
         BytesIO object con la imagen PNG
     """
     try:
-        from modules.petrofisica import get_valid_data_range
+        from .petrofisica import get_valid_data_range
         
         # Obtener rangos de profundidad
-        depth_min_data, depth_max_data = get_valid_data_range(df)
+        depth_min_data, depth_max_data = get_valid_data_range(df, stats=curve_stats)
         depth_min = depth_min_data
         depth_max = depth_max_data
         
         # Crear figura con 8 subplots - Tamaño optimizado para PDF
-        fig, axes = plt.subplots(1, 8, figsize=(16, 7), sharey='row', facecolor='white')
+        fig = Figure(figsize=(16, 7), facecolor='white')
+        axes = fig.subplots(1, 8, sharey='row')
         fig.suptitle(f"{_pdf_t(language, 'petrophysical_log')}", fontsize=12, fontweight='bold', y=1.0)
         
         # Configurar límites Y y escala superior para todos los tracks
@@ -355,12 +474,11 @@ def generate_8track_figure(df, LITHO_COLORS, language='es'):
         
         # Track 8: Litología
         ax = axes[7]
-        litho_unique = df['LITOLOGIA'].unique()
-        litho_mapping = {lith: i for i, lith in enumerate(litho_unique)}
-        lith_num = df['LITOLOGIA'].map(litho_mapping)
+        litho_unique = [str(lith) for lith in df['LITOLOGIA'].unique()]
+        lith_num = pd.Categorical(df['LITOLOGIA'], categories=litho_unique).codes
         colors_present = [LITHO_COLORS.get(lith, '#CCCCCC') for lith in litho_unique]
         cmap = ListedColormap(colors_present)
-        img = np.array(lith_num).reshape(-1, 1)
+        img = lith_num.reshape(-1, 1)
         ax.imshow(img, aspect='auto', cmap=cmap, origin='upper',
                  extent=[0, 1, depth_max, depth_min], interpolation='nearest')
         ax.set_xticks([])
@@ -374,13 +492,12 @@ def generate_8track_figure(df, LITHO_COLORS, language='es'):
                         for lith in litho_unique]
         ax.legend(handles=legend_patches, loc='lower left', fontsize=6, framealpha=0.9)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Guardar imagen
         img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight', facecolor='white')
+        fig.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight', facecolor='white')
         img_buffer.seek(0)
-        plt.close()
         
         return img_buffer
     
@@ -389,7 +506,8 @@ def generate_8track_figure(df, LITHO_COLORS, language='es'):
         return None
 
 
-def create_pdf_report(df, well_name, config, stats, curve_mapping=None, dominant_matrix_info=None, language='es'):
+def create_pdf_report(df, well_name, config, stats, curve_mapping=None, dominant_matrix_info=None, language='es',
+                      curve_stats=None, pay_zones=None):
     """Crea reporte PDF completo con análisis petrofísico
     
     Args:
@@ -399,6 +517,8 @@ def create_pdf_report(df, well_name, config, stats, curve_mapping=None, dominant
         stats: Diccionario con estadísticas
         curve_mapping: Diccionario con mapeo de curvas disponibles
         dominant_matrix_info: Diccionario con info de matriz dominante
+        curve_stats: CurveStats del pozo (se calcula si no se pasa)
+        pay_zones: Zonas de extract_pay_zones (se calculan con los criterios de config si no se pasan)
     """
     
     buffer = io.BytesIO()
@@ -409,6 +529,9 @@ def create_pdf_report(df, well_name, config, stats, curve_mapping=None, dominant
     elements = []
     styles = getSampleStyleSheet()
     t = lambda key: _pdf_t(language, key)
+    if curve_stats is None:
+        curve_stats = CurveStats(df, [c for c in dict.fromkeys(list(curve_mapping or {}) + KEY_CURVES)
+                                      if c in df.columns])
     
     # Estilos personalizados
     title_style = ParagraphStyle(
@@ -472,7 +595,7 @@ def create_pdf_report(df, well_name, config, stats, curve_mapping=None, dominant
         
         curve_data = [[t('std_curve'), t('orig_column'), t('valid_samples')]]
         for standard, original in sorted(curve_mapping.items()):
-            valid_count = df[standard].notna().sum() if standard in df.columns else 0
+            valid_count = curve_stats.count(standard)
             pct_valid = 100 * valid_count / len(df) if len(df) > 0 else 0
             curve_data.append([
                 standard,
@@ -589,8 +712,8 @@ def create_pdf_report(df, well_name, config, stats, curve_mapping=None, dominant
     elements.append(Spacer(1, 0.1*inch))
     
     try:
-        from modules.petrofisica import LITHO_COLORS
-        track_buffer = generate_8track_figure(df, LITHO_COLORS, language=language)
+        from .petrofisica import LITHO_COLORS
+        track_buffer = generate_8track_figure(df, LITHO_COLORS, language=language, curve_stats=curve_stats)
         if track_buffer:
             track_img = Image(track_buffer, width=7.5*inch, height=3.2*inch)
             elements.append(track_img)
@@ -603,7 +726,7 @@ def create_pdf_report(df, well_name, config, stats, curve_mapping=None, dominant
         elements.append(Paragraph(t('section_7'), heading_style))
         elements.append(Spacer(1, 0.1*inch))
         
-        lith_counts = df['LITOLOGIA'].value_counts()
+        lith_counts = litho_counts(df['LITOLOGIA'])
         lith_data = [[t('lithology'), t('samples'), t('percentage')]]
         
         for lith, count in lith_counts.items():
@@ -636,7 +759,7 @@ def create_pdf_report(df, well_name, config, stats, curve_mapping=None, dominant
             from reportlab.lib.colors import HexColor
             
             # Crear figura con mejor dimensionamiento
-            fig = plt.figure(figsize=(12, 5), facecolor='white')
+            fig = Figure(figsize=(12, 5), facecolor='white')
             
             # Colores para litologías
             litho_colors_custom = {
@@ -653,7 +776,7 @@ def create_pdf_report(df, well_name, config, stats, curve_mapping=None, dominant
             colors_plot = [litho_colors_custom.get(lith, '#CCCCCC') for lith in lith_unique]
             
             # Subplot 1: Pie chart con leyenda separada
-            ax1 = plt.subplot(1, 2, 1)
+            ax1 = fig.add_subplot(1, 2, 1)
             
             # Crear pie chart sin etiquetas (solo con porcentajes pequeños)
             wedges, texts, autotexts = ax1.pie(lith_counts.values, 
@@ -676,7 +799,7 @@ def create_pdf_report(df, well_name, config, stats, curve_mapping=None, dominant
                       fontsize=9, frameon=True, fancybox=True)
             
             # Subplot 2: Gráfico de barras horizontal mejorado
-            ax2 = plt.subplot(1, 2, 2)
+            ax2 = fig.add_subplot(1, 2, 2)
             
             lith_sorted = lith_counts.sort_values(ascending=True)
             colors_sorted = [colors_plot[lith_unique.index(lith)] for lith in lith_sorted.index]
@@ -701,13 +824,12 @@ def create_pdf_report(df, well_name, config, stats, curve_mapping=None, dominant
                         va='center', fontsize=9, fontweight='bold')
             
             # Mejorar espacios
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Guardar imagen con alta resolución
             img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=200, bbox_inches='tight', facecolor='white')
+            fig.savefig(img_buffer, format='png', dpi=200, bbox_inches='tight', facecolor='white')
             img_buffer.seek(0)
-            plt.close()
             
             # Agregar imagen al PDF con mejor tamaño
             litho_img = Image(img_buffer, width=7.0*inch, height=3.0*inch)
@@ -719,45 +841,9 @@ def create_pdf_report(df, well_name, config, stats, curve_mapping=None, dominant
     
     # ===== SECCIÓN 8: ZONAS PRODUCTIVAS (NET PAY) =====
     if 'IS_PAY' in df.columns:
-        elements.append(Paragraph(t('section_8'), heading_style))
-        elements.append(Spacer(1, 0.1*inch))
-        
-        net_pay = df['IS_PAY'].sum()
-        pct_pay = 100 * net_pay / len(df)
-        
-        pay_data = [
-            [t('metric'), t('value')],
-            [t('net_pay_samples'), str(int(net_pay))],
-            [t('interval_pct'), f"{pct_pay:.1f}%"],
-        ]
-        
-        if net_pay > 0:
-            pay_mask = df['IS_PAY']
-            if df.loc[pay_mask, 'PHI_E'].notna().any():
-                pay_data.append([t('avg_phi_pay'), 
-                               f"{df.loc[pay_mask, 'PHI_E'].mean():.4f}"])
-            if df.loc[pay_mask, 'VSH'].notna().any():
-                pay_data.append([t('avg_vsh_pay'), 
-                               f"{df.loc[pay_mask, 'VSH'].mean():.4f}"])
-            if df.loc[pay_mask, 'SW'].notna().any():
-                pay_data.append([t('avg_sw_pay'), 
-                               f"{df.loc[pay_mask, 'SW'].mean():.4f}"])
-        
-        pay_table = Table(pay_data, colWidths=[3*inch, 2*inch])
-        pay_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-        ]))
-        
-        elements.append(pay_table)
+        if pay_zones is None:
+            pay_zones = extract_pay_zones(df, config.get('PAY_MIN_THICKNESS', 0.0), config.get('PAY_MERGE_GAP', 0.0))
+        elements.extend(pay_section_elements(df, pay_zones, t, heading_style))
     
     # Pie
     elements.append(Spacer(1, 0.2*inch))
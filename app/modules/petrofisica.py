@@ -3,10 +3,11 @@
 # ==========================================================
 import numpy as np
 import pandas as pd
-from scipy.ndimage import median_filter
 import warnings
 warnings.filterwarnings('ignore')
 
+from .curve_stats import CurveStats
+
 
 class PetroConfig:
     """Parámetros petrofísicos configurables"""
@@ -35,6 +36,10 @@ class PetroConfig:
     M = 2.0
     N = 2.0
     RW = 0.05
+    RSH = 2.0
+    
+    # Modelo de saturación usado para SW e IS_PAY (uno de SW_MODELS)
+    SW_MODEL = 'ARCHIE'
     
     DOMINANT_MATRIX = 'ARENISCA'
     DOMINANT_RHO = 2.65
@@ -54,6 +59,34 @@ LITHO_COLORS = {
     'CONGLOMERADO': '#CD853F',
 }
 
+# Orden fijo de clases litológicas (código entero = posición en la tupla)
+LITHO_CLASSES = tuple(LITHO_COLORS.keys())
+
+# Alias de la curva de profundidad (en orden de prioridad)
+DEPTH_ALIASES = ['DEPTH', 'DEPT', 'MD', 'MEASURED_DEPTH', 'TVD', 'TVDSS',
+                 'TDEP', 'MD_FT', 'DEPTM', 'INDEX']
+
+# Nombre estándar -> alias aceptados (en orden de prioridad)
+CURVE_ALIASES = {
+    'CALI': ['CALI', 'CAL', 'CAL1', 'CALIPER'],
+    'BS': ['BS', 'BIT_SIZE'],
+    'GR': ['GR', 'GAM', 'HGR', 'GAMMA'],
+    'SP': ['SP', 'SSP'],
+    'RT': ['RT', 'RTRUE', 'RESD', 'RDEP', 'ILD', 'LLD', 'RILD', 'RD', 'AT90', 'AIT90', 'AT60', 'AIT60', 'RLA4', 'HRLA4'],
+    'RM_RES': ['RESM', 'LLM', 'ILM', 'AT30', 'AIT30', 'AT20', 'AIT20', 'RLA3', 'HRLA3', 'RLA2', 'HRLA2'],
+    'RXOS': ['RXOS', 'RESS', 'LLS', 'SFL', 'MSFL', 'RXO', 'AT10', 'AIT10', 'RLA1', 'HRLA1'],
+    'RMC': ['RMC', 'RMCAKE', 'MUDCAKE'],
+    'RMUD': ['RMUD', 'MUD_RES'],
+    'RW': ['RW', 'RWA', 'WATER_RES'],
+    'RHOB': ['RHOB', 'DEN', 'DENS', 'RHOZ', 'DENSITY'],
+    'NPHI': ['NPHI', 'NPL', 'NPOS', 'NEUT'],
+    'PEF': ['PEF', 'PE', 'PHOTO'],
+    'DT': ['DT', 'AC', 'SONIC'],
+    'VSH': ['VSH', 'VCL', 'VSHALE'],
+    'SW': ['SW', 'SWE', 'SWAT'],
+    'PHIT': ['PHIT', 'PHI_T', 'PHIE', 'PHI'],
+}
+
 
 class PetroPhysics:
     """Cálculos petrofísicos"""
@@ -173,21 +206,407 @@ class LithoClassifier:
             return 'ARENISCA'
 
 
+# ==========================================================
+# ETAPAS VECTORIZADAS (mismas reglas que los métodos escalares)
+# ==========================================================
+
+def vsh_larionov_array(gr, gr_min, gr_max):
+    """VSH Larionov sobre un arreglo (NaN se conserva)"""
+    igr = np.clip((gr - gr_min) / (gr_max - gr_min), 0, 1)
+    return np.clip(0.083 * (2**(3.7 * igr) - 1), 0, 1)
+
+
+def porosity_density_array(rhob, rho_ma, rho_fl, vsh, rho_sh=2.7):
+    """Porosidad de densidad corregida por arcilla (VSH NaN = 0)"""
+    vsh = np.nan_to_num(vsh, nan=0.0)
+    phi_d = (rho_ma - rhob) / (rho_ma - rho_fl)
+    phi_sh = (rho_ma - rho_sh) / (rho_ma - rho_fl)
+    phi_d = np.where(vsh > 0, phi_d - vsh * phi_sh, phi_d)
+    return np.clip(phi_d, 0, 0.45)
+
+
+def porosity_neutron_density_array(nphi, rhob, rho_ma, rho_fl, vsh):
+    """Porosidad neutrón-densidad (media cuadrática)"""
+    phi_d = porosity_density_array(rhob, rho_ma, rho_fl, vsh)
+    return np.clip(np.sqrt((nphi**2 + phi_d**2) / 2), 0, 0.45)
+
+
+def water_saturation_array(phi, rt, a=1.0, m=2.0, n=2.0, rw=0.05):
+    """Saturación de Archie: NaN sin datos, 1.0 si PHI <= 0 o RT <= 0"""
+    positive = (phi > 0) & (rt > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sw = np.clip((a * rw / (np.where(positive, phi, 1.0)**m * np.where(positive, rt, 1.0)))**(1 / n), 0, 1)
+    sw = np.where(positive, sw, 1.0)
+    return np.where(np.isnan(phi) | np.isnan(rt), np.nan, sw)
+
+
+# Modelos de saturación evaluados en una sola pasada (columnas SW_<MODELO>)
+SW_MODELS = ('ARCHIE', 'SIMANDOUX', 'MOD_SIMANDOUX', 'INDONESIA')
+
+
+def sw_model_column(model):
+    return f'SW_{model}'
+
+
+SW_MODEL_COLUMNS = [sw_model_column(model) for model in SW_MODELS]
+
+
+def saturation_models_array(phi, rt, vsh, a=1.0, m=2.0, n=2.0, rw=0.05, rsh=2.0, models=SW_MODELS):
+    """Saturación de agua con varios modelos sobre los mismos términos comunes
+
+    φ^m/(a·Rw), 1/Rt y Vsh/Rsh se calculan una sola vez y se reutilizan:
+        Archie:              C·Sw^n = 1/Rt
+        Simandoux:           C·Sw^n + (Vsh/Rsh)·Sw^(n/2) = 1/Rt
+        Simandoux modificado: igual con C/(1 − Vsh)
+        Indonesia:           [Vsh^(1 − Vsh/2)/√Rsh + √C]·Sw^(n/2) = 1/√Rt
+    Las formas de Simandoux se resuelven con la raíz positiva de la
+    cuadrática en Sw^(n/2) (exacta para n = 2). Con Vsh = 0 todos los modelos
+    coinciden con Archie. Mismas reglas que water_saturation_array: NaN sin
+    datos, 1.0 si PHI <= 0 o RT <= 0; VSH NaN se toma como 0. Los parámetros
+    admiten broadcasting (p. ej. columnas de realizaciones).
+
+    Returns:
+        dict {SW_<MODELO>: arreglo limitado a [0, 1]}
+    """
+    unknown = set(models) - set(SW_MODELS)
+    if unknown:
+        raise ValueError(f"Modelo de saturación desconocido: {sorted(unknown)}")
+    positive = (phi > 0) & (rt > 0)
+    missing = np.isnan(phi) | np.isnan(rt)
+    vsh = np.clip(np.nan_to_num(vsh, nan=0.0), 0, 1)
+
+    # Términos comunes
+    with np.errstate(divide='ignore'):
+        clean = np.where(positive, phi, 1.0)**m / (a * rw)
+        inv_rt = 1.0 / np.where(positive, rt, 1.0)
+    shale = vsh / rsh
+
+    def finish(sw):
+        sw = np.where(positive, np.clip(sw, 0, 1), 1.0)
+        return np.where(missing, np.nan, sw)
+
+    def simandoux(c):
+        # c·S² + shale·S − 1/Rt = 0 con S = Sw^(n/2); forma estable de la raíz positiva
+        root = 2 * inv_rt / (shale + np.sqrt(shale**2 + 4 * c * inv_rt))
+        return root**(2 / n)
+
+    results = {}
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for model in models:
+            if model == 'ARCHIE':
+                sw = (inv_rt / clean)**(1 / n)
+            elif model == 'SIMANDOUX':
+                sw = simandoux(clean)
+            elif model == 'MOD_SIMANDOUX':
+                # Lutita pura: sin espacio poral efectivo, SW = 1
+                sw = np.where(vsh < 1, simandoux(clean / np.maximum(1 - vsh, 1e-12)), 1.0)
+            else:
+                sw = (np.sqrt(inv_rt) / (vsh**(1 - vsh / 2) / np.sqrt(rsh) + np.sqrt(clean)))**(2 / n)
+            results[sw_model_column(model)] = finish(sw)
+    return results
+
+
+def permeability_kozeny_array(phi, vsh):
+    """Permeabilidad Kozeny: NaN sin datos, 0 fuera del rango físico"""
+    phi_eff = phi * (1 - vsh)
+    ok = (phi > 0) & (phi_eff > 0) & (phi_eff < 1)
+    safe = np.where(ok, phi_eff, 0.5)
+    k = np.where(ok, np.clip(100 * safe**3 / (1 - safe)**2, 0, 10000), 0.0)
+    return np.where(np.isnan(phi) | np.isnan(vsh), np.nan, k)
+
+
+def classify_lithology_array(vsh, rhob, pef, dominant_matrix='ARENISCA'):
+    """Clasificación litológica vectorizada (reglas de classify_advanced)
+
+    Returns:
+        Códigos int8 sobre LITHO_CLASSES
+    """
+    code = {name: i for i, name in enumerate(LITHO_CLASSES)}
+    vsh = np.where(np.isnan(vsh), 0.5, vsh)
+    rhob = np.where(np.isnan(rhob), PetroConfig.RHO_MATRIX.get(dominant_matrix, 2.65), rhob)
+    mid_rhob = dominant_matrix if dominant_matrix in ('CALIZA', 'DOLOMITA') else 'ARENISCA'
+    # Las comparaciones con PEF NaN son falsas: equivale a omitir la rama PEF
+    conditions = [
+        vsh > 0.7,
+        (pef > 4.5) & (rhob > 2.80),
+        pef > 4.5,
+        pef > 2.5,
+        (pef < 2.2) & (vsh < 0.35),
+        (vsh > 0.35) & (rhob > 2.68),
+        vsh > 0.35,
+        rhob > 2.78,
+        rhob > 2.68,
+        rhob > 2.60,
+    ]
+    choices = ['LUTITA', 'DOLOMITA', 'CALIZA', 'DOLOMITA', 'ARENISCA',
+               'CALIZA', 'ARENISCA_ARCILLOSA', 'DOLOMITA', 'CALIZA', mid_rhob]
+    return np.select(conditions, [code[c] for c in choices], default=code['ARENISCA']).astype(np.int8)
+
+
+def rho_matrix_array(litho_codes, dominant_rho):
+    """Densidad de matriz por código litológico (dominante si no aplica)"""
+    table = np.array([
+        2.87 if 'DOLOMITA' in lith else
+        2.71 if ('CALIZA' in lith or 'CARBONATO' in lith) else
+        2.70 if 'LUTITA' in lith else
+        dominant_rho
+        for lith in LITHO_CLASSES
+    ])
+    return table[litho_codes]
+
+
+def petro_stages(curves, dominant_matrix, dominant_rho, gr_limits=None,
+                 vsh_precalc=False, phit_precalc=False, has_rhob=True, has_rt=True,
+                 a=None, m=None, n=None, rw=None, rsh=None, sw_model=None,
+                 phi_cutoff=None, vsh_cutoff=None, sw_cutoff=None, litho_codes=None):
+    """Etapas VSH → litología → porosidad → SW → permeabilidad → net pay
+
+    Opera sobre un bloque de muestras (pozo completo o un tramo), por lo que
+    puede aplicarse por tramos. Las decisiones que dependen del pozo completo
+    (curvas precalculadas, límites de GR) se pasan como argumentos.
+
+    Args:
+        curves: dict {curva estándar: arreglo} con GR, RHOB, NPHI, RT, PEF, VSH, PHIT
+        gr_limits: (GR mínimo, GR máximo) para Larionov, o None si no hay GR
+        sw_model: Modelo de SW_MODELS que define SW e IS_PAY
+        litho_codes: Códigos litológicos externos (p. ej. electrofacies); las
+            muestras con -1 usan el árbol de classify_lithology_array
+
+    Returns:
+        dict con VSH, LITOLOGIA (códigos int8), RHO_MATRIX, PHI_T, PHI_E, SW,
+        SW_<MODELO> de cada modelo de SW_MODELS, PERM, IS_PAY
+    """
+    a = PetroConfig.A if a is None else a
+    m = PetroConfig.M if m is None else m
+    n = PetroConfig.N if n is None else n
+    rw = PetroConfig.RW if rw is None else rw
+    rsh = PetroConfig.RSH if rsh is None else rsh
+    sw_model = PetroConfig.SW_MODEL if sw_model is None else sw_model
+    if sw_model not in SW_MODELS:
+        raise ValueError(f"Modelo de saturación desconocido: {sw_model}")
+    phi_cutoff = PetroConfig.PHI_CUTOFF if phi_cutoff is None else phi_cutoff
+    vsh_cutoff = PetroConfig.VSH_CUTOFF if vsh_cutoff is None else vsh_cutoff
+    sw_cutoff = PetroConfig.SW_CUTOFF if sw_cutoff is None else sw_cutoff
+
+    get = lambda name: np.asarray(curves[name], dtype=np.float64)
+    size = len(curves['GR'])
+    empty = np.full(size, np.nan)
+
+    if vsh_precalc:
+        vsh = get('VSH')
+    elif gr_limits is not None:
+        vsh = vsh_larionov_array(get('GR'), *gr_limits)
+    else:
+        vsh = empty
+
+    rhob = get('RHOB')
+    nphi = get('NPHI')
+    litho = classify_lithology_array(vsh, rhob, get('PEF'), dominant_matrix)
+    if litho_codes is not None:
+        litho = np.where(litho_codes >= 0, litho_codes, litho).astype(np.int8)
+    rho_ma = rho_matrix_array(litho, dominant_rho)
+
+    if phit_precalc:
+        phi_t = get('PHIT')
+    elif has_rhob:
+        phi_t = np.where(
+            np.isnan(nphi),
+            porosity_density_array(rhob, rho_ma, PetroConfig.RHO_FLUID, vsh),
+            porosity_neutron_density_array(nphi, rhob, rho_ma, PetroConfig.RHO_FLUID, vsh)
+        )
+    else:
+        phi_t = empty
+    phi_e = phi_t * (1 - vsh)
+
+    if has_rt:
+        saturations = saturation_models_array(phi_e, get('RT'), vsh, a, m, n, rw, rsh)
+    else:
+        saturations = {column: empty for column in SW_MODEL_COLUMNS}
+    sw = saturations[sw_model_column(sw_model)]
+    perm = permeability_kozeny_array(phi_e, vsh)
+
+    is_pay = (np.nan_to_num(phi_e, nan=0.0) >= phi_cutoff) & (np.nan_to_num(vsh, nan=1.0) <= vsh_cutoff)
+    if has_rt:
+        is_pay &= np.nan_to_num(sw, nan=1.0) <= sw_cutoff
+
+    return {
+        'VSH': vsh, 'LITOLOGIA': litho, 'RHO_MATRIX': rho_ma,
+        'PHI_T': phi_t, 'PHI_E': phi_e, 'SW': sw, **saturations, 'PERM': perm, 'IS_PAY': is_pay,
+    }
+
+
+# Filtros de suavizado disponibles
+SMOOTHING_METHODS = ('median', 'savgol', 'mean')
+
+# Curvas que se suavizan antes de los cálculos
+SMOOTHED_CURVES = ('GR', 'RHOB', 'NPHI')
+
+
+def _segment_bounds(valid):
+    """Inicio y fin (inclusive) de cada tramo continuo de muestras válidas
+
+    valid es un arreglo 2-D (muestras × curvas); los tramos no cruzan de una
+    curva a otra. Los índices son sobre el arreglo aplanado por columnas.
+    """
+    flat = valid.ravel(order='F')
+    first_row = np.zeros(valid.shape, dtype=bool)
+    first_row[0, :] = True
+    last_row = np.zeros(valid.shape, dtype=bool)
+    last_row[-1, :] = True
+    prev = np.concatenate(([False], flat[:-1])) & ~first_row.ravel(order='F')
+    nxt = np.concatenate((flat[1:], [False])) & ~last_row.ravel(order='F')
+    starts = np.flatnonzero(flat & ~prev)
+    ends = np.flatnonzero(flat & ~nxt)
+    return starts, ends
+
+
+def _reflect(local, lengths):
+    """Índice local reflejado dentro de un tramo de largo lengths (modo 'reflect')"""
+    period = 2 * lengths
+    pos = np.mod(local, period)
+    return np.where(pos < lengths, pos, period - 1 - pos)
+
+
+def smooth_array(values, windows, method='median', polyorder=2):
+    """Suaviza varias curvas a la vez respetando los huecos de datos
+
+    Cada tramo continuo sin NaN se filtra como una serie independiente, con
+    reflexión en sus extremos (modo 'reflect' de scipy): nunca se mezclan
+    valores de lados opuestos de un hueco. Las muestras válidas de todas las
+    curvas con la misma ventana se filtran en una sola llamada; solo las
+    muestras a menos de window // 2 del borde de un tramo se recalculan con su
+    vecindad reflejada.
+
+    Args:
+        values: Arreglo 2-D (muestras × curvas)
+        windows: Ventana por curva (impar; 1 = sin suavizar)
+        method: 'median', 'savgol' o 'mean'
+        polyorder: Orden del polinomio Savitzky-Golay
+
+    Returns:
+        Arreglo float64 con la misma forma (NaN donde no había datos)
+    """
+    from scipy.ndimage import median_filter, uniform_filter1d
+    from scipy.signal import savgol_coeffs, savgol_filter
+
+    if method not in SMOOTHING_METHODS:
+        raise ValueError(f"Método de suavizado desconocido: {method}")
+    # Copia única en orden por columnas: cada curva es un bloque contiguo
+    result = np.array(values, dtype=np.float64, order='F', ndmin=2)
+    windows = np.asarray(windows, dtype=int)
+
+    for window in np.unique(windows):
+        if window <= 1 or (method == 'savgol' and window <= polyorder):
+            continue
+        cols = np.flatnonzero(windows == window)
+        whole = len(cols) == result.shape[1]
+        block = result if whole else np.asfortranarray(result[:, cols])
+        flat = block.ravel(order='F')
+        valid = ~np.isnan(block)
+        starts, ends = _segment_bounds(valid)
+        if len(starts) == 0:
+            continue
+
+        # Muestras cerca del borde de cada tramo: vecindad reflejada dentro del tramo
+        h = window // 2
+        lengths = ends - starts + 1
+        offsets = np.arange(h)
+        local = np.concatenate([np.broadcast_to(offsets, (len(starts), h)),
+                                lengths[:, None] - 1 - offsets], axis=1)
+        seg = np.broadcast_to(np.arange(len(starts))[:, None], local.shape)
+        inside = (local >= 0) & (local < lengths[:, None])
+        local, seg = local[inside], seg[inside]
+        pos, first = np.unique(starts[seg] + local, return_index=True)
+        local, seg = local[first], seg[first]
+        neighbours = local[:, None] + np.arange(-h, h + 1)
+        window_values = flat[starts[seg][:, None] + _reflect(neighbours, lengths[seg][:, None])]
+
+        # Filtro de todas las muestras válidas concatenadas (exacto lejos de los bordes)
+        valid_flat = valid.ravel(order='F')
+        series = flat[valid_flat]
+        if method == 'median':
+            flat[valid_flat] = median_filter(series, size=window)
+            flat[pos] = np.median(window_values, axis=1)
+        elif method == 'savgol':
+            flat[valid_flat] = savgol_filter(series, window, polyorder, mode='nearest')
+            flat[pos] = window_values @ savgol_coeffs(window, polyorder, use='dot')
+        else:
+            flat[valid_flat] = uniform_filter1d(series, size=window)
+            flat[pos] = window_values.mean(axis=1)
+
+        if not whole:
+            result[:, cols] = block
+
+    return result
+
+
+def smooth_curves(df, columns, method='median', window=5, min_valid=10, polyorder=2):
+    """Suaviza varias curvas de un DataFrame en una sola pasada (ver smooth_array)
+
+    Args:
+        df: DataFrame con las curvas
+        columns: Curvas a suavizar (las ausentes se ignoran)
+        method: 'median', 'savgol' o 'mean'
+        window: Ventana común o diccionario {curva: ventana}; se fuerza a impar
+        min_valid: Curvas con menos muestras válidas no se suavizan
+
+    Returns:
+        DataFrame con las curvas suavizadas (mismo dtype)
+    """
+    cols = [c for c in columns if c in df.columns and df[c].notna().sum() > min_valid]
+    if not cols:
+        return df
+    windows = [window.get(c, 1) if isinstance(window, dict) else window for c in cols]
+    windows = [w + 1 if w > 1 and w % 2 == 0 else w for w in windows]
+    smoothed = smooth_array(df[cols].to_numpy(dtype=np.float64), windows, method, polyorder)
+    df = df.copy()
+    for i, col in enumerate(cols):
+        df[col] = smoothed[:, i].astype(df[col].dtype, copy=False)
+    return df
+
+
 def smooth_curve(data, window=5):
-    """Suaviza curva con filtro de mediana"""
+    """Suaviza curva con filtro de mediana (por tramos continuos sin NaN)"""
     valid = data.notna()
     if valid.sum() < window:
         return data
-    smoothed = data.copy()
-    smoothed[valid] = median_filter(data[valid], size=window)
-    return smoothed
+    name = data.name if data.name is not None else 0
+    return smooth_curves(data.to_frame(name), [name], window=window, min_valid=0)[name]
+
 
+def litho_counts(series):
+    """Conteo de muestras por litología (solo clases presentes)"""
+    counts = series.value_counts()
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(str)
+    return counts
+
+
+# Rango físico válido de cada curva (mínimo, máximo) en sus unidades habituales
+QC_RANGES = {
+    'GR': (0.0, 350.0),
+    'RHOB': (1.5, 3.2),
+    'NPHI': (-0.15, 1.0),
+    'RT': (0.05, 100000.0),
+    'PEF': (0.0, 15.0),
+    'DT': (30.0, 250.0),
+    'CALI': (3.0, 30.0),
+}
+
+
+def flag_bad_data(df, curve_name, min_val=None, max_val=None):
+    """Marca datos fuera de rango con la regla RANGE del QC (por defecto, el rango de QC_RANGES)
+
+    Es la misma máscara que el bit RANGE de log_qc.evaluate_qc para la curva.
+    """
+    from .log_qc import out_of_range
 
-def flag_bad_data(df, curve_name, min_val, max_val):
-    """Marca datos fuera de rango"""
     if curve_name not in df.columns:
         return pd.Series(False, index=df.index)
-    return (df[curve_name] < min_val) | (df[curve_name] > max_val)
+    default_min, default_max = QC_RANGES.get(curve_name, (-np.inf, np.inf))
+    min_val = default_min if min_val is None else min_val
+    max_val = default_max if max_val is None else max_val
+    return pd.Series(out_of_range(df[curve_name].to_numpy(dtype=np.float64), min_val, max_val), index=df.index)
 
 
 def clean_depth_data(df):
@@ -212,19 +631,23 @@ def clean_depth_data(df):
     return df
 
 
-def detect_dominant_matrix(df):
-    """Detecta matriz dominante del pozo"""
-    if not df['RHOB'].notna().any():
+def detect_dominant_matrix(df, stats=None):
+    """Detecta matriz dominante del pozo
+
+    Args:
+        df: DataFrame con RHOB y, si existen, PEF y GR
+        stats: CurveStats del pozo (se calcula si no se pasa)
+    """
+    if stats is None:
+        stats = CurveStats(df, ['RHOB', 'PEF', 'GR'])
+    if not stats.has_data('RHOB'):
         return 'ARENISCA', 2.65
     
-    rhob_valid = df['RHOB'].dropna()
-    rhob_median = rhob_valid.median()
-    rhob_p25 = rhob_valid.quantile(0.25)
-    rhob_p75 = rhob_valid.quantile(0.75)
+    rhob_median = stats.median('RHOB')
+    rhob_p75 = stats.quantile('RHOB', 0.75)
     
-    if 'PEF' in df.columns and df['PEF'].notna().any():
-        pef_valid = df['PEF'].dropna()
-        pef_median = pef_valid.median()
+    if stats.has_data('PEF'):
+        pef_median = stats.median('PEF')
         
         if pef_median > 4.5:
             if rhob_median > 2.80:
@@ -249,9 +672,8 @@ def detect_dominant_matrix(df):
         if rhob_p75 > 2.75:
             return 'CALIZA', 2.71
         else:
-            if 'GR' in df.columns and df['GR'].notna().any():
-                gr_median = df['GR'].dropna().median()
-                if gr_median < 50:
+            if stats.has_data('GR'):
+                if stats.median('GR') < 50:
                     return 'CALIZA', 2.71
                 else:
                     return 'ARENISCA', 2.65
@@ -260,9 +682,8 @@ def detect_dominant_matrix(df):
     elif rhob_median < 2.60:
         return 'ARENISCA', 2.65
     else:
-        if 'GR' in df.columns and df['GR'].notna().any():
-            gr_median = df['GR'].dropna().median()
-            if gr_median < 60:
+        if stats.has_data('GR'):
+            if stats.median('GR') < 60:
                 return 'CALIZA', 2.71
             else:
                 return 'ARENISCA', 2.65
@@ -270,24 +691,26 @@ def detect_dominant_matrix(df):
             return 'ARENISCA', 2.65
 
 
-def get_valid_data_range(df, key_curves=['GR', 'RHOB', 'NPHI', 'RT', 'CALI']):
-    """Encuentra rango de profundidad con datos válidos"""
-    available = [c for c in key_curves if c in df.columns and df[c].notna().any()]
-    
-    if not available:
-        return df['DEPTH_FT'].min(), df['DEPTH_FT'].max()
-    
-    has_data = df[available].notna().any(axis=1)
+# Curvas que delimitan el intervalo con datos del pozo
+KEY_CURVES = ['GR', 'RHOB', 'NPHI', 'RT', 'CALI']
+
+
+def get_valid_data_range(df, key_curves=KEY_CURVES, stats=None):
+    """Encuentra rango de profundidad con datos válidos
+
+    Args:
+        df: DataFrame ordenado por DEPTH_FT
+        key_curves: Curvas que se consideran
+        stats: CurveStats del pozo (se calcula si no se pasa)
+    """
+    if stats is None or not all(c in stats for c in key_curves if c in df.columns):
+        stats = CurveStats(df, [c for c in key_curves if c in df.columns])
+    valid_range = stats.valid_range(key_curves)
     
-    if not has_data.any():
+    if valid_range is None:
         return df['DEPTH_FT'].min(), df['DEPTH_FT'].max()
     
-    valid_indices = has_data[has_data].index
-    first_idx = valid_indices[0]
-    last_idx = valid_indices[-1]
-    
-    depth_start = df.loc[first_idx, 'DEPTH_FT']
-    depth_end = df.loc[last_idx, 'DEPTH_FT']
+    depth_start, depth_end = valid_range
     
     margin = (depth_end - depth_start) * 0.02
     
@@ -0,0 +1,304 @@
+# ==========================================================
+# MÓDULO: FLUJO DE PROCESAMIENTO DE UN POZO (SIN INTERFAZ)
+# ==========================================================
+import time
+
+from .petrofisica import (
+    PetroConfig, DEPTH_ALIASES, CURVE_ALIASES, SMOOTHED_CURVES, KEY_CURVES,
+    clean_depth_data, detect_dominant_matrix, smooth_curves, petro_stages,
+)
+from .curve_stats import CurveStats
+from .pay_zones import extract_pay_zones, pay_summary, sample_edges, zone_pay_mask
+from .cutoff_index import CutoffIndex
+from .depth_matching import (
+    DEPTH_MATCH_CURVES, DEPTH_MATCH_MAX_SHIFT_FT, DEPTH_MATCH_REFERENCE, DEPTH_MATCH_WINDOW_FT, depth_match
+)
+from .log_qc import QC_SPIKE_THRESHOLD, evaluate_qc, mask_flagged
+from .las_ingest import read_las_projected
+from .resampling import DepthGrid, resample_well
+from .export_cache import bytes_fingerprint
+from .well_model import STAGE_INPUT_CURVES, map_standard_curves, compact_curves, litho_from_codes, session_well_frame
+
+
+# Curvas resumidas en las estadísticas del pozo (PERM solo con valores > 0)
+SUMMARY_CURVES = ('PHI_E', 'VSH', 'SW', 'PERM')
+
+
+def default_pipeline_config():
+    """Configuración de process_well con los valores por defecto de la app"""
+    return {
+        'A': PetroConfig.A,
+        'M': PetroConfig.M,
+        'N': PetroConfig.N,
+        'RW': PetroConfig.RW,
+        'RSH': PetroConfig.RSH,
+        'SW_MODEL': PetroConfig.SW_MODEL,
+        'PHI_CUTOFF': PetroConfig.PHI_CUTOFF,
+        'VSH_CUTOFF': PetroConfig.VSH_CUTOFF,
+        'SW_CUTOFF': PetroConfig.SW_CUTOFF,
+        'PAY_MIN_THICKNESS': 0.0,
+        'PAY_MERGE_GAP': 0.0,
+        'RESAMPLE_STEP': None,
+        'RESAMPLE_ANCHOR': 0.0,
+        'DEPTH_MATCH_MODE': 'bulk',
+        'DEPTH_MATCH_REFERENCE': DEPTH_MATCH_REFERENCE,
+        'DEPTH_MATCH_MAX_SHIFT': DEPTH_MATCH_MAX_SHIFT_FT,
+        'DEPTH_MATCH_WINDOW': DEPTH_MATCH_WINDOW_FT,
+        'QC_MASK': False,
+        'QC_SPIKE_THRESHOLD': QC_SPIKE_THRESHOLD,
+        'SMOOTHING_METHOD': 'median',
+        'SMOOTHING_WINDOW': 5,
+    }
+
+
+def config_key(config):
+    """Clave hashable de una configuración (los dicts anidados se ordenan)"""
+    return tuple(sorted(
+        (name, tuple(sorted(value.items())) if isinstance(value, dict) else value)
+        for name, value in config.items()
+    ))
+
+
+def well_name_from_file(file_name):
+    """Nombre del pozo a partir del nombre del archivo (como en la app)"""
+    return file_name.replace('.las', '').upper()
+
+
+def _no_progress(pct):
+    pass
+
+
+# Curvas de CurveStats que deciden la matriz, los límites de GR y el intervalo con datos
+STATS_CURVES = list(dict.fromkeys(STAGE_INPUT_CURVES + KEY_CURVES))
+
+
+def matrix_parameters(curve_stats, config):
+    """Matriz dominante (sobre las curvas sin suavizar) y parámetros de Archie que le corresponden"""
+    dominant_matrix, dominant_rho = detect_dominant_matrix(None, curve_stats)
+    archie = PetroConfig.ARCHIE_PARAMS.get(dominant_matrix, {})
+    return {
+        'dominant_matrix': dominant_matrix,
+        'dominant_rho': dominant_rho,
+        'a': archie.get('A', config['A']),
+        'm': archie.get('M', config['M']),
+        'n': archie.get('N', config['N']),
+    }
+
+
+def stage_parameters(curve_stats, matrix, config):
+    """Argumentos de petro_stages que dependen del pozo completo (curvas ya suavizadas)
+
+    Returns:
+        dict de argumentos con nombre de petro_stages (sin curves ni litho_codes)
+    """
+    vsh_precalc = curve_stats.has_data('VSH')
+    gr_limits = None
+    if not vsh_precalc and curve_stats.has_data('GR'):
+        gr_limits = (curve_stats.quantile('GR', 0.02), curve_stats.quantile('GR', 0.98))
+    return {
+        **matrix,
+        'gr_limits': gr_limits,
+        'vsh_precalc': vsh_precalc,
+        'phit_precalc': curve_stats.has_data('PHIT'),
+        'has_rhob': curve_stats.has_data('RHOB'),
+        'has_rt': curve_stats.has_data('RT'),
+        'rw': config['RW'], 'rsh': config['RSH'], 'sw_model': config['SW_MODEL'],
+        'phi_cutoff': config['PHI_CUTOFF'], 'vsh_cutoff': config['VSH_CUTOFF'], 'sw_cutoff': config['SW_CUTOFF'],
+    }
+
+
+def compute_stages(df, params, facies_model=None):
+    """Electrofacies y etapas petrofísicas de un bloque de muestras (pozo completo o un tramo)
+
+    Returns:
+        dict de petro_stages (LITOLOGIA como códigos int8) más FACIES si hay modelo
+    """
+    facies = facies_model.predict(df) if facies_model is not None else None
+    stages = petro_stages(
+        {c: df[c].to_numpy() for c in STAGE_INPUT_CURVES}, **params,
+        litho_codes=facies_model.litho_codes(facies) if facies is not None else None
+    )
+    if facies is not None:
+        stages['FACIES'] = facies
+    return stages
+
+
+def vsh_source(params):
+    """Origen de VSH: 'precalc', 'GR' o None"""
+    return 'precalc' if params['vsh_precalc'] else ('GR' if params['gr_limits'] is not None else None)
+
+
+def effective_config(params, config):
+    """Parámetros efectivos de un pozo procesado (los que se exportan)"""
+    return {
+        'DOMINANT_MATRIX': params['dominant_matrix'],
+        'DOMINANT_RHO': params['dominant_rho'],
+        'A': params['a'],
+        'M': params['m'],
+        'N': params['n'],
+        **{key: config[key] for key in (
+            'RW', 'RSH', 'SW_MODEL', 'PHI_CUTOFF', 'VSH_CUTOFF', 'SW_CUTOFF', 'PAY_MIN_THICKNESS', 'PAY_MERGE_GAP',
+            'DEPTH_MATCH_MODE', 'DEPTH_MATCH_REFERENCE', 'DEPTH_MATCH_MAX_SHIFT', 'QC_MASK', 'QC_SPIKE_THRESHOLD',
+        )},
+    }
+
+
+def process_well(raw_bytes, well_name, config=None, facies_model=None, progress=None):
+    """Lectura → profundidad → mapeo → ajuste de profundidad → QC → matriz →
+    suavizado → etapas petrofísicas → zonas productivas
+
+    No usa la interfaz ni modifica PetroConfig: todos los parámetros salen de
+    config, por lo que puede ejecutarse en varios hilos a la vez.
+
+    Args:
+        raw_bytes: Contenido del archivo LAS
+        config: dict de default_pipeline_config (las claves ausentes toman su valor por defecto)
+        facies_model: ElectrofaciesModel ajustado o None
+        progress: Función opcional progress(pct) con pct de 0 a 100
+
+    Returns:
+        dict con df (pozo completo procesado), well_df (session_well_frame),
+        source (LasSource), config (parámetros efectivos, para exportar),
+        curve_stats, stats {curva: resumen}, pay_zones, pay_totals y los
+        informes de cada paso
+    """
+    config = {**default_pipeline_config(), **(config or {})}
+    progress = progress or _no_progress
+    start = time.perf_counter()
+
+    source, df = read_las_projected(raw_bytes)
+    original_columns = len(source.curve_names)
+    # Estadísticas de las columnas ya decodificadas, para el explorador
+    source.column_stats(list(df.columns))
+    progress(10)
+
+    depth_col = next((alias for alias in DEPTH_ALIASES if alias in df.columns), df.columns[0])
+    df = df.rename(columns={depth_col: 'DEPTH_FT'})
+    df = clean_depth_data(df)
+    samples_before = len(df)
+    step = config['RESAMPLE_STEP']
+    resampled = bool(step) and len(df) > 1
+    if resampled:
+        grid = DepthGrid.covering(df['DEPTH_FT'].iloc[0], df['DEPTH_FT'].iloc[-1], step, config['RESAMPLE_ANCHOR'])
+        df = resample_well(df, grid)
+    df['DEPTH'] = df['DEPTH_FT'] * 0.3048
+
+    df, available_curves = map_standard_curves(df, CURVE_ALIASES)
+    df = compact_curves(df)
+    df, depth_report = depth_match(
+        df, config['DEPTH_MATCH_REFERENCE'], ('GR',) + DEPTH_MATCH_CURVES, config['DEPTH_MATCH_MODE'],
+        config['DEPTH_MATCH_MAX_SHIFT'], config['DEPTH_MATCH_WINDOW']
+    )
+    progress(25)
+
+    log_qc = evaluate_qc(df, spike_threshold=config['QC_SPIKE_THRESHOLD'])
+    if config['QC_MASK']:
+        df = mask_flagged(df, log_qc)
+    df['QC_FLAGS'] = log_qc.sample_flags()
+    progress(40)
+
+    curve_stats = CurveStats(df, STATS_CURVES)
+    matrix = matrix_parameters(curve_stats, config)
+
+    df = smooth_curves(df, SMOOTHED_CURVES, config['SMOOTHING_METHOD'], config['SMOOTHING_WINDOW'])
+    curve_stats.update(df, SMOOTHED_CURVES)
+    progress(55)
+
+    params = stage_parameters(curve_stats, matrix, config)
+    stages = compute_stages(df, params, facies_model)
+    progress(75)
+
+    stages['LITOLOGIA'] = litho_from_codes(stages['LITOLOGIA'])
+    df = df.assign(**stages)
+    df = compact_curves(df)
+    curve_stats.update(df, list(SUMMARY_CURVES), positive=('PERM',))
+
+    pay_zones = extract_pay_zones(df, config['PAY_MIN_THICKNESS'], config['PAY_MERGE_GAP'])
+    # IS_PAY filtrado por zonas: curvas y exportaciones cuadran con las zonas
+    # (el índice de cutoffs usa el pay por muestra, sin este filtro)
+    df['IS_PAY'] = zone_pay_mask(df, pay_zones)
+    edges = sample_edges(df['DEPTH_FT'].to_numpy())
+    progress(90)
+
+    result = {
+        'well_name': well_name,
+        'file_fingerprint': bytes_fingerprint(raw_bytes),
+        'source': source,
+        'original_columns': original_columns,
+        'samples_before_resample': samples_before,
+        'resampled': resampled,
+        'samples': len(df),
+        'df': df,
+        'well_df': session_well_frame(df),
+        'available_curves': available_curves,
+        'depth_report': depth_report,
+        'qc_summary': log_qc.summary(),
+        'qc_washout_checked': log_qc.washout_checked,
+        'curve_stats': curve_stats,
+        'vsh_source': vsh_source(params),
+        'config': effective_config(params, config),
+        'stats': {col: curve_stats.summary(col) for col in SUMMARY_CURVES
+                  if curve_stats[col]['nulls'] < len(df)},
+        'pay_zones': pay_zones,
+        'pay_totals': pay_summary(pay_zones),
+        'interval_ft': float(edges[-1] - edges[0]) if len(edges) else 0.0,
+        'cutoff_index': CutoffIndex(df),
+    }
+    result['seconds'] = time.perf_counter() - start
+    progress(100)
+    return result
+
+
+class FaciesWells:
+    """Pozos de entrada de ElectrofaciesModel.fit, reiterables sin retenerlos
+
+    Cada recorrido decodifica de nuevo un LAS por vez (solo las curvas de
+    FACIES_CURVES), de modo que en memoria hay un único pozo aunque fit
+    recorra la colección varias veces. Las fuentes son bytes de LAS o rutas
+    de archivo; las rutas se leen en cada pasada.
+    """
+
+    def __init__(self, sources, passes=1, progress=None):
+        from .electrofacies import FACIES_CURVES
+
+        self.sources = list(sources)
+        self.curves = list(FACIES_CURVES)
+        self.aliases = {curve: CURVE_ALIASES[curve] for curve in FACIES_CURVES}
+        self.passes = max(passes, 1)
+        self.progress = progress or _no_progress
+        self._decoded = 0
+
+    def __len__(self):
+        return len(self.sources)
+
+    def _read(self, source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return source
+        with open(source, 'rb') as f:
+            return f.read()
+
+    def __iter__(self):
+        total = max(len(self.sources) * self.passes, 1)
+        for source in self.sources:
+            _, df = read_las_projected(self._read(source), curve_aliases=self.aliases)
+            df, _ = map_standard_curves(df, self.aliases)
+            frame = compact_curves(df[self.curves])
+            del df
+            self._decoded += 1
+            self.progress(min(95 * self._decoded / total, 95))
+            yield frame
+
+
+def fit_facies_model(raw_files, n_clusters, seed=42, progress=None):
+    """Ajusta un ElectrofaciesModel sobre las curvas de entrada de varios LAS
+
+    raw_files son bytes de LAS o rutas de archivo. Los pozos se decodifican
+    en cada pasada del ajuste (FaciesWells) en lugar de retenerse todos.
+    """
+    from .electrofacies import ElectrofaciesModel
+
+    progress = progress or _no_progress
+    model = ElectrofaciesModel(n_clusters, seed=seed)
+    model.fit(FaciesWells(raw_files, passes=model.fit_passes, progress=progress))
+    progress(100)
+    return model
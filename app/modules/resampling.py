@@ -0,0 +1,215 @@
+# ==========================================================
+# MÓDULO: REMUESTREO A MALLA UNIFORME DE PROFUNDIDAD
+# ==========================================================
+import numpy as np
+import pandas as pd
+
+
+# Columnas que se remuestrean por vecino más cercano (no se interpolan)
+CATEGORICAL_COLUMNS = ('LITOLOGIA', 'IS_PAY')
+
+
+class DepthGrid:
+    """Malla uniforme de profundidad: start + step * i, con i en [0, size)
+
+    Las posiciones en la malla se obtienen aritméticamente (sin búsquedas).
+    Dos mallas con el mismo paso y ancla son submallas de la misma malla de campo.
+    """
+
+    def __init__(self, start, step, size):
+        if step <= 0:
+            raise ValueError("El paso de la malla debe ser positivo")
+        self.start = float(start)
+        self.step = float(step)
+        self.size = max(int(size), 0)
+
+    @classmethod
+    def covering(cls, depth_min, depth_max, step, anchor=0.0):
+        """Malla con nodos en anchor + k * step dentro de [depth_min, depth_max]"""
+        k0 = np.ceil((depth_min - anchor) / step - 1e-9)
+        k1 = np.floor((depth_max - anchor) / step + 1e-9)
+        return cls(anchor + k0 * step, step, k1 - k0 + 1)
+
+    @property
+    def stop(self):
+        """Profundidad del último nodo"""
+        return self.start + self.step * (self.size - 1)
+
+    @property
+    def depths(self):
+        return self.start + self.step * np.arange(self.size)
+
+    def index_of(self, depth):
+        """Índice del nodo más cercano a depth (escalar o arreglo); -1 fuera de la malla"""
+        idx = np.rint((np.asarray(depth, dtype=np.float64) - self.start) / self.step).astype(np.int64)
+        idx = np.where((idx >= 0) & (idx < self.size), idx, -1)
+        return int(idx) if idx.ndim == 0 else idx
+
+    def slice_between(self, top, base):
+        """slice de los nodos comprendidos entre top y base"""
+        i0 = max(int(np.ceil((top - self.start) / self.step - 1e-9)), 0)
+        i1 = min(int(np.floor((base - self.start) / self.step + 1e-9)) + 1, self.size)
+        return slice(i0, max(i0, i1))
+
+    def subgrid(self, depth_min, depth_max):
+        """Submalla (mismo paso y fase) que cubre [depth_min, depth_max]
+
+        Returns:
+            (DepthGrid, desplazamiento del primer nodo en esta malla)
+        """
+        sl = self.slice_between(depth_min, depth_max)
+        return DepthGrid(self.start + sl.start * self.step, self.step, sl.stop - sl.start), sl.start
+
+    def __repr__(self):
+        return f"DepthGrid(start={self.start}, step={self.step}, size={self.size})"
+
+
+def median_step(depth):
+    """Paso de muestreo típico (mediana de las diferencias positivas)"""
+    diffs = np.diff(np.asarray(depth, dtype=np.float64))
+    diffs = diffs[diffs > 0]
+    return float(np.median(diffs)) if len(diffs) else 0.0
+
+
+def _bracket(depth, targets):
+    """Índices izquierdo/derecho y peso lineal de cada profundidad objetivo"""
+    n = len(depth)
+    right = np.searchsorted(depth, targets, side='left')
+    right_c = np.minimum(right, n - 1)
+    exact = depth[right_c] == targets
+    left = np.where(exact, right_c, np.maximum(right - 1, 0))
+    right = right_c
+    span = depth[right] - depth[left]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = np.where(span > 0, (targets - depth[left]) / span, 0.0)
+    inside = (targets >= depth[0]) & (targets <= depth[-1])
+    return left, right, weight, span, inside
+
+
+def interpolate_at(depth, values, targets):
+    """Interpolación lineal de una curva en profundidades arbitrarias
+
+    Mismas reglas que resample_well: NaN si alguno de los dos vecinos es NaN
+    o si el objetivo cae fuera del rango de depth.
+    """
+    depth = np.asarray(depth, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    targets = np.asarray(targets, dtype=np.float64)
+    if len(depth) == 0:
+        return np.full(len(targets), np.nan)
+    left, right, weight, _, inside = _bracket(depth, targets)
+    lo, hi = values[left], values[right]
+    out = np.where(weight == 0, lo, lo * (1 - weight) + hi * weight)
+    out[~inside] = np.nan
+    return out
+
+
+def resample_well(df, grid, depth_col='DEPTH_FT', categorical=CATEGORICAL_COLUMNS, max_gap=None):
+    """Lleva un pozo a una malla uniforme
+
+    Curvas continuas: interpolación lineal (NaN si alguno de los dos vecinos es
+    NaN). Columnas categóricas, booleanas o no numéricas: vecino más cercano.
+    Fuera del rango del pozo las curvas quedan en NaN (False / sin clase).
+
+    Args:
+        df: DataFrame con depth_col ordenada y sin duplicados (clean_depth_data)
+        grid: DepthGrid destino
+        depth_col: Columna de profundidad
+        categorical: Columnas que no se interpolan
+        max_gap: Hueco máximo entre muestras originales que se interpola (None = sin límite)
+    """
+    depth = df[depth_col].to_numpy(dtype=np.float64)
+    targets = grid.depths
+    out = {depth_col: targets}
+    if len(depth) == 0:
+        return pd.DataFrame(out)
+
+    left, right, weight, span, inside = _bracket(depth, targets)
+    valid = inside if max_gap is None else inside & (span <= max_gap)
+    nearest = np.where(weight < 0.5, left, right)
+
+    continuous = [c for c in df.columns
+                  if c != depth_col and c not in categorical
+                  and pd.api.types.is_float_dtype(df[c])]
+
+    # Todas las curvas continuas en un solo bloque (una sola indexación)
+    if continuous:
+        block = df[continuous].to_numpy(dtype=np.float64)
+        lo = block[left]
+        hi = block[right]
+        w = weight[:, None]
+        values = np.where(w == 0, lo, lo * (1 - w) + hi * w)
+        values[~valid] = np.nan
+        for i, col in enumerate(continuous):
+            out[col] = values[:, i].astype(df[col].dtype, copy=False)
+
+    for col in df.columns:
+        if col == depth_col or col in out:
+            continue
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()[nearest]
+            codes = np.where(valid, codes, -1)
+            out[col] = pd.Categorical.from_codes(codes, dtype=series.dtype)
+        elif pd.api.types.is_bool_dtype(series):
+            out[col] = np.where(valid, series.to_numpy(dtype=bool)[nearest], False)
+        elif pd.api.types.is_numeric_dtype(series):
+            out[col] = np.where(valid, series.to_numpy(dtype=np.float64)[nearest], np.nan)
+        else:
+            taken = series.to_numpy(dtype=object)[nearest]
+            taken[~valid] = None
+            out[col] = taken
+
+    return pd.DataFrame(out, columns=list(df.columns))
+
+
+def field_grid(frames, step=None, anchor=0.0, depth_col='DEPTH_FT'):
+    """Malla común que cubre todos los pozos (paso por defecto: el más fino)"""
+    frames = [df for df in frames if len(df)]
+    if not frames:
+        raise ValueError("No hay pozos con datos para construir la malla")
+    if step is None:
+        step = min(median_step(df[depth_col]) or np.inf for df in frames)
+        if not np.isfinite(step):
+            raise ValueError("No se pudo determinar el paso de muestreo")
+    depth_min = min(float(df[depth_col].min()) for df in frames)
+    depth_max = max(float(df[depth_col].max()) for df in frames)
+    return DepthGrid.covering(depth_min, depth_max, step, anchor)
+
+
+def stack_wells(frames, columns, grid=None, step=None, anchor=0.0, depth_col='DEPTH_FT'):
+    """Apila varios pozos en matrices densas pozos × profundidad sobre una malla común
+
+    Returns:
+        (DepthGrid, dict {columna: ndarray (n_pozos, grid.size)}). Las curvas
+        continuas van en float32 con NaN, LITOLOGIA como códigos int8 (-1 sin
+        dato) e IS_PAY como bool. COVERAGE indica dónde cada pozo tiene datos.
+    """
+    frames = list(frames)
+    if grid is None:
+        grid = field_grid(frames, step, anchor, depth_col)
+
+    n_wells = len(frames)
+    matrices = {'COVERAGE': np.zeros((n_wells, grid.size), dtype=bool)}
+    for i, df in enumerate(frames):
+        if len(df) == 0:
+            continue
+        sub, offset = grid.subgrid(float(df[depth_col].min()), float(df[depth_col].max()))
+        cols = [c for c in columns if c in df.columns and c != depth_col]
+        resampled = resample_well(df[[depth_col] + cols], sub, depth_col)
+        window = slice(offset, offset + sub.size)
+        matrices['COVERAGE'][i, window] = True
+        for col in cols:
+            series = resampled[col]
+            if col not in matrices:
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    matrices[col] = np.full((n_wells, grid.size), -1, dtype=np.int8)
+                elif pd.api.types.is_bool_dtype(series):
+                    matrices[col] = np.zeros((n_wells, grid.size), dtype=bool)
+                else:
+                    matrices[col] = np.full((n_wells, grid.size), np.nan, dtype=np.float32)
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                matrices[col][i, window] = series.cat.codes.to_numpy()
+            else:
+                matrices[col][i, window] = series.to_numpy()
+    return grid, matrices
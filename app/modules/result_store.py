@@ -0,0 +1,100 @@
+# ==========================================================
+# MÓDULO: ALMACÉN COMPARTIDO DE RESULTADOS (LRU POR BYTES DE ARREGLOS)
+# ==========================================================
+import os
+from types import MappingProxyType
+import numpy as np
+import pandas as pd
+
+from .export_cache import ExportCache
+
+
+# Presupuesto por defecto del almacén de resultados por proceso
+RESULT_STORE_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def default_max_bytes():
+    """Presupuesto en bytes: AIWELLLOG_RESULT_CACHE_MB o RESULT_STORE_MAX_BYTES"""
+    max_mb = os.environ.get("AIWELLLOG_RESULT_CACHE_MB")
+    return int(float(max_mb) * 1024 * 1024) if max_mb else RESULT_STORE_MAX_BYTES
+
+
+def _buffer(array):
+    """(dirección, bytes) del buffer de un arreglo NumPy"""
+    return array.__array_interface__['data'][0], array.nbytes
+
+
+def _column_buffer(series):
+    values = series.array
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = values.codes
+    return _buffer(np.asarray(values))
+
+
+def measure_bytes(value, _seen=None):
+    """Bytes de los arreglos de un resultado
+
+    Recorre dicts, listas y atributos de objetos. Los buffers compartidos
+    (p. ej. las columnas de un DataFrame y de su selección de columnas,
+    que comparten memoria con copy-on-write) se cuentan una sola vez. Los
+    objetos con atributo o método nbytes usan ese valor.
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, np.ndarray):
+        buffer = _buffer(value)
+        if buffer in seen:
+            return 0
+        seen.add(buffer)
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        return sum(measure_bytes(value[c], seen) for c in value.columns) + int(value.index.memory_usage())
+    if isinstance(value, pd.Series):
+        try:
+            buffer = _column_buffer(value)
+        except (TypeError, ValueError):
+            return int(value.memory_usage(index=False, deep=True))
+        if buffer in seen:
+            return 0
+        seen.add(buffer)
+        return int(value.memory_usage(index=False))
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, (dict, MappingProxyType)):
+        return sum(measure_bytes(v, seen) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(measure_bytes(v, seen) for v in value)
+    nbytes = getattr(value, 'nbytes', None)
+    if nbytes is not None:
+        return int(nbytes() if callable(nbytes) else nbytes)
+    if hasattr(value, '__dict__'):
+        return measure_bytes(vars(value), seen)
+    return 0
+
+
+class ResultStore(ExportCache):
+    """Resultados procesados compartidos entre sesiones
+
+    Mismas reglas LRU que ExportCache, pero el tamaño de cada entrada son los
+    bytes de sus arreglos (measure_bytes). Los dicts se guardan como
+    MappingProxyType: las sesiones reciben referencias de solo lectura y los
+    DataFrames se protegen con copy-on-write de pandas (siempre activo desde
+    pandas 3.0, la versión mínima de requirements.txt).
+    """
+
+    def __init__(self, max_bytes=None):
+        super().__init__(max_bytes=default_max_bytes() if max_bytes is None else max_bytes)
+
+    def _size(self, data):
+        return measure_bytes(data)
+
+    @staticmethod
+    def freeze(data):
+        """Versión de solo lectura de un resultado (los dicts, como MappingProxyType)"""
+        return MappingProxyType(dict(data)) if isinstance(data, dict) else data
+
+    def put(self, key, data):
+        return super().put(key, self.freeze(data))
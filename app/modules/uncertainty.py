@@ -0,0 +1,246 @@
+# ==========================================================
+# MÓDULO: INCERTIDUMBRE MONTE CARLO (ARCHIE Y CUTOFFS)
+# ==========================================================
+import numpy as np
+import pandas as pd
+
+from .pay_zones import sample_edges, zone_filtered_pay
+from .petrofisica import PetroConfig, saturation_models_array, sw_model_column
+
+
+# Parámetros que pueden variar entre realizaciones
+UNCERTAIN_PARAMS = ('A', 'M', 'N', 'RW', 'PHI_CUTOFF', 'VSH_CUTOFF', 'SW_CUTOFF')
+CUTOFF_PARAMS = ('PHI_CUTOFF', 'VSH_CUTOFF', 'SW_CUTOFF')
+
+# Distribuciones disponibles; la amplitud es una fracción del valor base
+DISTRIBUTIONS = ('fixed', 'uniform', 'triangular', 'normal')
+
+# Métricas por realización
+MC_METRICS = ('NET_PAY_FT', 'HCPV_FT', 'SW_PAY')
+
+# Memoria máxima de los bloques realizaciones × muestras
+MC_CHUNK_BYTES = 64 * 1024 * 1024
+
+# z de los percentiles 10/90 (la amplitud de 'normal' es P10/P90)
+_Z90 = 1.2815515655446004
+
+
+def sample_parameters(base, spec, n, seed=None):
+    """Sortea n realizaciones de los parámetros
+
+    Args:
+        base: dict {parámetro: valor base} (moda / media de la distribución)
+        spec: dict {parámetro: (distribución, amplitud)}; la amplitud es la
+            fracción del valor base que define los extremos (uniforme,
+            triangular) o los percentiles 10/90 (normal). Los parámetros sin
+            spec quedan fijos.
+        n: Número de realizaciones
+        seed: Semilla (None = aleatoria)
+
+    Returns:
+        dict {parámetro: ndarray (n,)}
+    """
+    rng = np.random.default_rng(seed)
+    draws = {}
+    for name in UNCERTAIN_PARAMS:
+        value = float(base[name])
+        dist, spread = spec.get(name, ('fixed', 0.0))
+        if dist not in DISTRIBUTIONS:
+            raise ValueError(f"Distribución desconocida para {name}: {dist}")
+        low, high = value * (1 - spread), value * (1 + spread)
+        if dist == 'fixed' or spread <= 0:
+            values = np.full(n, value)
+        elif dist == 'uniform':
+            values = rng.uniform(low, high, n)
+        elif dist == 'triangular':
+            values = rng.triangular(low, value, high, n)
+        else:
+            values = rng.normal(value, value * spread / _Z90, n)
+        # Parámetros físicos positivos; cutoffs como fracción
+        values = np.clip(values, 0.0, 1.0) if name in CUTOFF_PARAMS else np.maximum(values, 1e-6)
+        draws[name] = values
+    return draws
+
+
+class _WellInputs:
+    """Curvas del pozo preparadas para evaluar muchas realizaciones
+
+    min_thickness y merge_gap son los del filtro de zonas (PAY_MIN_THICKNESS,
+    PAY_MERGE_GAP), que se aplica al pay de cada realización.
+    """
+
+    def __init__(self, df, min_thickness=0.0, merge_gap=0.0):
+        self.phi = np.nan_to_num(df['PHI_E'].to_numpy(dtype=np.float64), nan=0.0)
+        self.vsh = np.nan_to_num(df['VSH'].to_numpy(dtype=np.float64), nan=1.0)
+        rt = df['RT'].to_numpy(dtype=np.float64) if 'RT' in df.columns else np.full(len(df), np.nan)
+        # Curvas sin rellenar para los modelos con término de arcilla
+        self.rt = rt
+        self.vsh_raw = df['VSH'].to_numpy(dtype=np.float64)
+        self.has_rt = bool(np.any(~np.isnan(rt)))
+        # Archie en escala logarítmica. Sin PHI_E o RT positivos, log Rt = -inf
+        # lleva SW a +inf, que el límite superior deja en 1 (regla de petro_stages)
+        positive = (self.phi > 0) & (rt > 0)
+        self.log_phi = np.log(np.where(positive, self.phi, 1.0))
+        with np.errstate(divide='ignore'):
+            self.log_rt = np.where(positive, np.log(np.where(positive, rt, 1.0)), -np.inf)
+        self.edges = sample_edges(df['DEPTH_FT'].to_numpy(dtype=np.float64))
+        self.thickness = np.diff(self.edges)
+        self.min_thickness = min_thickness
+        self.merge_gap = merge_gap
+        self.size = len(df)
+
+    def zone_pay(self, pay):
+        """Pay de cada realización restringido a las zonas que quedan tras el filtro"""
+        return zone_filtered_pay(pay, self.edges, self.min_thickness, self.merge_gap)
+
+
+def _evaluate_chunk(inputs, p, sw_model='ARCHIE', rsh=None):
+    """Métricas de un bloque de realizaciones (arreglos (k, muestras))"""
+    col = lambda name: p[name][:, None]
+    pay = (inputs.phi >= col('PHI_CUTOFF')) & (inputs.vsh <= col('VSH_CUTOFF'))
+    if not inputs.has_rt:
+        net = inputs.zone_pay(pay) @ inputs.thickness
+        return net, np.full(len(net), np.nan), np.full(len(net), np.nan)
+
+    if sw_model == 'ARCHIE':
+        # SW = (a·Rw / (φ^m · Rt))^(1/n), limitada a [0, 1]; 1 sin φ o Rt positivos
+        sw = np.log(col('A') * col('RW')) - col('M') * inputs.log_phi - inputs.log_rt
+        sw /= col('N')
+        np.exp(sw, out=sw)
+        np.minimum(sw, 1.0, out=sw)
+    else:
+        rsh = PetroConfig.RSH if rsh is None else rsh
+        sw = saturation_models_array(inputs.phi, inputs.rt, inputs.vsh_raw, col('A'), col('M'), col('N'),
+                                     col('RW'), rsh, models=(sw_model,))[sw_model_column(sw_model)]
+        sw = np.nan_to_num(sw, nan=1.0)
+    pay &= sw <= col('SW_CUTOFF')
+    pay = inputs.zone_pay(pay)
+
+    weights = np.where(pay, inputs.thickness, 0.0)
+    net = weights.sum(axis=1)
+    sw_pay = np.einsum('ij,ij->i', weights, sw)
+    # HCPV por unidad de área: Σ φ·(1 − Sw)·h en pay
+    np.subtract(1.0, sw, out=sw)
+    sw *= inputs.phi
+    hcpv = np.einsum('ij,ij->i', weights, sw)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sw_pay = np.where(net > 0, sw_pay / net, np.nan)
+    return net, hcpv, sw_pay
+
+
+def evaluate_realizations(df, params, chunk_bytes=MC_CHUNK_BYTES, sw_model='ARCHIE', rsh=None, progress=None,
+                          min_thickness=0.0, merge_gap=0.0):
+    """Evalúa net pay, HCPV y Sw media en pay para cada realización
+
+    VSH y PHI_E no dependen de Archie ni de los cutoffs y se toman del pozo;
+    SW e IS_PAY se recalculan con las mismas reglas que petro_stages para
+    todas las realizaciones a la vez, en bloques de realizaciones que no
+    superan chunk_bytes por arreglo. sw_model y rsh eligen el modelo de
+    saturación (saturation_models_array); Archie usa la forma logarítmica.
+    El net pay es el de las zonas productivas: el pay de cada realización
+    pasa por el filtro de zonas de extract_pay_zones con min_thickness y
+    merge_gap (PAY_MIN_THICKNESS, PAY_MERGE_GAP).
+
+    Args:
+        df: DataFrame del pozo (DEPTH_FT, PHI_E, VSH, RT)
+        params: dict {parámetro: ndarray (n,)} (sample_parameters)
+        progress: Función opcional progress(pct) llamada tras cada bloque
+
+    Returns:
+        DataFrame con una fila por realización: parámetros y MC_METRICS
+    """
+    inputs = _WellInputs(df, min_thickness, merge_gap)
+    n = len(next(iter(params.values())))
+    chunk = max(1, int(chunk_bytes // (8 * max(inputs.size, 1))))
+    metrics = {name: np.empty(n) for name in MC_METRICS}
+    for start in range(0, n, chunk):
+        sl = slice(start, min(start + chunk, n))
+        net, hcpv, sw_pay = _evaluate_chunk(inputs, {k: np.asarray(v[sl], dtype=np.float64) for k, v in params.items()},
+                                            sw_model, rsh)
+        metrics['NET_PAY_FT'][sl] = net
+        metrics['HCPV_FT'][sl] = hcpv
+        metrics['SW_PAY'][sl] = sw_pay
+        if progress is not None:
+            progress(100 * sl.stop / n)
+    return pd.DataFrame({**{k: np.asarray(v) for k, v in params.items()}, **metrics})
+
+
+def percentile_summary(results, metrics=MC_METRICS):
+    """P90 / P50 / P10 de cada métrica (convención de excedencia: P90 es el
+    valor superado por el 90 % de las realizaciones) y la media"""
+    rows = {}
+    for name in metrics:
+        values = results[name].to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            rows[name] = {'P90': np.nan, 'P50': np.nan, 'P10': np.nan, 'MEAN': np.nan}
+            continue
+        p10, p50, p90 = np.percentile(values, [10, 50, 90])
+        rows[name] = {'P90': p10, 'P50': p50, 'P10': p90, 'MEAN': float(values.mean())}
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def tornado(df, base, params, metric='NET_PAY_FT', sw_model='ARCHIE', rsh=None, min_thickness=0.0, merge_gap=0.0):
+    """Sensibilidad de una métrica a cada parámetro (gráfico tornado)
+
+    Cada parámetro se lleva a los percentiles 10 y 90 de sus realizaciones
+    manteniendo los demás en su valor base. Todas las combinaciones se evalúan
+    en un solo bloque.
+
+    Returns:
+        (valor de la métrica en el caso base, DataFrame ordenado por amplitud
+        con PARAM, LOW, HIGH, METRIC_LOW, METRIC_HIGH, SWING)
+    """
+    varied = [name for name in UNCERTAIN_PARAMS if np.ptp(params[name]) > 0]
+    cases = {name: [float(base[name])] for name in UNCERTAIN_PARAMS}
+    for name in varied:
+        low, high = np.percentile(params[name], [10, 90])
+        for other in UNCERTAIN_PARAMS:
+            cases[other] += [low, high] if other == name else [float(base[other])] * 2
+    results = evaluate_realizations(df, {k: np.array(v) for k, v in cases.items()}, sw_model=sw_model, rsh=rsh,
+                                    min_thickness=min_thickness, merge_gap=merge_gap)[metric].to_numpy()
+
+    rows = []
+    for i, name in enumerate(varied):
+        lo, hi = results[1 + 2 * i], results[2 + 2 * i]
+        rows.append({
+            'PARAM': name,
+            'LOW': cases[name][1 + 2 * i],
+            'HIGH': cases[name][2 + 2 * i],
+            'METRIC_LOW': lo,
+            'METRIC_HIGH': hi,
+            'SWING': abs(hi - lo),
+        })
+    table = pd.DataFrame(rows, columns=['PARAM', 'LOW', 'HIGH', 'METRIC_LOW', 'METRIC_HIGH', 'SWING'])
+    return float(results[0]), table.sort_values('SWING', ascending=False, ignore_index=True)
+
+
+def run_monte_carlo(df, base, spec, n=1000, seed=None, chunk_bytes=MC_CHUNK_BYTES, sw_model='ARCHIE', rsh=None,
+                    progress=None, min_thickness=0.0, merge_gap=0.0):
+    """Sorteo, evaluación, percentiles y tornado de net pay en una llamada
+
+    progress (opcional) recibe el avance de 0 a 100, como en process_well,
+    para poder lanzarla como trabajo del JobManager. min_thickness y
+    merge_gap son los del filtro de zonas (evaluate_realizations).
+
+    Returns:
+        dict con 'results' (una fila por realización), 'summary'
+        (percentile_summary), 'base' (métricas con los valores base),
+        'tornado' y 'base_net_pay'
+    """
+    params = sample_parameters(base, spec, n, seed)
+    report = progress or (lambda pct: None)
+    zones = {'min_thickness': min_thickness, 'merge_gap': merge_gap}
+    results = evaluate_realizations(df, params, chunk_bytes, sw_model, rsh,
+                                    progress=lambda pct: report(0.9 * pct), **zones)
+    base_case = evaluate_realizations(df, {name: np.array([float(base[name])]) for name in UNCERTAIN_PARAMS},
+                                      sw_model=sw_model, rsh=rsh, **zones)
+    base_net_pay, tornado_table = tornado(df, base, params, sw_model=sw_model, rsh=rsh, **zones)
+    report(100)
+    return {
+        'results': results,
+        'summary': percentile_summary(results),
+        'base': {name: float(base_case[name].iloc[0]) for name in MC_METRICS},
+        'tornado': tornado_table,
+        'base_net_pay': base_net_pay,
+    }
@@ -0,0 +1,210 @@
+# ==========================================================
+# MÓDULO: CARPETA VIGILADA (SONDEO, ESTABILIZACIÓN Y COLA PERSISTENTE)
+# ==========================================================
+import fnmatch
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+
+# Segundos entre barridos de la carpeta
+WATCH_INTERVAL_SECONDS = 2.0
+
+# Un archivo se procesa cuando su tamaño y mtime no cambian durante este tiempo
+WATCH_SETTLE_SECONDS = 5.0
+
+WATCH_PATTERN = '*.las'
+
+# Intentos por versión de un archivo antes de dejarlo en estado 'error'
+WATCH_MAX_ATTEMPTS = 3
+
+# Estados de la cola
+PENDING, RUNNING, DONE, ERROR = 'pending', 'running', 'done', 'error'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    file_fingerprint TEXT NOT NULL,
+    config_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    well_name TEXT,
+    error TEXT,
+    seconds REAL,
+    queued_at TEXT,
+    processed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_files_status ON files(status, queued_at);
+CREATE INDEX IF NOT EXISTS idx_files_content ON files(file_fingerprint, config_key, status);
+"""
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def scan_directory(directory, pattern=WATCH_PATTERN, recursive=False):
+    """{ruta: (tamaño, mtime_ns)} de los archivos que coinciden con pattern (sin distinguir mayúsculas)"""
+    pattern = pattern.lower()
+    found = {}
+    pending = [directory]
+    while pending:
+        try:
+            entries = list(os.scandir(pending.pop()))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                elif entry.is_file() and fnmatch.fnmatch(entry.name.lower(), pattern):
+                    st = entry.stat()
+                    found[os.path.abspath(entry.path)] = (st.st_size, st.st_mtime_ns)
+            except FileNotFoundError:
+                continue
+    return found
+
+
+class Debouncer:
+    """Filtra las escrituras parciales: un archivo es estable cuando su
+    (tamaño, mtime) no cambia durante settle segundos seguidos"""
+
+    def __init__(self, settle=WATCH_SETTLE_SECONDS):
+        self.settle = settle
+        self._seen = {}
+
+    def update(self, snapshot, now):
+        """Lista de (ruta, (tamaño, mtime_ns)) estables en este barrido"""
+        stable = []
+        for path, signature in snapshot.items():
+            previous = self._seen.get(path)
+            if previous is None or previous[0] != signature:
+                self._seen[path] = (signature, now)
+            elif now - previous[1] >= self.settle:
+                stable.append((path, signature))
+        for path in set(self._seen) - set(snapshot):
+            del self._seen[path]
+        return stable
+
+    def unsettled(self, now):
+        """Archivos vistos que aún no llevan settle segundos sin cambios"""
+        return sum(1 for _, since in self._seen.values() if now - since < self.settle)
+
+
+class IngestQueue:
+    """Cola de archivos persistida en SQLite
+
+    Cada ruta guarda la huella del contenido y la clave de configuración con
+    que se procesó: un archivo solo vuelve a la cola si cambia su contenido
+    (o la configuración), y un contenido ya procesado con otra ruta no se
+    repite. Tras un reinicio, los trabajos que quedaron 'running' vuelven a
+    'pending' (recover).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def signature(self, path):
+        """(tamaño, mtime_ns) registrados para la ruta (None si no está)"""
+        with self._connect() as conn:
+            row = conn.execute('SELECT size, mtime_ns FROM files WHERE path = ?', (path,)).fetchone()
+        return None if row is None else (row['size'], row['mtime_ns'])
+
+    def offer(self, path, signature, file_fingerprint, config_key):
+        """Registra la versión actual de un archivo estable
+
+        Returns:
+            True si quedó en la cola; False si ese contenido ya estaba
+            procesado (o encolado) con la misma configuración
+        """
+        size, mtime_ns = signature
+        with self._connect() as conn:
+            row = conn.execute('SELECT file_fingerprint, config_key FROM files WHERE path = ?', (path,)).fetchone()
+            if row is not None and tuple(row) == (file_fingerprint, config_key):
+                conn.execute('UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?', (size, mtime_ns, path))
+                return False
+            done = conn.execute(
+                'SELECT well_name FROM files WHERE file_fingerprint = ? AND config_key = ? AND status = ? LIMIT 1',
+                (file_fingerprint, config_key, DONE)
+            ).fetchone()
+            status = DONE if done is not None else PENDING
+            conn.execute(
+                'INSERT OR REPLACE INTO files (path, size, mtime_ns, file_fingerprint, config_key, status, '
+                'attempts, well_name, queued_at) VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)',
+                (path, size, mtime_ns, file_fingerprint, config_key, status,
+                 done['well_name'] if done is not None else None, _now())
+            )
+            return status == PENDING
+
+    def recover(self):
+        """Devuelve a la cola los trabajos interrumpidos; número de trabajos"""
+        with self._connect() as conn:
+            return conn.execute('UPDATE files SET status = ? WHERE status = ?', (PENDING, RUNNING)).rowcount
+
+    def claim(self):
+        """Siguiente archivo pendiente (el más antiguo), marcado como 'running'; None si no hay
+
+        Un contenido igual a otro en curso espera a que termine; si ya está
+        procesado, el archivo se marca como hecho sin volver a procesarlo.
+        """
+        with self._connect() as conn:
+            while True:
+                row = conn.execute(
+                    'SELECT path, file_fingerprint, config_key FROM files AS f WHERE status = ? '
+                    'AND NOT EXISTS (SELECT 1 FROM files AS r WHERE r.status = ? '
+                    'AND r.file_fingerprint = f.file_fingerprint AND r.config_key = f.config_key) '
+                    'ORDER BY queued_at LIMIT 1', (PENDING, RUNNING)
+                ).fetchone()
+                if row is None:
+                    return None
+                done = conn.execute(
+                    'SELECT well_name FROM files WHERE file_fingerprint = ? AND config_key = ? AND status = ? LIMIT 1',
+                    (row['file_fingerprint'], row['config_key'], DONE)
+                ).fetchone()
+                if done is None:
+                    break
+                conn.execute('UPDATE files SET status = ?, well_name = ?, processed_at = ? WHERE path = ?',
+                             (DONE, done['well_name'], _now(), row['path']))
+            conn.execute('UPDATE files SET status = ?, attempts = attempts + 1 WHERE path = ?', (RUNNING, row['path']))
+            return {'path': row['path'], 'file_fingerprint': row['file_fingerprint']}
+
+    def complete(self, path, file_fingerprint, well_name, seconds):
+        """Marca la ruta como procesada si su contenido no cambió mientras tanto"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE files SET status = ?, well_name = ?, error = NULL, seconds = ?, processed_at = ? '
+                'WHERE path = ? AND file_fingerprint = ? AND status = ?',
+                (DONE, well_name, seconds, _now(), path, file_fingerprint, RUNNING)
+            )
+
+    def fail(self, path, error, seconds, max_attempts=WATCH_MAX_ATTEMPTS):
+        """Registra un fallo; vuelve a la cola hasta max_attempts intentos"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE files SET status = CASE WHEN attempts < ? THEN ? ELSE ? END, '
+                'error = ?, seconds = ?, processed_at = ? WHERE path = ? AND status = ?',
+                (max_attempts, PENDING, ERROR, error, seconds, _now(), path, RUNNING)
+            )
+
+    def counts(self):
+        """Archivos por estado"""
+        with self._connect() as conn:
+            rows = conn.execute('SELECT status, COUNT(*) FROM files GROUP BY status').fetchall()
+        return {status: 0 for status in (PENDING, RUNNING, DONE, ERROR)} | {row[0]: row[1] for row in rows}
@@ -0,0 +1,345 @@
+# ==========================================================
+# MÓDULO: CATÁLOGO LOCAL DE POZOS (SQLITE)
+# ==========================================================
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+from .pay_zones import net_pay_thickness
+
+
+# Ruta por defecto del catálogo (sobrescribible con AIWELLLOG_CATALOG_PATH)
+DEFAULT_CATALOG_PATH = os.path.join(os.path.expanduser('~'), '.aiwelllog', 'catalog.sqlite')
+
+# Curvas calculadas cuyas estadísticas se indexan (total y dentro de net pay)
+CATALOG_STAT_CURVES = ['PHI_T', 'PHI_E', 'VSH', 'SW', 'PERM']
+
+# Mnemónicos de ~W que se guardan como columnas consultables
+HEADER_FIELDS = {'uwi': 'UWI', 'field': 'FLD', 'company': 'COMP', 'location': 'LOC', 'country': 'CTRY'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS wells (
+    id INTEGER PRIMARY KEY,
+    file_fingerprint TEXT NOT NULL UNIQUE,
+    result_fingerprint TEXT,
+    well_name TEXT NOT NULL,
+    file_name TEXT,
+    uwi TEXT,
+    field TEXT,
+    company TEXT,
+    location TEXT,
+    country TEXT,
+    depth_min REAL,
+    depth_max REAL,
+    samples INTEGER,
+    dominant_matrix TEXT,
+    dominant_rho REAL,
+    net_pay_samples INTEGER,
+    net_pay_ft REAL,
+    config_json TEXT,
+    header_json TEXT,
+    stats_json TEXT,
+    arrays_path TEXT,
+    processed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_wells_name ON wells(well_name);
+CREATE INDEX IF NOT EXISTS idx_wells_field ON wells(field);
+
+CREATE TABLE IF NOT EXISTS well_curves (
+    well_id INTEGER NOT NULL REFERENCES wells(id) ON DELETE CASCADE,
+    standard TEXT NOT NULL,
+    mnemonic TEXT NOT NULL,
+    PRIMARY KEY (well_id, standard)
+);
+CREATE INDEX IF NOT EXISTS idx_curves_standard ON well_curves(standard, well_id);
+
+CREATE TABLE IF NOT EXISTS well_stats (
+    well_id INTEGER NOT NULL REFERENCES wells(id) ON DELETE CASCADE,
+    curve TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    mean REAL,
+    min REAL,
+    max REAL,
+    valid INTEGER NOT NULL,
+    PRIMARY KEY (well_id, curve, scope)
+);
+CREATE INDEX IF NOT EXISTS idx_stats_curve ON well_stats(curve, scope, well_id);
+"""
+
+
+def catalog_path():
+    """Ruta del catálogo según AIWELLLOG_CATALOG_PATH (o la ruta por defecto)"""
+    return os.environ.get('AIWELLLOG_CATALOG_PATH') or DEFAULT_CATALOG_PATH
+
+
+def las_header(las):
+    """Encabezado ~W como diccionario {mnemónico: valor}"""
+    header = {}
+    for item in las.well:
+        value = item.value
+        header[item.mnemonic] = value if isinstance(value, (int, float)) else str(value).strip()
+    return header
+
+
+def _curve_stats(values):
+    valid = values[~np.isnan(values)]
+    if len(valid) == 0:
+        return None, None, None, 0
+    return float(valid.mean()), float(valid.min()), float(valid.max()), int(len(valid))
+
+
+def well_summary_stats(df):
+    """Estadísticas por curva calculada, en todo el pozo ('all') y en net pay ('pay')
+
+    PERM solo considera valores > 0, igual que la tabla de estadísticas de la app.
+    """
+    pay = df['IS_PAY'].to_numpy(dtype=bool) if 'IS_PAY' in df.columns else np.zeros(len(df), dtype=bool)
+    rows = []
+    for curve in CATALOG_STAT_CURVES:
+        if curve not in df.columns:
+            continue
+        values = df[curve].to_numpy(dtype=np.float64)
+        if curve == 'PERM':
+            values = np.where(values > 0, values, np.nan)
+        rows.append((curve, 'all') + _curve_stats(values))
+        rows.append((curve, 'pay') + _curve_stats(values[pay]))
+    return rows
+
+
+class WellCatalog:
+    """Catálogo persistente de pozos procesados
+
+    Cada operación abre su propia conexión, por lo que una instancia puede
+    compartirse entre sesiones de Streamlit. Los arreglos de resultados se
+    guardan como .npz junto a la base de datos.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or catalog_path()
+        self.arrays_dir = os.path.join(os.path.dirname(os.path.abspath(self.path)), 'arrays')
+        os.makedirs(self.arrays_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Conexión con commit al salir y cierre garantizado"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute('PRAGMA foreign_keys=ON')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _query(self, sql, params=()):
+        with self._connect() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    # ------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------
+    def record_well(self, df, well_name, file_fingerprint, result_fingerprint=None,
+                    file_name=None, header=None, curve_mapping=None, config=None,
+                    stats=None, arrays_bytes=None):
+        """Registra (o actualiza) un pozo procesado
+
+        Si el pozo ya está registrado con la misma huella de resultados no se
+        reescribe nada.
+
+        Args:
+            df: DataFrame procesado (DEPTH_FT y columnas calculadas)
+            well_name: Nombre del pozo
+            file_fingerprint: Huella del archivo LAS (identifica el pozo)
+            result_fingerprint: Huella de los resultados (evita reescrituras)
+            file_name: Nombre del archivo original
+            header: Encabezado ~W como diccionario
+            curve_mapping: {nombre estándar: columna original}
+            config: Configuración petrofísica usada
+            stats: Estadísticas mostradas en la app
+            arrays_bytes: Contenido .npz de los resultados
+
+        Returns:
+            id del pozo en el catálogo
+        """
+        header = header or {}
+        config = config or {}
+
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT id, result_fingerprint FROM wells WHERE file_fingerprint = ?',
+                (file_fingerprint,)
+            ).fetchone()
+            if row is not None and result_fingerprint is not None and row[1] == result_fingerprint:
+                return row[0]
+
+        arrays_path = None
+        if arrays_bytes is not None:
+            arrays_path = os.path.join(self.arrays_dir, f'{file_fingerprint}.npz')
+            tmp_path = arrays_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(arrays_bytes)
+            os.replace(tmp_path, arrays_path)
+
+        depth = df['DEPTH_FT']
+        values = {
+            'file_fingerprint': file_fingerprint,
+            'result_fingerprint': result_fingerprint,
+            'well_name': well_name,
+            'file_name': file_name,
+            'depth_min': float(depth.min()) if len(df) else None,
+            'depth_max': float(depth.max()) if len(df) else None,
+            'samples': int(len(df)),
+            'dominant_matrix': config.get('DOMINANT_MATRIX'),
+            'dominant_rho': config.get('DOMINANT_RHO'),
+            'net_pay_samples': int(df['IS_PAY'].sum()) if 'IS_PAY' in df.columns else 0,
+            'net_pay_ft': net_pay_thickness(df),
+            'config_json': json.dumps(config, default=float),
+            'header_json': json.dumps(header, default=str),
+            'stats_json': json.dumps(stats or {}, default=float),
+            'arrays_path': arrays_path,
+            'processed_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        for column, mnemonic in HEADER_FIELDS.items():
+            value = header.get(mnemonic)
+            values[column] = str(value) if value not in (None, '') else None
+
+        columns = ', '.join(values)
+        placeholders = ', '.join('?' for _ in values)
+        updates = ', '.join(f'{c} = excluded.{c}' for c in values if c != 'file_fingerprint')
+
+        with self._connect() as conn:
+            conn.execute(
+                f'INSERT INTO wells ({columns}) VALUES ({placeholders}) '
+                f'ON CONFLICT(file_fingerprint) DO UPDATE SET {updates}',
+                tuple(values.values())
+            )
+            well_id = conn.execute(
+                'SELECT id FROM wells WHERE file_fingerprint = ?', (file_fingerprint,)
+            ).fetchone()[0]
+            conn.execute('DELETE FROM well_curves WHERE well_id = ?', (well_id,))
+            conn.execute('DELETE FROM well_stats WHERE well_id = ?', (well_id,))
+            conn.executemany(
+                'INSERT INTO well_curves (well_id, standard, mnemonic) VALUES (?, ?, ?)',
+                [(well_id, std, mnemonic) for std, mnemonic in (curve_mapping or {}).items()]
+            )
+            conn.executemany(
+                'INSERT INTO well_stats (well_id, curve, scope, mean, min, max, valid) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(well_id,) + row for row in well_summary_stats(df)]
+            )
+        return well_id
+
+    def delete_well(self, well_id):
+        """Elimina un pozo del catálogo y su archivo de arreglos"""
+        with self._connect() as conn:
+            row = conn.execute('SELECT arrays_path FROM wells WHERE id = ?', (well_id,)).fetchone()
+            conn.execute('DELETE FROM wells WHERE id = ?', (well_id,))
+        if row and row[0] and os.path.exists(row[0]):
+            os.remove(row[0])
+
+    # ------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------
+    def list_wells(self, field=None):
+        """Pozos registrados (sin los campos JSON)"""
+        sql = ('SELECT id, well_name, file_name, uwi, field, company, depth_min, depth_max, '
+               'samples, dominant_matrix, net_pay_samples, net_pay_ft, processed_at FROM wells')
+        if field:
+            return self._query(sql + ' WHERE field = ? ORDER BY well_name', (field,))
+        return self._query(sql + ' ORDER BY well_name')
+
+    def get_well(self, well_id):
+        """Registro completo de un pozo (JSON decodificado), o None"""
+        df = self._query('SELECT * FROM wells WHERE id = ?', (well_id,))
+        if df.empty:
+            return None
+        record = df.iloc[0].to_dict()
+        for key in ('config_json', 'header_json', 'stats_json'):
+            record[key[:-5]] = json.loads(record.pop(key) or '{}')
+        record['curves'] = dict(self._query(
+            'SELECT standard, mnemonic FROM well_curves WHERE well_id = ?', (well_id,)
+        ).itertuples(index=False, name=None))
+        return record
+
+    def fields(self):
+        """Campos (FLD) presentes en el catálogo"""
+        return self._query(
+            'SELECT DISTINCT field FROM wells WHERE field IS NOT NULL ORDER BY field'
+        )['field'].tolist()
+
+    def curve_coverage(self):
+        """Número de pozos que tienen cada curva estándar"""
+        return self._query(
+            'SELECT standard, COUNT(*) AS wells FROM well_curves GROUP BY standard ORDER BY wells DESC'
+        )
+
+    def wells_with_curve(self, standard):
+        """Pozos que tienen la curva estándar indicada (con su mnemónico original)"""
+        return self._query(
+            'SELECT w.id, w.well_name, c.mnemonic FROM well_curves c '
+            'JOIN wells w ON w.id = c.well_id WHERE c.standard = ? ORDER BY w.well_name',
+            (standard,)
+        )
+
+    def wells_missing_curve(self, standard):
+        """Pozos que no tienen la curva estándar indicada"""
+        return self._query(
+            'SELECT id, well_name, file_name FROM wells WHERE NOT EXISTS ('
+            'SELECT 1 FROM well_curves c WHERE c.well_id = wells.id AND c.standard = ?) '
+            'ORDER BY well_name',
+            (standard,)
+        )
+
+    def curve_stats(self, curve, scope='all'):
+        """Estadísticas de una curva calculada por pozo"""
+        return self._query(
+            'SELECT w.id, w.well_name, s.mean, s.min, s.max, s.valid FROM well_stats s '
+            'JOIN wells w ON w.id = s.well_id WHERE s.curve = ? AND s.scope = ? '
+            'ORDER BY w.well_name',
+            (curve, scope)
+        )
+
+    def field_average(self, curve, scope='pay', field=None):
+        """Promedio de campo de una curva calculada, ponderado por muestras válidas
+
+        Returns:
+            dict con mean, min, max, samples y wells
+        """
+        sql = ('SELECT SUM(s.mean * s.valid) / SUM(s.valid), MIN(s.min), MAX(s.max), '
+               'SUM(s.valid), COUNT(*) FROM well_stats s JOIN wells w ON w.id = s.well_id '
+               'WHERE s.curve = ? AND s.scope = ? AND s.valid > 0')
+        params = [curve, scope]
+        if field:
+            sql += ' AND w.field = ?'
+            params.append(field)
+        with self._connect() as conn:
+            mean, vmin, vmax, samples, wells = conn.execute(sql, params).fetchone()
+        return {'mean': mean, 'min': vmin, 'max': vmax, 'samples': samples or 0, 'wells': wells}
+
+    def summary(self):
+        """Totales del catálogo: pozos, muestras y net pay"""
+        with self._connect() as conn:
+            wells, samples, pay_ft = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(samples), 0), COALESCE(SUM(net_pay_ft), 0) FROM wells'
+            ).fetchone()
+        return {'wells': wells, 'samples': samples, 'net_pay_ft': pay_ft}
+
+    def load_arrays(self, well_id):
+        """Carga los arreglos de resultados guardados de un pozo
+
+        Returns:
+            (DataFrame, metadatos) o None si el pozo no tiene arreglos guardados
+        """
+        from .data_export import load_npz_results
+
+        with self._connect() as conn:
+            row = conn.execute('SELECT arrays_path FROM wells WHERE id = ?', (well_id,)).fetchone()
+        if not row or not row[0] or not os.path.exists(row[0]):
+            return None
+        return load_npz_results(row[0])
@@ -0,0 +1,124 @@
+# ==========================================================
+# MÓDULO: REPRESENTACIÓN COMPACTA DEL POZO
+# ==========================================================
+import numpy as np
+import pandas as pd
+
+from .petrofisica import CURVE_ALIASES, LITHO_CLASSES, SW_MODEL_COLUMNS
+from .result_store import measure_bytes
+
+
+# Tipo de almacenamiento de las curvas (la profundidad se mantiene en float64)
+CURVE_DTYPE = np.float32
+DEPTH_COLUMNS = ('DEPTH_FT', 'DEPTH')
+
+# Curvas estándar que consumen las etapas petrofísicas (petro_stages)
+STAGE_INPUT_CURVES = ['GR', 'RHOB', 'NPHI', 'RT', 'PEF', 'VSH', 'PHIT']
+
+# Columnas calculadas por el flujo petrofísico
+RESULT_COLUMNS = ['VSH', 'PHI_T', 'PHI_E', 'SW', *SW_MODEL_COLUMNS, 'PERM', 'LITOLOGIA', 'FACIES', 'RHO_MATRIX', 'IS_PAY', 'QC_FLAGS']
+
+# Columnas que la representación anterior añadía al pozo (VSH y SW sobrescribían
+# las curvas estándar del mismo nombre)
+LEGACY_RESULT_COLUMNS = ['PHI_T', 'PHI_E', 'PERM', 'RHO_MATRIX', 'LITOLOGIA', 'IS_PAY']
+
+
+def map_standard_curves(df, curve_aliases=CURVE_ALIASES):
+    """Asigna los nombres estándar renombrando las columnas alias (sin copiar datos)
+
+    Las curvas estándar ausentes se crean vacías (NaN) en CURVE_DTYPE.
+
+    Returns:
+        (DataFrame, diccionario {nombre estándar: columna original})
+    """
+    available_curves = {}
+    renames = {}
+    for standard_name, aliases in curve_aliases.items():
+        for alias in aliases:
+            if alias in df.columns:
+                available_curves[standard_name] = alias
+                if alias != standard_name:
+                    if standard_name in df.columns:
+                        df[standard_name] = df[alias]
+                    else:
+                        renames[alias] = standard_name
+                break
+
+    if renames:
+        df = df.rename(columns=renames)
+
+    missing = [name for name in curve_aliases if name not in available_curves]
+    if missing:
+        empty = pd.DataFrame(
+            {name: np.full(len(df), np.nan, dtype=CURVE_DTYPE) for name in missing},
+            index=df.index
+        )
+        df = pd.concat([df.drop(columns=[c for c in missing if c in df.columns]), empty], axis=1)
+
+    return df, available_curves
+
+
+def compact_curves(df):
+    """Convierte las curvas float64 a CURVE_DTYPE (excepto la profundidad)"""
+    float_cols = {c: CURVE_DTYPE for c in df.columns
+                  if c not in DEPTH_COLUMNS and df[c].dtype == np.float64}
+    if float_cols:
+        df = df.astype(float_cols)
+    return df
+
+
+def litho_from_codes(codes):
+    """LITOLOGIA categórica a partir de códigos sobre LITHO_CLASSES (-1 = sin clase)"""
+    return pd.Categorical.from_codes(codes, categories=LITHO_CLASSES)
+
+
+def session_well_frame(df):
+    """DataFrame del pozo que se conserva en la sesión
+
+    Solo profundidad, curvas estándar y resultados; las columnas originales del
+    LAS que no usa el flujo se descartan.
+    """
+    keep = [c for c in DEPTH_COLUMNS if c in df.columns]
+    keep += [c for c in CURVE_ALIASES if c in df.columns]
+    keep += [c for c in df.columns if c not in keep and c in RESULT_COLUMNS]
+    return df[keep]
+
+
+def memory_report(df, original_columns, available_curves, result=None):
+    """Memoria del DataFrame del pozo frente a la representación anterior
+
+    La representación anterior conservaba todas las columnas del LAS, copias
+    de las curvas estándar con otro nombre, las estándar ausentes como NaN y
+    LEGACY_RESULT_COLUMNS, todo en float64 salvo IS_PAY (bool) y LITOLOGIA
+    (objetos Python). legacy_bytes es una estimación de ese esquema y solo se
+    compara con ese DataFrame (bytes y ratio).
+
+    retained_bytes son los bytes que el proceso conserva realmente por pozo:
+    el resultado completo de process_well (DataFrame completo, LasSource con
+    el LAS crudo, índice de cutoffs, ...) medido como en el ResultStore.
+
+    Args:
+        df: DataFrame que se conserva en la sesión
+        original_columns: Número de columnas leídas del LAS (incluida la profundidad)
+        available_curves: Mapeo {nombre estándar: columna original}
+        result: Resultado de process_well (opcional) para retained_bytes
+    """
+    n = len(df)
+    current_bytes = int(df.memory_usage(index=True, deep=True).sum())
+
+    copied = sum(1 for std, alias in available_curves.items() if std != alias)
+    missing = len(CURVE_ALIASES) - len(available_curves)
+    # Originales + copias estándar + estándar vacías + DEPTH (m) + calculadas en float64
+    # (LITOLOGIA cuenta como un puntero de objeto por fila) + IS_PAY en 1 byte/fila
+    legacy_cols = original_columns + copied + missing + 1 + len(LEGACY_RESULT_COLUMNS) - 1
+    legacy_bytes = 8 * n * legacy_cols + n
+    legacy_bytes += int(df.index.memory_usage())
+
+    return {
+        'samples': n,
+        'columns': len(df.columns),
+        'bytes': current_bytes,
+        'legacy_bytes': legacy_bytes,
+        'ratio': legacy_bytes / current_bytes if current_bytes else 0.0,
+        'retained_bytes': measure_bytes(result) if result is not None else None,
+    }
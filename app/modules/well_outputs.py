@@ -0,0 +1,82 @@
+# ==========================================================
+# MÓDULO: ENTREGABLES DE UN POZO PROCESADO (SIN INTERFAZ)
+# ==========================================================
+from .data_export import (
+    export_csv_bytes, export_excel_bytes, export_npz_bytes, export_parquet_bytes, export_las_bytes,
+    export_pay_zones_csv_bytes
+)
+from .locales import translate
+
+
+# Formatos por pozo; csv incluye también las zonas productivas
+OUTPUT_FORMATS = ('csv', 'xlsx', 'pdf', 'npz', 'parquet', 'las')
+
+OUTPUT_MIME_TYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'pdf': 'application/pdf',
+    'npz': 'application/octet-stream',
+    'parquet': 'application/vnd.apache.parquet',
+    'las': 'text/plain',
+}
+
+# Etiquetas de las estadísticas del PDF (mismas claves de texto que la app)
+STATS_LABEL_KEYS = (('PHI_E', 'effective_porosity'), ('VSH', 'clay_volume'),
+                    ('SW', 'water_saturation'), ('PERM', 'permeability'))
+
+
+def output_name(well_name, fmt):
+    """Nombre de archivo del entregable (los mismos que las descargas de la app)"""
+    return f"{well_name}_analysis.pdf" if fmt == 'pdf' else f"{well_name}_results.{fmt}"
+
+
+def well_stats(result, language):
+    """Estadísticas de process_well con las etiquetas de la app en el idioma indicado"""
+    return {translate(language, key): result['stats'][col]
+            for col, key in STATS_LABEL_KEYS if col in result['stats']}
+
+
+def well_summary(result):
+    """Resumen JSON-serializable de un resultado de process_well (o de process_las_out_of_core)"""
+    return {
+        'well_name': result['well_name'],
+        'file_fingerprint': result['file_fingerprint'],
+        'samples': result['samples'],
+        'pay_zones': result['pay_totals']['zones'],
+        'net_pay_ft': result['pay_totals']['net_ft'],
+        'dominant_matrix': result['config']['DOMINANT_MATRIX'],
+    }
+
+
+def well_output_bytes(result, formats, language='es', stats=None):
+    """Entregables de un resultado de process_well
+
+    reportlab solo se importa si se pide 'pdf'.
+
+    Returns:
+        {nombre de archivo: bytes}, en el orden de formats
+    """
+    df = result['df']
+    well_name = result['well_name']
+    effective = result['config']
+    builders = {
+        'csv': lambda: export_csv_bytes(df),
+        'xlsx': lambda: export_excel_bytes(df),
+        'npz': lambda: export_npz_bytes(df, well_name, effective),
+        'parquet': lambda: export_parquet_bytes(df, well_name, effective),
+        'las': lambda: export_las_bytes(result['source'], df, well_name, effective),
+    }
+    outputs = {}
+    for fmt in formats:
+        if fmt == 'pdf':
+            from .pdf_export import create_pdf_report
+            outputs[output_name(well_name, fmt)] = create_pdf_report(
+                df, well_name, effective, well_stats(result, language) if stats is None else stats,
+                result['available_curves'], language=language, curve_stats=result['curve_stats'],
+                pay_zones=result['pay_zones']
+            ).getvalue()
+            continue
+        outputs[output_name(well_name, fmt)] = builders[fmt]()
+        if fmt == 'csv':
+            outputs[f"{well_name}_pay_zones.csv"] = export_pay_zones_csv_bytes(result['pay_zones'])
+    return outputs
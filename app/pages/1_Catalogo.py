@@ -0,0 +1,230 @@
+# ==========================================================
+# PÁGINA STREAMLIT: CATÁLOGO DE POZOS
+# ==========================================================
+import sqlite3
+import streamlit as st
+
+from modules.well_catalog import WellCatalog, CATALOG_STAT_CURVES
+from modules.petrofisica import CURVE_ALIASES
+
+
+CATALOG_TEXTS = {
+    "es": {
+        "title": "📚 Catálogo de Pozos",
+        "caption": "Consultas sobre los pozos ya procesados, sin volver a leer los archivos LAS.",
+        "db_error": "No se pudo abrir el catálogo",
+        "empty": "El catálogo está vacío. Procesa pozos en la página principal para registrarlos.",
+        "wells": "Pozos",
+        "samples": "Muestras",
+        "net_pay_total": "Net pay total (ft)",
+        "field_filter": "Campo",
+        "all_fields": "Todos",
+        "registered_wells": "Pozos registrados",
+        "field_average": "Promedio de campo",
+        "curve": "Curva",
+        "scope": "Intervalo",
+        "scope_pay": "Net pay",
+        "scope_all": "Todo el pozo",
+        "mean": "Media",
+        "wells_used": "Pozos con datos",
+        "per_well": "Detalle por pozo",
+        "curve_presence": "Disponibilidad de curvas",
+        "standard_curve": "Curva estándar",
+        "missing": "Pozos sin la curva",
+        "present": "Pozos con la curva",
+        "coverage": "Cobertura por curva",
+        "none_missing": "Todos los pozos tienen esta curva.",
+        "well_detail": "Detalle de pozo",
+        "select_well": "Pozo",
+        "header": "Encabezado ~W",
+        "config": "Configuración usada",
+        "arrays": "Resultados guardados",
+        "no_arrays": "Este pozo no tiene resultados guardados.",
+        "delete": "🗑️ Eliminar del catálogo",
+    },
+    "en": {
+        "title": "📚 Well Catalog",
+        "caption": "Queries over already processed wells, without re-reading the LAS files.",
+        "db_error": "Could not open the catalog",
+        "empty": "The catalog is empty. Process wells on the main page to record them.",
+        "wells": "Wells",
+        "samples": "Samples",
+        "net_pay_total": "Total net pay (ft)",
+        "field_filter": "Field",
+        "all_fields": "All",
+        "registered_wells": "Recorded wells",
+        "field_average": "Field average",
+        "curve": "Curve",
+        "scope": "Interval",
+        "scope_pay": "Net pay",
+        "scope_all": "Whole well",
+        "mean": "Mean",
+        "wells_used": "Wells with data",
+        "per_well": "Per-well detail",
+        "curve_presence": "Curve availability",
+        "standard_curve": "Standard curve",
+        "missing": "Wells without the curve",
+        "present": "Wells with the curve",
+        "coverage": "Coverage by curve",
+        "none_missing": "Every well has this curve.",
+        "well_detail": "Well detail",
+        "select_well": "Well",
+        "header": "~W header",
+        "config": "Configuration used",
+        "arrays": "Stored results",
+        "no_arrays": "This well has no stored results.",
+        "delete": "🗑️ Remove from catalog",
+    },
+    "fr": {
+        "title": "📚 Catalogue de Puits",
+        "caption": "Requêtes sur les puits déjà traités, sans relire les fichiers LAS.",
+        "db_error": "Impossible d'ouvrir le catalogue",
+        "empty": "Le catalogue est vide. Traitez des puits sur la page principale pour les enregistrer.",
+        "wells": "Puits",
+        "samples": "Échantillons",
+        "net_pay_total": "Net pay total (ft)",
+        "field_filter": "Champ",
+        "all_fields": "Tous",
+        "registered_wells": "Puits enregistrés",
+        "field_average": "Moyenne du champ",
+        "curve": "Courbe",
+        "scope": "Intervalle",
+        "scope_pay": "Net pay",
+        "scope_all": "Puits entier",
+        "mean": "Moyenne",
+        "wells_used": "Puits avec données",
+        "per_well": "Détail par puits",
+        "curve_presence": "Disponibilité des courbes",
+        "standard_curve": "Courbe standard",
+        "missing": "Puits sans la courbe",
+        "present": "Puits avec la courbe",
+        "coverage": "Couverture par courbe",
+        "none_missing": "Tous les puits ont cette courbe.",
+        "well_detail": "Détail du puits",
+        "select_well": "Puits",
+        "header": "En-tête ~W",
+        "config": "Configuration utilisée",
+        "arrays": "Résultats enregistrés",
+        "no_arrays": "Ce puits n'a pas de résultats enregistrés.",
+        "delete": "🗑️ Retirer du catalogue",
+    },
+}
+
+
+def t(key):
+    lang = st.session_state.get("app_lang", "es")
+    return CATALOG_TEXTS.get(lang, CATALOG_TEXTS["es"]).get(key, CATALOG_TEXTS["es"].get(key, key))
+
+
+@st.cache_resource
+def get_well_catalog():
+    """Catálogo SQLite de pozos (ruta en AIWELLLOG_CATALOG_PATH)"""
+    return WellCatalog()
+
+
+st.set_page_config(page_title="AI_WELL_LOG - Catalog", page_icon="📚", layout="wide")
+
+st.title(t("title"))
+st.caption(t("caption"))
+
+try:
+    catalog = get_well_catalog()
+    summary = catalog.summary()
+except (sqlite3.Error, OSError) as e:
+    st.error(f"{t('db_error')}: {e}")
+    st.stop()
+
+if summary['wells'] == 0:
+    st.info(t("empty"))
+    st.stop()
+
+col1, col2, col3 = st.columns(3)
+col1.metric(t("wells"), summary['wells'])
+col2.metric(t("samples"), f"{summary['samples']:,}")
+col3.metric(t("net_pay_total"), f"{summary['net_pay_ft']:.1f}")
+
+fields = catalog.fields()
+field = None
+if fields:
+    field_label = st.selectbox(t("field_filter"), [t("all_fields")] + fields)
+    field = None if field_label == t("all_fields") else field_label
+
+# ==========================================================
+# POZOS REGISTRADOS
+# ==========================================================
+st.subheader(t("registered_wells"))
+wells = catalog.list_wells(field)
+st.dataframe(wells.drop(columns=['id']), use_container_width=True, hide_index=True)
+
+# ==========================================================
+# PROMEDIOS DE CAMPO
+# ==========================================================
+st.subheader(t("field_average"))
+col1, col2 = st.columns(2)
+with col1:
+    curve = st.selectbox(t("curve"), CATALOG_STAT_CURVES, index=CATALOG_STAT_CURVES.index('PHI_E'))
+with col2:
+    scope_labels = {t("scope_pay"): 'pay', t("scope_all"): 'all'}
+    scope = scope_labels[st.radio(t("scope"), list(scope_labels), horizontal=True)]
+
+avg = catalog.field_average(curve, scope, field)
+col1, col2, col3, col4 = st.columns(4)
+col1.metric(t("mean"), f"{avg['mean']:.4f}" if avg['mean'] is not None else "-")
+col2.metric("Min", f"{avg['min']:.4f}" if avg['min'] is not None else "-")
+col3.metric("Max", f"{avg['max']:.4f}" if avg['max'] is not None else "-")
+col4.metric(t("wells_used"), avg['wells'])
+
+with st.expander(t("per_well")):
+    per_well = catalog.curve_stats(curve, scope)
+    if field:
+        per_well = per_well[per_well['id'].isin(wells['id'])]
+    st.dataframe(per_well.drop(columns=['id']), use_container_width=True, hide_index=True)
+
+# ==========================================================
+# DISPONIBILIDAD DE CURVAS
+# ==========================================================
+st.subheader(t("curve_presence"))
+standard = st.selectbox(t("standard_curve"), list(CURVE_ALIASES), index=list(CURVE_ALIASES).index('RT'))
+col1, col2 = st.columns(2)
+with col1:
+    st.markdown(f"**{t('missing')}**")
+    missing = catalog.wells_missing_curve(standard)
+    if missing.empty:
+        st.success(t("none_missing"))
+    else:
+        st.dataframe(missing.drop(columns=['id']), use_container_width=True, hide_index=True)
+with col2:
+    st.markdown(f"**{t('present')}**")
+    st.dataframe(catalog.wells_with_curve(standard).drop(columns=['id']),
+                 use_container_width=True, hide_index=True)
+
+with st.expander(t("coverage")):
+    st.dataframe(catalog.curve_coverage(), use_container_width=True, hide_index=True)
+
+# ==========================================================
+# DETALLE DE POZO
+# ==========================================================
+st.subheader(t("well_detail"))
+well_options = dict(zip(wells['well_name'] + ' (' + wells['file_name'].fillna('') + ')', wells['id']))
+if well_options:
+    well_id = int(well_options[st.selectbox(t("select_well"), list(well_options))])
+    record = catalog.get_well(well_id)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"**{t('header')}**")
+        st.json(record['header'], expanded=False)
+    with col2:
+        st.markdown(f"**{t('config')}**")
+        st.json(record['config'], expanded=False)
+
+    with st.expander(t("arrays")):
+        loaded = catalog.load_arrays(well_id)
+        if loaded is None:
+            st.info(t("no_arrays"))
+        else:
+            arrays_df, _ = loaded
+            st.dataframe(arrays_df.head(200), use_container_width=True, height=300)
+
+    if st.button(t("delete"), key=f"delete_{well_id}"):
+        catalog.delete_well(well_id)
+        st.rerun()
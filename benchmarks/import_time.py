@@ -0,0 +1,85 @@
+# ==========================================================
+# BENCHMARK: TIEMPO DE IMPORTACIÓN DEL ARRANQUE (-X importtime)
+# ==========================================================
+"""Resumen de `python -X importtime` para el arranque de la app
+
+Por defecto importa, en un intérprete nuevo, los mismos módulos que
+app/main.py importa a nivel de módulo (las importaciones dentro de
+funciones o bloques condicionales no cuentan), que es lo que paga cada
+arranque en frío antes de mostrar la portada.
+
+Uso:
+    python benchmarks/import_time.py [--top 15] [--module modules.pdf_export ...]
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app')
+
+# Dependencias pesadas que deberían cargarse solo al usarlas
+HEAVY_PACKAGES = ('matplotlib', 'reportlab', 'lasio', 'scipy', 'PIL', 'pyarrow')
+
+
+def startup_imports(path=os.path.join(APP_DIR, 'main.py')):
+    """Módulos importados a nivel de módulo por un script"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def import_times(modules):
+    """(self µs, acumulado µs, nombre) de cada módulo cargado por un intérprete nuevo"""
+    code = ''.join(f'import {name}\n' for name in modules)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=APP_DIR, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top', type=int, default=15, help='módulos de mayor tiempo acumulado a mostrar')
+    parser.add_argument('--module', action='append', help='módulo a medir en lugar del arranque de app/main.py')
+    args = parser.parse_args(argv)
+
+    modules = args.module or startup_imports()
+    rows = import_times(modules)
+    total_us = sum(self_us for self_us, _, _ in rows)
+
+    print(f"Módulos: {', '.join(modules)}")
+    print(f"Cargados: {len(rows)} · total {total_us / 1000:.1f} ms\n")
+    print(f"{'acumulado ms':>12}  {'propio ms':>9}  módulo")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda row: -row[1])[:args.top]:
+        print(f"{cumulative_us / 1000:12.1f}  {self_us / 1000:9.1f}  {name}")
+
+    print("\nDependencias pesadas:")
+    for package in HEAVY_PACKAGES:
+        own = [self_us for self_us, _, name in rows
+               if name.strip() == package or name.strip().startswith(package + '.')]
+        if own:
+            print(f"  {package:<12} {len(own)} módulos, {sum(own) / 1000:.1f} ms")
+        else:
+            print(f"  {package:<12} no cargado")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+# ==========================================================
+# DATOS DE PRUEBA: LAS 2.0 SINTÉTICO
+# ==========================================================
+import numpy as np
+
+
+SAMPLE_CURVES = (('DEPT', 'FT'), ('GR', 'API'), ('RHOB', 'G/C3'), ('NPHI', 'V/V'),
+                 ('ILD', 'OHMM'), ('PEF', 'B/E'), ('CALI', 'IN'))
+
+
+def sample_las_bytes(n=600, start=5000.0, step=0.5, seed=0, well='TEST-1'):
+    """Contenido de un LAS 2.0 con las curvas de SAMPLE_CURVES (NULL = -999.25)"""
+    rng = np.random.default_rng(seed)
+    depth = start + step * np.arange(n)
+    data = np.column_stack([
+        depth,
+        60 + 40 * np.sin(depth / 30) + rng.normal(0, 5, n),
+        2.45 + 0.1 * np.sin(depth / 25) + rng.normal(0, 0.02, n),
+        0.2 + 0.08 * np.sin(depth / 25) + rng.normal(0, 0.01, n),
+        np.exp(1.5 + np.cos(depth / 40)),
+        2.0 + rng.normal(0, 0.2, n),
+        8.5 + np.abs(rng.normal(0, 0.3, n)),
+    ])
+    data[20:30, 1] = -999.25
+    lines = [
+        '~VERSION INFORMATION',
+        ' VERS.   2.0 : CWLS LOG ASCII STANDARD - VERSION 2.0',
+        ' WRAP.   NO  : ONE LINE PER DEPTH STEP',
+        '~WELL INFORMATION',
+        f' STRT.FT {depth[0]:.4f} : START DEPTH',
+        f' STOP.FT {depth[-1]:.4f} : STOP DEPTH',
+        f' STEP.FT {step:.4f} : STEP',
+        ' NULL.   -999.25 : NULL VALUE',
+        f' WELL.   {well} : WELL',
+        '~CURVE INFORMATION',
+        *(f' {name}.{unit} : {name}' for name, unit in SAMPLE_CURVES),
+        '~A',
+        *(' '.join(f'{value:.5f}' for value in row) for row in data),
+    ]
+    return ('\n'.join(lines) + '\n').encode('ascii')
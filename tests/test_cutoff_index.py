@@ -0,0 +1,31 @@
+import unittest
+
+from app.modules.pay_zones import extract_pay_zones
+from app.modules.pipeline import process_well
+
+from .sample_las import sample_las_bytes
+
+
+def recomputed_pay(df, phi_cutoff, vsh_cutoff, sw_cutoff):
+    """IS_PAY con otros cutoffs y las reglas de NaN de petro_stages"""
+    return ((df['PHI_E'].fillna(0.0) >= phi_cutoff) &
+            (df['VSH'].fillna(1.0) <= vsh_cutoff) &
+            (df['SW'].fillna(1.0) <= sw_cutoff))
+
+
+class CutoffIndexTest(unittest.TestCase):
+
+    def test_net_pay_matches_unfiltered_zones_away_from_base(self):
+        # Cutoffs base con filtro de zonas: el índice no debe heredarlo
+        config = {'PAY_MIN_THICKNESS': 3.0, 'PAY_MERGE_GAP': 1.0, 'PHI_CUTOFF': 0.1, 'VSH_CUTOFF': 0.5,
+                  'SW_CUTOFF': 0.9}
+        result = process_well(sample_las_bytes(n=1500), 'TEST-1', config)
+        df, index = result['df'], result['cutoff_index']
+        for cutoffs in ((0.1, 0.5, 0.9), (0.05, 0.6, 0.95), (0.12, 0.4, 0.8), (0.2, 0.3, 0.6), (0.0, 1.0, 1.0)):
+            with self.subTest(cutoffs=cutoffs):
+                zones = extract_pay_zones(df.assign(IS_PAY=recomputed_pay(df, *cutoffs)))
+                self.assertAlmostEqual(index.net_pay(*cutoffs), float(zones['NET_FT'].sum()), places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
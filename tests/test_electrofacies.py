@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from app.modules.electrofacies import ElectrofaciesModel
+from app.modules.pipeline import FaciesWells, fit_facies_model
+
+from .sample_las import sample_las_bytes
+
+
+class FaciesWellsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.raws = [sample_las_bytes(n=300, seed=seed) for seed in range(3)]
+
+    def test_decodes_one_well_per_pass(self):
+        model = ElectrofaciesModel(3, seed=42)
+        wells = FaciesWells(self.raws, passes=model.fit_passes)
+        model.fit(wells)
+        self.assertEqual(wells._decoded, len(self.raws) * model.fit_passes)
+
+    def test_paths_match_bytes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for i, raw in enumerate(self.raws):
+                paths.append(os.path.join(directory, f'well_{i}.las'))
+                with open(paths[-1], 'wb') as f:
+                    f.write(raw)
+            from_paths = fit_facies_model(paths, 3)
+        from_bytes = fit_facies_model(self.raws, 3)
+        np.testing.assert_array_equal(from_paths.kmeans.centers, from_bytes.kmeans.centers)
+        self.assertEqual(from_paths.samples, from_bytes.samples)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import asyncio
+import io
+import json
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+from app.modules.http_api import ProcessingApi
+
+from .sample_las import sample_las_bytes
+
+
+POLL_SECONDS = 0.1
+POLL_TIMEOUT = 60
+
+
+class HttpApiTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.api = ProcessingApi(max_workers=1)
+        cls.loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def ready(port):
+            cls.port = port
+            started.set()
+
+        cls.task = cls.loop.create_task(cls.api.serve(port=0, ready=ready))
+        cls.thread = threading.Thread(target=cls._run_loop, daemon=True)
+        cls.thread.start()
+        if not started.wait(10):
+            raise RuntimeError('La API no empezó a escuchar')
+
+    @classmethod
+    def _run_loop(cls):
+        try:
+            cls.loop.run_until_complete(cls.task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            cls.loop.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.call_soon_threadsafe(cls.task.cancel)
+        cls.thread.join(10)
+
+    def request(self, method, path, body=None):
+        """(estado, cabeceras, cuerpo) de una petición a la API"""
+        req = urllib.request.Request(f"http://127.0.0.1:{self.port}{path}", data=body, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+
+    def request_json(self, method, path, body=None):
+        status, _, data = self.request(method, path, body)
+        return status, json.loads(data)
+
+    def wait_job(self, job_id):
+        deadline = time.monotonic() + POLL_TIMEOUT
+        while time.monotonic() < deadline:
+            status, job = self.request_json('GET', f"/jobs/{job_id}")
+            self.assertEqual(status, 200)
+            if job['status'] in ('done', 'error'):
+                return job
+            time.sleep(POLL_SECONDS)
+        self.fail(f"El trabajo {job_id} no terminó")
+
+    def test_health(self):
+        status, payload = self.request_json('GET', '/health')
+        self.assertEqual(status, 200)
+        self.assertEqual(payload['status'], 'ok')
+        self.assertEqual(payload['workers'], 1)
+
+    def test_job_lifecycle(self):
+        status, job = self.request_json('POST', '/jobs?well=api-1&PHI_CUTOFF=0.08', sample_las_bytes(n=300))
+        self.assertEqual(status, 202)
+        self.assertEqual(job['well_name'], 'API-1')
+        self.assertEqual(job['config'], {'PHI_CUTOFF': 0.08})
+
+        job = self.wait_job(job['id'])
+        self.assertEqual(job['status'], 'done', job['error'])
+        self.assertEqual(job['ready'], ['csv', 'npz'])
+        self.assertEqual(job['summary']['samples'], 300)
+
+        status, headers, data = self.request('GET', job['results']['csv'])
+        self.assertEqual(status, 200)
+        self.assertIn('API-1', headers['Content-Disposition'])
+        self.assertIn('DEPTH_FT', data.decode('utf-8').splitlines()[0])
+
+        status, _, data = self.request('GET', job['results']['npz'])
+        self.assertEqual(status, 200)
+        with np.load(io.BytesIO(data)) as npz:
+            self.assertIn('DEPTH_FT', npz.files)
+            self.assertEqual(len(npz['DEPTH_FT']), 300)
+
+        status, payload = self.request_json('GET', '/jobs')
+        self.assertEqual(status, 200)
+        self.assertIn(job['id'], [listed['id'] for listed in payload['jobs']])
+
+    def test_invalid_las_fails_the_job(self):
+        status, job = self.request_json('POST', '/jobs?well=bad', b'garbage')
+        self.assertEqual(status, 202)
+        job = self.wait_job(job['id'])
+        self.assertEqual(job['status'], 'error')
+        self.assertTrue(job['error'])
+        status, _ = self.request_json('GET', f"/jobs/{job['id']}/pdf")
+        self.assertEqual(status, 409)
+
+    def test_client_errors(self):
+        cases = [
+            ('POST', '/jobs', b'', 400),
+            ('POST', '/jobs?language=de', b'x', 400),
+            ('POST', '/jobs?unknown=1', b'x', 400),
+            ('GET', '/jobs/missing', None, 404),
+            ('GET', '/jobs/missing/csv', None, 404),
+            ('GET', '/nowhere', None, 404),
+            ('DELETE', '/jobs', None, 405),
+            ('POST', '/health', b'x', 405),
+        ]
+        for method, path, body, expected in cases:
+            with self.subTest(method=method, path=path):
+                status, payload = self.request_json(method, path, body)
+                self.assertEqual(status, expected)
+                self.assertIn('error', payload)
+
+    def test_unknown_format(self):
+        status, job = self.request_json('POST', '/jobs?well=fmt', sample_las_bytes(n=100))
+        self.assertEqual(status, 202)
+        status, payload = self.request_json('GET', f"/jobs/{job['id']}/docx")
+        self.assertEqual(status, 404)
+        self.assertIn('docx', payload['error'])
+        self.assertEqual(self.wait_job(job['id'])['status'], 'done')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import threading
+import unittest
+
+import numpy as np
+
+from app.modules.jobs import JobManager
+from app.modules.result_store import ResultStore
+
+
+class JobManagerStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.manager = JobManager(max_workers=1, store=ResultStore(max_bytes=1024))
+
+    def tearDown(self):
+        self.manager.shutdown()
+
+    def build(self, size, progress=None):
+        with self.lock:
+            self.calls += 1
+        return {'values': np.zeros(size)}
+
+    def test_oversize_result_is_not_recomputed(self):
+        first = self.manager.submit(('well', 'big'), self.build, 1000)
+        self.assertEqual(len(first.result(10)['values']), 1000)
+        self.assertFalse(first.stored)
+        again = self.manager.submit(('well', 'big'), self.build, 1000)
+        self.assertIs(again, first)
+        self.assertEqual(self.calls, 1)
+
+    def test_stored_result_is_served_from_the_store(self):
+        first = self.manager.submit(('well', 'small'), self.build, 10)
+        first.result(10)
+        self.assertTrue(first.stored)
+        again = self.manager.submit(('well', 'small'), self.build, 10)
+        self.assertIsNot(again, first)
+        self.assertIs(again.result(), first.result())
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.manager.stats()['jobs'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+
+from app.modules.las_ingest import LasSource, read_las_projected
+from app.modules.pipeline import process_well
+
+from .sample_las import sample_las_bytes
+
+
+class LasSourceTest(unittest.TestCase):
+
+    def test_projected_read(self):
+        source, df = read_las_projected(sample_las_bytes(n=200))
+        self.assertTrue(source.projected)
+        self.assertEqual(len(df), 200)
+        self.assertEqual(df['GR'].isna().sum(), 10)
+
+    def test_path_like_body_is_not_read_from_disk(self):
+        # Un cuerpo que no es LAS no debe abrirse como ruta del servidor
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'server_side.las')
+            with open(path, 'wb') as f:
+                f.write(sample_las_bytes(n=50))
+            for body in (path.encode(), b'garbage'):
+                with self.subTest(body=body):
+                    with self.assertRaises(Exception) as raised:
+                        LasSource(body)
+                    self.assertNotIsInstance(raised.exception, FileNotFoundError)
+                    with self.assertRaises(Exception):
+                        process_well(body, 'X', {})
+
+
+if __name__ == '__main__':
+    unittest.main()
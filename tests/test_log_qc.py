@@ -0,0 +1,35 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app.modules.log_qc import evaluate_qc
+from app.modules.petrofisica import flag_bad_data
+
+
+class RangeFlagTest(unittest.TestCase):
+
+    def test_flag_bad_data_matches_qc_range_bit(self):
+        rng = np.random.default_rng(0)
+        n = 200
+        df = pd.DataFrame({
+            'DEPTH_FT': 1000 + 0.5 * np.arange(n),
+            'GR': rng.uniform(-50, 400, n),
+            'RHOB': rng.uniform(1.2, 3.5, n),
+            'RT': rng.uniform(0.01, 20, n),
+        })
+        df.loc[10:15, 'GR'] = np.nan
+        df.loc[20, 'RHOB'] = 3.2
+        df.loc[30:32, 'RT'] = 0.01
+        qc = evaluate_qc(df)
+        for curve in ('GR', 'RHOB', 'RT'):
+            with self.subTest(curve=curve):
+                flags = flag_bad_data(df, curve)
+                self.assertTrue(flags.any())
+                np.testing.assert_array_equal(flags.to_numpy(), qc.bad(curve, ('RANGE',)))
+        self.assertFalse(flag_bad_data(df, 'RHOB')[20])
+        self.assertFalse(flag_bad_data(df, 'PEF').any())
+
+
+if __name__ == '__main__':
+    unittest.main()
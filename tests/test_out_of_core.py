@@ -0,0 +1,56 @@
+import io
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from app.modules.data_export import load_npz_results
+from app.modules.out_of_core import process_las_out_of_core, write_store_outputs
+from app.modules.pipeline import process_well
+from app.modules.well_outputs import well_output_bytes
+
+from .sample_las import sample_las_bytes
+
+
+class OutOfCoreTest(unittest.TestCase):
+
+    def compare(self, config, chunk_rows=97):
+        raw = sample_las_bytes(n=1500)
+        expected = process_well(raw, 'TEST-1', config)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'TEST-1.las')
+            with open(path, 'wb') as f:
+                f.write(raw)
+            result = process_las_out_of_core(path, os.path.join(directory, 'store'), 'TEST-1', config,
+                                              chunk_rows=chunk_rows)
+            _, skipped = write_store_outputs(result, directory, ('csv', 'npz', 'pdf'), chunk_rows)
+            files = {name: open(os.path.join(directory, name), 'rb').read()
+                     for name in ('TEST-1_results.csv', 'TEST-1_pay_zones.csv', 'TEST-1_results.npz')}
+
+        self.assertEqual(skipped, ['pdf'])
+        outputs = well_output_bytes(expected, ('csv', 'npz'))
+        self.assertEqual(files['TEST-1_results.csv'], outputs['TEST-1_results.csv'])
+        # Las sumas de las zonas que cruzan tramos pueden diferir en el último decimal
+        pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(files['TEST-1_pay_zones.csv'])),
+                                      pd.read_csv(io.BytesIO(outputs['TEST-1_pay_zones.csv'])), check_exact=False)
+        pd.testing.assert_frame_equal(load_npz_results(io.BytesIO(files['TEST-1_results.npz']))[0],
+                                      load_npz_results(io.BytesIO(outputs['TEST-1_results.npz']))[0])
+        for key in ('samples', 'config', 'available_curves', 'file_fingerprint', 'vsh_source', 'interval_ft'):
+            self.assertEqual(result[key], expected[key], key)
+        pd.testing.assert_frame_equal(result['depth_report'], expected['depth_report'], check_exact=False)
+        pd.testing.assert_frame_equal(result['qc_summary'], expected['qc_summary'], check_dtype=False)
+        for col, summary in expected['stats'].items():
+            for name, value in summary.items():
+                self.assertAlmostEqual(result['stats'][col][name], value, places=10)
+
+    def test_matches_process_well(self):
+        self.compare({})
+
+    def test_matches_process_well_windowed_resampled(self):
+        self.compare({'DEPTH_MATCH_MODE': 'windowed', 'QC_MASK': True, 'RESAMPLE_STEP': 0.3,
+                      'PAY_MERGE_GAP': 2.0, 'PAY_MIN_THICKNESS': 3.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app.modules.pay_zones import extract_pay_zones, sample_thickness, zone_pay_mask
+from app.modules.pipeline import process_well
+
+from .sample_las import sample_las_bytes
+
+
+class ZonePayMaskTest(unittest.TestCase):
+
+    def test_thin_runs_are_not_pay(self):
+        df = pd.DataFrame({'DEPTH_FT': 1000 + 0.5 * np.arange(20),
+                           'IS_PAY': np.isin(np.arange(20), [2, 3, 4, 5, 6, 7, 10, 15, 16])})
+        zones = extract_pay_zones(df, min_thickness=2.0)
+        self.assertEqual(len(zones), 1)
+        np.testing.assert_array_equal(np.flatnonzero(zone_pay_mask(df, zones)), [2, 3, 4, 5, 6, 7])
+
+    def test_process_well_pay_matches_zones(self):
+        config = {'PAY_MIN_THICKNESS': 3.0, 'PAY_MERGE_GAP': 1.0, 'PHI_CUTOFF': 0.1, 'VSH_CUTOFF': 0.5,
+                  'SW_CUTOFF': 0.9}
+        result = process_well(sample_las_bytes(n=1500), 'TEST-1', config)
+        df, net = result['df'], result['pay_totals']['net_ft']
+        thickness = sample_thickness(df['DEPTH_FT'].to_numpy())
+        self.assertAlmostEqual(float(thickness[df['IS_PAY'].to_numpy()].sum()), net, places=6)
+        self.assertEqual(int(df['IS_PAY'].sum()), int(result['pay_zones']['SAMPLES'].sum()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+
+from app.modules.pay_zones import extract_pay_zones
+from app.modules.pipeline import process_well
+from app.modules.uncertainty import UNCERTAIN_PARAMS, evaluate_realizations, run_monte_carlo
+
+from .sample_las import sample_las_bytes
+
+
+class ZoneFilteredMonteCarloTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.config = {'PAY_MIN_THICKNESS': 3.0, 'PAY_MERGE_GAP': 1.0, 'PHI_CUTOFF': 0.1, 'VSH_CUTOFF': 0.5,
+                      'SW_CUTOFF': 0.9}
+        cls.result = process_well(sample_las_bytes(n=1500), 'TEST-1', cls.config)
+        config = cls.result['config']
+        cls.base = {name: config[name] for name in UNCERTAIN_PARAMS}
+        cls.options = {'sw_model': config['SW_MODEL'], 'rsh': config['RSH'],
+                       'min_thickness': config['PAY_MIN_THICKNESS'], 'merge_gap': config['PAY_MERGE_GAP']}
+
+    def test_base_case_matches_zone_net_pay(self):
+        mc = run_monte_carlo(self.result['df'], self.base, {'RW': ('normal', 0.2)}, n=200, seed=1, **self.options)
+        self.assertAlmostEqual(mc['base']['NET_PAY_FT'], self.result['pay_totals']['net_ft'], places=4)
+        self.assertAlmostEqual(mc['base_net_pay'], self.result['pay_totals']['net_ft'], places=4)
+
+    def test_realizations_match_zones_of_recomputed_flags(self):
+        df = self.result['df']
+        cutoffs = [(0.08, 0.6, 0.95), (0.12, 0.4, 0.8), (0.1, 0.5, 0.9)]
+        params = {name: np.full(len(cutoffs), float(self.base[name])) for name in UNCERTAIN_PARAMS}
+        for i, (phi, vsh, sw) in enumerate(cutoffs):
+            params['PHI_CUTOFF'][i], params['VSH_CUTOFF'][i], params['SW_CUTOFF'][i] = phi, vsh, sw
+        net = evaluate_realizations(df, params, **self.options)['NET_PAY_FT'].to_numpy()
+        for i, (phi, vsh, sw) in enumerate(cutoffs):
+            with self.subTest(cutoffs=(phi, vsh, sw)):
+                pay = ((df['PHI_E'].fillna(0.0) >= phi) & (df['VSH'].fillna(1.0) <= vsh) &
+                       (df['SW'].fillna(1.0) <= sw))
+                zones = extract_pay_zones(df.assign(IS_PAY=pay), self.config['PAY_MIN_THICKNESS'],
+                                          self.config['PAY_MERGE_GAP'])
+                self.assertAlmostEqual(net[i], float(zones['NET_FT'].sum()), places=4)
+
+
+if __name__ == '__main__':
+    unittest.main()